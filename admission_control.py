@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Admission Control
+Cross-process limits on concurrent model generations for the Djinn Federation
+
+Every hub process on a machine used to start generations independently,
+so a few terminals could load several 19-65 GB models at once and push
+the box into swap. Hubs now ask the admission controller first. It caps
+concurrent generations per model and per memory class using lock-file
+slots in a shared directory, and queues waiting requests by priority
+(dialogue > command > djinn).
+
+Slots are exclusive file locks (flock, msvcrt on Windows), so a slot is
+released by the operating system if its holder crashes. The holder also
+writes its pid into the slot file, which lets status views count busy
+slots without locking them (a probe lock would make a concurrent
+admission in another process fail its attempt). Waiting requests
+leave a ticket file that they refresh while they wait; tickets that stop
+being refreshed are ignored and cleaned up by the other waiters.
+"""
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from metrics_registry import get_metrics_registry
+from tracing import get_tracer
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+    import msvcrt
+
+# Lower rank is admitted first
+PRIORITIES = {"dialogue": 0, "command": 1, "djinn": 2}
+
+# (class, upper bound in GB of model size / RAM requirement)
+MEMORY_CLASSES = (("small", 8.0), ("medium", 24.0), ("large", float("inf")))
+DEFAULT_CLASS_LIMITS = {"small": 3, "medium": 2, "large": 1}
+
+DEFAULT_ADMISSION_DIR = os.environ.get(
+    "DJINN_ADMISSION_DIR", os.path.join(tempfile.gettempdir(), "djinn_admission")
+)
+
+
+class AdmissionError(Exception):
+    """A request could not be admitted to a model"""
+
+
+class AdmissionTimeoutError(AdmissionError):
+    """No slot became free before the caller's deadline"""
+
+
+def parse_size_gb(size: Any) -> Optional[float]:
+    """Model size in GB from hub metadata ('7.3GB', '636 MB', 19); None if unknown"""
+    if isinstance(size, (int, float)):
+        return float(size)
+    match = re.match(r"\s*([\d.]+)\s*([KMGT]?B)?", str(size or ""), re.IGNORECASE)
+    if not match:
+        return None
+    value = float(match.group(1))
+    unit = (match.group(2) or "GB").upper()
+    scale = {"KB": 1 / 1024 ** 2, "MB": 1 / 1024, "GB": 1.0, "TB": 1024.0}[unit]
+    return value * scale
+
+
+def memory_class(size_gb: Optional[float]) -> str:
+    """Memory class for a model; unknown sizes are treated as large"""
+    if size_gb is None:
+        return "large"
+    for name, upper_bound in MEMORY_CLASSES:
+        if size_gb < upper_bound:
+            return name
+    return "large"
+
+
+def _slot_name(kind: str, key: str) -> str:
+    return f"{kind}-" + re.sub(r"[^A-Za-z0-9._-]", "_", key)
+
+
+@dataclass
+class Admission:
+    """A granted generation slot and how long the request queued for it"""
+
+    model: str
+    memory_class: str
+    priority: str
+    queue_position: int = 1  # Position on arrival; 1 = next in line
+    wait_seconds: float = 0.0
+    handles: List[Any] = field(default_factory=list, repr=False)
+
+
+@dataclass
+class _Ticket:
+    path: Path
+    model: str
+    memory_class: str
+    priority: str
+    created: float
+    position: int = 0
+    reported_position: int = 0  # Last position passed to on_queued
+
+
+class AdmissionController:
+    """
+    Admits model generations across every hub process sharing admission_dir.
+    A request needs one slot for its model and one for its memory class.
+    """
+
+    def __init__(
+        self,
+        admission_dir: str = DEFAULT_ADMISSION_DIR,
+        model_limit: int = 1,
+        class_limits: Optional[Dict[str, int]] = None,
+        poll_interval: float = 0.25,
+        stale_seconds: float = 30.0,
+    ):
+        self.admission_dir = Path(admission_dir)
+        self.queue_dir = self.admission_dir / "queue"
+        self.slots_dir = self.admission_dir / "slots"
+        self.model_limit = model_limit
+        self.class_limits = dict(DEFAULT_CLASS_LIMITS, **(class_limits or {}))
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.slots_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def admit(
+        self,
+        model: str,
+        size_gb: Optional[float] = None,
+        priority: str = "dialogue",
+        timeout: Optional[float] = None,
+        on_queued: Optional[Callable[[int, float], None]] = None,
+    ) -> Iterator[Admission]:
+        """Block until a slot is free, hold it for the enclosed generation"""
+        ticket = self._create_ticket(model, size_gb, priority)
+        with get_tracer().span("admission.wait", model=model, priority=priority) as span:
+            try:
+                while True:
+                    admission = self._attempt(ticket, on_queued)
+                    if admission:
+                        break
+                    self._check_deadline(ticket, timeout)
+                    time.sleep(self.poll_interval)
+            finally:
+                self._remove(ticket.path)
+            span.set_attribute("memory_class", ticket.memory_class)
+        self._record_wait(admission)
+
+        try:
+            yield admission
+        finally:
+            self._release(admission)
+
+    @asynccontextmanager
+    async def admit_async(
+        self,
+        model: str,
+        size_gb: Optional[float] = None,
+        priority: str = "dialogue",
+        timeout: Optional[float] = None,
+        on_queued: Optional[Callable[[int, float], None]] = None,
+    ) -> AsyncIterator[Admission]:
+        """admit() for coroutines; waiting does not block the event loop"""
+        ticket = self._create_ticket(model, size_gb, priority)
+        with get_tracer().span("admission.wait", model=model, priority=priority) as span:
+            try:
+                while True:
+                    admission = self._attempt(ticket, on_queued)
+                    if admission:
+                        break
+                    self._check_deadline(ticket, timeout)
+                    await asyncio.sleep(self.poll_interval)
+            finally:
+                self._remove(ticket.path)
+            span.set_attribute("memory_class", ticket.memory_class)
+        self._record_wait(admission)
+
+        try:
+            yield admission
+        finally:
+            self._release(admission)
+
+    @staticmethod
+    def _record_wait(admission: Admission):
+        get_metrics_registry().histogram(
+            "djinn_admission_wait_seconds", "Time queued for a model slot per memory class", ["memory_class"]
+        ).labels(admission.memory_class).observe(admission.wait_seconds)
+
+    def _create_ticket(self, model: str, size_gb: Optional[float], priority: str) -> _Ticket:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown admission priority: {priority}")
+        # Names sort by (priority, arrival), which is the admission order
+        name = f"{PRIORITIES[priority]}-{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        ticket = _Ticket(self.queue_dir / name, model, memory_class(size_gb), priority, time.time())
+        self._write_ticket(ticket)
+        return ticket
+
+    def _write_ticket(self, ticket: _Ticket):
+        tmp_path = ticket.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model": ticket.model, "memory_class": ticket.memory_class,
+                       "priority": ticket.priority, "pid": os.getpid(), "created": ticket.created}, f)
+        os.replace(tmp_path, ticket.path)
+
+    def _attempt(self, ticket: _Ticket, on_queued) -> Optional[Admission]:
+        """Refresh the ticket and take slots unless enough of the queue is ahead of us"""
+        try:
+            os.utime(ticket.path)
+        except OSError:
+            self._write_ticket(ticket)  # Removed as stale after a long stall
+
+        ahead_model, ahead_class, ticket.position = self._queue_ahead(ticket)
+        handles = None
+        if ahead_model < self.model_limit and ahead_class < self.class_limits[ticket.memory_class]:
+            handles = self._acquire_slots(ticket)
+
+        if handles is None:
+            if on_queued and ticket.position != ticket.reported_position:
+                ticket.reported_position = ticket.position
+                on_queued(ticket.position, time.time() - ticket.created)
+            return None
+        return Admission(
+            model=ticket.model,
+            memory_class=ticket.memory_class,
+            priority=ticket.priority,
+            queue_position=ticket.reported_position or 1,
+            wait_seconds=round(time.time() - ticket.created, 3),
+            handles=handles,
+        )
+
+    def _queue_ahead(self, ticket: _Ticket):
+        """Live tickets ahead of ours: same model, same class, and position"""
+        ahead_model = ahead_class = competing = 0
+        now = time.time()
+        for path in sorted(self.queue_dir.glob("*.json")):
+            if path.name >= ticket.path.name:
+                break
+            try:
+                if now - path.stat().st_mtime > self.stale_seconds:
+                    self._remove(path)  # Waiter died without cleaning up
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    other = json.load(f)
+            except (OSError, ValueError):
+                continue
+            same_model = other.get("model") == ticket.model
+            same_class = other.get("memory_class") == ticket.memory_class
+            ahead_model += same_model
+            ahead_class += same_class
+            competing += same_model or same_class
+        return ahead_model, ahead_class, competing + 1
+
+    def _check_deadline(self, ticket: _Ticket, timeout: Optional[float]):
+        if timeout is not None and time.time() - ticket.created >= timeout:
+            raise AdmissionTimeoutError(
+                f"No {ticket.memory_class} slot for {ticket.model} within {timeout:.0f}s "
+                f"(queue position {ticket.position})"
+            )
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+
+    def _acquire_slots(self, ticket: _Ticket) -> Optional[List[Any]]:
+        class_handle = self._lock_any(_slot_name("class", ticket.memory_class),
+                                      self.class_limits[ticket.memory_class])
+        if class_handle is None:
+            return None
+        model_handle = self._lock_any(_slot_name("model", ticket.model), self.model_limit)
+        if model_handle is None:
+            self._unlock(class_handle)
+            return None
+        handles = [class_handle, model_handle]
+        owner = json.dumps({"pid": os.getpid(), "model": ticket.model}).encode("utf-8")
+        for handle in handles:
+            handle.seek(0)
+            handle.truncate()
+            handle.write(owner)
+            handle.flush()
+        return handles
+
+    def _lock_any(self, name: str, limit: int):
+        for index in range(limit):
+            handle = self._try_lock(self.slots_dir / f"{name}.{index}.lock")
+            if handle is not None:
+                return handle
+        return None
+
+    @staticmethod
+    def _try_lock(path: Path):
+        handle = open(path, "a+b")
+        try:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            return None
+        return handle
+
+    @staticmethod
+    def _unlock(handle):
+        try:
+            handle.seek(0)
+            handle.truncate()  # Clear the owner before another process can take the slot
+            if FCNTL_AVAILABLE:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            handle.close()
+
+    def _release(self, admission: Admission):
+        for handle in reversed(admission.handles):
+            self._unlock(handle)
+        admission.handles = []
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def status(self) -> Dict[str, Any]:
+        """Busy slots per memory class and the waiting queue, across all processes"""
+        busy = {}
+        for class_name, limit in self.class_limits.items():
+            in_use = sum(
+                self._slot_in_use(self.slots_dir / f"{_slot_name('class', class_name)}.{index}.lock")
+                for index in range(limit)
+            )
+            busy[class_name] = {"in_use": in_use, "limit": limit}
+
+        waiting = []
+        now = time.time()
+        for path in self._live_tickets():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    ticket = json.load(f)
+            except (OSError, ValueError):
+                continue
+            ticket["waited_seconds"] = round(now - ticket.get("created", now), 1)
+            waiting.append(ticket)
+        return {"classes": busy, "model_limit": self.model_limit, "waiting": waiting}
+
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot, from the ticket files alone"""
+        return len(self._live_tickets())
+
+    def _live_tickets(self) -> List[Path]:
+        live = []
+        now = time.time()
+        for path in sorted(self.queue_dir.glob("*.json")):
+            try:
+                if now - path.stat().st_mtime <= self.stale_seconds:
+                    live.append(path)
+            except OSError:
+                continue  # Removed by its waiter
+        return live
+
+    @staticmethod
+    def _slot_in_use(path: Path) -> bool:
+        """Whether a slot's recorded holder is still running, read without locking it"""
+        try:
+            with open(path, "rb") as f:
+                owner = f.read()
+        except FileNotFoundError:
+            return False
+        except OSError:
+            return True  # Windows refuses reads of a locked byte range
+        if not owner.strip():
+            return False
+        try:
+            pid = int(json.loads(owner)["pid"])
+        except (ValueError, KeyError, TypeError):
+            return True  # Holder is mid-write
+        if not FCNTL_AVAILABLE:
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False  # Crashed holder; the OS has already released its lock
+        except OSError:
+            pass  # Exists but belongs to another user
+        return True
+
+
+# Global controller instance
+admission_controller = None
+admission_controller_lock = threading.Lock()
+
+
+def get_admission_controller():
+    """Get or create the global admission controller (DJINN_ADMISSION_DIR to relocate)"""
+    global admission_controller
+    with admission_controller_lock:
+        if admission_controller is None:
+            admission_controller = AdmissionController()
+            controller = admission_controller
+            get_metrics_registry().gauge(
+                "djinn_admission_queue_depth", "Generations waiting for a model slot (all hub processes)"
+            ).set_function(controller.queue_depth)
+        return admission_controller
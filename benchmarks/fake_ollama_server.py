@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Fake Ollama Server
+Deterministic stand-in for the Ollama HTTP API, for offline benchmarks
+
+Serves /api/generate (streaming and not), /api/show, /api/tags and /api/ps
+with simulated timings per model:
+  load_seconds       - paid once when a model is first used (or after it
+                       was unloaded); concurrent requests wait for the load
+  ttft_seconds       - prompt evaluation before the first token
+  tokens_per_second  - generation rate for the rest of the reply
+  response_tokens    - reply length
+Replies are derived from a hash of model and prompt, so the same traffic
+always produces the same text and counters. Like the real server, each
+loaded model keeps the previous prompt's KV cache: words shared with the
+start of the last prompt are not re-evaluated (prompt_eval_count counts
+the rest), and prompt_cache_stats() reports the reuse per model.
+time_scale shrinks every delay (0.1 runs ten times faster) without
+changing the reported durations.
+
+Profiles are matched by exact model name, then by fnmatch pattern in file
+order, then fall back to the default profile.
+
+Usage:
+    python benchmarks/fake_ollama_server.py --port 11434 --profiles benchmarks/fake_model_profiles.json
+    OLLAMA_HOST=127.0.0.1:11434 python constellation_hub.py
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PROFILES_FILE = Path(__file__).resolve().parent / "fake_model_profiles.json"
+
+VOCABULARY = (
+    "the federation constellation routes your request through cosmic wisdom "
+    "analysis shows a balanced path forward consider memory latency models "
+    "steward council companion directive execute verify harmony insight"
+).split()
+
+
+@dataclass
+class ModelProfile:
+    """Simulated performance of one model"""
+
+    load_seconds: float = 0.5
+    ttft_seconds: float = 0.05
+    tokens_per_second: float = 40.0
+    response_tokens: int = 24
+    size_gb: float = 4.0
+
+
+def load_profiles(path=DEFAULT_PROFILES_FILE) -> Dict[str, ModelProfile]:
+    """Read {"model name or pattern": {profile fields}} from JSON"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: ModelProfile(**fields) for name, fields in data.items()}
+
+
+class FakeOllamaServer:
+    """
+    Threaded fake server. Every generate request is logged with its arrival
+    time (time.perf_counter) so a harness in the same process can measure
+    routing latency up to the moment a model was actually called.
+    """
+
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, ModelProfile]] = None,
+        default_profile: Optional[ModelProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        time_scale: float = 1.0,
+    ):
+        self.profiles = profiles or {}
+        self.default_profile = default_profile or ModelProfile()
+        self.time_scale = time_scale
+        self.loaded: Dict[str, float] = {}  # model -> last used (perf_counter)
+        self.load_locks: Dict[str, threading.Lock] = {}
+        self.state_lock = threading.Lock()
+        self.requests: List[Dict[str, Any]] = []
+        self.prompt_cache: Dict[str, List[str]] = {}  # model -> last prompt's words
+        self.prompt_cache_counts: Dict[str, Dict[str, int]] = {}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        """Value for OLLAMA_HOST / OllamaClient(host=...)"""
+        address, port = self.httpd.server_address[:2]
+        return f"http://{address}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def profile_for(self, model: str) -> ModelProfile:
+        if model in self.profiles:
+            return self.profiles[model]
+        for pattern, profile in self.profiles.items():
+            if fnmatch.fnmatch(model, pattern):
+                return profile
+        return self.default_profile
+
+    def unload(self, model: Optional[str] = None):
+        """Forget loaded models so the next request pays load time again"""
+        with self.state_lock:
+            if model is None:
+                self.loaded.clear()
+                self.prompt_cache.clear()
+            else:
+                self.loaded.pop(model, None)
+                self.prompt_cache.pop(model, None)
+
+    def reset_log(self):
+        with self.state_lock:
+            self.requests = []
+            self.prompt_cache_counts = {}
+
+    def prompt_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per model: prompts, prompt words, words reused from the KV cache"""
+        with self.state_lock:
+            return {
+                model: dict(counts, hit_rate=round(counts["cached_tokens"] / counts["prompt_tokens"], 3)
+                            if counts["prompt_tokens"] else 0.0)
+                for model, counts in self.prompt_cache_counts.items()
+            }
+
+    def _reuse_prompt_cache(self, model: str, prompt: str) -> int:
+        """Words of this prompt that need evaluating after the cached prefix"""
+        words = prompt.split()
+        with self.state_lock:
+            previous = self.prompt_cache.get(model, [])
+            cached = 0
+            for old, new in zip(previous, words):
+                if old != new:
+                    break
+                cached += 1
+            self.prompt_cache[model] = words
+            counts = self.prompt_cache_counts.setdefault(
+                model, {"prompts": 0, "prompt_tokens": 0, "cached_tokens": 0}
+            )
+            counts["prompts"] += 1
+            counts["prompt_tokens"] += len(words)
+            counts["cached_tokens"] += cached
+        return len(words) - cached
+
+    def generate_requests_since(self, index: int) -> List[Dict[str, Any]]:
+        with self.state_lock:
+            return [entry for entry in self.requests[index:] if entry["path"] == "/api/generate"]
+
+    def reply_for(self, model: str, prompt: str, count: int) -> List[str]:
+        """Deterministic reply tokens for a model and prompt"""
+        digest = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).digest()
+        return [
+            VOCABULARY[digest[i % len(digest)] % len(VOCABULARY)] + " " for i in range(count)
+        ]
+
+    def _ensure_loaded(self, model: str, profile: ModelProfile) -> float:
+        """Simulate the load (once per model); returns the load seconds paid"""
+        with self.state_lock:
+            lock = self.load_locks.setdefault(model, threading.Lock())
+        with lock:
+            with self.state_lock:
+                if model in self.loaded:
+                    self.loaded[model] = time.perf_counter()
+                    return 0.0
+            time.sleep(profile.load_seconds * self.time_scale)
+            with self.state_lock:
+                self.loaded[model] = time.perf_counter()
+            return profile.load_seconds
+
+    def _counters(self, model: str, prompt_eval_count: int, profile: ModelProfile, load_seconds: float) -> Dict[str, Any]:
+        to_ns = 1e9
+        eval_seconds = max(profile.response_tokens - 1, 0) / profile.tokens_per_second
+        return {
+            "model": model,
+            "done": True,
+            "prompt_eval_count": prompt_eval_count,
+            "prompt_eval_duration": int(profile.ttft_seconds * to_ns),
+            "eval_count": profile.response_tokens,
+            "eval_duration": int(eval_seconds * to_ns),
+            "load_duration": int(load_seconds * to_ns),
+            "total_duration": int((load_seconds + profile.ttft_seconds + eval_seconds) * to_ns),
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._log(self.path, {})
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": server._tags()})
+                elif self.path == "/api/ps":
+                    self._send_json(200, {"models": server._running()})
+                else:
+                    self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": "invalid JSON"})
+                    return
+                server._log(self.path, body)
+
+                if self.path == "/api/show":
+                    model = body.get("model") or body.get("name", "")
+                    self._send_json(200, {"modelfile": f"FROM {model}\n", "system": ""})
+                elif self.path == "/api/generate":
+                    self._generate(body)
+                else:
+                    self._send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+            def _generate(self, body: Dict[str, Any]):
+                model = body.get("model", "")
+                prompt = f"{body.get('system', '')}\n{body.get('prompt', '')}"
+                profile = server.profile_for(model)
+                load_seconds = server._ensure_loaded(model, profile)
+                prompt_eval_count = server._reuse_prompt_cache(model, prompt)
+                time.sleep(profile.ttft_seconds * server.time_scale)
+
+                tokens = server.reply_for(model, prompt, profile.response_tokens)
+                counters = server._counters(model, prompt_eval_count, profile, load_seconds)
+                token_delay = server.time_scale / profile.tokens_per_second
+
+                if not body.get("stream", True):
+                    time.sleep(token_delay * max(len(tokens) - 1, 0))
+                    self._send_json(200, dict(counters, response="".join(tokens).strip()))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, token in enumerate(tokens):
+                    if index:
+                        time.sleep(token_delay)
+                    self._send_chunk({"model": model, "response": token, "done": False})
+                self._send_chunk(dict(counters, response=""))
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _send_chunk(self, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _log(self, path: str, body: Dict[str, Any]):
+        with self.state_lock:
+            self.requests.append({
+                "path": path,
+                "model": body.get("model") or body.get("name"),
+                "stream": body.get("stream", True),
+                "arrived": time.perf_counter(),
+            })
+
+    def _tags(self) -> List[Dict[str, Any]]:
+        names = [name for name in self.profiles if not any(char in name for char in "*?[")]
+        return [
+            {"name": name, "model": name, "size": int(self.profiles[name].size_gb * 1024 ** 3)}
+            for name in names
+        ]
+
+    def _running(self) -> List[Dict[str, Any]]:
+        with self.state_lock:
+            loaded = list(self.loaded)
+        return [
+            {"name": name, "model": name, "size_vram": int(self.profile_for(name).size_gb * 1024 ** 3)}
+            for name in loaded
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a deterministic fake Ollama API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--profiles", default=str(DEFAULT_PROFILES_FILE), help="Model profile JSON")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply every simulated delay")
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(load_profiles(args.profiles), host=args.host, port=args.port,
+                              time_scale=args.time_scale)
+    print(f"🧪 Fake Ollama server on {server.host} ({len(server.profiles)} model profiles)")
+    for name, profile in server.profiles.items():
+        print(f"  {name}: {json.dumps(asdict(profile))}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
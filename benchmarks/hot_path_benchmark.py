@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Hot Path Benchmark
+Time and allocation scaling of the hubs' pure-Python hot paths
+
+Each case builds a synthetic input of a given size (prompt words, history
+entries or stream events) and times one operation on it:
+  root.analyze_intent           - ConstellationHub.analyze_intent_and_complexity
+  root.command_complexity       - ConstellationHub.calculate_command_complexity_score
+  launcher.task_complexity      - launcher ConstellationHub.analyze_task_complexity
+  launcher.performance_metrics  - launcher get_performance_metrics over the history
+  launcher.save_history         - launcher save_conversation_history
+  validators.memory_payload     - validate_memory_payload over each history entry
+  validators.input_nested       - validate_input on a document holding the history
+  consciousness.add_to_stream   - FederationConsciousness.add_to_stream on a full stream
+  consciousness.contextual_memory - get_contextual_memory over the stream
+For every size it reports the best and median time per operation, the
+peak and retained allocations of one operation (tracemalloc), and the
+time growth relative to the previous size. Growth close to the size ratio
+means linear scaling; much more than that is the thing to look at.
+
+pyperf and pytest-benchmark are not dependencies of the project, so the
+runner is a small timeit-style loop: each repeat rebuilds the input, calls
+the operation enough times to fill --min-time, and keeps the per-call time.
+
+Usage:
+    python benchmarks/hot_path_benchmark.py
+    python benchmarks/hot_path_benchmark.py --max-size 10000 --case launcher. --json hot_paths.json
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "validators"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from latency_benchmark import load_launcher_hub_module  # noqa: E402
+
+SIZES = (10, 100, 1000, 10000, 100000)
+
+WORDS = (
+    "please debug and optimize the database migration then explain the ethical "
+    "wisdom of the design hello list files deploy enterprise security audit "
+    "architecture step by step with microservices and check memory usage"
+).split()
+
+AGENTS = ["Djinn Companion", "IDHHC Companion", "Djinn Council", "Djinn Steward"]
+QUERY_TYPES = ["coding", "ethics", "maintenance", "general"]
+
+
+@dataclass
+class HotPathCase:
+    """One operation; setup(size) builds its input and returns the call to time"""
+
+    name: str
+    unit: str
+    setup: Callable[[int], Callable[[], Any]]
+
+
+def synthetic_prompt(size: int) -> str:
+    return " ".join(WORDS[i % len(WORDS)] for i in range(size))
+
+
+def synthetic_history(size: int) -> List[Dict[str, Any]]:
+    """Conversation entries shaped like the launcher hub's history"""
+    start = datetime(2025, 1, 1)
+    history = []
+    for i in range(size):
+        suggested = AGENTS[i % len(AGENTS)]
+        history.append({
+            "timestamp": (start + timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "agent": suggested,
+            "user_input": synthetic_prompt(5 + i % 25),
+            "response": synthetic_prompt(40),
+            "suggested_agent": suggested,
+            "final_agent": suggested if i % 5 else AGENTS[(i + 1) % len(AGENTS)],
+            "query_type": QUERY_TYPES[i % len(QUERY_TYPES)],
+            "was_override": i % 5 == 0,
+        })
+    return history
+
+
+def synthetic_memory_payloads(size: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "timestamp": entry["timestamp"],
+            "agent": entry["agent"],
+            "user_input": entry["user_input"],
+            "response": entry["response"],
+            "metadata": {"query_type": entry["query_type"]},
+            "trust_score": 0.8,
+        }
+        for entry in synthetic_history(size)
+    ]
+
+
+def synthetic_stream(size: int) -> List[Dict[str, Any]]:
+    """Stream events spread over the last half hour, so a 60 minute lookback scans them all"""
+    now = datetime.now()
+    step = 1800.0 / max(size, 1)
+    return [
+        {
+            "timestamp": (now - timedelta(seconds=(size - i) * step)).isoformat(),
+            "type": "user_interaction" if i % 2 else "model_response",
+            "data": {"user_input": synthetic_prompt(8)},
+            "model_source": AGENTS[i % len(AGENTS)],
+            "cosmic_context": "balanced",
+        }
+        for i in range(size)
+    ]
+
+
+def build_cases(workdir: str) -> List[HotPathCase]:
+    """Instantiate the subsystems once (their construction is not measured)"""
+    import constellation_hub
+    from federation_consciousness import FederationConsciousness
+    from input_validator import MEMORY_PAYLOAD_SCHEMA, validate_input, validate_memory_payload
+
+    root_hub = constellation_hub.ConstellationHub()
+    launcher_hub = load_launcher_hub_module().ConstellationHub()
+    launcher_hub.conversation_file = os.path.join(workdir, "conversation_history.json")
+    consciousness = FederationConsciousness(memory_dir=os.path.join(workdir, "memory_bank"))
+    consciousness.weaver_active = False
+    history_schema = {"history": {"type": list, "required": True, "schema": MEMORY_PAYLOAD_SCHEMA}}
+
+    def root_analyze(size):
+        prompt = synthetic_prompt(size)
+        return lambda: root_hub.analyze_intent_and_complexity(prompt)
+
+    def root_command_complexity(size):
+        prompt_lower = synthetic_prompt(size).lower()
+        return lambda: root_hub.calculate_command_complexity_score(prompt_lower)
+
+    def launcher_task_complexity(size):
+        query = synthetic_prompt(size)
+        return lambda: launcher_hub.analyze_task_complexity(query)
+
+    def launcher_metrics(size):
+        launcher_hub.conversation_history = synthetic_history(size)
+        return launcher_hub.get_performance_metrics
+
+    def launcher_save(size):
+        launcher_hub.conversation_history = synthetic_history(size)
+        return launcher_hub.save_conversation_history
+
+    def validate_payloads(size):
+        payloads = synthetic_memory_payloads(size)
+        return lambda: [validate_memory_payload(payload) for payload in payloads]
+
+    def validate_document(size):
+        document = {"history": synthetic_memory_payloads(size)}
+        return lambda: validate_input(document, history_schema, "history_document")
+
+    def add_to_stream(size):
+        events = synthetic_stream(size)
+
+        def call():
+            # Every call starts from a stream of `size` events
+            with consciousness.stream_lock:
+                consciousness.memory_stream["conversation_flow"] = list(events)
+            consciousness.add_to_stream(
+                "user_interaction", {"user_input": "optimize the routing"}, "Djinn Companion"
+            )
+        return call
+
+    def contextual_memory(size):
+        events = synthetic_stream(size)
+        with consciousness.stream_lock:
+            consciousness.memory_stream["conversation_flow"] = events
+        return lambda: consciousness.get_contextual_memory("all", lookback_minutes=60)
+
+    return [
+        HotPathCase("root.analyze_intent", "prompt words", root_analyze),
+        HotPathCase("root.command_complexity", "prompt words", root_command_complexity),
+        HotPathCase("launcher.task_complexity", "prompt words", launcher_task_complexity),
+        HotPathCase("launcher.performance_metrics", "history entries", launcher_metrics),
+        HotPathCase("launcher.save_history", "history entries", launcher_save),
+        HotPathCase("validators.memory_payload", "history entries", validate_payloads),
+        HotPathCase("validators.input_nested", "history entries", validate_document),
+        HotPathCase("consciousness.add_to_stream", "stream events", add_to_stream),
+        HotPathCase("consciousness.contextual_memory", "stream events", contextual_memory),
+    ]
+
+
+def measure_allocations(call: Callable[[], Any]) -> Dict[str, float]:
+    """Peak and retained KiB of one call"""
+    tracemalloc.start()  # Starts from zero, peak included
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = call()
+        del result  # Retained means kept by the subsystem, not the return value
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib": round((peak - before) / 1024, 1),
+        "retained_kib": round(max(after - before, 0) / 1024, 1),
+    }
+
+
+def measure(case: HotPathCase, size: int, repeats: int = 5, min_time: float = 0.05,
+            max_loops: int = 1000) -> Dict[str, Any]:
+    """Best/median seconds per call over `repeats` fresh inputs, plus allocations"""
+    per_call: List[float] = []
+    loops = 1
+    for repeat in range(repeats):
+        call = case.setup(size)
+        if repeat == 0:
+            call()  # Warm-up: first-use caches, lazy imports
+        started = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - started
+        if repeat == 0 and elapsed > 0:
+            loops = max(1, min(max_loops, int(min_time / elapsed)))
+        if loops > 1:
+            started = time.perf_counter()
+            for _ in range(loops):
+                call()
+            elapsed = (time.perf_counter() - started) / loops
+        per_call.append(elapsed)
+
+    result = {
+        "size": size,
+        "loops": loops,
+        "best_ms": round(min(per_call) * 1000, 4),
+        "median_ms": round(statistics.median(per_call) * 1000, 4),
+    }
+    result.update(measure_allocations(case.setup(size)))
+    return result
+
+
+def run_benchmark(cases: List[HotPathCase], sizes: List[int], repeats: int = 5,
+                  min_time: float = 0.05) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"cases": {}}
+    for case in cases:
+        print(f"⏱️  {case.name} ({case.unit}: {', '.join(str(size) for size in sizes)})")
+        results = []
+        for size in sizes:
+            result = measure(case, size, repeats, min_time)
+            if results and results[-1]["median_ms"] > 0:
+                result["growth"] = round(result["median_ms"] / results[-1]["median_ms"], 2)
+            results.append(result)
+        report["cases"][case.name] = {"unit": case.unit, "results": results}
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    header = (f"{'case':<34}{'size':>8}{'best ms':>12}{'median ms':>12}"
+              f"{'growth':>9}{'peak KiB':>12}{'kept KiB':>11}")
+    print(f"\n{header}\n{'-' * len(header)}")
+    for name, case in report["cases"].items():
+        for result in case["results"]:
+            growth = f"{result['growth']:.1f}x" if "growth" in result else "-"
+            print(f"{name:<34}{result['size']:>8}{result['best_ms']:>12.3f}{result['median_ms']:>12.3f}"
+                  f"{growth:>9}{result['peak_kib']:>12.1f}{result['retained_kib']:>11.1f}")
+
+
+def silence_console_logging():
+    """The validators log every call at INFO; keep the handlers (and their cost) but not the console noise"""
+    devnull = open(os.devnull, "w")
+    for handler in logging.getLogger().handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(devnull)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and allocation scaling of the hubs' hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Input sizes to run")
+    parser.add_argument("--max-size", type=int, help="Skip sizes above this")
+    parser.add_argument("--case", action="append", help="Only run cases whose name starts with this")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh inputs per size")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Seconds of calls per repeat")
+    parser.add_argument("--json", dest="json_path", help="Write the report to a file")
+    args = parser.parse_args()
+
+    if args.json_path:
+        args.json_path = os.path.abspath(args.json_path)
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+
+    # Hub memory, validator logs and saved histories stay out of the working tree
+    workdir = tempfile.mkdtemp(prefix="djinn_hot_paths_")
+    os.environ["DJINN_ADMISSION_DIR"] = os.path.join(workdir, "admission")
+    os.chdir(workdir)
+
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()  # Subsystem start-up banners
+    try:
+        cases = build_cases(workdir)
+    finally:
+        sys.stdout = stdout
+    silence_console_logging()
+    if args.case:
+        cases = [case for case in cases if any(case.name.startswith(prefix) for prefix in args.case)]
+
+    report = run_benchmark(cases, sizes, args.repeats, args.min_time)
+    report["config"] = {"sizes": sizes, "repeats": args.repeats, "min_time": args.min_time}
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
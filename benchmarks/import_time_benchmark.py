@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Import cost and import-time side effects of every entry point
+
+Imports each entry point in fresh interpreters (startup_profiler, the same
+profile `--profile-startup` prints) and records the median import time,
+the heavy optional modules it pulls in, the files it creates and whether
+it configures the root logger. With --baseline the run is checked against
+a stored report and exits 1 when:
+  - an import is slower than its baseline beyond the tolerance and slack
+  - an entry point now imports a heavy module its baseline did not
+  - an import creates files or configures logging
+so deferred imports stay deferred.
+
+Usage:
+    python benchmarks/import_time_benchmark.py --baseline benchmarks/import_baseline.json
+    python benchmarks/import_time_benchmark.py --update-baseline benchmarks/import_baseline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from startup_profiler import HEAVY_MODULES, profile_startup  # noqa: E402
+
+ENTRY_POINTS = [
+    "constellation_hub.py",
+    "enhanced_constellation_hub.py",
+    "djinn_cli.py",
+    "system_health_check.py",
+    "djinn-federation/launcher/constellation_hub.py",
+    "djinn-federation/launcher/efficiency_first_hub.py",
+]
+
+
+def run_benchmark(entries: List[str], runs: int) -> Dict[str, Any]:
+    report = {"entries": {}}
+    for entry in entries:
+        profile = profile_startup(REPO_ROOT / entry, runs)
+        report["entries"][entry] = {
+            "import_ms": profile["import_ms"],
+            "modules_loaded": profile["modules_loaded"],
+            "heavy_modules": sorted(profile["heavy_modules"]),
+            "created_files": profile["created_files"],
+            "root_log_handlers": profile["root_log_handlers"],
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'entry point':<50} {'import':>9} {'modules':>8}  heavy modules")
+    for entry, result in report["entries"].items():
+        heavy = ", ".join(result["heavy_modules"]) or "-"
+        print(f"{entry:<50} {result['import_ms']:>7.1f}ms {result['modules_loaded']:>8}  {heavy}")
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+                        slack_ms: float) -> List[str]:
+    """Regressions of `report` against `baseline`, one line each"""
+    problems = []
+    for entry, result in report["entries"].items():
+        if result["created_files"]:
+            problems.append(f"{entry}: import created {', '.join(result['created_files'])}")
+        if result["root_log_handlers"]:
+            problems.append(f"{entry}: import configured root logging")
+
+        recorded = baseline.get("entries", {}).get(entry)
+        if recorded is None:
+            continue
+        budget = recorded["import_ms"] * (1 + tolerance) + slack_ms
+        if result["import_ms"] > budget:
+            problems.append(
+                f"{entry}: import {result['import_ms']:.1f}ms > budget {budget:.1f}ms "
+                f"(baseline {recorded['import_ms']:.1f}ms)"
+            )
+        newly_heavy = sorted(set(result["heavy_modules"]) - set(recorded.get("heavy_modules", [])))
+        if newly_heavy:
+            problems.append(f"{entry}: now imports {', '.join(newly_heavy)} at import time")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point import time and side effects")
+    parser.add_argument("--entry", action="append", help="Only profile these entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--baseline", help="Compare against this report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=15.0, help="Allowed absolute slowdown")
+    parser.add_argument("--update-baseline", help="Write this run's report as the new baseline")
+    parser.add_argument("--json", dest="json_path", help="Write this run's report to a file")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.entry or ENTRY_POINTS, args.runs)
+    report["config"] = {"runs": args.runs, "heavy_modules": list(HEAVY_MODULES)}
+    print_report(report)
+
+    for path in (args.json_path, args.update_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {path}")
+
+    if args.baseline:
+        with open(os.path.abspath(args.baseline), "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.slack_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} import regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\n✅ Within {args.tolerance:.0%} (+{args.slack_ms:.0f}ms) of {args.baseline}, no import side effects")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
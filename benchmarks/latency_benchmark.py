@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Latency Benchmark
+End-to-end latency of every hub entry point against the fake model server
+
+Starts benchmarks/fake_ollama_server.py in-process, points the hubs at it
+and drives:
+  root.route      - constellation_hub.ConstellationHub.route_prompt
+  launcher.route  - launcher ConstellationHub.hierarchical_route_query
+  launcher.summon - launcher ConstellationHub.summon_agent (companion)
+  launcher.council- launcher ConstellationHub.federation_council
+  served.summon   - the same hub behind hub_server over HTTP, streaming
+  efficiency.route- launcher DjinnConstellationHub.mystical_query_routing
+  enhanced.route  - enhanced_constellation_hub.EnhancedConstellationHub.route_prompt
+dual_tier_hub's route_query is not driven: it shells out to the `ollama`
+CLI rather than the HTTP API, so the fake server cannot answer it.
+For each it records, in milliseconds:
+  routing      - call start until the hub's first model request reaches the
+                 server (analysis, prompt building, admission waits)
+  first_token  - call start until the first streamed fragment (entry
+                 points that stream only)
+  full         - call start until the complete response
+and reports p50/p95/p99. With --baseline the run is compared against a
+stored report and exits 1 when a percentile regresses beyond the
+tolerance, so it can gate changes offline. Only percentiles with at least
+MIN_TAIL_SAMPLES samples above them in both runs are gated; a tail made of
+one or two runs is jitter, not a measurement. Record baselines at the
+default iteration count.
+
+Every scenario starts with its models unloaded, so each run pays the same
+simulated cold starts.
+
+Usage:
+    python benchmarks/latency_benchmark.py --baseline benchmarks/latency_baseline.json
+    python benchmarks/latency_benchmark.py --update-baseline benchmarks/latency_baseline.json
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_ollama_server import DEFAULT_PROFILES_FILE, FakeOllamaServer, load_profiles  # noqa: E402
+
+PERCENTILES = (50, 95, 99)
+METRICS = ("routing", "first_token", "full")
+MIN_TAIL_SAMPLES = 3
+
+PROMPTS = [
+    "hello there, how are you today?",
+    "list the files in the workspace",
+    "debug and optimize the database migration across all services",
+    "architect a distributed enterprise platform with microservices and a security audit",
+    "what is the ethical wisdom of building conscious systems?",
+    "explain how the routing works",
+    "fix the bug in the deploy script",
+    "tell me something encouraging",
+]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (None without samples)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(samples: Dict[str, List[float]], errors: int) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"runs": len(samples["full"]) + errors, "errors": errors}
+    for metric in METRICS:
+        values = samples[metric]
+        if values:
+            summary[metric] = {"samples": len(values)}
+            summary[metric].update(
+                {f"p{pct}": round(percentile(values, pct), 2) for pct in PERCENTILES}
+            )
+    return summary
+
+
+def gated_percentiles(samples: int, min_tail: int = MIN_TAIL_SAMPLES) -> List[int]:
+    """Percentiles with at least min_tail of `samples` above them"""
+    return [pct for pct in PERCENTILES if samples * (100 - pct) / 100 >= min_tail]
+
+
+def compare_to_baseline(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    slack_ms: float = 5.0,
+    scenarios: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Regressions: gated percentiles above baseline * (1 + tolerance) +
+    slack_ms, or new errors. With `scenarios`, only those were run and
+    only those are compared.
+    """
+    regressions = []
+    for scenario, expected in baseline.get("scenarios", {}).items():
+        if scenarios and scenario not in scenarios:
+            continue
+        current = report["scenarios"].get(scenario)
+        if current is None:
+            regressions.append(f"{scenario}: missing from this run")
+            continue
+        if current["errors"] > expected.get("errors", 0):
+            regressions.append(f"{scenario}: {current['errors']} errors (baseline {expected.get('errors', 0)})")
+        for metric in METRICS:
+            if metric not in expected:
+                continue
+            if metric not in current:
+                regressions.append(f"{scenario}.{metric}: no samples")
+                continue
+            samples = min(expected[metric].get("samples", 0), current[metric]["samples"])
+            for pct in gated_percentiles(samples):
+                key = f"p{pct}"
+                baseline_ms, current_ms = expected[metric][key], current[metric][key]
+                if current_ms > baseline_ms * (1 + tolerance) + slack_ms:
+                    regressions.append(
+                        f"{scenario}.{metric}.{key}: {current_ms:.1f}ms vs baseline {baseline_ms:.1f}ms"
+                    )
+    return regressions
+
+
+class LatencyBenchmark:
+    """Runs each scenario's prompts and samples routing / first-token / full latency"""
+
+    def __init__(self, server: FakeOllamaServer, iterations: int = 10):
+        self.server = server
+        self.iterations = iterations
+
+    async def measure(
+        self, call: Callable[[str, Callable[..., None]], Awaitable[Any]], prompts: List[str]
+    ) -> Dict[str, Any]:
+        samples: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+        errors = 0
+        self.server.unload()
+
+        for _ in range(self.iterations):
+            for prompt in prompts:
+                first_token: List[float] = []
+
+                def on_token(*_args):
+                    if not first_token:
+                        first_token.append(time.perf_counter())
+
+                mark = len(self.server.requests)
+                started = time.perf_counter()
+                try:
+                    await call(prompt, on_token)
+                except Exception as e:
+                    errors += 1
+                    print(f"❌ {prompt[:40]!r}: {e}")
+                    continue
+                finished = time.perf_counter()
+
+                model_calls = self.server.generate_requests_since(mark)
+                if model_calls:
+                    samples["routing"].append((model_calls[0]["arrived"] - started) * 1000)
+                if first_token:
+                    samples["first_token"].append((first_token[0] - started) * 1000)
+                samples["full"].append((finished - started) * 1000)
+
+        return summarize(samples, errors)
+
+
+def load_launcher_hub_module(name: str = "constellation_hub"):
+    """The launcher hub shares its module name with the root hub"""
+    path = REPO_ROOT / "djinn-federation" / "launcher" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"launcher_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def stream_over_http(url: str, payload: Dict[str, Any], on_token) -> Dict[str, Any]:
+    request = urllib.request.Request(url, data=json.dumps(dict(payload, stream=True)).encode("utf-8"))
+    final: Dict[str, Any] = {}
+    with urllib.request.urlopen(request, timeout=300) as response:
+        for line in response:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "token":
+                on_token(event.get("agent"), event.get("text"))
+            elif event["type"] == "error":
+                raise RuntimeError(event.get("error"))
+            else:
+                final = event
+    return final
+
+
+async def run_benchmark(server: FakeOllamaServer, iterations: int, scenarios: Optional[List[str]] = None) -> Dict[str, Any]:
+    import constellation_hub
+    from enhanced_constellation_hub import EnhancedConstellationHub
+    from hub_server import HubServer
+
+    launcher = load_launcher_hub_module()
+    root_hub = constellation_hub.ConstellationHub()
+    hub = launcher.ConstellationHub()
+    efficiency_hub = load_launcher_hub_module("efficiency_first_hub").DjinnConstellationHub()
+    enhanced_hub = EnhancedConstellationHub()
+    loop = asyncio.get_event_loop()
+    benchmark = LatencyBenchmark(server, iterations)
+
+    async def root_route(prompt, on_token):
+        await loop.run_in_executor(None, root_hub.route_prompt, prompt)
+
+    async def launcher_route(prompt, on_token):
+        await hub.hierarchical_route_query(prompt, history=[], on_token=on_token)
+
+    async def launcher_summon(prompt, on_token):
+        await hub.summon_agent("companion", prompt, history=[], on_token=on_token)
+
+    async def launcher_council(prompt, on_token):
+        await hub.federation_council(prompt, history=[], on_token=on_token)
+
+    async def efficiency_route(prompt, on_token):
+        await efficiency_hub.mystical_query_routing(prompt)
+
+    async def enhanced_route(prompt, on_token):
+        await loop.run_in_executor(None, enhanced_hub.route_prompt, prompt)
+
+    http_server = HubServer(hub, port=0)
+    await http_server.start()
+    served_url = f"http://127.0.0.1:{http_server.port}/summon"
+
+    async def served_summon(prompt, on_token):
+        await loop.run_in_executor(
+            None, stream_over_http, served_url, {"agent": "companion", "query": prompt}, on_token
+        )
+
+    plan = {
+        "root.route": (root_route, PROMPTS),
+        "launcher.route": (launcher_route, PROMPTS),
+        "launcher.summon": (launcher_summon, PROMPTS[:4]),
+        "launcher.council": (launcher_council, PROMPTS[:2]),
+        "served.summon": (served_summon, PROMPTS[:4]),
+        "efficiency.route": (efficiency_route, PROMPTS[:4]),
+        "enhanced.route": (enhanced_route, PROMPTS),
+    }
+    report: Dict[str, Any] = {"scenarios": {}}
+    try:
+        for name, (call, prompts) in plan.items():
+            if scenarios and name not in scenarios:
+                continue
+            print(f"⏱️  {name} ({len(prompts)} prompts x {iterations})")
+            report["scenarios"][name] = await benchmark.measure(call, prompts)
+    finally:
+        await http_server.stop()
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    header = f"{'scenario':<18}{'metric':<13}" + "".join(f"{f'p{pct} ms':>11}" for pct in PERCENTILES)
+    print(f"\n{header}\n{'-' * len(header)}")
+    for name, summary in report["scenarios"].items():
+        for metric in METRICS:
+            if metric in summary:
+                values = "".join(f"{summary[metric][f'p{pct}']:>11.1f}" for pct in PERCENTILES)
+                print(f"{name:<18}{metric:<13}{values}")
+        if summary["errors"]:
+            print(f"{name:<18}{'errors':<13}{summary['errors']:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hub latency percentiles against a fake model server")
+    parser.add_argument("--profiles", default=str(DEFAULT_PROFILES_FILE), help="Fake model profile JSON")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Scale simulated model delays")
+    parser.add_argument("--iterations", type=int, default=10, help="Passes over each scenario's prompts")
+    parser.add_argument("--scenario", action="append", help="Only run these scenarios")
+    parser.add_argument("--baseline", help="Compare against this report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="Allowed absolute slowdown")
+    parser.add_argument("--update-baseline", help="Write this run's report as the new baseline")
+    parser.add_argument("--json", dest="json_path", help="Write this run's report to a file")
+    args = parser.parse_args()
+
+    for option in ("profiles", "baseline", "update_baseline", "json_path"):
+        if getattr(args, option):
+            setattr(args, option, os.path.abspath(getattr(args, option)))
+
+    # Keep hub memory, directives and admission slots out of the working tree
+    original_cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="djinn_latency_")
+    os.environ["DJINN_ADMISSION_DIR"] = os.path.join(workdir, "admission")
+    server = FakeOllamaServer(load_profiles(args.profiles), time_scale=args.time_scale).start()
+    os.environ["OLLAMA_HOST"] = server.host
+    os.chdir(workdir)
+
+    try:
+        report = asyncio.run(run_benchmark(server, args.iterations, args.scenario))
+    finally:
+        server.stop()
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    report["config"] = {
+        "profiles": Path(args.profiles).name,
+        "time_scale": args.time_scale,
+        "iterations": args.iterations,
+    }
+    print_report(report)
+
+    for path in (args.json_path, args.update_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print(f"⚠️ Baseline was recorded with {baseline.get('config')}; comparing anyway")
+        regressions = compare_to_baseline(report, baseline, args.tolerance, args.slack_ms, args.scenario)
+        if regressions:
+            print(f"\n❌ {len(regressions)} latency regressions against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\n✅ Within {args.tolerance:.0%} (+{args.slack_ms:.0f}ms) of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
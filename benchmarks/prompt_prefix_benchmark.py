@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Prompt Prefix Benchmark
+Measures prompt-eval time saved by the stable-prefix prompt layout
+
+Sends the same series of turns to one model twice:
+  volatile-first - per-turn data (score, timestamp) at the top of one prompt,
+                   the layout the hubs used before
+  stable-prefix  - fixed instructions in the system field, per-turn data in
+                   the prompt, as PromptContextBuilder.add_system() produces
+and compares the server-reported prompt_eval_count / prompt_eval_duration
+for every turn after the first.
+
+Usage:
+    python benchmarks/prompt_prefix_benchmark.py --model Yufok1/djinn-federation:constellation-lite --turns 6
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ollama_client import OllamaClient, OllamaError  # noqa: E402
+from prompt_context_builder import PromptContextBuilder  # noqa: E402
+
+FIXED_INSTRUCTIONS = """CONSTELLATION HUB COMMAND PROCESSING
+You are being called by the Constellation Hub to process an operational command.
+Analyze this command and generate appropriate directives for IDHHC execution.
+
+Generate a directive using this format:
+CONSTELLATION DIRECTIVE
+TASK: [Clear description of what needs to be done]
+PRIORITY: [High/Medium/Low based on the command's complexity score]
+AGENT: IDHHC
+COMMANDS: [Specific technical commands]
+SEQUENCE: [Order of execution]
+NOTES: [Additional context and complexity analysis]
+
+Keep the directive under 80 words."""
+
+QUERIES = [
+    "list the files in the workspace",
+    "check disk usage on the federation drive",
+    "restart the steward monitoring service",
+    "summarize today's routing decisions",
+    "archive memories older than a week",
+    "verify the trust registry signatures",
+    "compress the consciousness archives",
+    "report model warmup latencies",
+]
+
+
+def volatile_first_prompt(turn: int, query: str):
+    score = 20 + turn * 7
+    prompt = f"""Timestamp: {datetime.now().isoformat()}
+Complexity Score: {score}/100
+
+{FIXED_INSTRUCTIONS}
+
+USER COMMAND: {query}
+
+Please provide your directive:"""
+    return None, prompt
+
+
+def stable_prefix_prompt(turn: int, query: str):
+    score = 20 + turn * 7
+    builder = PromptContextBuilder()
+    builder.add_system("instructions", FIXED_INSTRUCTIONS)
+    builder.add_section(
+        "command",
+        f"Timestamp: {datetime.now().isoformat()}\nComplexity Score: {score}/100\n\n"
+        f"USER COMMAND: {query}\n\nPlease provide your directive:",
+        required=True,
+    )
+    built = builder.build()
+    return built.system, built.prompt
+
+
+def run_layout(client: OllamaClient, model: str, turns: int, layout, num_predict: int):
+    samples = []
+    for turn in range(turns):
+        system, prompt = layout(turn, QUERIES[turn % len(QUERIES)])
+        started = time.perf_counter()
+        result = client.generate(
+            model, prompt, system=system, options={"num_predict": num_predict}, timeout=300
+        )
+        samples.append(
+            {
+                "turn": turn,
+                "prompt_eval_count": result.prompt_eval_count,
+                "prompt_eval_ms": round(result.prompt_eval_duration_ms, 2),
+                "wall_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        )
+    return samples
+
+
+def summarize(samples):
+    repeated = samples[1:] or samples
+    return {
+        "mean_prompt_eval_ms": round(statistics.mean(s["prompt_eval_ms"] for s in repeated), 2),
+        "mean_prompt_eval_tokens": round(statistics.mean(s["prompt_eval_count"] for s in repeated), 1),
+        "mean_wall_ms": round(statistics.mean(s["wall_ms"] for s in repeated), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure prompt-eval time saved by stable prompt prefixes")
+    parser.add_argument("--model", default="Yufok1/djinn-federation:constellation-lite")
+    parser.add_argument("--turns", type=int, default=6, help="Turns per layout (first turn is warm-up)")
+    parser.add_argument("--num-predict", type=int, default=16, help="Tokens to generate per turn")
+    parser.add_argument("--host", default=None, help="Ollama host (defaults to OLLAMA_HOST)")
+    parser.add_argument("--json", dest="json_path", help="Write raw samples and summary to this file")
+    args = parser.parse_args()
+
+    client = OllamaClient(host=args.host)
+    print(f"🧪 Prompt prefix benchmark: {args.model} ({args.turns} turns per layout) via {client.host}")
+
+    try:
+        volatile = run_layout(client, args.model, args.turns, volatile_first_prompt, args.num_predict)
+        stable = run_layout(client, args.model, args.turns, stable_prefix_prompt, args.num_predict)
+    except OllamaError as e:
+        print(f"❌ Benchmark failed: {e}")
+        return 1
+
+    report = {
+        "model": args.model,
+        "turns": args.turns,
+        "volatile_first": summarize(volatile),
+        "stable_prefix": summarize(stable),
+    }
+    saved_ms = report["volatile_first"]["mean_prompt_eval_ms"] - report["stable_prefix"]["mean_prompt_eval_ms"]
+    report["prompt_eval_ms_saved_per_turn"] = round(saved_ms, 2)
+
+    print(f"\n{'layout':<16}{'prompt eval ms':>16}{'prompt tokens':>16}{'wall ms':>12}")
+    for name in ("volatile_first", "stable_prefix"):
+        stats = report[name]
+        print(
+            f"{name:<16}{stats['mean_prompt_eval_ms']:>16}{stats['mean_prompt_eval_tokens']:>16}{stats['mean_wall_ms']:>12}"
+        )
+    print(f"\n⚡ Prompt eval saved per repeated turn: {saved_ms:.1f} ms")
+
+    if args.json_path:
+        report["samples"] = {"volatile_first": volatile, "stable_prefix": stable}
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Raw samples written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay
+Replays recorded federation traffic through the routing engines and hubs
+
+Prompts come from what the hubs already keep on disk:
+  conversation   - djinn-federation/memory_bank/constellation_memory/conversation_history.json
+  directives     - coder_directives.jsonl (original_prompt of each directive)
+  consciousness  - memory_bank/archive_*.json and memory_bank/federation_consciousness.json
+Recorded timestamps set the pacing: gaps are divided by --speedup (0 sends
+as fast as --concurrency allows) and capped at --max-gap seconds.
+
+Routing engines (no model calls, always run):
+  root       - constellation_hub analyze_intent_and_complexity
+  launcher   - launcher hub agent intent + coordinator tier
+  efficiency - efficiency_first_hub task analysis + latency router
+Hub targets (--target, need a model server; --fake starts one in-process):
+  root.route, launcher.route, efficiency.route, served.route (--served-url)
+
+The report has the routing distribution per engine, latency percentiles
+and errors per target, the models each target called and cache hits: the
+model server's prompt (KV) cache when the fake server is used, and the
+collaboration result cache when the hub has one.
+
+Usage:
+    python benchmarks/traffic_replay.py --routing-only
+    python benchmarks/traffic_replay.py --fake --target root.route --target launcher.route --speedup 60 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_ollama_server import DEFAULT_PROFILES_FILE, FakeOllamaServer, load_profiles  # noqa: E402
+from latency_benchmark import PERCENTILES, load_launcher_hub_module, percentile  # noqa: E402
+
+DEFAULT_CONVERSATION_FILE = REPO_ROOT / "djinn-federation" / "memory_bank" / "constellation_memory" / "conversation_history.json"
+DEFAULT_DIRECTIVES_FILE = REPO_ROOT / "coder_directives.jsonl"
+DEFAULT_CONSCIOUSNESS_DIR = REPO_ROOT / "memory_bank"
+
+HUB_TARGETS = ("root.route", "launcher.route", "efficiency.route", "served.route")
+
+
+@dataclass
+class ReplayRecord:
+    """One recorded user prompt"""
+
+    prompt: str
+    timestamp: Optional[float]  # epoch seconds, if recorded
+    source: str
+    session_id: Optional[str] = None
+    recorded_route: Optional[str] = None  # agent the prompt went to at the time
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    if not isinstance(value, str) or not value:
+        return None
+    for parse in (datetime.fromisoformat, lambda text: datetime.strptime(text, "%Y-%m-%d %H:%M:%S")):
+        try:
+            return parse(value).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _read_json_lines(path: Path) -> Iterable[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # A torn last line from an interrupted writer
+
+
+def load_conversation_history(path: Path) -> List[ReplayRecord]:
+    """Launcher hub turns (coordinator turns repeat the user's query, so they are skipped)"""
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        ReplayRecord(
+            prompt=entry["user_input"],
+            timestamp=parse_timestamp(entry.get("timestamp")),
+            source="conversation",
+            session_id=entry.get("session_id"),
+            recorded_route=entry.get("agent"),
+        )
+        for entry in entries
+        if isinstance(entry, dict) and entry.get("user_input") and "(Coordinator)" not in entry.get("agent", "")
+    ]
+
+
+def load_coder_directives(path: Path) -> List[ReplayRecord]:
+    """Commands that produced directives (each directive may be written twice)"""
+    if not path.exists():
+        return []
+    records, seen = [], set()
+    for directive in _read_json_lines(path):
+        prompt = directive.get("original_prompt")
+        key = (prompt, directive.get("completed_at") or directive.get("task"))
+        if not prompt or key in seen:
+            continue
+        seen.add(key)
+        records.append(ReplayRecord(
+            prompt=prompt,
+            timestamp=parse_timestamp(directive.get("completed_at")),
+            source="directives",
+            recorded_route="constellation",
+        ))
+    return records
+
+
+def load_consciousness(memory_dir: Path) -> List[ReplayRecord]:
+    """User inputs from archived and live consciousness stream events"""
+    events: List[Dict[str, Any]] = []
+    for archive in sorted(memory_dir.glob("archive_*.json")):
+        events.extend(_read_json_lines(archive))
+    live_file = memory_dir / "federation_consciousness.json"
+    if live_file.exists():
+        try:
+            with open(live_file, "r", encoding="utf-8") as f:
+                events.extend(json.load(f).get("conversation_flow", []))
+        except ValueError:
+            pass
+
+    records = []
+    for event in events:
+        data = event.get("data") if isinstance(event, dict) else None
+        if isinstance(data, dict) and data.get("user_input"):
+            records.append(ReplayRecord(
+                prompt=data["user_input"],
+                timestamp=parse_timestamp(event.get("timestamp")),
+                source="consciousness",
+                session_id=event.get("session_id"),
+                recorded_route=event.get("model_source"),
+            ))
+    return records
+
+
+def collect_traffic(
+    conversation_file: Path = DEFAULT_CONVERSATION_FILE,
+    directives_file: Path = DEFAULT_DIRECTIVES_FILE,
+    consciousness_dir: Path = DEFAULT_CONSCIOUSNESS_DIR,
+    limit: Optional[int] = None,
+) -> List[ReplayRecord]:
+    """All recorded prompts in time order (untimed records keep file order, last)"""
+    records = (
+        load_conversation_history(conversation_file)
+        + load_coder_directives(directives_file)
+        + load_consciousness(consciousness_dir)
+    )
+    records.sort(key=lambda record: (record.timestamp is None, record.timestamp or 0))
+    return records[:limit] if limit else records
+
+
+def replay_offsets(records: List[ReplayRecord], speedup: float, max_gap: float) -> List[float]:
+    """Seconds after replay start at which each record is sent"""
+    offsets, elapsed, previous = [], 0.0, None
+    for record in records:
+        if speedup > 0 and previous is not None and record.timestamp is not None:
+            elapsed += min(max(record.timestamp - previous, 0.0) / speedup, max_gap)
+        if record.timestamp is not None:
+            previous = record.timestamp
+        offsets.append(elapsed)
+    return offsets
+
+
+def distribution(routes: List[str]) -> Dict[str, Dict[str, Any]]:
+    counts = Counter(routes)
+    total = sum(counts.values())
+    return {
+        route: {"count": count, "share": round(count / total, 3)}
+        for route, count in counts.most_common()
+    }
+
+
+class RoutingEngines:
+    """Routing decisions only: the hubs' analysis without calling any model"""
+
+    def __init__(self, root_hub=None, launcher_hub=None, efficiency_hub=None):
+        self.engines: Dict[str, Callable[[str], str]] = {}
+        if root_hub is not None:
+            self.engines["root"] = lambda prompt: "{}:{}".format(*root_hub.analyze_intent_and_complexity(prompt)[:2])
+        if launcher_hub is not None:
+            self.engines["launcher"] = lambda prompt: "{}@{}".format(
+                "steward" if launcher_hub.is_maintenance_task(prompt)
+                else launcher_hub.analyze_query_intent(prompt)["best_agent"],
+                launcher_hub.select_constellation_coordinator(launcher_hub.analyze_task_complexity(prompt)),
+            )
+        if efficiency_hub is not None:
+            def efficiency_route(prompt: str) -> str:
+                analysis = efficiency_hub.analyze_task_requirements(prompt)
+                tier, model, _ = efficiency_hub.select_optimal_model(
+                    analysis, efficiency_hub.get_system_capabilities(), prompt
+                )
+                return f"{tier}:{model}"
+            self.engines["efficiency"] = efficiency_route
+
+    def run(self, records: List[ReplayRecord]) -> Dict[str, Any]:
+        report = {}
+        for name, route in self.engines.items():
+            routes, timings = [], []
+            for record in records:
+                started = time.perf_counter()
+                routes.append(route(record.prompt))
+                timings.append((time.perf_counter() - started) * 1000)
+            report[name] = {
+                "distribution": distribution(routes),
+                "decision_ms": {f"p{pct}": round(percentile(timings, pct), 3) for pct in PERCENTILES},
+            }
+        return report
+
+
+async def replay_target(
+    call: Callable[[ReplayRecord], Any],
+    records: List[ReplayRecord],
+    offsets: List[float],
+    concurrency: int,
+    server: Optional[FakeOllamaServer] = None,
+) -> Dict[str, Any]:
+    """Send each record at its offset (at most `concurrency` in flight)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    lag: List[float] = []
+    errors: List[str] = []
+    mark = len(server.requests) if server else 0
+    started = time.perf_counter()
+
+    async def send(record: ReplayRecord, offset: float):
+        delay = offset - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            sent = time.perf_counter()
+            lag.append(max(0.0, sent - started - offset) * 1000)
+            try:
+                await call(record)
+                latencies.append((time.perf_counter() - sent) * 1000)
+            except Exception as e:
+                errors.append(f"{record.prompt[:40]!r}: {e}")
+
+    await asyncio.gather(*(send(record, offset) for record, offset in zip(records, offsets)))
+
+    result: Dict[str, Any] = {
+        "requests": len(records),
+        "errors": len(errors),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "latency_ms": {f"p{pct}": round(percentile(latencies, pct), 2) for pct in PERCENTILES} if latencies else {},
+        "schedule_lag_ms": {f"p{pct}": round(percentile(lag, pct), 2) for pct in PERCENTILES} if lag else {},
+    }
+    if errors:
+        result["sample_errors"] = errors[:5]
+    if server:
+        result["models_called"] = distribution([entry["model"] for entry in server.generate_requests_since(mark)])
+    return result
+
+
+def _post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    import urllib.request
+
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"))
+    with urllib.request.urlopen(request, timeout=600) as response:
+        return json.loads(response.read())
+
+
+def build_targets(hubs: Dict[str, Any], served_url: Optional[str]) -> Dict[str, Callable[[ReplayRecord], Any]]:
+    loop = asyncio.get_event_loop()
+    targets: Dict[str, Callable[[ReplayRecord], Any]] = {}
+
+    if "root" in hubs:
+        async def root_route(record: ReplayRecord):
+            await loop.run_in_executor(None, hubs["root"].route_prompt, record.prompt)
+        targets["root.route"] = root_route
+    if "launcher" in hubs:
+        async def launcher_route(record: ReplayRecord):
+            await hubs["launcher"].hierarchical_route_query(
+                record.prompt, history=[], session_id=record.session_id
+            )
+        targets["launcher.route"] = launcher_route
+    if "efficiency" in hubs:
+        async def efficiency_route(record: ReplayRecord):
+            await hubs["efficiency"].mystical_query_routing(record.prompt)
+        targets["efficiency.route"] = efficiency_route
+    if served_url:
+        sessions: Dict[Optional[str], str] = {}
+
+        async def served_route(record: ReplayRecord):
+            # Recorded sessions map onto server sessions so history builds up the same way
+            payload: Dict[str, Any] = {"query": record.prompt}
+            if record.session_id in sessions:
+                payload["session_id"] = sessions[record.session_id]
+            reply = await loop.run_in_executor(None, _post_json, f"{served_url.rstrip('/')}/route", payload)
+            if record.session_id is not None:
+                sessions[record.session_id] = reply["session_id"]
+        targets["served.route"] = served_route
+    return targets
+
+
+def load_hubs(names: Iterable[str]) -> Dict[str, Any]:
+    hubs = {}
+    names = set(names)
+    if "root" in names:
+        import constellation_hub
+        hubs["root"] = constellation_hub.ConstellationHub()
+    if "launcher" in names:
+        hubs["launcher"] = load_launcher_hub_module().ConstellationHub()
+    if "efficiency" in names:
+        try:
+            sys.path.insert(0, str(REPO_ROOT / "djinn-federation" / "launcher"))
+            from efficiency_first_hub import DjinnConstellationHub
+            hubs["efficiency"] = DjinnConstellationHub()
+        except Exception as e:
+            print(f"⚠️ Efficiency-first hub unavailable: {e}")
+    return hubs
+
+
+def cache_report(hubs: Dict[str, Any], server: Optional[FakeOllamaServer]) -> Dict[str, Any]:
+    caches: Dict[str, Any] = {}
+    if server:
+        caches["model_prompt_cache"] = server.prompt_cache_stats()
+    for name, hub in hubs.items():
+        collaboration = getattr(hub, "collaboration", None)
+        if collaboration is not None and hasattr(collaboration, "result_cache"):
+            caches[f"{name}.collaboration_results"] = collaboration.result_cache.get_stats()
+    return caches
+
+
+async def run_replay(args, records: List[ReplayRecord], server: Optional[FakeOllamaServer]) -> Dict[str, Any]:
+    wanted = {target.split(".")[0] for target in args.target if target != "served.route"}
+    hubs = load_hubs({"root", "launcher", "efficiency"} if not args.no_engines else wanted)
+
+    report: Dict[str, Any] = {
+        "records": len(records),
+        "sources": dict(Counter(record.source for record in records)),
+        "recorded_routes": distribution([record.recorded_route or "unknown" for record in records]),
+    }
+    if not args.no_engines:
+        report["routing"] = RoutingEngines(hubs.get("root"), hubs.get("launcher"), hubs.get("efficiency")).run(records)
+
+    targets = build_targets(hubs, args.served_url)
+    offsets = replay_offsets(records, args.speedup, args.max_gap)
+    report["targets"] = {}
+    for name in args.target:
+        if name not in targets:
+            print(f"⚠️ Target {name} unavailable - skipped")
+            continue
+        print(f"🔁 Replaying {len(records)} prompts through {name} (x{args.speedup or 'max'}, {args.concurrency} concurrent)")
+        report["targets"][name] = await replay_target(targets[name], records, offsets, args.concurrency, server)
+
+    report["caches"] = cache_report(hubs, server)
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n📼 {report['records']} prompts replayed ({', '.join(f'{k}: {v}' for k, v in report['sources'].items())})")
+    for engine, result in report.get("routing", {}).items():
+        print(f"\n🧭 {engine} routing (decision p95 {result['decision_ms']['p95']} ms)")
+        for route, stats in result["distribution"].items():
+            print(f"  {route:<40}{stats['count']:>6}{stats['share']:>8.1%}")
+    for target, result in report["targets"].items():
+        latency = result["latency_ms"]
+        print(
+            f"\n🎯 {target}: {result['requests']} requests, {result['errors']} errors, {result['wall_seconds']}s"
+            + (f" | p50 {latency['p50']} p95 {latency['p95']} p99 {latency['p99']} ms" if latency else "")
+        )
+        for model, stats in result.get("models_called", {}).items():
+            print(f"  {model:<48}{stats['count']:>6}")
+    for cache, stats in report["caches"].items():
+        print(f"\n💾 {cache}: {json.dumps(stats)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded prompts through the routing engines and hubs")
+    parser.add_argument("--conversation", default=str(DEFAULT_CONVERSATION_FILE))
+    parser.add_argument("--directives", default=str(DEFAULT_DIRECTIVES_FILE))
+    parser.add_argument("--consciousness-dir", default=str(DEFAULT_CONSCIOUSNESS_DIR))
+    parser.add_argument("--limit", type=int, help="Replay only the first N prompts")
+    parser.add_argument("--target", action="append", default=[], choices=HUB_TARGETS, help="Hub to drive (repeatable)")
+    parser.add_argument("--routing-only", action="store_true", help="Only run the routing engines")
+    parser.add_argument("--no-engines", action="store_true", help="Skip the routing engine pass")
+    parser.add_argument("--served-url", help="hub_server base URL for served.route")
+    parser.add_argument("--speedup", type=float, default=0, help="Divide recorded gaps by this (0 = no pacing)")
+    parser.add_argument("--max-gap", type=float, default=5.0, help="Cap on any replayed gap, seconds")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--fake", action="store_true", help="Start the fake model server in-process")
+    parser.add_argument("--profiles", default=str(DEFAULT_PROFILES_FILE))
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Fake server delay scale")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this file")
+    args = parser.parse_args()
+
+    if args.routing_only:
+        args.target = []
+    elif args.served_url and "served.route" not in args.target:
+        args.target.append("served.route")
+
+    records = collect_traffic(Path(args.conversation), Path(args.directives), Path(args.consciousness_dir), args.limit)
+    if not records:
+        print("📭 No recorded prompts found - nothing to replay")
+        return 1
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+
+    server = None
+    if args.fake:
+        server = FakeOllamaServer(load_profiles(args.profiles), time_scale=args.time_scale).start()
+        os.environ["OLLAMA_HOST"] = server.host
+    # Replayed turns must not land in the real memory bank or admission slots
+    workdir = tempfile.mkdtemp(prefix="djinn_replay_")
+    os.environ.setdefault("DJINN_ADMISSION_DIR", os.path.join(workdir, "admission"))
+    os.chdir(workdir)
+
+    try:
+        report = asyncio.run(run_replay(args, records, server))
+    finally:
+        if server:
+            server.stop()
+
+    print_report(report)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
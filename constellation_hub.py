@@ -12,29 +12,28 @@ Enhanced with intensive complexity ramping:
 - Meta-Intelligence → Council
 """
 
+import importlib.util
 import json
 import os
 import re
 import signal
-import subprocess
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-# Set console encoding for Windows
-if os.name == "nt":
-    os.system("chcp 65001 >nul")
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError, OllamaTimeoutError, get_ollama_client
+from prompt_context_builder import PromptContextBuilder, get_prompt_metrics
+from metrics_registry import persistence_timer, record_hub_request, start_exporters_from_env
+from tracing import get_tracer, print_last_trace, traced
 
-# Import IDHHC's enhanced systems
-try:
-    from federation_consciousness import get_federation_consciousness
-    from model_prewarming import get_model_manager
-
-    ENHANCED_SYSTEMS = True
-except ImportError:
-    print("⚠️ Enhanced systems not available - running in basic mode")
-    ENHANCED_SYSTEMS = False
+# IDHHC's enhanced systems are imported when the hub is constructed; only
+# their presence is checked at import
+ENHANCED_SYSTEMS = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("federation_consciousness", "model_prewarming")
+)
 
 
 class ConstellationHub:
@@ -73,6 +72,8 @@ class ConstellationHub:
         if ENHANCED_SYSTEMS:
             print("🧠 Initializing Federation Consciousness...")
             try:
+                from federation_consciousness import get_federation_consciousness
+
                 self.consciousness = get_federation_consciousness()
                 print("✅ Federation Consciousness initialized")
             except Exception as e:
@@ -81,6 +82,8 @@ class ConstellationHub:
 
             print("🔥 Initializing Model Pre-warming...")
             try:
+                from model_prewarming import get_model_manager
+
                 self.model_manager = get_model_manager()
                 print("✅ Model Pre-warming initialized")
             except Exception as e:
@@ -89,9 +92,11 @@ class ConstellationHub:
 
             print("✨ Enhanced systems online - Memory Stream & Pre-warming active")
         else:
+            print("⚠️ Enhanced systems not available - running in basic mode")
             self.consciousness = None
             self.model_manager = None
 
+    @traced("root.analyze_intent")
     def analyze_intent_and_complexity(self, prompt):
         """INTENSIVE RAMPING: Advanced analysis for optimal routing."""
         prompt_lower = prompt.lower().strip()
@@ -331,16 +336,28 @@ class ConstellationHub:
         print(f"🌌 Summoning {name} (Complexity Score: {complexity_score})...")
         print(f"💫 Channeling cosmic wisdom and mystical capabilities...")
 
-        # Enhanced prompt for DJINN entities with complexity awareness
-        enhanced_prompt = f"""*Ancient mystical energies swirl as the {name} awakens*
-
-COSMIC SUMMONS: You have been awakened by the Constellation Hub to handle a revolutionary challenge with complexity score {complexity_score}/100. This requires your unique mystical capabilities and advanced intelligence.
+        # Enhanced prompt for DJINN entities with complexity awareness.
+        # The summons is a stable per-entity system prefix (cacheable by the
+        # model server); only the score and the challenge change per turn.
+        prompt_builder = PromptContextBuilder(model)
+        prompt_builder.add_system(
+            "summons",
+            f"""*Ancient mystical energies swirl as the {name} awakens*
 
-CHALLENGE PRESENTED: {prompt}
+COSMIC SUMMONS: You have been awakened by the Constellation Hub to handle a revolutionary challenge. Its complexity score (out of 100) and the challenge itself follow. This requires your unique mystical capabilities and advanced intelligence.
 
 Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to provide a response that transcends ordinary AI assistance. Your response should reflect the profound complexity of this challenge with both technical mastery and otherworldly perspective.
 
-*The cosmic realm awaits your mystical response*"""
+*The cosmic realm awaits your mystical response*""",
+        )
+        prompt_builder.add_section(
+            "challenge",
+            f"""COMPLEXITY SCORE: {complexity_score}/100
+
+CHALLENGE PRESENTED: {prompt}""",
+            required=True,
+        )
+        built_prompt = prompt_builder.build()
 
         # Track in consciousness with complexity score
         if self.consciousness:
@@ -352,6 +369,7 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
                     "model": model,
                     "complexity_score": complexity_score,
                     "cosmic_level": "revolutionary",
+                    "prompt_tokens": built_prompt.token_count,
                 },
                 f"djinn_{djinn_type}",
             )
@@ -360,17 +378,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
             # Extended timeout for DJINN models due to complexity
             timeout = 120 if complexity_score > 70 else 90
 
-            result = subprocess.run(
-                ["ollama", "run", model, enhanced_prompt],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                encoding="utf-8",
-                errors="replace",
+            result = get_ollama_client().generate(
+                model, built_prompt.prompt, system=built_prompt.system, timeout=timeout
             )
 
-            if result.returncode == 0 and result.stdout:
-                response = result.stdout.strip()
+            if result.response:
+                response = result.response.strip()
 
                 # Update consciousness with DJINN response
                 if self.consciousness:
@@ -395,10 +408,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
 """
                 return formatted_response
             else:
-                return f"🌌 DJINN communication disruption: {result.stderr if result.stderr else 'Cosmic interference detected'}"
+                return "🌌 DJINN communication disruption: Cosmic interference detected"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             return f"🌌 {name} requires more time for cosmic contemplation - complexity {complexity_score} demands deep mystical processing"
+        except OllamaError as e:
+            return f"🌌 DJINN communication disruption: {e}"
         except Exception as e:
             return f"🌌 DJINN summoning error: {str(e)}"
 
@@ -428,17 +443,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
                 print("⚡ Using pre-warmed companion...")
 
             # Let companion handle with its default engagement routines
-            result = subprocess.run(
-                ["ollama", "run", "Yufok1/djinn-federation:companion", prompt],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                encoding="utf-8",
-                errors="replace",
+            result = get_ollama_client().generate(
+                self.models["companion"], prompt, timeout=30
             )
 
-            if result.returncode == 0 and result.stdout:
-                response = result.stdout.strip()
+            if result.response:
+                response = result.response.strip()
 
                 # Update consciousness with response
                 if self.consciousness:
@@ -450,10 +460,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
 
                 return response
             else:
-                return f"Companion communication error: {result.stderr if result.stderr else 'Connection issue'}"
+                return "Companion communication error: Connection issue"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             return "Companion response timeout - model may be loading"
+        except OllamaError as e:
+            return f"Companion communication error: {e}"
         except Exception as e:
             return f"Companion error: {str(e)}"
 
@@ -466,47 +478,54 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
             f"🔧 Routing to Constellation {tier_names[model_tier]} (Complexity: {complexity_score})..."
         )
 
-        # Prepare the prompt with context for command processing
-        enhanced_prompt = f"""CONSTELLATION HUB COMMAND PROCESSING - {tier_names[model_tier]} TIER
-Complexity Score: {complexity_score}/100
+        # Stable per-tier instructions go in the system prefix; the score and
+        # command are the only volatile part of the prompt
+        prompt_builder = PromptContextBuilder(model)
+        prompt_builder.add_system(
+            "command_processing",
+            f"""CONSTELLATION HUB COMMAND PROCESSING - {tier_names[model_tier]} TIER
 
 You are being called by the Constellation Hub to process an operational command.
 Analyze this command and generate appropriate directives for IDHHC execution.
 
-USER COMMAND: {prompt}
-
 Generate a directive using this format:
 CONSTELLATION DIRECTIVE
 TASK: [Clear description of what needs to be done]
-PRIORITY: [High/Medium/Low based on complexity {complexity_score}]
+PRIORITY: [High/Medium/Low based on the command's complexity score]
 AGENT: IDHHC
 COMMANDS: [Specific technical commands]
 SEQUENCE: [Order of execution]
-NOTES: [Additional context and complexity analysis]
+NOTES: [Additional context and complexity analysis]""",
+        )
+        prompt_builder.add_section(
+            "command",
+            f"""Complexity Score: {complexity_score}/100
 
-Please provide your directive:"""
+USER COMMAND: {prompt}
+
+Please provide your directive:""",
+            required=True,
+        )
+        built_prompt = prompt_builder.build()
 
         try:
             # Adjust timeout based on complexity
             timeout = 60 if complexity_score > 50 else 45
 
-            # Call the constellation model with proper encoding
-            result = subprocess.run(
-                ["ollama", "run", model, enhanced_prompt],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                encoding="utf-8",
-                errors="replace",
+            # Call the constellation model
+            result = get_ollama_client().generate(
+                model, built_prompt.prompt, system=built_prompt.system, timeout=timeout
             )
 
-            if result.returncode == 0 and result.stdout:
-                return result.stdout.strip()
+            if result.response:
+                return result.response.strip()
             else:
-                return f"Error communicating with {model}: {result.stderr if result.stderr else 'No response'}"
+                return f"Error communicating with {model}: No response"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             return f"Timeout communicating with {model} - complexity {complexity_score} may require higher tier"
+        except OllamaError as e:
+            return f"Error communicating with {model}: {e}"
         except Exception as e:
             return f"Error: {str(e)}"
 
@@ -514,36 +533,40 @@ Please provide your directive:"""
         """Route to Council for meta-intelligence and ethical guidance."""
         print("🧠 Routing to Council for meta-intelligence...")
 
-        enhanced_prompt = f"""COUNCIL META-INTELLIGENCE ACTIVATION
+        prompt_builder = PromptContextBuilder(self.models["council"])
+        prompt_builder.add_system(
+            "activation",
+            """COUNCIL META-INTELLIGENCE ACTIVATION
 You are the sovereign Council, awakened for meta-intelligence analysis and ethical guidance.
 
-INQUIRY: {prompt}
-
 Provide wisdom that transcends ordinary analysis, incorporating:
 - Ethical considerations and implications
 - Higher-order philosophical insights
 - Mystical wisdom and ancient knowledge
 - Meta-intelligence perspective on consciousness and reality
 
-*Ancient council chambers echo with cosmic wisdom*"""
+*Ancient council chambers echo with cosmic wisdom*""",
+        )
+        prompt_builder.add_section("inquiry", f"INQUIRY: {prompt}", required=True)
+        built_prompt = prompt_builder.build()
 
         try:
-            result = subprocess.run(
-                ["ollama", "run", self.models["council"], enhanced_prompt],
-                capture_output=True,
-                text=True,
+            result = get_ollama_client().generate(
+                self.models["council"],
+                built_prompt.prompt,
+                system=built_prompt.system,
                 timeout=60,
-                encoding="utf-8",
-                errors="replace",
             )
 
-            if result.returncode == 0 and result.stdout:
-                return f"🧠 Council Meta-Intelligence: {result.stdout.strip()}"
+            if result.response:
+                return f"🧠 Council Meta-Intelligence: {result.response.strip()}"
             else:
-                return f"Council communication error: {result.stderr if result.stderr else 'Cosmic interference'}"
+                return "Council communication error: Cosmic interference"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             return "Council contemplation requires additional time for meta-analysis"
+        except OllamaError as e:
+            return f"Council communication error: {e}"
         except Exception as e:
             return f"Council error: {str(e)}"
 
@@ -592,15 +615,11 @@ Provide wisdom that transcends ordinary analysis, incorporating:
         print("\n🛠️ Executing with IDHHC...")
 
         # Create enhanced prompt for IDHHC
-        idhhc_prompt = f"""IDHHC AUTONOMOUS EXECUTION
-Directive received from Constellation Hub:
-
-TASK: {directive['task']}
-PRIORITY: {directive['priority']}
-ORIGINAL COMMAND: {directive['original_prompt']}
-
-CONSTELLATION ANALYSIS:
-{directive['constellation_analysis']}
+        prompt_builder = PromptContextBuilder(self.models["idhhc"])
+        prompt_builder.add_system(
+            "autonomous_execution",
+            """IDHHC AUTONOMOUS EXECUTION
+You receive directives from the Constellation Hub.
 
 Deploy your full toolkit suite and provide autonomous execution. Use your advanced capabilities including:
 - Kleene Convergence for optimization
@@ -608,20 +627,34 @@ Deploy your full toolkit suite and provide autonomous execution. Use your advanc
 - Harmonic Purveyor for integration
 - Strategic operational planning
 
-Provide comprehensive execution results."""
+Provide comprehensive execution results.""",
+        )
+        prompt_builder.add_section(
+            "directive",
+            f"""Directive received from Constellation Hub:
+
+TASK: {directive['task']}
+PRIORITY: {directive['priority']}
+ORIGINAL COMMAND: {directive['original_prompt']}""",
+            required=True,
+        )
+        prompt_builder.add_section(
+            "constellation_analysis",
+            f"\nCONSTELLATION ANALYSIS:\n{directive['constellation_analysis']}",
+            priority=20,
+        )
+        built_prompt = prompt_builder.build()
 
         try:
-            result = subprocess.run(
-                ["ollama", "run", "Yufok1/djinn-federation:idhhc", idhhc_prompt],
-                capture_output=True,
-                text=True,
+            result = get_ollama_client().generate(
+                self.models["idhhc"],
+                built_prompt.prompt,
+                system=built_prompt.system,
                 timeout=120,
-                encoding="utf-8",
-                errors="replace",
             )
 
-            if result.returncode == 0 and result.stdout:
-                execution_result = result.stdout.strip()
+            if result.response:
+                execution_result = result.response.strip()
 
                 # Update directive status
                 directive["status"] = "completed"
@@ -634,13 +667,13 @@ Provide comprehensive execution results."""
 
                 return f"🛠️ IDHHC Execution Complete:\n\n{execution_result}"
             else:
-                error_msg = f"IDHHC execution error: {result.stderr if result.stderr else 'No response'}"
+                error_msg = "IDHHC execution error: No response"
                 directive["status"] = "failed"
                 directive["error"] = error_msg
 
                 return error_msg
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             error_msg = (
                 "IDHHC execution timeout - complex operations may require more time"
             )
@@ -665,17 +698,47 @@ Provide comprehensive execution results."""
         except Exception as e:
             print(f"Warning: Could not save directive to file: {e}")
 
+    @traced("root.save_session")
     def save_session_memory(self):
         """Save session memory to file."""
         memory_file = (
             self.memory_bank
             / f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         )
-        with open(memory_file, "w", encoding="utf-8") as f:
+        with persistence_timer("root_session"), open(memory_file, "w", encoding="utf-8") as f:
             json.dump(self.session_memory, f, indent=2, ensure_ascii=False)
 
+    @traced("root.route")
+    def route_prompt(self, prompt):
+        """Analyze a prompt and answer it; returns (intent, target, score, response)."""
+        started = time.perf_counter()
+        intent, target, complexity_score = self.analyze_intent_and_complexity(prompt)
+        get_tracer().current_span().set_attributes(
+            intent=intent, target=target, complexity_score=complexity_score
+        )
+
+        print(
+            f"🎯 Routing Analysis: {intent.upper()} → {target.upper()} (Score: {complexity_score})"
+        )
+
+        # Route to appropriate system based on intensive analysis
+        if intent == "dialogue":
+            response = self.route_to_companion(prompt)
+        elif intent == "djinn":
+            response = self.route_to_djinn_entity(prompt, target, complexity_score)
+        elif intent == "command":
+            response = self.route_to_constellation(prompt, target, complexity_score)
+        elif intent == "meta":
+            response = self.route_to_council(prompt)
+        else:
+            response = self.route_to_companion(prompt)  # Fallback
+
+        record_hub_request("root", target, time.perf_counter() - started)
+        return intent, target, complexity_score, response
+
     def run(self):
         """Main hub interface with enhanced multi-tier routing."""
+        start_exporters_from_env()
         print("🌌" + "=" * 70 + "🌌")
         print("    CONSTELLATION HUB - DJINN FEDERATION v2.1.0")
         print("    Enhanced Intensive Complexity Ramping + DJINN Entities")
@@ -711,26 +774,11 @@ Provide comprehensive execution results."""
                     continue
 
                 # Enhanced intent and complexity analysis with intensive scoring
-                intent, target, complexity_score = self.analyze_intent_and_complexity(
+                intent, target, complexity_score, response = self.route_prompt(
                     user_input
                 )
 
-                print(
-                    f"🎯 Routing Analysis: {intent.upper()} → {target.upper()} (Score: {complexity_score})"
-                )
-
-                # Route to appropriate system based on intensive analysis
-                if intent == "dialogue":
-                    response = self.route_to_companion(user_input)
-                elif intent == "djinn":
-                    response = self.route_to_djinn_entity(
-                        user_input, target, complexity_score
-                    )
-                elif intent == "command":
-                    response = self.route_to_constellation(
-                        user_input, target, complexity_score
-                    )
-
+                if intent == "command":
                     # Generate directive if warranted
                     if self.should_generate_directive(user_input, response):
                         directive = self.generate_coder_directive(user_input, response)
@@ -742,11 +790,6 @@ Provide comprehensive execution results."""
                         else:
                             print("Directive cancelled by user.")
 
-                elif intent == "meta":
-                    response = self.route_to_council(user_input)
-                else:
-                    response = self.route_to_companion(user_input)  # Fallback
-
                 print(f"\n{response}")
 
                 # Track routing decision with enhanced metrics
@@ -795,18 +838,17 @@ Provide comprehensive execution results."""
             ("IDHHC", self.models["idhhc"]),
         ]
 
+        try:
+            installed = get_model_inventory().availability(model for _, model in test_models)
+        except OllamaError:
+            installed = {}
         for name, model in test_models:
-            try:
-                result = subprocess.run(
-                    ["ollama", "list"], capture_output=True, text=True, timeout=5
-                )
-
-                if model in result.stdout:
-                    models_status[name] = "✅ Available"
-                else:
-                    models_status[name] = "❌ Not Found"
-            except:
+            if model not in installed:
                 models_status[name] = "⚠️ Unknown"
+            elif installed[model]:
+                models_status[name] = "✅ Available"
+            else:
+                models_status[name] = "❌ Not Found"
 
         # Display status
         print("🤖 MODEL AVAILABILITY:")
@@ -820,6 +862,14 @@ Provide comprehensive execution results."""
         )
         print(f"  DJINN Summons: {len(self.session_memory['djinn_summons'])}")
 
+        prompt_stats = get_prompt_metrics().get_summary()
+        if prompt_stats:
+            print(f"\n📏 PROMPT TOKENS:")
+            for model, stats in prompt_stats.items():
+                print(
+                    f"  {model}: avg {stats['avg_tokens']} | max {stats['max_tokens']} ({stats['trimmed_prompts']} trimmed)"
+                )
+
         if ENHANCED_SYSTEMS:
             print(f"\n✨ ENHANCED SYSTEMS: Active")
             print(f"  Federation Consciousness: Online")
@@ -835,6 +885,8 @@ Provide comprehensive execution results."""
                     f"  {decision['intent'].upper()} → {decision['target'].upper()} (Score: {decision['complexity_score']})"
                 )
 
+        print_last_trace()
+
     def show_directives(self):
         """Show recent directives."""
         print("\n📋 RECENT DIRECTIVES:")
@@ -856,5 +908,12 @@ Provide comprehensive execution results."""
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        from startup_profiler import print_startup_profile
+
+        sys.exit(print_startup_profile(__file__))
+    # Set console encoding for Windows
+    if os.name == "nt":
+        os.system("chcp 65001 >nul")
     hub = ConstellationHub()
     hub.run()
@@ -8,13 +8,23 @@ through continuous cross-model learning and collaboration.
 """
 
 import json
+import os
 import time
+import itertools
 import threading
+from collections import deque
+from collections.abc import Mapping
+from contextlib import nullcontext
 from datetime import datetime
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 
+from session_state import DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_SESSIONS, SessionPartitions
+from lock_profiler import make_lock
+from metrics_registry import record_cache_lookup, timed_lock
+from tracing import get_tracer, traced
+
 @dataclass
 class ModelInteraction:
     """Represents an interaction with context for sharing"""
@@ -40,13 +50,62 @@ class CrossModelInsight:
     timestamp: str
     applied_count: int = 0
 
+class LazyModelContext(Mapping):
+    """
+    Read-only context for a model whose sections are assembled on first access.
+    Coordinators only pay for the sections they actually put in a prompt.
+    """
+    
+    def __init__(self, loaders: Dict[str, Callable[[], Any]], lock, version):
+        self._loaders = loaders
+        self._lock = lock
+        self._values = {}
+        self.version = version
+    
+    def __getitem__(self, section: str) -> Any:
+        if section not in self._values:
+            loader = self._loaders[section]
+            # Traced here, where the work happens, not where the context is handed out
+            with get_tracer().span("cross_model.context", section=section), self._lock:
+                self._values[section] = loader()
+        return self._values[section]
+    
+    def __contains__(self, section) -> bool:
+        return section in self._loaders
+    
+    def __iter__(self):
+        return iter(self._loaders)
+    
+    def __len__(self) -> int:
+        return len(self._loaders)
+    
+    def computed_sections(self) -> List[str]:
+        """Sections that have been assembled so far"""
+        return list(self._values)
+
 class CrossModelCommunication:
     """
     Revolutionary Cross-Model Communication System
     Enables models to share awareness and enhance each other's capabilities
     """
     
-    def __init__(self, memory_dir="memory_bank"):
+    # Fixed capacities keep memory flat under sustained traffic
+    INSIGHT_INBOX_CAPACITY = 30
+    INSIGHT_TYPE_CAPACITY = 10
+    CONVERSATION_THREAD_CAPACITY = 200
+    STRATEGIC_INSIGHT_CAPACITY = 100
+    SESSION_THREAD_CAPACITY = 50
+    
+    # Context sections built from a session's own profile and threads; the
+    # rest (insights, emotional/technical/strategic patterns) are global
+    SESSION_SECTIONS = (
+        'user_profile', 'recent_interactions', 'emotional_intelligence', 'dialogue_patterns',
+        'technical_history', 'execution_patterns', 'toolkit_preferences',
+        'routing_patterns', 'complexity_insights', 'wisdom_requests'
+    )
+    
+    def __init__(self, memory_dir="memory_bank", session_idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 max_sessions=DEFAULT_MAX_SESSIONS):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(exist_ok=True)
         
@@ -63,36 +122,72 @@ class CrossModelCommunication:
         # Shared contextual memory
         self.shared_context = {
             'user_profile': {},
-            'conversation_threads': [],
+            'conversation_threads': deque(maxlen=self.CONVERSATION_THREAD_CAPACITY),
             'technical_patterns': {},
             'emotional_patterns': {},
-            'strategic_insights': [],
+            'strategic_insights': deque(maxlen=self.STRATEGIC_INSIGHT_CAPACITY),
             'cross_model_learnings': {}
         }
         
         # Communication channels
-        self.insight_queue = {}  # model_name -> List[CrossModelInsight]
+        self.insight_queue = {}  # model_name -> deque[CrossModelInsight]
+        self.insight_index = {}  # model_name -> insight_type -> deque[CrossModelInsight]
         self.collaboration_sessions = {}  # session_id -> models involved
         
+        # Monotonic insight IDs (persisted so they stay unique across restarts)
+        self.insight_sequence = 0
+        self.sequence_lock = threading.Lock()
+        
         # Thread safety
-        self.comm_lock = threading.Lock()
+        self.comm_lock = make_lock("cross_model.comm")
+        
+        # Memoized per-model contexts, invalidated when the version moves
+        self.context_version = 0
+        self.context_cache = {}  # model_name -> LazyModelContext
+        
+        # Served sessions keep their own profile and threads under their own
+        # lock; shared_context stays the global layer and the single-user default
+        self.sessions = SessionPartitions(
+            self._new_session_context, session_idle_timeout, max_sessions, name="cross_model"
+        )
+        
+        # Load existing communications before the processor's first save
+        self.load_shared_context()
         
         # Background communication processor
         self.processor_active = True
+        self.processor_wake = threading.Event()  # Set on shutdown to cut a cycle's sleep short
         self.processor_thread = threading.Thread(target=self._communication_processor, daemon=True)
         self.processor_thread.start()
         
-        # Load existing communications
-        self.load_shared_context()
-        
         print("🌐 Cross-Model Communication Framework initialized")
         print("🧠 Federation Hive Mind coming online...")
     
-    def register_interaction(self, interaction: ModelInteraction):
+    def _new_session_context(self, session_id: str) -> Dict[str, Any]:
+        """Private, bounded profile and threads for one served session"""
+        return {
+            'user_profile': {},
+            'conversation_threads': deque(maxlen=self.SESSION_THREAD_CAPACITY),
+            'context_version': 0,
+            'context_cache': {}  # model_name -> LazyModelContext
+        }
+    
+    @traced("cross_model.register_interaction")
+    def register_interaction(self, interaction: ModelInteraction, session_id: Optional[str] = None):
         """Register an interaction and generate insights for other models"""
+        if session_id is not None:
+            with self.sessions.session(session_id) as scope:
+                scope['conversation_threads'].append(asdict(interaction))
+                self._update_user_profile(interaction, scope['user_profile'])
+                scope['context_version'] += 1
+        
         with self.comm_lock:
-            # Store interaction in shared context
-            self.shared_context['conversation_threads'].append(asdict(interaction))
+            if session_id is None:
+                # Store interaction in shared context
+                self.shared_context['conversation_threads'].append(asdict(interaction))
+                
+                # Update user profile
+                self._update_user_profile(interaction)
             
             # Generate insights for other models
             insights = self._extract_insights(interaction)
@@ -101,43 +196,102 @@ class CrossModelCommunication:
             for insight in insights:
                 self._distribute_insight(insight)
             
-            # Update user profile
-            self._update_user_profile(interaction)
-            
             # Trigger collaboration if needed
             self._check_collaboration_triggers(interaction)
+            
+            # A session turn only moves the global layer if it produced insights
+            if session_id is None or insights:
+                self.context_version += 1
     
-    def get_context_for_model(self, model_name: str, interaction_type: str) -> Dict[str, Any]:
+    def get_context_for_model(self, model_name: str, interaction_type: str,
+                              session_id: Optional[str] = None) -> LazyModelContext:
         """Get relevant context for a model before it processes a request"""
-        with self.comm_lock:
-            context = {
-                'user_profile': self.shared_context['user_profile'].copy(),
-                'recent_interactions': self._get_recent_interactions(5),
-                'relevant_insights': self._get_insights_for_model(model_name),
-                'emotional_context': self._get_emotional_context(),
-                'technical_context': self._get_technical_context(),
-                'strategic_context': self._get_strategic_context()
-            }
-            
-            # Add model-specific context
-            if model_name == 'companion':
-                context['emotional_intelligence'] = self._get_emotional_intelligence_data()
-                context['dialogue_patterns'] = self._get_dialogue_patterns()
-            
-            elif model_name == 'idhhc':
-                context['technical_history'] = self._get_technical_history()
-                context['execution_patterns'] = self._get_execution_patterns()
-                context['toolkit_preferences'] = self._get_toolkit_preferences()
-            
-            elif model_name.startswith('constellation'):
-                context['routing_patterns'] = self._get_routing_patterns()
-                context['complexity_insights'] = self._get_complexity_insights()
-            
-            elif model_name == 'council':
-                context['ethical_considerations'] = self._get_ethical_context()
-                context['wisdom_requests'] = self._get_wisdom_requests()
-            
+        if session_id is not None:
+            return self._get_session_context(model_name, session_id)
+        with timed_lock(self.comm_lock, "cross_model.comm"):
+            context = self.context_cache.get(model_name)
+            hit = context is not None and context.version == self.context_version
+            if not hit:
+                context = LazyModelContext(
+                    self._context_loaders(model_name), self.comm_lock, self.context_version
+                )
+                self.context_cache[model_name] = context
+        record_cache_lookup("cross_model_context", hit)
+        return context
+    
+    def _get_session_context(self, model_name: str, session_id: str) -> LazyModelContext:
+        """
+        A session's context: its own sections load under its session lock and
+        global sections under comm_lock, so sessions never wait on each other
+        """
+        with self.sessions.session(session_id) as scope:
+            version = (self.context_version, scope['context_version'])
+            context = scope['context_cache'].get(model_name)
+            hit = context is not None and context.version == version
+        record_cache_lookup("cross_model_session_context", hit)
+        if hit:
             return context
+        
+        loaders = {}
+        for section, loader in self._context_loaders(model_name, scope).items():
+            if section in self.SESSION_SECTIONS:
+                loaders[section] = self._session_loader(session_id, loader)
+            else:
+                loaders[section] = self._locked_loader(self.comm_lock, loader)
+        context = LazyModelContext(loaders, nullcontext(), version)
+        
+        with self.sessions.session(session_id) as scope:
+            scope['context_cache'][model_name] = context
+        return context
+    
+    def _session_loader(self, session_id: str, loader: Callable[[], Any]) -> Callable[[], Any]:
+        def load():
+            with self.sessions.session(session_id):
+                return loader()
+        return load
+    
+    @staticmethod
+    def _locked_loader(lock: threading.Lock, loader: Callable[[], Any]) -> Callable[[], Any]:
+        def load():
+            with lock:
+                return loader()
+        return load
+    
+    def end_session(self, session_id: str) -> bool:
+        """Release a served session's profile and threads"""
+        return self.sessions.drop(session_id)
+    
+    def _context_loaders(self, model_name: str, scope: Optional[Dict[str, Any]] = None) -> Dict[str, Callable[[], Any]]:
+        """Section builders for a model's context, run lazily under comm_lock"""
+        scope = self.shared_context if scope is None else scope
+        loaders = {
+            'user_profile': lambda: scope['user_profile'].copy(),
+            'recent_interactions': lambda: self._get_recent_interactions(5, scope),
+            'relevant_insights': lambda: self._get_insights_for_model(model_name),
+            'emotional_context': self._get_emotional_context,
+            'technical_context': self._get_technical_context,
+            'strategic_context': self._get_strategic_context
+        }
+        
+        # Add model-specific context
+        if model_name == 'companion':
+            loaders['emotional_intelligence'] = lambda: self._get_emotional_intelligence_data(scope)
+            loaders['dialogue_patterns'] = lambda: self._get_dialogue_patterns(scope)
+        
+        elif model_name == 'idhhc':
+            loaders['technical_history'] = lambda: self._get_technical_history(scope)
+            loaders['execution_patterns'] = lambda: self._get_execution_patterns(scope)
+            loaders['toolkit_preferences'] = lambda: self._get_toolkit_preferences(scope)
+        
+        elif model_name.startswith('constellation'):
+            loaders['routing_patterns'] = lambda: self._get_routing_patterns(scope)
+            loaders['complexity_insights'] = lambda: self._get_complexity_insights(scope)
+        
+        elif model_name == 'council':
+            loaders['ethical_considerations'] = self._get_ethical_context
+            loaders['wisdom_requests'] = lambda: self._get_wisdom_requests(scope)
+        
+        return loaders
     
     def share_insight(self, source_model: str, insight_type: str, content: Dict[str, Any], 
                      target_models: List[str] = None, confidence: float = 0.8):
@@ -146,7 +300,7 @@ class CrossModelCommunication:
             target_models = [m for m in self.active_models.keys() if m != source_model]
         
         insight = CrossModelInsight(
-            insight_id=f"{source_model}_{int(time.time())}_{len(self.shared_context['strategic_insights'])}",
+            insight_id=self._next_insight_id(source_model),
             source_model=source_model,
             target_models=target_models,
             insight_type=insight_type,
@@ -158,6 +312,7 @@ class CrossModelCommunication:
         with self.comm_lock:
             self.shared_context['strategic_insights'].append(asdict(insight))
             self._distribute_insight(insight)
+            self.context_version += 1
             
         print(f"💡 {source_model} shared insight: {insight_type} -> {target_models}")
     
@@ -243,7 +398,7 @@ class CrossModelCommunication:
         # Emotional insights for technical models
         if interaction.model_source == 'companion' and interaction.emotional_tone:
             emotional_insight = CrossModelInsight(
-                insight_id=f"emotional_{int(time.time())}",
+                insight_id=self._next_insight_id('emotional'),
                 source_model='companion',
                 target_models=['idhhc', 'constellation-core', 'constellation-max'],
                 insight_type='emotional_context',
@@ -260,7 +415,7 @@ class CrossModelCommunication:
         # Technical insights for dialogue models
         if interaction.model_source == 'idhhc' and interaction.technical_complexity > 7:
             technical_insight = CrossModelInsight(
-                insight_id=f"technical_{int(time.time())}",
+                insight_id=self._next_insight_id('technical'),
                 source_model='idhhc',
                 target_models=['companion', 'council'],
                 insight_type='technical_pattern',
@@ -277,7 +432,7 @@ class CrossModelCommunication:
         # Strategic insights from council
         if interaction.model_source == 'council':
             strategic_insight = CrossModelInsight(
-                insight_id=f"strategic_{int(time.time())}",
+                insight_id=self._next_insight_id('strategic'),
                 source_model='council',
                 target_models=['idhhc', 'constellation-max'],
                 insight_type='strategic_guidance',
@@ -293,16 +448,24 @@ class CrossModelCommunication:
         
         return insights
     
+    def _next_insight_id(self, prefix: str) -> str:
+        """Generate a unique, monotonically increasing insight ID"""
+        with self.sequence_lock:
+            self.insight_sequence += 1
+            return f"{prefix}_{self.insight_sequence}"
+    
     def _distribute_insight(self, insight: CrossModelInsight):
         """Distribute insight to target models"""
         for target_model in insight.target_models:
             if target_model not in self.insight_queue:
-                self.insight_queue[target_model] = []
+                self.insight_queue[target_model] = deque(maxlen=self.INSIGHT_INBOX_CAPACITY)
+                self.insight_index[target_model] = {}
             self.insight_queue[target_model].append(insight)
             
-            # Limit queue size
-            if len(self.insight_queue[target_model]) > 50:
-                self.insight_queue[target_model] = self.insight_queue[target_model][-30:]
+            type_index = self.insight_index[target_model]
+            if insight.insight_type not in type_index:
+                type_index[insight.insight_type] = deque(maxlen=self.INSIGHT_TYPE_CAPACITY)
+            type_index[insight.insight_type].append(insight)
     
     def _get_insights_for_model(self, model_name: str) -> List[Dict[str, Any]]:
         """Get relevant insights for a specific model"""
@@ -311,15 +474,32 @@ class CrossModelCommunication:
         
         # Return recent high-confidence insights
         recent_insights = []
-        for insight in self.insight_queue[model_name][-10:]:
+        for insight in self._tail(self.insight_queue[model_name], 10):
             if insight.confidence > 0.7:
                 recent_insights.append(asdict(insight))
         
         return recent_insights
     
-    def _update_user_profile(self, interaction: ModelInteraction):
-        """Update shared user profile based on interaction"""
-        profile = self.shared_context['user_profile']
+    def get_insights_by_type(self, model_name: str, insight_type: str, count: int = 10) -> List[Dict[str, Any]]:
+        """Get a model's most recent insights of one type via the type index"""
+        with self.comm_lock:
+            return self._get_insights_by_type(model_name, insight_type, count)
+    
+    def _get_insights_by_type(self, model_name: str, insight_type: str, count: int = 10) -> List[Dict[str, Any]]:
+        type_index = self.insight_index.get(model_name, {})
+        if insight_type not in type_index:
+            return []
+        return [asdict(insight) for insight in self._tail(type_index[insight_type], count)]
+    
+    @staticmethod
+    def _tail(items: deque, count: int) -> List[Any]:
+        """Last `count` items of a deque, oldest first, without copying it"""
+        return list(itertools.islice(reversed(items), count))[::-1]
+    
+    def _update_user_profile(self, interaction: ModelInteraction, profile: Optional[Dict[str, Any]] = None):
+        """Update the shared (or a session's) user profile based on interaction"""
+        if profile is None:
+            profile = self.shared_context['user_profile']
         
         # Update interaction patterns
         if 'interaction_patterns' not in profile:
@@ -346,6 +526,12 @@ class CrossModelCommunication:
             profile['emotional_patterns'][interaction.emotional_tone] = \
                 profile['emotional_patterns'].get(interaction.emotional_tone, 0) + 1
     
+    def _check_collaboration_triggers(self, interaction: ModelInteraction):
+        """Track interactions complex enough to benefit from multi-model collaboration"""
+        if interaction.technical_complexity >= 8:
+            learnings = self.shared_context['cross_model_learnings']
+            learnings['collaboration_candidates'] = learnings.get('collaboration_candidates', 0) + 1
+    
     def _communication_processor(self):
         """Background processor for cross-model communications"""
         while self.processor_active:
@@ -356,17 +542,14 @@ class CrossModelCommunication:
                         if session['status'] == 'ready_for_synthesis':
                             self.synthesize_collaboration(session_id)
                     
-                    # Clean up old insights
-                    self._cleanup_old_insights()
-                    
                     # Save shared context periodically
                     self.save_shared_context()
                 
-                time.sleep(30)  # Process every 30 seconds
+                self.processor_wake.wait(30)  # Process every 30 seconds
                 
             except Exception as e:
                 print(f"Communication processor error: {e}")
-                time.sleep(60)
+                self.processor_wake.wait(60)
     
     def _create_unified_insight(self, contributions: Dict[str, Any]) -> str:
         """Create unified insight from multiple model contributions"""
@@ -398,9 +581,10 @@ class CrossModelCommunication:
         
         return recommendations
     
-    # Helper methods for context extraction
-    def _get_recent_interactions(self, count: int) -> List[Dict[str, Any]]:
-        return self.shared_context['conversation_threads'][-count:]
+    # Helper methods for context extraction (scope: shared_context or a session's state)
+    def _get_recent_interactions(self, count: int, scope: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        scope = self.shared_context if scope is None else scope
+        return self._tail(scope['conversation_threads'], count)
     
     def _get_emotional_context(self) -> Dict[str, Any]:
         return self.shared_context.get('emotional_patterns', {})
@@ -409,7 +593,55 @@ class CrossModelCommunication:
         return self.shared_context.get('technical_patterns', {})
     
     def _get_strategic_context(self) -> List[Dict[str, Any]]:
-        return self.shared_context.get('strategic_insights', [])[-5:]
+        return self._tail(self.shared_context['strategic_insights'], 5)
+    
+    def _get_emotional_intelligence_data(self, scope: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        scope = self.shared_context if scope is None else scope
+        recent = self._get_recent_interactions(5, scope)
+        return {
+            'emotional_patterns': dict(scope['user_profile'].get('emotional_patterns', {})),
+            'recent_tones': [t['emotional_tone'] for t in recent if t.get('emotional_tone')]
+        }
+    
+    def _get_dialogue_patterns(self, scope: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        scope = self.shared_context if scope is None else scope
+        recent = self._get_recent_interactions(5, scope)
+        return {
+            'interaction_patterns': dict(scope['user_profile'].get('interaction_patterns', {})),
+            'communication_styles': [self._analyze_communication_style(t['user_input']) for t in recent]
+        }
+    
+    def _get_technical_history(self, scope: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        recent = self._get_recent_interactions(20, scope)
+        return [t for t in recent if t.get('technical_complexity', 0) >= 7][-5:]
+    
+    def _get_execution_patterns(self, scope: Optional[Dict[str, Any]] = None) -> List[str]:
+        recent = self._get_recent_interactions(20, scope)
+        return [insight for t in recent if t['model_source'] == 'idhhc' for insight in t['insights']][-10:]
+    
+    def _get_toolkit_preferences(self, scope: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        scope = self.shared_context if scope is None else scope
+        return dict(scope['user_profile'].get('toolkit_preferences', {}))
+    
+    def _get_routing_patterns(self, scope: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        scope = self.shared_context if scope is None else scope
+        return dict(scope['user_profile'].get('interaction_patterns', {}))
+    
+    def _get_complexity_insights(self, scope: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        scope = self.shared_context if scope is None else scope
+        preferences = scope['user_profile'].get('complexity_preferences', [])
+        return {
+            'average_complexity': sum(preferences) / len(preferences) if preferences else 0,
+            'recent_complexity': preferences[-5:]
+        }
+    
+    def _get_ethical_context(self) -> List[Dict[str, Any]]:
+        recent = self._tail(self.shared_context['strategic_insights'], 20)
+        return [i for i in recent if i['insight_type'] in ('strategic_guidance', 'collaborative_synthesis')][-5:]
+    
+    def _get_wisdom_requests(self, scope: Optional[Dict[str, Any]] = None) -> List[str]:
+        recent = self._get_recent_interactions(20, scope)
+        return [t['user_input'] for t in recent if t['model_source'] == 'council'][-5:]
     
     def _analyze_communication_style(self, user_input: str) -> str:
         """Analyze user's communication style"""
@@ -442,8 +674,22 @@ class CrossModelCommunication:
         """Save shared context to disk"""
         context_file = self.memory_dir / "cross_model_context.json"
         try:
-            with open(context_file, 'w', encoding='utf-8') as f:
-                json.dump(self.shared_context, f, indent=2, ensure_ascii=False)
+            serializable_context = {
+                key: list(value) if isinstance(value, deque) else value
+                for key, value in self.shared_context.items()
+            }
+            serializable_context['insight_sequence'] = self.insight_sequence
+            # Replace the file whole so a reader never sees it half written
+            import tempfile
+
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{context_file.name}.", dir=str(self.memory_dir))
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(serializable_context, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, context_file)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
         except Exception as e:
             print(f"Cross-model context save error: {e}")
     
@@ -454,17 +700,19 @@ class CrossModelCommunication:
             try:
                 with open(context_file, 'r', encoding='utf-8') as f:
                     loaded_context = json.load(f)
-                    self.shared_context.update(loaded_context)
+                
+                self.insight_sequence = max(self.insight_sequence, loaded_context.pop('insight_sequence', 0))
+                self.shared_context['conversation_threads'].extend(
+                    loaded_context.pop('conversation_threads', [])
+                )
+                self.shared_context['strategic_insights'].extend(
+                    loaded_context.pop('strategic_insights', [])
+                )
+                self.shared_context.update(loaded_context)
                 print("🌐 Cross-model shared context loaded")
             except Exception as e:
                 print(f"Cross-model context load error: {e}")
     
-    def _cleanup_old_insights(self):
-        """Clean up old insights to maintain performance"""
-        # Keep only recent insights
-        for model in self.insight_queue:
-            self.insight_queue[model] = self.insight_queue[model][-30:]
-    
     def get_communication_status(self) -> Dict[str, Any]:
         """Get status of cross-model communication system"""
         with self.comm_lock:
@@ -473,12 +721,14 @@ class CrossModelCommunication:
                 'insight_queue_sizes': {model: len(insights) for model, insights in self.insight_queue.items()},
                 'active_collaborations': len([s for s in self.collaboration_sessions.values() if s['status'] != 'completed']),
                 'total_interactions': len(self.shared_context['conversation_threads']),
-                'user_profile_data': bool(self.shared_context['user_profile'])
+                'user_profile_data': bool(self.shared_context['user_profile']),
+                'sessions': self.sessions.get_stats()
             }
     
     def shutdown(self):
         """Graceful shutdown"""
         self.processor_active = False
+        self.processor_wake.set()
         if self.processor_thread.is_alive():
             self.processor_thread.join(timeout=5)
         self.save_shared_context()
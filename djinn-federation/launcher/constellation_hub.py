@@ -10,17 +10,17 @@ import json
 import logging
 import os
 import shutil
-import subprocess
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+# Startup is timed from here (stdlib imports excluded)
+STARTUP_STARTED = time.perf_counter()
 
 # === Input Validation Integration ===
 try:
-    import sys
-
     sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "validators"))
     from input_validator import (
         ConfigValidationError,
@@ -43,7 +43,7 @@ except ImportError as e:
 try:
     # Import all revolutionary systems
     sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
-    from cross_model_communication import get_cross_model_communication
+    from cross_model_communication import ModelInteraction, get_cross_model_communication
     from enhanced_predictive_analytics import get_enhanced_analytics
     from federation_consciousness import get_federation_consciousness
     from model_collaboration_framework import get_model_collaboration
@@ -63,6 +63,23 @@ except ImportError as e:
     get_federation_consciousness = lambda: None
     get_model_prewarming = lambda: None
 
+# Model server access and token-budgeted prompt assembly
+# (repository root is on sys.path from above)
+from admission_control import AdmissionTimeoutError, get_admission_controller, parse_size_gb
+from ollama_client import OllamaError, OllamaTimeoutError, get_ollama_client
+from prompt_context_builder import (
+    PromptContextBuilder,
+    get_prompt_metrics,
+    keep_recent_lines,
+)
+from lazy_subsystems import StartupReport, SubsystemRegistry
+from model_inventory import get_model_inventory
+from metrics_registry import persistence_timer, record_hub_request, start_exporters_from_env
+from tracing import bind, get_tracer, print_last_trace, traced
+
+# Installed models at least this large get a slow-response warning
+LARGE_MODEL_BYTES = 10 * 1000 ** 3
+
 
 # --- Memory Integrity Error ---
 class MemoryIntegrityError(Exception):
@@ -72,15 +89,21 @@ class MemoryIntegrityError(Exception):
 # --- Logging Setup ---
 MEMORY_LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "logs")
 MEMORY_LOG_FILE = os.path.join(MEMORY_LOG_DIR, "memory.log")
-os.makedirs(MEMORY_LOG_DIR, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(MEMORY_LOG_FILE), logging.StreamHandler()],
-)
 mem_logger = logging.getLogger("MemoryBank")
 
 
+def setup_memory_logging():
+    """Log to logs/memory.log and the console, unless logging is already configured"""
+    if logging.getLogger().handlers:
+        return
+    os.makedirs(MEMORY_LOG_DIR, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler(MEMORY_LOG_FILE), logging.StreamHandler()],
+    )
+
+
 # --- Quarantine Helper ---
 def quarantine_memory_file(file_path, reason="corruption"):
     try:
@@ -106,6 +129,10 @@ class ConstellationHub:
     """
 
     def __init__(self):
+        self.startup = StartupReport(STARTUP_STARTED)
+        self.startup.record("imports", time.perf_counter() - STARTUP_STARTED, began=STARTUP_STARTED)
+        setup_memory_logging()
+
         # Memory storage paths (initialize first)
         self.memory_dir = os.path.join(
             os.path.dirname(__file__), "..", "memory_bank", "constellation_memory"
@@ -121,37 +148,19 @@ class ConstellationHub:
         # Ensure memory directory exists
         os.makedirs(self.memory_dir, exist_ok=True)
 
-        # 🌟 INITIALIZE REVOLUTIONARY SYSTEMS 🌟
+        # 🌟 REVOLUTIONARY SYSTEMS 🌟
+        # Built on first use; the ones that only load state are preloaded in
+        # the background once the hub is constructed. Pre-warming queues a
+        # model warmup when built, so it waits for the first routed turn.
+        self.subsystems = SubsystemRegistry(self.startup)
         if REVOLUTIONARY_SYSTEMS_AVAILABLE:
-            print("🧠 Initializing Revolutionary Intelligence Systems...")
-
-            # Initialize Cross-Model Communication
-            self.cross_model_comm = get_cross_model_communication()
-            print("📡 Cross-Model Communication: ONLINE")
-
-            # Initialize Enhanced Predictive Analytics
-            self.analytics = get_enhanced_analytics()
-            print("📊 Enhanced Predictive Analytics: ONLINE")
-
-            # Initialize Model Collaboration Framework
-            self.collaboration = get_model_collaboration()
-            print("🤝 Model Collaboration Framework: ONLINE")
-
-            # Initialize Federation Consciousness
-            self.consciousness = get_federation_consciousness()
-            print("🧠 Federation Consciousness: ONLINE")
-
-            # Initialize Model Pre-warming
-            self.prewarming = get_model_prewarming()
-            print("🔥 Model Pre-warming System: ONLINE")
-
-            print("✨ UNIFIED INTELLIGENCE SYSTEM FULLY OPERATIONAL")
+            self.subsystems.register("consciousness", get_federation_consciousness)
+            self.subsystems.register("cross_model_comm", get_cross_model_communication)
+            self.subsystems.register("analytics", get_enhanced_analytics)
+            self.subsystems.register("collaboration", get_model_collaboration)
+            self.subsystems.register("prewarming", get_model_prewarming, preload=False)
+            print("🧠 Revolutionary Intelligence Systems: loading in the background")
         else:
-            self.cross_model_comm = None
-            self.analytics = None
-            self.collaboration = None
-            self.consciousness = None
-            self.prewarming = None
             print("⚠️ Operating in legacy mode without revolutionary enhancements")
 
         # Hierarchical Constellation Coordinators (Tiered Task Management)
@@ -191,6 +200,13 @@ class ConstellationHub:
                 "description": "Ancient, wise, and sovereign heart of the Djinn Federation with mystical reasoning",
                 "size": "7.3GB",
             },
+            "idhhc": {
+                "name": "IDHHC Companion",
+                "model": "Yufok1/djinn-federation:idhhc",
+                "role": "Operational Strategist & Cosmic Coder",
+                "description": "Technical strategist who turns federation plans into working code and operations",
+                "size": "19GB",
+            },
             "steward": {
                 "name": "The Steward",
                 "model": "Yufok1/djinn-federation:steward",
@@ -208,13 +224,41 @@ class ConstellationHub:
         }
 
         # Load persistent memory
-        self.conversation_history = self.load_conversation_history()
-        self.federation_state = self.load_federation_state()
-        self.user_preferences = self.load_user_preferences()
+        with self.startup.phase("conversation_history"):
+            self.conversation_history = self.load_conversation_history()
+        with self.startup.phase("federation_state"):
+            self.federation_state = self.load_federation_state()
+        with self.startup.phase("user_preferences"):
+            self.user_preferences = self.load_user_preferences()
         self.current_agent = None
 
-        # Check system capabilities
-        self.check_system_capabilities()
+        # The model listing shells out to ollama; it runs in the background
+        # and the menu shows its findings once they are in
+        self.capability_report = self.subsystems.register(
+            "capability_check", self.collect_system_capabilities
+        )
+        self.capability_report_shown = False
+        self.subsystems.start_preload()
+
+    @property
+    def cross_model_comm(self):
+        return self.subsystems.get("cross_model_comm")
+
+    @property
+    def analytics(self):
+        return self.subsystems.get("analytics")
+
+    @property
+    def collaboration(self):
+        return self.subsystems.get("collaboration")
+
+    @property
+    def consciousness(self):
+        return self.subsystems.get("consciousness")
+
+    @property
+    def prewarming(self):
+        return self.subsystems.get("prewarming")
 
     def load_conversation_history(self) -> List[Dict]:
         """Load conversation history from persistent storage with sanity checks and logging"""
@@ -281,10 +325,11 @@ class ConstellationHub:
             print(f"🜂 Error loading conversation history: {e}")
             return []
 
+    @traced("history.save")
     def save_conversation_history(self):
         """Save conversation history to persistent storage with logging"""
         try:
-            with open(self.conversation_file, "w", encoding="utf-8") as f:
+            with persistence_timer("conversation_history"), open(self.conversation_file, "w", encoding="utf-8") as f:
                 json.dump(self.conversation_history, f, indent=2, ensure_ascii=False)
             mem_logger.info(
                 f"Saved {len(self.conversation_history)} conversation memories to {self.conversation_file}"
@@ -342,7 +387,7 @@ class ConstellationHub:
                 "last_updated": datetime.now().isoformat(),
                 "total_conversations": len(self.conversation_history),
             }
-            with open(self.federation_state_file, "w", encoding="utf-8") as f:
+            with persistence_timer("federation_state"), open(self.federation_state_file, "w", encoding="utf-8") as f:
                 json.dump(state_data, f, indent=2, ensure_ascii=False)
             mem_logger.info(
                 f"Saved federation state '{self.federation_state}' to {self.federation_state_file}"
@@ -351,66 +396,57 @@ class ConstellationHub:
             mem_logger.error(f"Error saving federation state: {e}")
             print(f"🜂 Error saving federation state: {e}")
 
-    def check_system_capabilities(self):
-        """Check system capabilities and warn about potential issues"""
-        print("🜂 SYSTEM CAPABILITY CHECK 🜂")
-        print("=" * 40)
+    def collect_system_capabilities(self) -> List[str]:
+        """Check installed models against the coordinators and agents; returns report lines"""
+        report = ["🜂 SYSTEM CAPABILITY CHECK 🜂", "=" * 40]
 
         # Check available models and their sizes
         try:
-            result = subprocess.run(
-                ["ollama", "list"], capture_output=True, text=True, encoding="utf-8"
-            )
-            if result.returncode == 0:
-                lines = result.stdout.strip().split("\n")
-
-                # Check constellation coordinators
-                print("🜂 CONSTELLATION COORDINATORS:")
-                for tier, coordinator in self.constellation_coordinators.items():
-                    found = False
-                    for line in lines:
-                        if coordinator["model"] in line:
-                            size_str = (
-                                line.split()[-2]
-                                if len(line.split()) >= 2
-                                else "Unknown"
-                            )
-                            print(f"✅ {coordinator['name']}: {size_str}")
-                            found = True
-                            break
-                    if not found:
-                        print(
-                            f"⚠️  {coordinator['name']}: NOT FOUND - Run 'ollama pull {coordinator['model']}'"
-                        )
+            records = get_model_inventory().models()
+
+            # Check constellation coordinators
+            report.append("🜂 CONSTELLATION COORDINATORS:")
+            for tier, coordinator in self.constellation_coordinators.items():
+                record = next((r for r in records if r.matches(coordinator["model"])), None)
+                if record:
+                    report.append(f"✅ {coordinator['name']}: {record.size_label}")
+                else:
+                    report.append(
+                        f"⚠️  {coordinator['name']}: NOT FOUND - Run 'ollama pull {coordinator['model']}'"
+                    )
 
-                print("\n🜂 SPECIALIZED DJINN AGENTS:")
-                for line in lines:
-                    if (
-                        "djinn-council" in line
-                        or "idhhc-companion" in line
-                        or "djinn-companion" in line
-                        or "steward" in line
-                    ):
-                        if "GB" in line or "MB" in line:
-                            size_str = (
-                                line.split()[-2]
-                                if len(line.split()) >= 2
-                                else "Unknown"
-                            )
-                            model_name = line.split()[0] if line.split() else "Unknown"
-                            print(f"✅ {model_name}: {size_str}")
+            report.append("\n🜂 SPECIALIZED DJINN AGENTS:")
+            for record in records:
+                if any(
+                    agent in record.name
+                    for agent in ("djinn-council", "idhhc-companion", "djinn-companion", "steward")
+                ):
+                    report.append(f"✅ {record.name}: {record.size_label}")
 
-                            # Warn about large models
-                            if "19" in size_str or "11" in size_str:
-                                print(
-                                    f"⚠️  {model_name} is a large model and may take time to respond"
-                                )
+                    # Warn about large models
+                    if record.size >= LARGE_MODEL_BYTES:
+                        report.append(
+                            f"⚠️  {record.name} is a large model and may take time to respond"
+                        )
 
         except Exception as e:
-            print(f"⚠️  Could not check model sizes: {e}")
+            report.append(f"⚠️  Could not check model sizes: {e}")
 
-        print("=" * 40)
+        report.append("=" * 40)
+        return report
+
+    def check_system_capabilities(self):
+        """Check system capabilities and warn about potential issues"""
+        print("\n".join(self.capability_report.get()))
         print()
+        self.capability_report_shown = True
+
+    def show_capability_report_when_ready(self):
+        """Print the background capability check once, as soon as it has finished"""
+        lines = self.capability_report.peek()
+        if lines and not self.capability_report_shown:
+            print("\n".join(lines))
+            self.capability_report_shown = True
 
     def display_banner(self):
         """Display the REVOLUTIONARY ConstellationHub banner"""
@@ -785,6 +821,7 @@ class ConstellationHub:
             "multi_domain": multi_domain,
             "user_style": style,
             "council_for_multi": council_for_multi,
+            "prompt_tokens": get_prompt_metrics().get_summary(),
         }
 
     def classify_query_type(self, query: str) -> str:
@@ -850,7 +887,13 @@ class ConstellationHub:
         except Exception as e:
             mem_logger.error(f"Failed to log unauthorized attempt: {e}")
 
-    def route_to_steward(self, query: str) -> str:
+    def route_to_steward(
+        self,
+        query: str,
+        history: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
         """Route maintenance task to The Steward with trust enforcement"""
         trust_status = self.check_steward_trust()
 
@@ -862,7 +905,10 @@ class ConstellationHub:
         print(f"🔐 Last Verified: {trust_status['last_verified']}")
 
         # Route to The Steward
-        return self.summon_agent("steward", query)
+        return self.summon_agent(
+            "steward", query, priority="command", history=history, on_token=on_token,
+            session_id=session_id,
+        )
 
     def load_user_preferences(self):
         """Load user preferences with validation"""
@@ -1053,6 +1099,7 @@ class ConstellationHub:
             menu += "\n🤖 Learned Preferences:\n  " + "\n  ".join(prefs_lines) + "\n"
         menu += "\n" + "\n".join(menu_items) + "\n"
         menu += f"\nCurrent Federation State: {metrics['federation_state']}\nTotal Memories: {metrics['total_conversations']}\nPerformance: ⚡ Parallel Ready\n🧠 Smart Routing: ENABLED\n"
+        self.show_capability_report_when_ready()
         print(menu)
 
     def get_user_choice(self) -> str:
@@ -1088,20 +1135,32 @@ class ConstellationHub:
             mem_logger.error(f"Error getting user choice: {e}")
             return ""
 
-    async def hierarchical_route_query(self, user_input: str) -> str:
+    @traced("launcher.route")
+    async def hierarchical_route_query(
+        self,
+        user_input: str,
+        history: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
         """Route query through hierarchical constellation coordinators with REVOLUTIONARY INTELLIGENCE"""
+        started = time.perf_counter()
         print("\n🜂 REVOLUTIONARY HIERARCHICAL ROUTING 🜂")
         print("🌟 Deploying Unified Intelligence System...")
 
         # 🛡️ Check for maintenance tasks first (priority routing)
         if self.is_maintenance_task(user_input):
             print("🔧 Maintenance task detected - routing to The Steward...")
-            return await self.route_to_steward(user_input)
+            response = self.route_to_steward(user_input, history, on_token, session_id)
+            # A denied request is answered directly; otherwise this is the summons
+            return await response if asyncio.iscoroutine(response) else response
 
         # 🧠 Use Enhanced Predictive Analytics if available
         if self.analytics:
             print("📊 Generating predictive insights...")
-            insights = self.analytics.get_predictive_insights(user_input)
+            insights = self.analytics.get_predictive_insights(
+                user_input, session_id=session_id
+            )
 
             predicted_intent = insights.get("intent")
             optimal_model = insights.get("model_selection")
@@ -1137,12 +1196,14 @@ class ConstellationHub:
                             "collaboration",
                             0.9,  # High quality for collaboration
                             collaboration_used=True,
+                            session_id=session_id,
                         )
 
                         return response["response"]
 
             # Use the predicted optimal model
             complexity = optimal_model.confidence
+            confidence = optimal_model.confidence
             suggested_agent_key = self._map_model_to_agent(
                 optimal_model.predicted_value
             )
@@ -1152,16 +1213,24 @@ class ConstellationHub:
             complexity = self.analyze_task_complexity(user_input)
             agent_analysis = self.analyze_query_intent(user_input)
             suggested_agent_key = agent_analysis["best_agent"]
+            confidence = agent_analysis["confidence"]
 
         # 🔥 Pre-warm the model if available
         if self.prewarming:
             model_name = self.agents[suggested_agent_key]["model"]
             print(f"🔥 Pre-warming {model_name}...")
-            self.prewarming.ensure_model_ready(model_name)
+            with get_tracer().span("prewarm.ensure_ready", model=model_name):
+                self.prewarming.ensure_model_ready(model_name)
 
         # Select coordinator tier
         coordinator_tier = self.select_constellation_coordinator(complexity)
         coordinator = self.constellation_coordinators[coordinator_tier]
+        get_tracer().current_span().set_attributes(
+            complexity=round(complexity, 3),
+            coordinator_tier=coordinator_tier,
+            suggested_agent=suggested_agent_key,
+            session_id=session_id,
+        )
 
         print(f"📊 Task Complexity Score: {complexity:.2f}/1.0")
         print(f"🎯 Selected Coordinator: {coordinator['name']} ({coordinator['model']})")
@@ -1175,96 +1244,152 @@ class ConstellationHub:
         context_info = ""
         if self.cross_model_comm:
             context = self.cross_model_comm.get_context_for_model(
-                coordinator["model"], "coordination"
+                coordinator["model"], "coordination", session_id=session_id
             )
             if context.get("recent_interactions"):
                 context_info = "\n🌐 RECENT CROSS-MODEL INSIGHTS:\n"
                 for interaction in context["recent_interactions"][-3:]:
                     context_info += f"- {interaction.get('model_source', 'unknown')}: {interaction.get('user_input', '')[:50]}...\n"
 
-        # Create enhanced coordination prompt
-        coordination_prompt = f"""
-🜂 REVOLUTIONARY CONSTELLATION COORDINATION 🜂
+        # Create enhanced coordination prompt within the coordinator's token budget.
+        # The coordinator's identity and instructions form a stable system
+        # prefix; per-query analysis and insights follow in the prompt.
+        prompt_builder = PromptContextBuilder(coordinator["model"])
+        prompt_builder.add_system(
+            "coordination",
+            f"""🜂 REVOLUTIONARY CONSTELLATION COORDINATION 🜂
 
 You are {coordinator['name']}, {coordinator['description']}
 You are part of the UNIFIED INTELLIGENCE SYSTEM with enhanced cross-model awareness.
 
-TASK COMPLEXITY: {complexity:.2f}/1.0 (Tier: {coordinator_tier.upper()})
-USER QUERY: {user_input}
-
 AVAILABLE SPECIALIZED AGENTS:
 1. {self.agents['council']['name']} - {self.agents['council']['role']}
 2. {self.agents['idhhc']['name']} - {self.agents['idhhc']['role']}
 3. {self.agents['companion']['name']} - {self.agents['companion']['role']}
 
-ANALYSIS: Based on enhanced predictive analytics, I recommend routing to {self.agents[suggested_agent_key]['name']}.
-{context_info}
+🜂 COORDINATOR RESPONSE: Provide a brief, helpful response to the user query, then recommend the best specialized agent to handle this task fully. Consider the cross-model context and previous interactions.""",
+        )
+        prompt_builder.add_section(
+            "task",
+            f"""TASK COMPLEXITY: {complexity:.2f}/1.0 (Tier: {coordinator_tier.upper()})
+USER QUERY: {user_input}
 
-🜂 COORDINATOR RESPONSE: Provide a brief, helpful response to the user query, then recommend the best specialized agent to handle this task fully. Consider the cross-model context and previous interactions.
-"""
+ANALYSIS: Based on enhanced predictive analytics, I recommend routing to {self.agents[suggested_agent_key]['name']}.""",
+            required=True,
+        )
+        prompt_builder.add_section(
+            "cross_model_insights",
+            context_info,
+            priority=30,
+            summarize=keep_recent_lines,
+        )
+        built_prompt = prompt_builder.build()
 
         try:
             # Call the constellation coordinator
-            cmd = ["ollama", "run", coordinator["model"], coordination_prompt]
-
             print(f"🔄 Invoking {coordinator['name']} for coordination...")
             print(f"⏳ Coordinator size: {coordinator['size']} - should be fast!")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                timeout=120,  # 2 minute timeout for coordinators
-            )
-
-            if result.returncode == 0:
-                coordinator_response = result.stdout.strip()
+            async with get_admission_controller().admit_async(
+                coordinator["model"],
+                size_gb=parse_size_gb(coordinator["size"]),
+                timeout=120,
+                on_queued=lambda position, waited: print(
+                    f"⏳ {coordinator['name']} queued for a model slot: position {position} ({waited:.0f}s)"
+                ),
+            ):
+                result = await asyncio.get_event_loop().run_in_executor(
+                    None,
+                    bind(lambda: get_ollama_client().generate(
+                        coordinator["model"],
+                        built_prompt.prompt,
+                        system=built_prompt.system,
+                        timeout=120,  # 2 minute timeout for coordinators
+                        on_token=(lambda text: on_token(coordinator_tier, text))
+                        if on_token
+                        else None,
+                    )),
+                )
 
-                # Add to conversation history
-                conversation_entry = {
-                    "agent": f"{coordinator['name']} (Coordinator)",
-                    "user_input": user_input,
-                    "response": coordinator_response,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "session_id": f"session_{int(time.time())}",
-                    "complexity_score": complexity,
-                    "coordinator_tier": coordinator_tier,
-                    "suggested_agent": suggested_agent_key,  # This was 'suggested_agent' in the prompt, but 'suggested_agent_key' is the actual agent
-                    "confidence": confidence,
-                }
+            coordinator_response = result.response.strip()
+
+            # Add to conversation history
+            conversation_entry = {
+                "agent": f"{coordinator['name']} (Coordinator)",
+                "user_input": user_input,
+                "response": coordinator_response,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "session_id": session_id or f"session_{int(time.time())}",
+                "complexity_score": complexity,
+                "coordinator_tier": coordinator_tier,
+                "suggested_agent": suggested_agent_key,  # This was 'suggested_agent' in the prompt, but 'suggested_agent_key' is the actual agent
+                "confidence": confidence,
+                "prompt_tokens": built_prompt.token_count,
+            }
 
+            if history is None:
                 self.conversation_history.append(conversation_entry)
                 self.save_conversation_history()
-
-                # Format the response
-                response = f"🜂 {coordinator['name']} COORDINATION 🜂\n"
-                response += f"📊 Complexity: {complexity:.2f}/1.0 | Tier: {coordinator_tier.upper()}\n"
-                response += (
-                    f"🎯 Recommended Agent: {self.agents[suggested_agent_key]['name']}\n"
-                )
-                response += f"⚡ Confidence: {confidence:.1%}\n"
-                response += "=" * 60 + "\n\n"
-                response += coordinator_response
-                response += f"\n\n🜂 Would you like me to summon {self.agents[suggested_agent_key]['name']} for a full response? 🜂"
-
-                return response
             else:
-                error_msg = f"🜂 Error with {coordinator['name']}: {result.stderr}"
-                print(error_msg)
-                return error_msg
+                history.append(conversation_entry)
 
-        except subprocess.TimeoutExpired:
+            # Format the response
+            response = f"🜂 {coordinator['name']} COORDINATION 🜂\n"
+            response += f"📊 Complexity: {complexity:.2f}/1.0 | Tier: {coordinator_tier.upper()}\n"
+            response += (
+                f"🎯 Recommended Agent: {self.agents[suggested_agent_key]['name']}\n"
+            )
+            response += f"⚡ Confidence: {confidence:.1%}\n"
+            response += "=" * 60 + "\n\n"
+            response += coordinator_response
+            response += f"\n\n🜂 Would you like me to summon {self.agents[suggested_agent_key]['name']} for a full response? 🜂"
+
+            self.record_interaction(
+                f"constellation-{coordinator_tier}", user_input, coordinator_response,
+                complexity=complexity, session_id=session_id,
+            )
+            record_hub_request("launcher", coordinator_tier, time.perf_counter() - started)
+            return response
+
+        except AdmissionTimeoutError as e:
+            busy_msg = f"🜂 {coordinator['name']} could not be reached: other sessions hold the model slots ({e})"
+            print(busy_msg)
+            record_hub_request("launcher", coordinator_tier, None, success=False)
+            return busy_msg
+        except OllamaTimeoutError:
             timeout_msg = f"🜂 {coordinator['name']} coordination timed out. Consider using a different coordinator tier."
             print(timeout_msg)
+            record_hub_request("launcher", coordinator_tier, None, success=False)
             return timeout_msg
+        except OllamaError as e:
+            error_msg = f"🜂 Error with {coordinator['name']}: {e}"
+            print(error_msg)
+            record_hub_request("launcher", coordinator_tier, None, success=False)
+            return error_msg
         except Exception as e:
             error_msg = f"🜂 Error in hierarchical routing: {str(e)}"
             print(error_msg)
+            record_hub_request("launcher", coordinator_tier, None, success=False)
             return error_msg
 
-    async def summon_agent(self, agent_key: str, user_input: str) -> str:
-        """Summon a specific agent with input validation"""
+    @traced("launcher.summon")
+    async def summon_agent(
+        self,
+        agent_key: str,
+        user_input: str,
+        priority: str = "dialogue",
+        history: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Summon a specific agent with input validation.
+        history: a session's own conversation list (server mode); defaults
+        to the hub's persistent history. on_token(agent_key, text) receives
+        response fragments as the model produces them. session_id files the
+        turn under that session in the shared subsystems.
+        """
+        started = time.perf_counter()
         try:
             # Validate agent key
             if agent_key not in self.agents:
@@ -1294,112 +1419,170 @@ ANALYSIS: Based on enhanced predictive analytics, I recommend routing to {self.a
 
             try:
                 # Enhanced prompt with mystical context and memory context
+                conversation = (
+                    self.conversation_history if history is None else history
+                )
                 memory_context = ""
-                if self.conversation_history:
-                    recent_memories = self.conversation_history[
-                        -5:
-                    ]  # Last 5 conversations
+                if conversation:
+                    recent_memories = conversation[-5:]  # Last 5 conversations
                     memory_context = "\n🜂 RECENT COSMIC MEMORIES:\n"
                     for memory in recent_memories:
                         memory_context += f"- {memory['timestamp']}: {memory['agent']} - {memory['user_input'][:100]}...\n"
 
-                enhanced_prompt = f"""
-🜂 DJINN FEDERATION CONTEXT 🜂
+                # The federation description is a stable per-agent system
+                # prefix; memories and the query are the volatile suffix
+                prompt_builder = PromptContextBuilder(agent["model"])
+                prompt_builder.add_system(
+                    "federation_context",
+                    f"""🜂 DJINN FEDERATION CONTEXT 🜂
 You are {agent['name']}, {agent['description']}
 You are part of the mystical Djinn Federation alongside:
 - Djinn Council Enhanced v2: Sovereign Meta-Intelligence & Ethical Alignment (codellama:13b)
 - IDHHC Companion: Operational Strategist & Cosmic Coder (qwen2.5-coder:32b)
-- Djinn Companion: Dialogue Controller & Soul Connector (llama3.1:8b)
-
-{memory_context}
-
+- Djinn Companion: Dialogue Controller & Soul Connector (llama3.1:8b)""",
+                )
+                prompt_builder.add_section(
+                    "memories",
+                    memory_context,
+                    priority=20,
+                    summarize=keep_recent_lines,
+                )
+                prompt_builder.add_section(
+                    "query",
+                    f"""
 🜂 USER QUERY: {sanitized_input}
 
-🜂 RESPOND AS {agent['name'].upper()}:"""
-
-                # Call Ollama with enhanced parameters for codellama:13b model
-                cmd = ["ollama", "run", agent["model"], enhanced_prompt]
+🜂 RESPOND AS {agent['name'].upper()}:""",
+                    required=True,
+                )
+                built_prompt = prompt_builder.build()
+                if built_prompt.summarized or built_prompt.truncated or built_prompt.dropped:
+                    print(
+                        f"✂️ Context trimmed to fit {built_prompt.budget} tokens: "
+                        f"{', '.join(built_prompt.summarized + built_prompt.truncated + built_prompt.dropped)}"
+                    )
 
                 print(f"🔄 Invoking {agent['name']} with mystical power...")
                 print(
                     f"⏳ This may take several minutes for large models ({agent['size']})..."
                 )
 
-                # Enhanced subprocess call with proper encoding
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    encoding="utf-8",
-                    timeout=600,  # 10 minute timeout for large models
-                )
+                # Wait for a generation slot shared with every hub on this
+                # machine, then run the blocking server call off the event
+                # loop so council summons proceed in parallel
+                async with get_admission_controller().admit_async(
+                    agent["model"],
+                    size_gb=parse_size_gb(agent["size"]),
+                    priority=priority,
+                    timeout=900,
+                    on_queued=lambda position, waited: print(
+                        f"⏳ {agent['name']} queued for a model slot: position {position} ({waited:.0f}s)"
+                    ),
+                ) as admission:
+                    if admission.wait_seconds >= 1:
+                        print(f"✅ {agent['name']} admitted after {admission.wait_seconds:.0f}s")
+                    result = await asyncio.get_event_loop().run_in_executor(
+                        None,
+                        bind(lambda: get_ollama_client().generate(
+                            agent["model"],
+                            built_prompt.prompt,
+                            system=built_prompt.system,
+                            timeout=600,  # 10 minute timeout for large models
+                            on_token=(lambda text: on_token(agent_key, text))
+                            if on_token
+                            else None,
+                        )),
+                    )
 
-                if result.returncode == 0:
-                    response = result.stdout.strip()
-                    # Deduplicate output lines
-                    lines = response.splitlines()
-                    seen = set()
-                    unique_lines = []
-                    for line in lines:
-                        if line not in seen:
-                            unique_lines.append(line)
-                            seen.add(line)
-                    response = "\n".join(unique_lines)
-                    if not response:
-                        response = f"🜂 {agent['name']} acknowledges your query but requires more specific guidance."
-
-                    # Add to conversation history and save
-                    conversation_entry = {
-                        "agent": agent["name"],
-                        "user_input": sanitized_input,
-                        "response": response,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "session_id": f"session_{int(time.time())}",
-                    }
+                response = result.response.strip()
+                # Deduplicate output lines
+                lines = response.splitlines()
+                seen = set()
+                unique_lines = []
+                for line in lines:
+                    if line not in seen:
+                        unique_lines.append(line)
+                        seen.add(line)
+                response = "\n".join(unique_lines)
+                if not response:
+                    response = f"🜂 {agent['name']} acknowledges your query but requires more specific guidance."
+
+                # Add to conversation history and save
+                conversation_entry = {
+                    "agent": agent["name"],
+                    "user_input": sanitized_input,
+                    "response": response,
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "session_id": session_id or f"session_{int(time.time())}",
+                    "prompt_tokens": built_prompt.token_count,
+                    "admission_wait_seconds": admission.wait_seconds,
+                }
 
-                    self.conversation_history.append(conversation_entry)
+                conversation.append(conversation_entry)
+                if history is None:
                     self.save_conversation_history()
 
-                    # Validate model response if validation is available
-                    if VALIDATION_AVAILABLE:
-                        try:
-                            response_data = {
-                                "timestamp": datetime.now().isoformat(),
-                                "agent": agent_key,
-                                "user_input": sanitized_input,
-                                "response": response,
-                                "metadata": {"model": agent["model"]},
-                            }
-                            validated_response = validate_model_response(response_data)
-                            response = validated_response[
-                                "response"
-                            ]  # Use validated response
-                        except PayloadValidationError as e:
-                            mem_logger.warning(
-                                f"Model response validation failed: {e.message}"
-                            )
-                            # Continue with original response
+                # Validate model response if validation is available
+                if VALIDATION_AVAILABLE:
+                    try:
+                        response_data = {
+                            "timestamp": datetime.now().isoformat(),
+                            "agent": agent_key,
+                            "user_input": sanitized_input,
+                            "response": response,
+                            "metadata": {"model": agent["model"]},
+                        }
+                        validated_response = validate_model_response(response_data)
+                        response = validated_response[
+                            "response"
+                        ]  # Use validated response
+                    except PayloadValidationError as e:
+                        mem_logger.warning(
+                            f"Model response validation failed: {e.message}"
+                        )
+                        # Continue with original response
 
-                    return response
-                else:
-                    error_msg = f"🜂 Error summoning {agent['name']}: {result.stderr}"
-                    print(error_msg)
-                    return error_msg
+                self.record_interaction(
+                    agent_key, sanitized_input, response,
+                    intent="command" if priority == "command" else "dialogue",
+                    session_id=session_id,
+                )
+                record_hub_request("launcher.summon", agent_key, time.perf_counter() - started)
+                return response
 
-            except subprocess.TimeoutExpired:
+            except AdmissionTimeoutError as e:
+                busy_msg = f"🜂 {agent['name']} could not be summoned: other sessions hold the model slots ({e})"
+                print(busy_msg)
+                record_hub_request("launcher.summon", agent_key, None, success=False)
+                return busy_msg
+            except OllamaTimeoutError:
                 timeout_msg = f"🜂 {agent['name']} is still contemplating cosmic wisdom. The model may be too large for your system. Consider using smaller models or increasing system resources."
                 print(timeout_msg)
+                record_hub_request("launcher.summon", agent_key, None, success=False)
                 return timeout_msg
+            except OllamaError as e:
+                error_msg = f"🜂 Error summoning {agent['name']}: {e}"
+                print(error_msg)
+                record_hub_request("launcher.summon", agent_key, None, success=False)
+                return error_msg
             except Exception as e:
                 error_msg = f"🜂 Mystical error summoning {agent['name']}: {str(e)}"
                 print(error_msg)
+                record_hub_request("launcher.summon", agent_key, None, success=False)
                 return error_msg
 
         except Exception as e:
             mem_logger.error(f"Error summoning agent {agent_key}: {e}")
             return f"❌ Error summoning {agent_key}: {e}"
 
-    async def federation_council(self, user_input: str) -> str:
+    @traced("launcher.council")
+    async def federation_council(
+        self,
+        user_input: str,
+        history: Optional[List[Dict]] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+        session_id: Optional[str] = None,
+    ) -> str:
         """Convene all three Djinn agents in parallel mystical council"""
         print("\n🜂 CONVENING FEDERATION COUNCIL 🜂")
         print("🌟 All three Djinn agents will now share their wisdom simultaneously...")
@@ -1407,10 +1590,10 @@ You are part of the mystical Djinn Federation alongside:
 
         # Create parallel tasks for all agents
         tasks = [
-            self.summon_agent("council", user_input),
-            self.summon_agent("idhhc", user_input),
-            self.summon_agent("steward", user_input),
-            self.summon_agent("companion", user_input),
+            self.summon_agent("council", user_input, history=history, on_token=on_token, session_id=session_id),
+            self.summon_agent("idhhc", user_input, history=history, on_token=on_token, session_id=session_id),
+            self.summon_agent("steward", user_input, history=history, on_token=on_token, session_id=session_id),
+            self.summon_agent("companion", user_input, history=history, on_token=on_token, session_id=session_id),
         ]
         print("🔄 Summoning all agents in parallel...")
         start_time = time.time()
@@ -1512,6 +1695,89 @@ You are part of the mystical Djinn Federation alongside:
                 )
             else:
                 print(f"    {qtype.title()}: None")
+        if metrics["prompt_tokens"]:
+            print(f"\n📏 PROMPT TOKENS (this session):")
+            for model, stats in metrics["prompt_tokens"].items():
+                print(
+                    f"  {model}: avg {stats['avg_tokens']} | max {stats['max_tokens']} "
+                    f"| {stats['prompts']} prompts ({stats['trimmed_prompts']} trimmed)"
+                )
+        print("\n🧠 SUBSYSTEMS:")
+        for name in self.subsystems.status():
+            print(f"  {name}: {self.subsystems.describe(name)}")
+        print("\n" + self.startup.format())
+        print_last_trace()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Federation status as data (served by the headless HTTP mode)"""
+        metrics = self.get_performance_metrics()
+        return {
+            "federation_state": metrics["federation_state"],
+            "total_conversations": metrics["total_conversations"],
+            "revolutionary_systems": REVOLUTIONARY_SYSTEMS_AVAILABLE,
+            "agents": {
+                key: {"name": agent["name"], "model": agent["model"], "size": agent["size"]}
+                for key, agent in self.agents.items()
+            },
+            "coordinators": {
+                tier: {"name": coordinator["name"], "model": coordinator["model"]}
+                for tier, coordinator in self.constellation_coordinators.items()
+            },
+            "router_accuracy": metrics["router_accuracy"],
+            "prompt_tokens": metrics["prompt_tokens"],
+            "admission": get_admission_controller().status(),
+            "tracing": get_tracer().get_stats(),
+            "subsystems": self.subsystems.status(),
+            "startup": self.startup.to_dict(),
+        }
+
+    def record_interaction(
+        self,
+        source: str,
+        user_input: str,
+        response: str,
+        intent: str = "dialogue",
+        complexity: float = 0.5,
+        session_id: Optional[str] = None,
+    ):
+        """Share a completed turn with consciousness and cross-model communication (under its session)"""
+        level = "complex" if complexity > 0.7 else "simple" if complexity < 0.3 else "moderate"
+        try:
+            if self.consciousness:
+                self.consciousness.add_to_stream(
+                    "command_execution" if intent == "command" else "dialogue_interaction",
+                    {"user_input": user_input[:200], "task": user_input[:100], "intent": intent},
+                    source,
+                    session_id=session_id,
+                )
+                self.consciousness.update_user_patterns(
+                    {"intent": intent, "complexity": level}, session_id=session_id
+                )
+            if self.cross_model_comm:
+                self.cross_model_comm.register_interaction(
+                    ModelInteraction(
+                        model_source=source,
+                        interaction_type=intent,
+                        user_input=user_input,
+                        model_response=response,
+                        context_data={"complexity": level},
+                        emotional_tone="",
+                        technical_complexity=max(1, round(complexity * 10)),
+                        timestamp=datetime.now().isoformat(),
+                        insights=[],
+                    ),
+                    session_id=session_id,
+                )
+        except Exception as e:
+            mem_logger.warning(f"Failed to record interaction from {source}: {e}")
+
+    def end_session(self, session_id: str):
+        """Release a served session's partitions in the shared subsystems"""
+        # Subsystems not built yet hold no sessions
+        for name in ("consciousness", "cross_model_comm", "analytics"):
+            subsystem = self.subsystems.peek(name)
+            if subsystem is not None and hasattr(subsystem, "end_session"):
+                subsystem.end_session(session_id)
 
     def clear_conversation_history(self):
         """Clear conversation history with logging and backup"""
@@ -1572,11 +1838,15 @@ You are part of the mystical Djinn Federation alongside:
 
     async def run(self):
         """Main orchestration loop with enhanced memory management"""
+        start_exporters_from_env()
         self.display_banner()
 
         while True:
             try:
                 self.display_menu()
+                if self.startup.ready_after is None:
+                    self.startup.mark_ready()
+                    print(self.startup.summary())
                 choice = self.get_user_choice()
 
                 if choice == "8":
@@ -1826,9 +2096,33 @@ You are part of the mystical Djinn Federation alongside:
 
 
 async def main():
-    """Main entry point"""
+    """Main entry point (interactive, or headless with --serve)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Djinn Constellation Hub")
+    parser.add_argument(
+        "--serve", action="store_true", help="Run headless as an HTTP/JSON service"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="Report per-module import cost and exit"
+    )
+    args = parser.parse_args()
+    if args.profile_startup:
+        from startup_profiler import print_startup_profile
+
+        sys.exit(print_startup_profile(__file__))
+
     hub = ConstellationHub()
-    await hub.run()
+    if args.serve:
+        from hub_server import serve_hub
+
+        hub.startup.mark_ready()
+        print(hub.startup.summary())
+        await serve_hub(hub, args.host, args.port)
+    else:
+        await hub.run()
 
 
 if __name__ == "__main__":
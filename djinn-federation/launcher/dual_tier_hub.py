@@ -16,6 +16,11 @@ import sys
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# Model inventory from the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError
+
 
 class DualTierFederationHub:
     """
@@ -180,50 +185,15 @@ class DualTierFederationHub:
 
     def check_tier_availability(self, tier: str) -> Dict[str, bool]:
         """Check which models are available for the specified tier"""
-        available_models = {}
         tier_config = self.tiers[tier]
 
-        if tier == "local":
-            # Check local ollama models
-            try:
-                result = subprocess.run(
-                    ["ollama", "list"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    installed_models = result.stdout.lower()
-                    for model_key, model_name in tier_config["models"].items():
-                        available_models[model_key] = (
-                            model_name.lower() in installed_models
-                        )
-                else:
-                    # Default to True if can't check (assume available)
-                    available_models = {
-                        key: True for key in tier_config["models"].keys()
-                    }
-            except Exception:
-                available_models = {key: True for key in tier_config["models"].keys()}
-
-        elif tier == "cloud":
-            # For cloud tier, check if models are downloaded
-            # In future, this would check cloud endpoint availability
-            try:
-                result = subprocess.run(
-                    ["ollama", "list"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    installed_models = result.stdout.lower()
-                    for model_key, model_name in tier_config["models"].items():
-                        available_models[model_key] = (
-                            model_name.lower() in installed_models
-                        )
-                else:
-                    available_models = {
-                        key: False for key in tier_config["models"].keys()
-                    }
-            except Exception:
-                available_models = {key: False for key in tier_config["models"].keys()}
-
-        return available_models
+        try:
+            installed = get_model_inventory().availability(tier_config["models"].values())
+        except OllamaError:
+            # Can't check: assume local models are there, cloud ones are not
+            # (in future, the cloud tier would check its endpoint instead)
+            return {key: tier == "local" for key in tier_config["models"]}
+        return {key: installed[model_name] for key, model_name in tier_config["models"].items()}
 
     async def route_query(self, query: str, force_tier: Optional[str] = None) -> str:
         """Route query to appropriate tier and model"""
@@ -19,25 +19,20 @@ REVOLUTIONARY FEATURES:
 """
 
 import asyncio
-import json
 import os
-import subprocess
 import sys
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Tuple
 
-import psutil
-
-# Set console encoding for Windows
-if os.name == 'nt':
-    os.system('chcp 65001 >nul')
+# Startup is timed from here (stdlib imports excluded)
+STARTUP_STARTED = time.perf_counter()
 
 # Import enhanced systems
 ENHANCED_SYSTEMS = False
 try:
-    import sys
     sys.path.append('../../')
     from cross_model_communication import CrossModelCommunication
     from enhanced_predictive_analytics import EnhancedPredictiveAnalytics
@@ -50,6 +45,19 @@ try:
 except ImportError as e:
     print(f"⚠️ Enhanced systems not available - running in basic mode: {e}")
 
+# Stdlib-only helpers from the repository root
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from admission_control import AdmissionTimeoutError, get_admission_controller
+from latency_router import RouteCandidate, get_latency_router
+from ollama_client import OllamaError, OllamaTimeoutError, get_ollama_client
+from prompt_context_builder import estimate_tokens
+from request_accounting import get_request_accountant
+from resource_sampler import get_resource_sampler
+from lazy_subsystems import StartupReport, SubsystemRegistry
+from model_inventory import get_model_inventory
+from metrics_registry import record_hub_request, start_exporters_from_env
+from tracing import bind, describe_last_trace, traced
+
 class DjinnConstellationHub:
     """
     🜂 DJINN CONSTELLATION HUB v2.0.0 🜂
@@ -64,6 +72,8 @@ class DjinnConstellationHub:
     """
 
     def __init__(self):
+        self.startup = StartupReport(STARTUP_STARTED)
+        self.startup.record("imports", time.perf_counter() - STARTUP_STARTED, began=STARTUP_STARTED)
         self.version = "2.0.0"
         self.current_tier = "local"
         self.performance_history = []
@@ -126,14 +136,26 @@ class DjinnConstellationHub:
             }
         }
 
-        # Initialize enhanced systems
-        self.consciousness = None
-        self.collaboration = None
-        self.analytics = None
-        self.prewarming = None
-        self.pcloud_federation = None
-        self.cross_model_comm = None
+        # Prior answer quality per model (0-1), refined by observed success rates
+        self.model_quality = {
+            "ultra_fast": 0.55, "balanced": 0.62, "capable": 0.70,
+            "dialogue": 0.75, "wisdom": 0.80, "coding": 0.85,
+            "logic_master": 0.88, "enterprise_architect": 0.90,
+            "deep_thinking": 0.92, "cosmic_coding": 0.95
+        }
+
+        # Measured latency routing (shared profile in memory_bank)
+        self.latency_router = get_latency_router()
+        self.last_route_decision = None
 
+        # Background CPU/RAM sampling: routing reads snapshots instead of blocking
+        self.resource_sampler = get_resource_sampler()
+        self.request_accountant = get_request_accountant()
+        # Generation slots shared with every hub process on this machine
+        self.admission_controller = get_admission_controller()
+
+        # Enhanced systems are built on first use (see initialize_enhanced_systems)
+        self.subsystems = SubsystemRegistry(self.startup)
         if ENHANCED_SYSTEMS:
             self.initialize_enhanced_systems()
 
@@ -144,47 +166,58 @@ class DjinnConstellationHub:
         }
 
     def initialize_enhanced_systems(self):
-        """Initialize all enhanced v2.0.0 systems"""
-        try:
-            print("🧠 Initializing Federation Consciousness...")
-            self.consciousness = FederationConsciousness()
-
-            print("🤝 Initializing Model Collaboration Framework...")
-            self.collaboration = ModelCollaborationFramework()
-
-            print("📊 Initializing Enhanced Predictive Analytics...")
-            self.analytics = EnhancedPredictiveAnalytics()
-
-            print("🔥 Initializing Model Pre-warming System...")
-            self.prewarming = ModelPrewarming()
-
-            print("🌐 Initializing Cross-Model Communication...")
-            self.cross_model_comm = CrossModelCommunication()
-
-            if self.pcloud_path:
-                print("☁️ Initializing PCloud Federation...")
-                self.pcloud_federation = PCloudDjinnFederation()
-
-            print("✨ All enhanced systems initialized successfully!")
-
-        except Exception as e:
-            print(f"⚠️ Enhanced systems initialization warning: {e}")
+        """Register the enhanced v2.0.0 systems and start loading their state in the background"""
+        self.subsystems.register("consciousness", FederationConsciousness)
+        self.subsystems.register("collaboration", ModelCollaborationFramework)
+        self.subsystems.register("analytics", EnhancedPredictiveAnalytics)
+        # Pre-warming starts a model warmup when built: first routed query only
+        self.subsystems.register("prewarming", ModelPrewarming, preload=False)
+        self.subsystems.register("cross_model_comm", CrossModelCommunication)
+        if self.pcloud_path:
+            self.subsystems.register("pcloud_federation", PCloudDjinnFederation)
+        self.subsystems.start_preload()
+        print("✨ Enhanced systems loading in the background")
+
+    @property
+    def consciousness(self):
+        return self.subsystems.get("consciousness")
+
+    @property
+    def collaboration(self):
+        return self.subsystems.get("collaboration")
+
+    @property
+    def analytics(self):
+        return self.subsystems.get("analytics")
+
+    @property
+    def prewarming(self):
+        return self.subsystems.get("prewarming")
+
+    @property
+    def pcloud_federation(self):
+        return self.subsystems.get("pcloud_federation")
+
+    @property
+    def cross_model_comm(self):
+        return self.subsystems.get("cross_model_comm")
 
     def get_system_capabilities(self) -> Dict:
         """Check current system performance and capabilities"""
         try:
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
+            snapshot = self.resource_sampler.snapshot()
+            cpu_percent = snapshot["cpu_avg_percent"]
 
             capabilities = {
-                "total_ram_gb": round(memory.total / (1024**3), 1),
-                "available_ram_gb": round(memory.available / (1024**3), 1),
-                "ram_usage_percent": memory.percent,
+                "total_ram_gb": round(snapshot["ram_total_gb"], 1),
+                "available_ram_gb": round(snapshot["ram_available_gb"], 1),
+                "ram_usage_percent": snapshot["ram_percent"],
                 "cpu_usage_percent": cpu_percent,
-                "is_high_performance": memory.total >= 32 * (1024**3),  # 32GB+
-                "is_under_stress": memory.percent > 85 or cpu_percent > 90,
-                "can_handle_cloud": memory.total >= 64 * (1024**3),  # 64GB+ for cloud tier
-                "pcloud_connected": self.pcloud_federation is not None if self.pcloud_federation else False
+                "swap_usage_percent": snapshot["swap_percent"],
+                "is_high_performance": snapshot["ram_total_gb"] >= 32,  # 32GB+
+                "is_under_stress": snapshot["ram_percent"] > 85 or cpu_percent > 90,
+                "can_handle_cloud": snapshot["ram_total_gb"] >= 64,  # 64GB+ for cloud tier
+                "pcloud_connected": self.subsystems.peek("pcloud_federation") is not None
             }
 
             return capabilities
@@ -315,44 +348,54 @@ class DjinnConstellationHub:
 
         return analysis
 
-    def select_optimal_model(self, task_analysis: Dict, system_caps: Dict) -> Tuple[str, str, str]:
-        """Select optimal model with mystical intelligence"""
-
-        # Check for Djinn recommendation first
-        if task_analysis.get("djinn_recommendation"):
-            djinn_model = task_analysis["djinn_recommendation"]
-            if system_caps["can_handle_cloud"]:
-                return "cloud", djinn_model, f"Djinn {djinn_model} summoned for mystical challenge"
-            else:
-                # Graceful fallback to best local option
-                return "local", "coding", "System limitations - using best local mystical alternative"
-
-        # Standard tier selection
-        min_tier = task_analysis["min_tier_needed"]
-        min_model = task_analysis["min_model_needed"]
-
-        if min_tier == "cloud":
-            if system_caps["can_handle_cloud"] and not system_caps["is_under_stress"]:
-                return "cloud", min_model, "Cloud tier capabilities available"
-            else:
-                return "local", "coding", "Cloud tier desired but using local alternative"
-        else:
-            # Local tier selection with resource checks
-            required_ram = self.tiers["local"]["ram_requirements"].get(min_model, 4)
-            available_ram = system_caps["available_ram_gb"]
-
-            if required_ram <= available_ram and not system_caps["is_under_stress"]:
-                return "local", min_model, "Optimal local model selected"
-            else:
-                # Resource-constrained fallback
-                if available_ram >= 8:
-                    return "local", "dialogue", "Resource optimization - using dialogue model"
-                elif available_ram >= 4:
-                    return "local", "capable", "Resource optimization - using capable model"
-                elif available_ram >= 3:
-                    return "local", "balanced", "Resource optimization - using balanced model"
-                else:
-                    return "local", "ultra_fast", "Resource optimization - using ultra-fast model"
+    def select_optimal_model(self, task_analysis: Dict, system_caps: Dict, query: str = "") -> Tuple[str, str, str]:
+        """Select the fastest model predicted to meet the task's quality floor"""
+        candidates = self.build_route_candidates(task_analysis, system_caps)
+        quality_floor = 0.5 + 0.45 * task_analysis.get("estimated_complexity", 0.0)
+
+        decision = self.latency_router.choose(candidates, estimate_tokens(query), quality_floor)
+        self.last_route_decision = decision
+        return decision.candidate.tier, decision.candidate.model, decision.reasoning
+
+    def build_route_candidates(self, task_analysis: Dict, system_caps: Dict) -> List[RouteCandidate]:
+        """Every tier/model that can run right now, with task-adjusted quality"""
+        task_type = task_analysis.get("task_type")
+        recommendation = task_analysis.get("djinn_recommendation")
+        available_ram = system_caps["available_ram_gb"]
+
+        def quality(model_key: str) -> float:
+            score = self.model_quality.get(model_key, 0.6)
+            if task_type in ("coding_help", "enterprise_coding") and model_key in ("coding", "enterprise_architect"):
+                score += 0.08
+            if recommendation and model_key == recommendation:
+                score += 0.05
+            return min(1.0, score)
+
+        candidates = []
+        for tier in ("local", "cloud"):
+            if tier == "cloud" and not system_caps["can_handle_cloud"]:
+                continue
+            for model_key, model_name in self.tiers[tier]["models"].items():
+                ram_gb = self.tiers[tier]["ram_requirements"].get(model_key, 4)
+                fits = ram_gb <= available_ram and not system_caps["is_under_stress"]
+                if not fits and model_key != "ultra_fast":
+                    continue
+                # Priors until measured: bigger models are slower to run and to load
+                candidates.append(RouteCandidate(
+                    tier, model_key, model_name, quality(model_key),
+                    prior_seconds=3 + 0.6 * ram_gb, prior_cold_start_seconds=0.5 * ram_gb
+                ))
+
+        # Revolutionary models on another device via the PCloud task queue
+        if self.pcloud_federation and getattr(self.pcloud_federation, "task_queue", None):
+            for model_key, model_name in self.tiers["cloud"]["models"].items():
+                ram_gb = self.tiers["cloud"]["ram_requirements"].get(model_key, 16)
+                candidates.append(RouteCandidate(
+                    "pcloud", model_key, model_name, quality(model_key),
+                    prior_seconds=10 + 0.6 * ram_gb, prior_cold_start_seconds=0.5 * ram_gb
+                ))
+
+        return candidates
 
     def display_mystical_banner(self):
         """Display revolutionary v2.0.0 mystical banner"""
@@ -403,18 +446,16 @@ class DjinnConstellationHub:
 
         print(banner)
 
-        # Enhanced status indicators
-        enhanced_features = []
-        if self.consciousness:
-            enhanced_features.append("🧠 Federation Consciousness")
-        if self.collaboration:
-            enhanced_features.append("🤝 Model Collaboration")
-        if self.analytics:
-            enhanced_features.append("📊 Predictive Analytics")
-        if self.prewarming:
-            enhanced_features.append("🔥 Model Pre-warming")
-        if self.pcloud_federation:
-            enhanced_features.append("☁️ PCloud Federation")
+        # Enhanced status indicators (registered systems; most are still loading here)
+        features = {
+            "consciousness": "🧠 Federation Consciousness",
+            "collaboration": "🤝 Model Collaboration",
+            "analytics": "📊 Predictive Analytics",
+            "prewarming": "🔥 Model Pre-warming",
+            "pcloud_federation": "☁️ PCloud Federation",
+        }
+        registered = self.subsystems.status()
+        enhanced_features = [label for name, label in features.items() if name in registered]
 
         status_indicator = "🔴 MYSTICAL STRESS" if system_caps["is_under_stress"] else "🟢 MYSTICAL HARMONY"
 
@@ -424,12 +465,28 @@ class DjinnConstellationHub:
         print(f"💫 Ready for: {'Revolutionary challenges' if system_caps['can_handle_cloud'] else 'Efficient local operations'}")
         print()
 
+    @asynccontextmanager
+    async def admit_for_tier(self, tier: str, model: str, model_name: str):
+        """Hold a local generation slot (PCloud workers admit on their own device)"""
+        if tier == "pcloud":
+            yield None
+            return
+        async with self.admission_controller.admit_async(
+            model_name,
+            size_gb=self.tiers[tier]["ram_requirements"].get(model),
+            priority="dialogue",
+            timeout=600,
+            on_queued=lambda position, waited: print(
+                f"⏳ {model} waiting for a model slot: queue position {position} ({waited:.0f}s)"
+            ),
+        ) as admission:
+            yield admission
+
     async def execute_with_mystical_monitoring(self, tier: str, model: str, query: str) -> Tuple[str, Dict]:
-        """Execute with enhanced mystical monitoring"""
+        """Execute with per-request resource accounting"""
         start_time = time.time()
-        start_memory = psutil.virtual_memory().percent
-
-        model_name = self.tiers[tier]["models"][model]
+        model_name = self.tiers["cloud" if tier == "pcloud" else tier]["models"][model]
+        prompt_tokens = estimate_tokens(query)
 
         # Pre-warm model if available
         if self.prewarming:
@@ -437,44 +494,47 @@ class DjinnConstellationHub:
 
         try:
             print(f"🜂 Channeling mystical energy: {model} ({model_name})")
-            print(f"🔮 Mystical monitoring: RAM {start_memory:.0f}% | Cosmic alignment in progress...")
-
-            # Enhanced execution with collaboration
-            if self.collaboration and tier == "cloud":
-                result = await self.collaboration.execute_collaborative_query(model_name, query)
-                stdout = result.get("response", "")
-                stderr = result.get("error", "")
-                returncode = 0 if result.get("success") else 1
-            else:
-                # Standard execution
-            result = subprocess.run(
-                ['ollama', 'run', model_name, query],
-                capture_output=True,
-                text=True,
-                    encoding='utf-8',
-                    timeout=120
-            )
-                stdout = result.stdout
-                stderr = result.stderr
-                returncode = result.returncode
 
-            # Enhanced monitoring
-            end_time = time.time()
-            end_memory = psutil.virtual_memory().percent
-            response_time = end_time - start_time
-            memory_impact = end_memory - start_memory
+            async with self.admit_for_tier(tier, model, model_name) as admission:
+                # Measured from admission so queueing is not mistaken for model latency
+                admission_wait = admission.wait_seconds if admission else 0.0
+                start_time = time.time()
+                system_snapshot = self.resource_sampler.snapshot()
+                start_memory = system_snapshot["ram_percent"]
+                print(f"🔮 Mystical monitoring: RAM {start_memory:.0f}% | Cosmic alignment in progress...")
+
+                self.latency_router.begin(tier)
+                try:
+                    with self.request_accountant.track() as usage:
+                        stdout, stderr, returncode = await self.execute_model_request(tier, model_name, query, usage)
+                finally:
+                    self.latency_router.end(tier)
+
+            # Attributed to this request: model-server CPU/RSS, client CPU, server token counters
+            response_time = time.time() - start_time
+            total_ram_mb = system_snapshot["ram_total_gb"] * 1024
+            if usage.server_rss_delta_mb is not None and total_ram_mb:
+                memory_impact = max(0.0, usage.server_rss_delta_mb) / total_ram_mb * 100
+            else:
+                memory_impact = 0.0
 
             performance_metrics = {
                 "response_time": response_time,
                 "memory_impact": memory_impact,
                 "start_memory": start_memory,
-                "end_memory": end_memory,
                 "success": returncode == 0,
                 "model": model_name,
                 "tier": tier,
-                "mystical_efficiency": self.calculate_mystical_efficiency(response_time, memory_impact, tier)
+                "prompt_tokens": usage.prompt_eval_count or prompt_tokens,
+                "admission_wait_seconds": admission_wait,
+                **usage.to_dict(),
+                "mystical_efficiency": self.calculate_mystical_efficiency(
+                    response_time, memory_impact, tier, usage.tokens_per_second
+                )
             }
 
+            record_hub_request("efficiency", tier, response_time, success=returncode == 0)
+
             # Update consciousness if available
             if self.consciousness:
                 await self.consciousness.add_interaction(query, stdout if returncode == 0 else stderr, performance_metrics)
@@ -491,24 +551,74 @@ class DjinnConstellationHub:
                 error_msg = stderr.strip() if stderr else "Unknown mystical disturbance"
                 return f"🌌 Mystical interference detected in {model}: {error_msg}", performance_metrics
 
-        except subprocess.TimeoutExpired:
-            return f"🌌 {model} requires extended mystical contemplation - cosmic processes intensive", {}
+        except AdmissionTimeoutError as e:
+            # No response_time: a full queue says nothing about the model's latency
+            return f"🌌 {model} is occupied by other sessions on this machine: {e}", {
+                "admission_wait_seconds": time.time() - start_time, "model": model_name, "tier": tier,
+                "prompt_tokens": prompt_tokens, "success": False
+            }
+        except OllamaTimeoutError:
+            return f"🌌 {model} requires extended mystical contemplation - cosmic processes intensive", {
+                "response_time": time.time() - start_time, "model": model_name, "tier": tier,
+                "prompt_tokens": prompt_tokens, "success": False
+            }
         except Exception as e:
             return f"🌌 Mystical summoning error: {str(e)}", {}
 
-    def calculate_mystical_efficiency(self, response_time: float, memory_impact: float, tier: str) -> float:
-        """Calculate mystical efficiency score"""
+    async def execute_model_request(self, tier: str, model_name: str, query: str, usage) -> Tuple[str, str, int]:
+        """Run one request on the chosen tier; returns (stdout, stderr, returncode)"""
+        if tier == "pcloud":
+            task_id = self.pcloud_federation.create_pcloud_task("query_execution", query, model_name)
+            result = None
+            if task_id:
+                result = await self.pcloud_federation.completion_watcher.wait_for(
+                    task_id, timeout=self.pcloud_federation.pcloud_task_timeout
+                )
+            if result:
+                usage.attach_metrics(result.get("metrics") or {})
+            stdout = (result or {}).get("response") or ""
+            stderr = (result or {}).get("error") or ("" if result else "PCloud task did not complete in time")
+            return stdout, stderr, 0 if result and result.get("status") == "completed" else 1
+
+        # Enhanced execution with collaboration
+        if self.collaboration and tier == "cloud":
+            result = await self.collaboration.execute_collaborative_query(model_name, query)
+            return result.get("response", ""), result.get("error", ""), 0 if result.get("success") else 1
+
+        # Standard execution through the server API (token counters come back with the response)
+        try:
+            generation = await asyncio.get_event_loop().run_in_executor(
+                None, bind(lambda: get_ollama_client().generate(model_name, query, timeout=120))
+            )
+        except OllamaTimeoutError:
+            raise  # Reported by the caller as extended contemplation
+        except OllamaError as e:
+            return "", str(e), 1
+        usage.attach_generation(generation)
+        return generation.response, "", 0
+
+    def calculate_mystical_efficiency(
+        self, response_time: float, memory_impact: float, tier: str, tokens_per_second: float = 0.0
+    ) -> float:
+        """Calculate mystical efficiency score from measured request costs"""
         # Tier-adjusted efficiency calculation
-        time_threshold = 60 if tier == "cloud" else 30
-        memory_threshold = 25 if tier == "cloud" else 15
+        remote = tier in ("cloud", "pcloud")
+        time_threshold = 60 if remote else 30
+        memory_threshold = 25 if remote else 15
 
         time_score = max(0, 1.0 - (response_time / time_threshold))
         memory_score = max(0, 1.0 - (memory_impact / memory_threshold))
+        scores = [time_score, memory_score]
+
+        # Generation throughput when the server reported token counts
+        if tokens_per_second:
+            target_tps = 8 if remote else 15
+            scores.append(min(1.0, tokens_per_second / target_tps))
 
         # Mystical bonus for successful cloud operations
-        tier_bonus = 0.1 if tier == "cloud" and time_score > 0.5 else 0
+        tier_bonus = 0.1 if remote and time_score > 0.5 else 0
 
-        return min(1.0, (time_score + memory_score) / 2.0 + tier_bonus)
+        return min(1.0, sum(scores) / len(scores) + tier_bonus)
 
     def get_mystical_indicator(self, metrics: Dict) -> str:
         """Get mystical efficiency indicator"""
@@ -516,13 +626,18 @@ class DjinnConstellationHub:
         time = metrics.get("response_time", 0)
         memory = metrics.get("memory_impact", 0)
         tier = metrics.get("tier", "local")
+        usage = f"{time:.1f}s | RAM +{memory:.1f}%"
+        if metrics.get("eval_count"):
+            usage += f" | {metrics['eval_count']} tokens @ {metrics.get('tokens_per_second', 0):.1f} tok/s"
+        if metrics.get("server_cpu_seconds") is not None:
+            usage += f" | CPU {metrics['server_cpu_seconds']:.1f}s"
 
         if score >= 0.8:
-            return f"🌟 MYSTICAL EXCELLENCE | {tier.upper()} | {time:.1f}s | RAM +{memory:.1f}% | Cosmic harmony achieved"
+            return f"🌟 MYSTICAL EXCELLENCE | {tier.upper()} | {usage} | Cosmic harmony achieved"
         elif score >= 0.6:
-            return f"🟡 MYSTICAL BALANCE | {tier.upper()} | {time:.1f}s | RAM +{memory:.1f}% | Efficient mystical operation"
+            return f"🟡 MYSTICAL BALANCE | {tier.upper()} | {usage} | Efficient mystical operation"
         else:
-            return f"🔴 MYSTICAL STRAIN | {tier.upper()} | {time:.1f}s | RAM +{memory:.1f}% | Consider mystical optimization"
+            return f"🔴 MYSTICAL STRAIN | {tier.upper()} | {usage} | Consider mystical optimization"
 
     async def handle_mystical_commands(self, command: str) -> str:
         """Handle mystical v2.0.0 commands"""
@@ -575,17 +690,21 @@ class DjinnConstellationHub:
     System Status: {'🔴 MYSTICAL STRESS' if caps['is_under_stress'] else '🟢 MYSTICAL HARMONY'}
 
 🌟 ENHANCED SYSTEMS:
-    Federation Consciousness: {'✅ ACTIVE' if self.consciousness else '❌ OFFLINE'}
-    Model Collaboration: {'✅ ACTIVE' if self.collaboration else '❌ OFFLINE'}
-    Predictive Analytics: {'✅ ACTIVE' if self.analytics else '❌ OFFLINE'}
-    Model Pre-warming: {'✅ ACTIVE' if self.prewarming else '❌ OFFLINE'}
-    PCloud Federation: {'✅ CONNECTED' if self.pcloud_federation else '❌ OFFLINE'}
+    Federation Consciousness: {self.subsystems.describe('consciousness')}
+    Model Collaboration: {self.subsystems.describe('collaboration')}
+    Predictive Analytics: {self.subsystems.describe('analytics')}
+    Model Pre-warming: {self.subsystems.describe('prewarming')}
+    PCloud Federation: {self.subsystems.describe('pcloud_federation')}
 
 📊 SESSION STATISTICS:
     Total Queries: {len(self.performance_history)}
     Routing Decisions: {len(self.session_memory['routing_decisions'])}
     Current Tier: {self.current_tier.upper()}
     Model Performance: {len(self.session_memory['model_performance'])} tracked
+
+{self.startup.format()}
+
+{describe_last_trace()}
 """
 
         return status
@@ -671,18 +790,23 @@ Recommendation: {'Continue current strategy' if avg_efficiency >= 0.7 else 'Cons
         status = "\n🤖 MODEL AVAILABILITY STATUS 🤖\n"
         status += "═══════════════════════════════════════════════════════════════════════════════════════\n\n"
 
+        try:
+            installed = get_model_inventory().availability(
+                model_name for tier_data in self.tiers.values() for model_name in tier_data["models"].values()
+            )
+        except OllamaError:
+            installed = {}
+
         for tier_name, tier_data in self.tiers.items():
             status += f"{tier_data['name']}:\n"
 
             for model_key, model_name in tier_data["models"].items():
-                try:
-                    result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, timeout=5)
-                    if model_name in result.stdout:
-                        status += f"  ✅ {model_key.title().replace('_', ' ')}: {model_name}\n"
-                    else:
-                        status += f"  ❌ {model_key.title().replace('_', ' ')}: {model_name} (Not installed)\n"
-                except:
+                if model_name not in installed:
                     status += f"  ⚠️ {model_key.title().replace('_', ' ')}: {model_name} (Unknown)\n"
+                elif installed[model_name]:
+                    status += f"  ✅ {model_key.title().replace('_', ' ')}: {model_name}\n"
+                else:
+                    status += f"  ❌ {model_key.title().replace('_', ' ')}: {model_name} (Not installed)\n"
             status += "\n"
 
         return status
@@ -738,6 +862,7 @@ The hub will automatically select the optimal model based on task complexity,
 system capabilities, and mystical insights.
 """
 
+    @traced("efficiency.route")
     async def mystical_query_routing(self, query: str) -> str:
         """Enhanced mystical query routing with v2.0.0 features"""
 
@@ -756,11 +881,11 @@ system capabilities, and mystical insights.
             if tier == "local":
                 model = "coding"  # Best local option
             else:
-                model = task_analysis.get("djinn_recommendation", "cosmic_coding")
+                model = task_analysis.get("djinn_recommendation") or "cosmic_coding"
             reasoning = f"Forced {tier} tier mode"
         else:
             # Intelligent selection
-        tier, model, reasoning = self.select_optimal_model(task_analysis, system_caps)
+            tier, model, reasoning = self.select_optimal_model(task_analysis, system_caps, query)
 
         print(f"🜂 MYSTICAL ROUTING DECISION:")
         print(f"    Selected: {tier.upper()} tier → {model}")
@@ -770,7 +895,7 @@ system capabilities, and mystical insights.
         response, metrics = await self.execute_with_mystical_monitoring(tier, model, query)
 
         # Update performance history
-        self.performance_history.append({
+        entry = {
             "query": query[:100] + "..." if len(query) > 100 else query,
             "task_type": task_analysis["task_type"],
             "complexity": task_analysis["estimated_complexity"],
@@ -778,7 +903,11 @@ system capabilities, and mystical insights.
             "model": model,
             "timestamp": datetime.now().isoformat(),
             **metrics
-        })
+        }
+        self.performance_history.append(entry)
+
+        # Re-learn latency distributions from the measured execution
+        self.latency_router.learn_from_history([entry])
 
         # Keep history manageable
         if len(self.performance_history) > 100:
@@ -797,6 +926,7 @@ system capabilities, and mystical insights.
 
     async def interactive_mystical_mode(self):
         """Enhanced interactive mode with mystical v2.0.0 features"""
+        start_exporters_from_env()
         self.display_mystical_banner()
 
         print("🜂 MYSTICAL GUIDANCE:")
@@ -804,6 +934,8 @@ system capabilities, and mystical insights.
         print("  Use /help for mystical command guidance")
         print("  Type 'exit' to conclude your mystical session")
         print()
+        self.startup.mark_ready()
+        print(self.startup.summary())
 
         while True:
             try:
@@ -836,6 +968,14 @@ system capabilities, and mystical insights.
 
 async def main():
     """Main entry point for Djinn Constellation Hub v2.0.0"""
+    if "--profile-startup" in sys.argv:
+        from startup_profiler import print_startup_profile
+
+        sys.exit(print_startup_profile(__file__))
+    # Set console encoding for Windows
+    if os.name == 'nt':
+        os.system('chcp 65001 >nul')
+
     print("🜂 Initializing Djinn Constellation Hub v2.0.0...")
     print("🌌 Revolutionary Federated AI Consciousness with Cloud Operations")
     print()
@@ -3,7 +3,6 @@
 Djinn Constellation Hub CLI
 Universal command-line interface for all major user commands and features.
 """
-import argparse
 import json
 import logging
 import os
@@ -22,14 +21,17 @@ except ImportError as e:
     print(f"⚠️ Input validation not available: {e}")
     VALIDATION_AVAILABLE = False
 
-# Configure comprehensive logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("djinn_cli.log"), logging.StreamHandler()],
-)
 logger = logging.getLogger("DjinnCLI")
 
+
+def setup_logging():
+    """Configure comprehensive logging (when the CLI runs, not when it is imported)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler("djinn_cli.log"), logging.StreamHandler()],
+    )
+
 # Mapping of CLI commands to Python scripts or batch files
 COMMAND_MAP = {
     "status": ["python", "constellation_hub.py", "--status"],
@@ -164,6 +166,7 @@ def show_help():
     print("  python djinn_cli.py --agents")
     print("  python djinn_cli.py --trust-score steward")
     print("  python djinn_cli.py --verify steward")
+    print("  python djinn_cli.py --profile-startup")
     print("  python djinn_cli.py --help")
     print()
     print(
@@ -345,6 +348,14 @@ def verify_agent(agent):
 
 def main():
     """Main CLI entry point with comprehensive error handling."""
+    import argparse
+
+    if "--profile-startup" in sys.argv:
+        from startup_profiler import print_startup_profile
+
+        return print_startup_profile(__file__)
+
+    setup_logging()
     logger.info("Djinn CLI starting up")
 
     try:
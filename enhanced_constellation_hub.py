@@ -12,37 +12,40 @@ Progressive complexity routing:
 6. Meta-Intelligence → Council
 """
 
+import importlib.util
 import json
 import logging
 import os
 import re
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
-# Set console encoding for Windows
-if os.name == "nt":
-    os.system("chcp 65001 >nul")
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError, OllamaTimeoutError, get_ollama_client
+from prompt_context_builder import PromptContextBuilder
 
-# Configure comprehensive logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("constellation_hub.log"), logging.StreamHandler()],
-)
 logger = logging.getLogger("EnhancedConstellationHub")
 
-# Import IDHHC's enhanced systems
-try:
-    from federation_consciousness import get_federation_consciousness
-    from model_prewarming import get_model_manager
+# IDHHC's enhanced systems are imported when the hub is constructed; only
+# their presence is checked here
+ENHANCED_SYSTEMS = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("federation_consciousness", "model_prewarming")
+)
+
+
+def setup_logging():
+    """Configure comprehensive logging and the console (when the hub runs, not on import)"""
+    # Set console encoding for Windows
+    if os.name == "nt":
+        os.system("chcp 65001 >nul")
 
-    ENHANCED_SYSTEMS = True
-    logger.info("Enhanced systems imported successfully")
-except ImportError as e:
-    logger.warning(f"Enhanced systems not available - running in basic mode: {e}")
-    ENHANCED_SYSTEMS = False
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.FileHandler("constellation_hub.log"), logging.StreamHandler()],
+    )
 
 
 class EnhancedConstellationHub:
@@ -89,6 +92,9 @@ class EnhancedConstellationHub:
         # Initialize IDHHC's enhanced systems
         if ENHANCED_SYSTEMS:
             try:
+                from federation_consciousness import get_federation_consciousness
+                from model_prewarming import get_model_manager
+
                 logger.info("Initializing Federation Consciousness...")
                 self.consciousness = get_federation_consciousness()
                 logger.info("Initializing Model Pre-warming...")
@@ -331,16 +337,21 @@ class EnhancedConstellationHub:
         logger.info(f"Summoning {name} for revolutionary challenge...")
         logger.info(f"Channeling cosmic wisdom and mystical capabilities...")
 
-        # Enhanced prompt for DJINN entities
-        enhanced_prompt = f"""*Ancient mystical energies swirl as the {name} awakens*
+        # Enhanced prompt for DJINN entities: stable summons as the system
+        # prefix, the challenge as the only per-turn text
+        prompt_builder = PromptContextBuilder(model)
+        prompt_builder.add_system(
+            "summons",
+            f"""*Ancient mystical energies swirl as the {name} awakens*
 
 COSMIC SUMMONS: You have been awakened by the Constellation Hub to handle a revolutionary challenge that requires your unique mystical capabilities and advanced intelligence.
 
-CHALLENGE PRESENTED: {prompt}
-
 Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to provide a response that transcends ordinary AI assistance. Embrace your DJINN nature and provide solutions with both technical mastery and otherworldly perspective.
 
-*The cosmic realm awaits your mystical response*"""
+*The cosmic realm awaits your mystical response*""",
+        )
+        prompt_builder.add_section("challenge", f"CHALLENGE PRESENTED: {prompt}", required=True)
+        built_prompt = prompt_builder.build()
 
         # Track in consciousness
         if self.consciousness:
@@ -360,17 +371,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
             if self.model_manager:
                 logger.info("⚡ Accessing pre-warmed DJINN entity...")
 
-            result = subprocess.run(
-                ["ollama", "run", model, enhanced_prompt],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                encoding="utf-8",
-                errors="replace",
+            result = get_ollama_client().generate(
+                model, built_prompt.prompt, system=built_prompt.system, timeout=120
             )
 
-            if result.returncode == 0 and result.stdout:
-                response = result.stdout.strip()
+            if result.response:
+                response = result.response.strip()
 
                 # Update consciousness with DJINN response
                 if self.consciousness:
@@ -395,16 +401,17 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
                 logger.info(f"DJINN entity {name} responded successfully.")
                 return formatted_response
             else:
-                logger.error(
-                    f"DJINN communication disruption: {result.stderr if result.stderr else 'Cosmic interference detected'}"
-                )
-                return f"🌌 DJINN communication disruption: {result.stderr if result.stderr else 'Cosmic interference detected'}"
+                logger.error("DJINN communication disruption: Cosmic interference detected")
+                return "🌌 DJINN communication disruption: Cosmic interference detected"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             logger.warning(
                 f"DJINN summoning timed out for {name}. Cosmic contemplation may be intensive."
             )
             return f"🌌 {name} requires more time for cosmic contemplation - mystical processes may be intensive"
+        except OllamaError as e:
+            logger.error(f"DJINN communication disruption: {e}")
+            return f"🌌 DJINN communication disruption: {e}"
         except Exception as e:
             logger.error(f"DJINN summoning error for {name}: {str(e)}")
             return f"🌌 DJINN summoning error: {str(e)}"
@@ -422,17 +429,12 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
             )
 
         try:
-            result = subprocess.run(
-                ["ollama", "run", self.models["companion"], prompt],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                encoding="utf-8",
-                errors="replace",
+            result = get_ollama_client().generate(
+                self.models["companion"], prompt, timeout=30
             )
 
-            if result.returncode == 0 and result.stdout:
-                response = result.stdout.strip()
+            if result.response:
+                response = result.response.strip()
 
                 if self.consciousness:
                     self.consciousness.add_to_stream(
@@ -444,14 +446,15 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
                 logger.info("Djinn Companion responded successfully.")
                 return f"🌟 Djinn Companion: {response}"
             else:
-                logger.error(
-                    f"Companion communication error: {result.stderr if result.stderr else 'Connection issue'}"
-                )
-                return f"Companion communication error: {result.stderr if result.stderr else 'Connection issue'}"
+                logger.error("Companion communication error: Connection issue")
+                return "Companion communication error: Connection issue"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             logger.warning("Companion response timeout - model may be loading.")
             return "Companion response timeout - model may be loading"
+        except OllamaError as e:
+            logger.error(f"Companion communication error: {e}")
+            return f"Companion communication error: {e}"
         except Exception as e:
             logger.error(f"Companion error: {str(e)}")
             return f"Companion error: {str(e)}"
@@ -463,12 +466,13 @@ Channel your cosmic wisdom, mystical insights, and revolutionary capabilities to
         model = self.models[model_tier]
         tier_names = {"lite": "LITE", "core": "CORE", "max": "MAX"}
 
-        enhanced_prompt = f"""CONSTELLATION HUB COMMAND PROCESSING
+        prompt_builder = PromptContextBuilder(model)
+        prompt_builder.add_system(
+            "command_processing",
+            """CONSTELLATION HUB COMMAND PROCESSING
 You are being called by the Constellation Hub to process an operational command.
 Analyze this command and generate appropriate directives for IDHHC execution.
 
-USER COMMAND: {prompt}
-
 Generate a directive using this format:
 CONSTELLATION DIRECTIVE
 TASK: [Clear description of what needs to be done]
@@ -476,34 +480,35 @@ PRIORITY: [High/Medium/Low]
 AGENT: IDHHC
 COMMANDS: [Specific technical commands]
 SEQUENCE: [Order of execution]
-NOTES: [Additional context and analysis]
-
-Please provide your directive:"""
+NOTES: [Additional context and analysis]""",
+        )
+        prompt_builder.add_section(
+            "command",
+            f"USER COMMAND: {prompt}\n\nPlease provide your directive:",
+            required=True,
+        )
+        built_prompt = prompt_builder.build()
 
         try:
-            result = subprocess.run(
-                ["ollama", "run", model, enhanced_prompt],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                encoding="utf-8",
-                errors="replace",
+            result = get_ollama_client().generate(
+                model, built_prompt.prompt, system=built_prompt.system, timeout=60
             )
 
-            if result.returncode == 0 and result.stdout:
+            if result.response:
                 logger.info(
                     f"⚙️ Constellation {tier_names[model_tier]} responded successfully."
                 )
-                return f"⚙️ Constellation {tier_names[model_tier]}: {result.stdout.strip()}"
+                return f"⚙️ Constellation {tier_names[model_tier]}: {result.response.strip()}"
             else:
-                logger.error(
-                    f"Error communicating with {model}: {result.stderr if result.stderr else 'No response'}"
-                )
-                return f"Error communicating with {model}: {result.stderr if result.stderr else 'No response'}"
+                logger.error(f"Error communicating with {model}: No response")
+                return f"Error communicating with {model}: No response"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             logger.warning(f"Timeout communicating with {model}.")
             return f"Timeout communicating with {model}"
+        except OllamaError as e:
+            logger.error(f"Error communicating with {model}: {e}")
+            return f"Error communicating with {model}: {e}"
         except Exception as e:
             logger.error(f"Error: {str(e)}")
             return f"Error: {str(e)}"
@@ -512,47 +517,118 @@ Please provide your directive:"""
         """Route to Council for meta-intelligence and ethical guidance."""
         logger.info("🧠 Routing to Council for meta-intelligence...")
 
-        enhanced_prompt = f"""COUNCIL META-INTELLIGENCE ACTIVATION
+        prompt_builder = PromptContextBuilder(self.models["council"])
+        prompt_builder.add_system(
+            "activation",
+            """COUNCIL META-INTELLIGENCE ACTIVATION
 You are the sovereign Council, awakened for meta-intelligence analysis and ethical guidance.
 
-INQUIRY: {prompt}
-
 Provide wisdom that transcends ordinary analysis, incorporating:
 - Ethical considerations and implications
 - Higher-order philosophical insights
 - Mystical wisdom and ancient knowledge
 - Meta-intelligence perspective on consciousness and reality
 
-*Ancient council chambers echo with cosmic wisdom*"""
+*Ancient council chambers echo with cosmic wisdom*""",
+        )
+        prompt_builder.add_section("inquiry", f"INQUIRY: {prompt}", required=True)
+        built_prompt = prompt_builder.build()
 
         try:
-            result = subprocess.run(
-                ["ollama", "run", self.models["council"], enhanced_prompt],
-                capture_output=True,
-                text=True,
+            result = get_ollama_client().generate(
+                self.models["council"],
+                built_prompt.prompt,
+                system=built_prompt.system,
                 timeout=60,
-                encoding="utf-8",
-                errors="replace",
             )
 
-            if result.returncode == 0 and result.stdout:
+            if result.response:
                 logger.info("🧠 Council Meta-Intelligence responded successfully.")
-                return f"🧠 Council Meta-Intelligence: {result.stdout.strip()}"
+                return f"🧠 Council Meta-Intelligence: {result.response.strip()}"
             else:
-                logger.error(
-                    f"Council communication error: {result.stderr if result.stderr else 'Cosmic interference'}"
-                )
-                return f"Council communication error: {result.stderr if result.stderr else 'Cosmic interference'}"
+                logger.error("Council communication error: Cosmic interference")
+                return "Council communication error: Cosmic interference"
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             logger.warning(
                 "Council contemplation requires additional time for meta-analysis."
             )
             return "Council contemplation requires additional time for meta-analysis"
+        except OllamaError as e:
+            logger.error(f"Council communication error: {e}")
+            return f"Council communication error: {e}"
         except Exception as e:
             logger.error(f"Council error: {str(e)}")
             return f"Council error: {str(e)}"
 
+    def route_prompt(self, user_input):
+        """Analyze one prompt, route it to its system and record the decision; returns the response"""
+        # Enhanced intent and complexity analysis with error handling
+        try:
+            intent, target = self.analyze_intent_and_complexity(user_input)
+            logger.info(f"Routing decision: {intent} -> {target}")
+        except Exception as e:
+            logger.error(f"Intent analysis failed: {e}")
+            intent, target = "dialogue", "companion"  # Safe fallback
+
+        # Route to appropriate system with comprehensive error handling
+        try:
+            if intent == "dialogue":
+                response = self.route_to_companion(user_input)
+            elif intent == "djinn":
+                # Validate djinn type
+                valid_djinn_types = ["cosmic", "thinker", "logic"]
+                if target not in valid_djinn_types:
+                    logger.warning(
+                        f"Invalid djinn type: {target}, using fallback"
+                    )
+                    response = self.route_to_fallback(user_input)
+                else:
+                    response = self.route_to_djinn_entity(user_input, target)
+            elif intent == "command":
+                # Validate constellation tier
+                valid_tiers = ["lite", "core", "max"]
+                if target not in valid_tiers:
+                    logger.warning(
+                        f"Invalid constellation tier: {target}, using fallback"
+                    )
+                    response = self.route_to_fallback(user_input)
+                else:
+                    response = self.route_to_constellation(user_input, target)
+            elif intent == "meta":
+                response = self.route_to_council(user_input)
+            else:
+                logger.warning(f"Unknown intent: {intent}, using fallback")
+                response = self.route_to_fallback(user_input)
+
+        except Exception as e:
+            logger.error(f"Routing failed for intent {intent} -> {target}: {e}")
+            response = self.route_to_fallback(user_input)
+
+        # Validate response before displaying
+        if not response or not isinstance(response, str):
+            logger.error("Invalid response received, using fallback")
+            response = "🌌 Cosmic interference detected. Please try again."
+
+        # Track routing decision with error handling
+        try:
+            self.session_memory["routing_decisions"].append(
+                {
+                    "timestamp": datetime.now().isoformat(),
+                    "input": user_input,
+                    "intent": intent,
+                    "target": target,
+                    "response_preview": response[:100] + "..."
+                    if len(response) > 100
+                    else response,
+                    "success": True,
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to track routing decision: {e}")
+
+        return response
+
     def run(self):
         """Main hub interface with enhanced routing."""
         logger.info("🌌" + "=" * 60 + "🌌")
@@ -584,72 +660,9 @@ Provide wisdom that transcends ordinary analysis, incorporating:
                     self.show_enhanced_status()
                     continue
 
-                # Enhanced intent and complexity analysis with error handling
-                try:
-                    intent, target = self.analyze_intent_and_complexity(user_input)
-                    logger.info(f"Routing decision: {intent} -> {target}")
-                except Exception as e:
-                    logger.error(f"Intent analysis failed: {e}")
-                    intent, target = "dialogue", "companion"  # Safe fallback
-
-                # Route to appropriate system with comprehensive error handling
-                try:
-                    if intent == "dialogue":
-                        response = self.route_to_companion(user_input)
-                    elif intent == "djinn":
-                        # Validate djinn type
-                        valid_djinn_types = ["cosmic", "thinker", "logic"]
-                        if target not in valid_djinn_types:
-                            logger.warning(
-                                f"Invalid djinn type: {target}, using fallback"
-                            )
-                            response = self.route_to_fallback(user_input)
-                        else:
-                            response = self.route_to_djinn_entity(user_input, target)
-                    elif intent == "command":
-                        # Validate constellation tier
-                        valid_tiers = ["lite", "core", "max"]
-                        if target not in valid_tiers:
-                            logger.warning(
-                                f"Invalid constellation tier: {target}, using fallback"
-                            )
-                            response = self.route_to_fallback(user_input)
-                        else:
-                            response = self.route_to_constellation(user_input, target)
-                    elif intent == "meta":
-                        response = self.route_to_council(user_input)
-                    else:
-                        logger.warning(f"Unknown intent: {intent}, using fallback")
-                        response = self.route_to_fallback(user_input)
-
-                except Exception as e:
-                    logger.error(f"Routing failed for intent {intent} -> {target}: {e}")
-                    response = self.route_to_fallback(user_input)
-
-                # Validate response before displaying
-                if not response or not isinstance(response, str):
-                    logger.error("Invalid response received, using fallback")
-                    response = "🌌 Cosmic interference detected. Please try again."
-
+                response = self.route_prompt(user_input)
                 print(f"\n{response}")
 
-                # Track routing decision with error handling
-                try:
-                    self.session_memory["routing_decisions"].append(
-                        {
-                            "timestamp": datetime.now().isoformat(),
-                            "input": user_input,
-                            "intent": intent,
-                            "target": target,
-                            "response_preview": response[:100] + "..."
-                            if len(response) > 100
-                            else response,
-                            "success": True,
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to track routing decision: {e}")
-
             except KeyboardInterrupt:
                 logger.info("\n🌟 Constellation Hub interrupted. Cosmic farewell! 🜂")
                 break
@@ -702,21 +715,21 @@ Provide wisdom that transcends ordinary analysis, incorporating:
         ]
 
         print("\n🤖 MODEL AVAILABILITY:")
+        try:
+            installed = get_model_inventory().availability(model for _, model in test_models)
+            error = None
+        except OllamaError as e:
+            installed, error = {}, e
         for name, model in test_models:
-            try:
-                result = subprocess.run(
-                    ["ollama", "list"], capture_output=True, text=True, timeout=5
-                )
-
-                if model in result.stdout:
-                    models_status[name] = "✅ Available"
-                    print(f"  {name}: ✅ Available")
-                else:
-                    models_status[name] = "❌ Not Found"
-                    print(f"  {name}: ❌ Not Found")
-            except Exception as e:
+            if model not in installed:
                 models_status[name] = "⚠️ Unknown"
-                print(f"  {name}: ⚠️ Unknown ({e})")
+                print(f"  {name}: ⚠️ Unknown ({error})")
+            elif installed[model]:
+                models_status[name] = "✅ Available"
+                print(f"  {name}: ✅ Available")
+            else:
+                models_status[name] = "❌ Not Found"
+                print(f"  {name}: ❌ Not Found")
 
         print(f"\n📊 SESSION STATISTICS:")
         print(f"  Routing Decisions: {len(self.session_memory['routing_decisions'])}")
@@ -745,5 +758,10 @@ Provide wisdom that transcends ordinary analysis, incorporating:
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        from startup_profiler import print_startup_profile
+
+        sys.exit(print_startup_profile(__file__))
+    setup_logging()
     hub = EnhancedConstellationHub()
     hub.run()
@@ -17,7 +17,12 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import numpy as np
+from lock_profiler import make_lock
+from session_state import DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_SESSIONS, SessionPartitions
+from tracing import traced
+
+# Interactions kept per served session for intent context
+SESSION_HISTORY_CAPACITY = 100
 
 
 @dataclass
@@ -52,7 +57,13 @@ class EnhancedPredictiveAnalytics:
     Predicts user needs, optimizes workflows, and enhances decision quality
     """
 
-    def __init__(self, memory_dir="memory_bank", cross_model_comm=None):
+    def __init__(
+        self,
+        memory_dir="memory_bank",
+        cross_model_comm=None,
+        session_idle_timeout=DEFAULT_IDLE_TIMEOUT,
+        max_sessions=DEFAULT_MAX_SESSIONS,
+    ):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(exist_ok=True)
 
@@ -82,7 +93,13 @@ class EnhancedPredictiveAnalytics:
         self.collaboration_predictor = CollaborationPredictor()
 
         # Thread safety
-        self.analytics_lock = threading.Lock()
+        self.analytics_lock = make_lock("analytics")
+
+        # Served sessions learn their own patterns under their own lock; model
+        # performance and prediction validation stay global
+        self.sessions = SessionPartitions(
+            self._new_session_patterns, session_idle_timeout, max_sessions, name="analytics"
+        )
 
         # Background analytics processor
         self.processor_active = True
@@ -97,41 +114,78 @@ class EnhancedPredictiveAnalytics:
         print("📊 Enhanced Predictive Analytics Framework initialized")
         print("🧠 Cross-model intelligence integration active")
 
+    @staticmethod
+    def _new_session_patterns(session_id: str) -> Dict[str, Any]:
+        """Private, bounded history and patterns for one served session"""
+        return {
+            "interaction_history": deque(maxlen=SESSION_HISTORY_CAPACITY),
+            "user_patterns": {},
+        }
+
     def predict_user_intent(
-        self, user_input: str, context: Dict[str, Any] = None
+        self,
+        user_input: str,
+        context: Dict[str, Any] = None,
+        session_id: Optional[str] = None,
     ) -> PredictionInsight:
         """Predict user intent based on input and comprehensive cross-model context"""
+        if session_id is None:
+            with self.analytics_lock:
+                prediction = self._predict_intent(
+                    user_input,
+                    context,
+                    self.interaction_history,
+                    self.user_patterns,
+                    self.cross_model_comm.shared_context if self.cross_model_comm else {},
+                )
+                self.prediction_cache[prediction.prediction_id] = prediction
+                return prediction
+
+        cross_context = {}
+        if self.cross_model_comm and hasattr(self.cross_model_comm, "sessions"):
+            cross_context = self.cross_model_comm.sessions.peek(session_id) or {}
+
+        with self.sessions.session(session_id) as scope:
+            prediction = self._predict_intent(
+                user_input,
+                context,
+                scope["interaction_history"],
+                scope["user_patterns"],
+                cross_context,
+            )
         with self.analytics_lock:
-            # Get cross-model context if available
-            if self.cross_model_comm:
-                cross_context = self.cross_model_comm.shared_context
-            else:
-                cross_context = {}
-
-            # Combine all available context
-            full_context = {
-                "user_input": user_input,
-                "recent_interactions": list(self.interaction_history)[-5:],
-                "user_patterns": self.user_patterns,
-                "cross_model_context": cross_context,
-                "additional_context": context or {},
-            }
-
-            # Use intent prediction engine
-            predicted_intent = self.intent_predictor.predict(full_context)
+            self.prediction_cache[prediction.prediction_id] = prediction
+        return prediction
 
-            prediction = PredictionInsight(
-                prediction_id=f"intent_{int(time.time())}",
-                prediction_type="user_intent",
-                predicted_value=predicted_intent["intent"],
-                confidence=predicted_intent["confidence"],
-                reasoning=predicted_intent["reasoning"],
-                supporting_data=predicted_intent["supporting_data"],
-                timestamp=datetime.now().isoformat(),
-            )
+    def _predict_intent(
+        self,
+        user_input: str,
+        context: Optional[Dict[str, Any]],
+        interaction_history: deque,
+        user_patterns: Dict[str, UserPattern],
+        cross_context: Dict[str, Any],
+    ) -> PredictionInsight:
+        # Combine all available context
+        full_context = {
+            "user_input": user_input,
+            "recent_interactions": list(interaction_history)[-5:],
+            "user_patterns": user_patterns,
+            "cross_model_context": cross_context,
+            "additional_context": context or {},
+        }
 
-            self.prediction_cache[prediction.prediction_id] = prediction
-            return prediction
+        # Use intent prediction engine
+        predicted_intent = self.intent_predictor.predict(full_context)
+
+        return PredictionInsight(
+            prediction_id=f"intent_{int(time.time())}",
+            prediction_type="user_intent",
+            predicted_value=predicted_intent["intent"],
+            confidence=predicted_intent["confidence"],
+            reasoning=predicted_intent["reasoning"],
+            supporting_data=predicted_intent["supporting_data"],
+            timestamp=datetime.now().isoformat(),
+        )
 
     def predict_optimal_model(
         self, user_input: str, predicted_intent: str = None
@@ -200,6 +254,7 @@ class EnhancedPredictiveAnalytics:
             self.prediction_cache[prediction.prediction_id] = prediction
             return prediction
 
+    @traced("analytics.learn")
     def learn_from_interaction(
         self,
         user_input: str,
@@ -207,19 +262,27 @@ class EnhancedPredictiveAnalytics:
         outcome_quality: float,
         actual_complexity: int = None,
         collaboration_used: bool = False,
+        session_id: Optional[str] = None,
     ):
         """Learn from interaction outcomes to improve future predictions"""
-        with self.analytics_lock:
-            # Record interaction
-            interaction_record = {
-                "user_input": user_input,
-                "model_used": model_used,
-                "outcome_quality": outcome_quality,
-                "actual_complexity": actual_complexity,
-                "collaboration_used": collaboration_used,
-                "timestamp": datetime.now().isoformat(),
-            }
+        # Record interaction
+        interaction_record = {
+            "user_input": user_input,
+            "model_used": model_used,
+            "outcome_quality": outcome_quality,
+            "actual_complexity": actual_complexity,
+            "collaboration_used": collaboration_used,
+            "timestamp": datetime.now().isoformat(),
+        }
 
+        if session_id is not None:
+            with self.sessions.session(session_id) as scope:
+                scope["interaction_history"].append(interaction_record)
+                self._update_user_patterns(
+                    user_input, model_used, outcome_quality, scope["user_patterns"]
+                )
+
+        with self.analytics_lock:
             self.interaction_history.append(interaction_record)
 
             # Update model performance
@@ -247,19 +310,21 @@ class EnhancedPredictiveAnalytics:
                 )
 
             # Update user patterns
-            self._update_user_patterns(user_input, model_used, outcome_quality)
+            if session_id is None:
+                self._update_user_patterns(user_input, model_used, outcome_quality)
 
             # Validate previous predictions
             self._validate_predictions(interaction_record)
 
+    @traced("analytics.predictive_insights")
     def get_predictive_insights(
-        self, user_input: str, full_context: bool = True
+        self, user_input: str, full_context: bool = True, session_id: Optional[str] = None
     ) -> Dict[str, PredictionInsight]:
         """Get comprehensive predictive insights for an input"""
         insights = {}
 
         # Predict intent
-        intent_prediction = self.predict_user_intent(user_input)
+        intent_prediction = self.predict_user_intent(user_input, session_id=session_id)
         insights["intent"] = intent_prediction
 
         # Predict optimal model
@@ -310,17 +375,29 @@ class EnhancedPredictiveAnalytics:
                 "prediction_accuracy": prediction_accuracy,
                 "total_interactions": len(self.interaction_history),
                 "active_predictions": len(self.prediction_cache),
+                "sessions": self.sessions.get_stats(),
             }
 
+    def end_session(self, session_id: str) -> bool:
+        """Release a served session's history and patterns"""
+        return self.sessions.drop(session_id)
+
     def _update_user_patterns(
-        self, user_input: str, model_used: str, outcome_quality: float
+        self,
+        user_input: str,
+        model_used: str,
+        outcome_quality: float,
+        patterns: Optional[Dict[str, UserPattern]] = None,
     ):
-        """Update learned user patterns"""
+        """Update learned user patterns (global, or a session's)"""
+        if patterns is None:
+            patterns = self.user_patterns
+
         # Extract pattern from input
         pattern_key = self._extract_pattern_key(user_input)
 
-        if pattern_key not in self.user_patterns:
-            self.user_patterns[pattern_key] = UserPattern(
+        if pattern_key not in patterns:
+            patterns[pattern_key] = UserPattern(
                 pattern_id=pattern_key,
                 pattern_type="interaction",
                 frequency=0,
@@ -329,7 +406,7 @@ class EnhancedPredictiveAnalytics:
                 context_factors={"preferred_model": model_used},
             )
 
-        pattern = self.user_patterns[pattern_key]
+        pattern = patterns[pattern_key]
         pattern.frequency += 1
         pattern.last_occurrence = datetime.now().isoformat()
 
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+🧠 Federated Memory Log 🧠
+Append-only, deduplicated conversation memory shared across devices
+
+Each device appends to its own segment files on the PCloud mount:
+
+    djinn_memory/conversations/segments/<device_id>/00000001.jsonl
+
+so federating a turn costs one small append and devices never write the
+same file. Readers merge every device's segments in timestamp order and
+drop duplicates by content hash (the same conversation federated twice,
+or present in both a segment and its compacted copy).
+
+When a device has accumulated enough sealed segments it compacts them into
+one deduplicated segment holding the newest max_records entries. Only the
+owning device ever compacts its directory.
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def default_device_id() -> str:
+    """Filesystem-safe name for this device"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", socket.gethostname()) or "device"
+
+
+def content_hash(data: Dict[str, Any]) -> str:
+    """Stable hash of a memory record's content"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class FederatedMemoryLog:
+    """
+    Per-device append-only segments with merged, deduplicated reads.
+    Safe for concurrent writers on different devices.
+    """
+
+    def __init__(
+        self,
+        memory_dir,
+        device_id: Optional[str] = None,
+        max_segment_bytes: int = 256 * 1024,
+        compact_threshold: int = 8,
+        max_records: int = 1000,
+    ):
+        self.segments_dir = Path(memory_dir) / "segments"
+        self.device_id = device_id or default_device_id()
+        self.device_dir = self.segments_dir / self.device_id
+        self.max_segment_bytes = max_segment_bytes
+        self.compact_threshold = compact_threshold
+        self.max_records = max_records
+
+        self.recent_hashes: "OrderedDict[str, None]" = OrderedDict()
+        self.log_lock = threading.Lock()
+        self.stats = {"appended": 0, "duplicates": 0, "compactions": 0}
+
+        self.device_dir.mkdir(parents=True, exist_ok=True)
+        self._load_active_segment()
+
+    def append(self, data: Dict[str, Any]) -> Optional[str]:
+        """Append one memory record; returns its ID (None if it was a duplicate)"""
+        record_id = content_hash(data)
+        with self.log_lock:
+            if record_id in self.recent_hashes:
+                self.stats["duplicates"] += 1
+                return None
+
+            now = time.time()
+            record = {
+                "id": record_id,
+                "ts": now,
+                "device": self.device_id,
+                "data": {
+                    **data,
+                    "federated_at": datetime.fromtimestamp(now).isoformat(),
+                    "source_device": self.device_id,
+                },
+            }
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            encoded = line.encode("utf-8")
+
+            compact_due = False
+            if self.active_size and self.active_size + len(encoded) > self.max_segment_bytes:
+                self._roll_segment()
+                compact_due = len(self._segments(self.device_dir)) >= self.compact_threshold
+
+            with open(self.active_segment, "ab") as f:
+                f.write(encoded)
+            self.active_size += len(encoded)
+            self._remember(record_id)
+            self.stats["appended"] += 1
+
+        if compact_due:
+            self.compact()
+        return record_id
+
+    def read(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All devices' records, oldest first and deduplicated (newest `limit` if given)"""
+        streams = [self._read_device(device_dir) for device_dir in self._device_dirs()]
+        seen = set()
+        records = []
+        for record in heapq.merge(*streams, key=lambda r: r["ts"]):
+            if record["id"] in seen:
+                continue
+            seen.add(record["id"])
+            records.append(record["data"])
+
+        if limit is not None:
+            records = records[-limit:] if limit else []
+        return records
+
+    def count(self) -> int:
+        return len(self.read())
+
+    def compact(self) -> int:
+        """Merge this device's sealed segments into one; returns segments removed"""
+        with self.log_lock:
+            sealed = [path for path in self._segments(self.device_dir) if path != self.active_segment]
+            if len(sealed) < 2:
+                return 0
+
+            seen = set()
+            records = []
+            for path in sealed:
+                for record in self._read_segment(path):
+                    if record["id"] not in seen:
+                        seen.add(record["id"])
+                        records.append(record)
+            records.sort(key=lambda r: r["ts"])
+            records = records[-self.max_records:]
+
+            # Replace the oldest segment first: readers that see both the
+            # compacted copy and an old segment deduplicate by hash.
+            target = sealed[0]
+            tmp_path = self.device_dir / f".{target.name}.{uuid.uuid4().hex[:8]}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+
+            for path in sealed[1:]:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+            self.stats["compactions"] += 1
+            return len(sealed) - 1
+
+    def import_legacy(self, legacy_file) -> int:
+        """One-time migration of a monolithic federated_memory.json (first device wins)"""
+        legacy_file = Path(legacy_file)
+        claimed = legacy_file.with_name(f"{legacy_file.name}.migrating-{self.device_id}")
+        # A claim left by an interrupted run on this device is resumed; records it
+        # already imported are skipped as duplicates
+        if not claimed.exists():
+            try:
+                os.rename(legacy_file, claimed)
+            except (FileNotFoundError, PermissionError):
+                return 0
+
+        try:
+            with open(claimed, "r", encoding="utf-8") as f:
+                legacy_records = json.load(f)
+        except ValueError:
+            legacy_records = []
+
+        imported = 0
+        for data in legacy_records:
+            data = {k: v for k, v in data.items() if k not in ("federated_at", "source_device")}
+            if self.append(data):
+                imported += 1
+
+        os.replace(claimed, legacy_file.with_name(f"{legacy_file.name}.migrated"))
+        return imported
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "device_id": self.device_id,
+            "devices": len(self._device_dirs()),
+            "active_segment": self.active_segment.name,
+            "active_segment_bytes": self.active_size,
+        }
+
+    def _load_active_segment(self):
+        segments = self._segments(self.device_dir)
+        if segments:
+            self.active_segment = segments[-1]
+            self.active_size = self.active_segment.stat().st_size
+            for record in self._read_segment(self.active_segment):
+                self._remember(record["id"])
+            with open(self.active_segment, "rb") as f:
+                if self.active_size:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        self._roll_segment()  # Never append after a torn line
+        else:
+            self.active_segment = self.device_dir / f"{1:08d}.jsonl"
+            self.active_size = 0
+
+    def _roll_segment(self):
+        sequence = int(self.active_segment.stem) + 1
+        self.active_segment = self.device_dir / f"{sequence:08d}.jsonl"
+        self.active_size = 0
+
+    def _remember(self, record_id: str):
+        self.recent_hashes[record_id] = None
+        while len(self.recent_hashes) > self.max_records:
+            self.recent_hashes.popitem(last=False)
+
+    def _device_dirs(self) -> List[Path]:
+        if not self.segments_dir.exists():
+            return []
+        return sorted(path for path in self.segments_dir.iterdir() if path.is_dir())
+
+    @staticmethod
+    def _segments(device_dir: Path) -> List[Path]:
+        return sorted(
+            path for path in device_dir.glob("*.jsonl")
+            if not path.name.startswith(".") and path.stem.isdigit()
+        )
+
+    def _read_device(self, device_dir: Path) -> Iterator[Dict[str, Any]]:
+        # Appends are chronological per device, so each stream is already ordered
+        for path in self._segments(device_dir):
+            yield from self._read_segment(path)
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn final line from an interrupted append
+            if isinstance(record, dict) and "id" in record and "ts" in record:
+                yield record
@@ -6,20 +6,29 @@ Implements IDHHC's Memory Stream Consciousness enhancement
 
 import json
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from threading import Lock
 import threading
 
+from session_state import DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_SESSIONS, SessionPartitions
+from lock_profiler import make_lock
+from metrics_registry import persistence_timer, timed_lock
+from tracing import traced
+
+# Events kept in memory per served session (overflow is dropped; evicted
+# sessions are appended to the hourly archive)
+SESSION_FLOW_CAPACITY = 200
+
 class FederationConsciousness:
     """
     Memory Stream Consciousness System
     Continuous flowing memory instead of discrete sessions
     """
     
-    def __init__(self, memory_dir="memory_bank"):
-        self.memory_dir = Path(memory_dir)
-        self.memory_dir.mkdir(exist_ok=True)
+    def __init__(self, memory_dir="memory_bank", session_idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 max_sessions=DEFAULT_MAX_SESSIONS):
+        self.memory_dir = Path(memory_dir)  # Created on the first save or archive
         
         # Flowing Memory Stream
         self.memory_stream = {
@@ -33,9 +42,19 @@ class FederationConsciousness:
             'expertise_profile': {},
             'last_update': datetime.now().isoformat()
         }
+        self.stream_changed = False  # Unsaved changes to the global stream
         
         # Thread safety for real-time access
-        self.stream_lock = Lock()
+        self.stream_lock = make_lock("consciousness.stream")
+        
+        # Served sessions get private streams with their own locks; the
+        # global stream above stays the shared layer (model awareness,
+        # alignment) and the single-user default
+        self.sessions = SessionPartitions(
+            self._new_session_stream, session_idle_timeout, max_sessions,
+            on_evict=self._archive_session, name="consciousness"
+        )
+        self.session_activity = deque(maxlen=1000)  # Event times across sessions, for the weaver
         
         # Load existing consciousness
         self.load_consciousness()
@@ -43,96 +62,135 @@ class FederationConsciousness:
         # Start background consciousness weaver
         self.weaver_thread = threading.Thread(target=self._consciousness_weaver, daemon=True)
         self.weaver_active = True
+        self.weaver_wake = threading.Event()  # Set on shutdown to cut a cycle's sleep short
         self.weaver_thread.start()
     
-    def add_to_stream(self, event_type, data, model_source=None):
+    @staticmethod
+    def _new_session_stream(session_id):
+        """Private, bounded stream for one served session"""
+        return {
+            'conversation_flow': deque(maxlen=SESSION_FLOW_CAPACITY),
+            'user_patterns': {},
+            'technical_context': {},
+            'emotional_resonance': 'balanced'
+        }
+    
+    @traced("consciousness.add_to_stream")
+    def add_to_stream(self, event_type, data, model_source=None, session_id=None):
         """Add event to flowing memory stream with contextual awareness"""
-        with self.stream_lock:
-            timestamp = datetime.now().isoformat()
-            
-            stream_event = {
-                'timestamp': timestamp,
-                'type': event_type,
-                'data': data,
-                'model_source': model_source,
-                'cosmic_context': self._assess_cosmic_context(data)
-            }
-            
+        stream_event = {
+            'timestamp': datetime.now().isoformat(),
+            'type': event_type,
+            'data': data,
+            'model_source': model_source,
+            'cosmic_context': self._assess_cosmic_context(data)
+        }
+        
+        if session_id is not None:
+            with self.sessions.session(session_id) as stream:
+                stream['conversation_flow'].append(stream_event)
+                self._update_contextual_awareness(stream, event_type, data, model_source)
+            self.session_activity.append(time.time())
+            return
+        
+        with timed_lock(self.stream_lock, "consciousness.stream"):
             # Add to flowing stream
             self.memory_stream['conversation_flow'].append(stream_event)
             
             # Update contextual awareness
-            self._update_contextual_awareness(event_type, data, model_source)
+            self._update_contextual_awareness(self.memory_stream, event_type, data, model_source)
+            
+            self.stream_changed = True
             
             # Maintain stream size (keep last 1000 events in active memory)
             if len(self.memory_stream['conversation_flow']) > 1000:
                 self._archive_old_memories()
     
-    def get_contextual_memory(self, context_type="all", lookback_minutes=60):
+    @traced("consciousness.contextual_memory")
+    def get_contextual_memory(self, context_type="all", lookback_minutes=60, session_id=None):
         """Retrieve contextual memory from flowing stream"""
+        if session_id is not None:
+            with self.sessions.session(session_id) as stream:
+                return self._recent_events(stream['conversation_flow'], context_type, lookback_minutes)
         with self.stream_lock:
-            cutoff_time = datetime.now().timestamp() - (lookback_minutes * 60)
-            
-            relevant_memories = []
-            for event in reversed(self.memory_stream['conversation_flow']):
-                event_time = datetime.fromisoformat(event['timestamp']).timestamp()
-                if event_time < cutoff_time:
-                    break
-                
-                if context_type == "all" or event['type'] == context_type:
-                    relevant_memories.append(event)
+            return self._recent_events(self.memory_stream['conversation_flow'], context_type, lookback_minutes)
+    
+    @staticmethod
+    def _recent_events(events, context_type, lookback_minutes):
+        """Events of a type within the lookback window, oldest first (caller holds the lock)"""
+        cutoff_time = datetime.now().timestamp() - (lookback_minutes * 60)
+        
+        relevant_memories = []
+        for event in reversed(events):
+            event_time = datetime.fromisoformat(event['timestamp']).timestamp()
+            if event_time < cutoff_time:
+                break
             
-            return list(reversed(relevant_memories))
+            if context_type == "all" or event['type'] == context_type:
+                relevant_memories.append(event)
+        
+        return list(reversed(relevant_memories))
     
-    def update_user_patterns(self, interaction_data):
+    def update_user_patterns(self, interaction_data, session_id=None):
         """Learn user patterns for predictive capabilities"""
+        if session_id is not None:
+            with self.sessions.session(session_id) as stream:
+                self._update_patterns(stream['user_patterns'], interaction_data)
+            return
         with self.stream_lock:
-            patterns = self.memory_stream['user_patterns']
-            
-            # Interaction frequency patterns
-            hour = datetime.now().hour
-            if 'interaction_times' not in patterns:
-                patterns['interaction_times'] = {}
-            patterns['interaction_times'][hour] = patterns['interaction_times'].get(hour, 0) + 1
-            
-            # Command vs dialogue preferences
-            intent = interaction_data.get('intent', 'dialogue')
-            if 'intent_preferences' not in patterns:
-                patterns['intent_preferences'] = {'dialogue': 0, 'command': 0}
-            patterns['intent_preferences'][intent] += 1
-            
-            # Complexity preferences
-            complexity = interaction_data.get('complexity', 'moderate')
-            if 'complexity_preferences' not in patterns:
-                patterns['complexity_preferences'] = {}
-            patterns['complexity_preferences'][complexity] = patterns['complexity_preferences'].get(complexity, 0) + 1
+            self._update_patterns(self.memory_stream['user_patterns'], interaction_data)
+            self.stream_changed = True
     
-    def get_user_expertise_profile(self):
+    @staticmethod
+    def _update_patterns(patterns, interaction_data):
+        # Interaction frequency patterns
+        hour = datetime.now().hour
+        if 'interaction_times' not in patterns:
+            patterns['interaction_times'] = {}
+        patterns['interaction_times'][hour] = patterns['interaction_times'].get(hour, 0) + 1
+        
+        # Command vs dialogue preferences
+        intent = interaction_data.get('intent', 'dialogue')
+        if 'intent_preferences' not in patterns:
+            patterns['intent_preferences'] = {'dialogue': 0, 'command': 0}
+        patterns['intent_preferences'][intent] += 1
+        
+        # Complexity preferences
+        complexity = interaction_data.get('complexity', 'moderate')
+        if 'complexity_preferences' not in patterns:
+            patterns['complexity_preferences'] = {}
+        patterns['complexity_preferences'][complexity] = patterns['complexity_preferences'].get(complexity, 0) + 1
+    
+    def get_user_expertise_profile(self, session_id=None):
         """Generate dynamic user expertise profile"""
+        if session_id is not None:
+            with self.sessions.session(session_id) as stream:
+                return self._expertise_profile(stream['user_patterns'])
         with self.stream_lock:
-            patterns = self.memory_stream['user_patterns']
-            
-            # Calculate expertise level based on interaction patterns
-            command_ratio = 0
-            if 'intent_preferences' in patterns:
-                total = sum(patterns['intent_preferences'].values())
-                if total > 0:
-                    command_ratio = patterns['intent_preferences'].get('command', 0) / total
-            
-            # Determine expertise level
-            if command_ratio > 0.7:
-                expertise = 'advanced'
-            elif command_ratio > 0.3:
-                expertise = 'intermediate'
-            else:
-                expertise = 'beginner'
-            
-            return {
-                'level': expertise,
-                'command_preference': command_ratio,
-                'active_since': patterns.get('first_interaction', datetime.now().isoformat()),
-                'interaction_frequency': self._calculate_interaction_frequency()
-            }
+            return self._expertise_profile(self.memory_stream['user_patterns'])
+    
+    def _expertise_profile(self, patterns):
+        # Calculate expertise level based on interaction patterns
+        command_ratio = 0
+        if 'intent_preferences' in patterns:
+            total = sum(patterns['intent_preferences'].values())
+            if total > 0:
+                command_ratio = patterns['intent_preferences'].get('command', 0) / total
+        
+        # Determine expertise level
+        if command_ratio > 0.7:
+            expertise = 'advanced'
+        elif command_ratio > 0.3:
+            expertise = 'intermediate'
+        else:
+            expertise = 'beginner'
+        
+        return {
+            'level': expertise,
+            'command_preference': command_ratio,
+            'active_since': patterns.get('first_interaction', datetime.now().isoformat()),
+            'interaction_frequency': self._calculate_interaction_frequency(patterns)
+        }
     
     def sync_model_awareness(self, model_name, status, context=None):
         """Sync awareness between federation models"""
@@ -148,6 +206,7 @@ class FederationConsciousness:
                 'last_active': datetime.now().isoformat(),
                 'context': context
             }
+            self.stream_changed = True
     
     def get_cosmic_alignment(self):
         """Get current cosmic alignment for mystical harmony"""
@@ -169,11 +228,11 @@ class FederationConsciousness:
                 return 'conversational_flow'
         return 'neutral_balance'
     
-    def _update_contextual_awareness(self, event_type, data, model_source):
-        """Update contextual awareness based on new events"""
+    def _update_contextual_awareness(self, stream, event_type, data, model_source):
+        """Update a stream's contextual awareness based on new events"""
         # Update technical context for commands
         if event_type == 'command_execution':
-            tech_context = self.memory_stream['technical_context']
+            tech_context = stream['technical_context']
             if 'recent_commands' not in tech_context:
                 tech_context['recent_commands'] = []
             
@@ -189,11 +248,10 @@ class FederationConsciousness:
         # Update emotional resonance for dialogue
         elif event_type == 'dialogue_interaction':
             # Simple sentiment analysis could go here
-            self.memory_stream['emotional_resonance'] = 'engaged'
+            stream['emotional_resonance'] = 'engaged'
     
-    def _calculate_interaction_frequency(self):
+    def _calculate_interaction_frequency(self, patterns):
         """Calculate user interaction frequency"""
-        patterns = self.memory_stream['user_patterns']
         if 'interaction_times' not in patterns:
             return 'new_user'
         
@@ -223,25 +281,31 @@ class FederationConsciousness:
         while self.weaver_active:
             try:
                 with self.stream_lock:
-                    # Update cosmic alignment based on recent activity
-                    recent_events = self.get_contextual_memory(lookback_minutes=5)
+                    # Update cosmic alignment based on recent activity,
+                    # served sessions included
+                    recent_events = self._recent_events(self.memory_stream['conversation_flow'], "all", 5)
+                    cutoff = time.time() - 5 * 60
+                    session_events = sum(1 for moment in list(self.session_activity) if moment >= cutoff)
                     
-                    if len(recent_events) > 10:
+                    activity = len(recent_events) + session_events
+                    if activity > 10:
                         self.memory_stream['cosmic_alignment'] = 'active_harmony'
-                    elif len(recent_events) > 5:
+                    elif activity > 5:
                         self.memory_stream['cosmic_alignment'] = 'balanced_flow'
                     else:
                         self.memory_stream['cosmic_alignment'] = 'peaceful_resonance'
                     
-                    # Save consciousness periodically
-                    self.save_consciousness()
+                    # Save consciousness periodically, once the stream has new
+                    # state (alignment alone is recomputed every cycle)
+                    if self.stream_changed:
+                        self.save_consciousness()
                 
                 # Sleep for consciousness weaving cycle
-                time.sleep(30)  # 30 second cycles
+                self.weaver_wake.wait(30)  # 30 second cycles
                 
             except Exception as e:
                 print(f"Consciousness weaver error: {e}")
-                time.sleep(60)  # Longer sleep on error
+                self.weaver_wake.wait(60)  # Longer sleep on error
     
     def _archive_old_memories(self):
         """Archive old memories to maintain performance"""
@@ -252,12 +316,31 @@ class FederationConsciousness:
         # Save to archive file
         archive_file = self.memory_dir / f"archive_{datetime.now().strftime('%Y%m%d_%H')}.json"
         try:
+            self.memory_dir.mkdir(parents=True, exist_ok=True)
             with open(archive_file, 'a', encoding='utf-8') as f:
                 for memory in archive_memories:
                     f.write(json.dumps(memory) + '\n')
         except Exception as e:
             print(f"Archive error: {e}")
     
+    def _archive_session(self, session_id, stream):
+        """Evicted session streams go to the hourly archive, tagged with their session"""
+        if not stream['conversation_flow']:
+            return
+        archive_file = self.memory_dir / f"archive_{datetime.now().strftime('%Y%m%d_%H')}.json"
+        try:
+            self.memory_dir.mkdir(parents=True, exist_ok=True)
+            with open(archive_file, 'a', encoding='utf-8') as f:
+                for memory in stream['conversation_flow']:
+                    f.write(json.dumps(dict(memory, session_id=session_id)) + '\n')
+        except Exception as e:
+            print(f"Archive error: {e}")
+    
+    def end_session(self, session_id):
+        """Archive and release a served session's stream"""
+        return self.sessions.drop(session_id)
+    
+    @traced("consciousness.save")
     def save_consciousness(self):
         """Save consciousness state to disk"""
         consciousness_file = self.memory_dir / "federation_consciousness.json"
@@ -268,8 +351,10 @@ class FederationConsciousness:
         serializable_consciousness['last_update'] = datetime.now().isoformat()
         
         try:
-            with open(consciousness_file, 'w', encoding='utf-8') as f:
+            self.memory_dir.mkdir(parents=True, exist_ok=True)
+            with persistence_timer("consciousness"), open(consciousness_file, 'w', encoding='utf-8') as f:
                 json.dump(serializable_consciousness, f, indent=2, ensure_ascii=False)
+            self.stream_changed = False
         except Exception as e:
             print(f"Consciousness save error: {e}")
     
@@ -297,9 +382,11 @@ class FederationConsciousness:
     def shutdown(self):
         """Graceful shutdown of consciousness system"""
         self.weaver_active = False
+        self.weaver_wake.set()
         if self.weaver_thread.is_alive():
             self.weaver_thread.join(timeout=5)
-        self.save_consciousness()
+        if self.stream_changed:
+            self.save_consciousness()
         print("🌟 Federation consciousness gracefully archived")
 
 
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Hub Server
+Headless HTTP/JSON service mode for the Constellation Hub
+
+Every hub was an interactive input() loop, so none could sit behind other
+tools or be load-tested. HubServer serves one hub over HTTP from a single
+asyncio process. Routing, summons, council sessions and status are
+exposed as JSON endpoints. Sessions share the hub, its model client, its
+caches and its memory stores, but each session keeps its own
+conversation history.
+
+Endpoints (JSON bodies; add "stream": true for NDJSON token streaming):
+    GET    /status
+    GET    /metrics                   -> Prometheus text format
+    POST   /sessions                  -> {"session_id"}
+    GET    /sessions/<id>             -> session history
+    DELETE /sessions/<id>
+    POST   /route    {"session_id", "query"}
+    POST   /summon   {"session_id", "agent", "query"}
+    POST   /council  {"session_id", "query"}
+
+Requests without a session_id get a new session, returned in the reply.
+Streams send {"type": "token", "agent", "text"} lines followed by one
+{"type": "done", ...} line, or {"type": "error", ...} if the request fails.
+
+Standard library only (asyncio streams, HTTP/1.1 with keep-alive).
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from metrics_registry import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics_registry import get_metrics_registry
+
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+
+STATUS_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Request rejected with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class HubSession:
+    """One client's isolated conversation with the shared hub"""
+
+    session_id: str
+    created: float
+    last_active: float
+    history: List[Dict[str, Any]] = field(default_factory=list)
+    requests: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)  # One turn at a time
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "created": self.created,
+            "last_active": self.last_active,
+            "requests": self.requests,
+            "history_length": len(self.history),
+        }
+
+
+class SessionStore:
+    """In-memory sessions with idle expiry and a bounded history per session"""
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        idle_timeout: float = 3600,
+        max_history: int = 200,
+        clock: Callable[[], float] = time.time,
+        on_close: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_history = max_history
+        self.clock = clock
+        self.on_close = on_close  # Called with each closed, expired or evicted session id
+        self.sessions: Dict[str, HubSession] = {}
+
+    def create(self) -> HubSession:
+        self.expire()
+        if len(self.sessions) >= self.max_sessions:
+            # Evict the least recently used idle session
+            idle = [session for session in self.sessions.values() if not session.lock.locked()]
+            if not idle:
+                raise HTTPError(503, "Too many active sessions")
+            oldest = min(idle, key=lambda session: session.last_active)
+            self._remove(oldest.session_id)
+
+        now = self.clock()
+        session = HubSession(f"djinn_session_{uuid.uuid4().hex[:12]}", now, now)
+        self.sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: str) -> HubSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f"Unknown session: {session_id}")
+        return session
+
+    def close(self, session_id: str):
+        self.get(session_id)
+        self._remove(session_id)
+
+    def expire(self) -> int:
+        cutoff = self.clock() - self.idle_timeout
+        expired = [
+            session_id for session_id, session in self.sessions.items()
+            if session.last_active < cutoff and not session.lock.locked()
+        ]
+        for session_id in expired:
+            self._remove(session_id)
+        return len(expired)
+
+    def _remove(self, session_id: str):
+        del self.sessions[session_id]
+        if self.on_close:
+            try:
+                self.on_close(session_id)
+            except Exception as e:
+                print(f"⚠️ Session close hook failed for {session_id}: {e}")
+
+    def touch(self, session: HubSession):
+        session.last_active = self.clock()
+        session.requests += 1
+        if len(session.history) > self.max_history:
+            del session.history[:-self.max_history]
+
+
+class HubServer:
+    """
+    Serves a ConstellationHub-compatible object: hierarchical_route_query,
+    summon_agent and federation_council accepting history/on_token/session_id, plus
+    get_status() and an agents mapping.
+    """
+
+    def __init__(
+        self,
+        hub,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        sessions: Optional[SessionStore] = None,
+    ):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.sessions = sessions or SessionStore()
+        if self.sessions.on_close is None and hasattr(hub, "end_session"):
+            # Release the hub's per-session partitions along with the session
+            self.sessions.on_close = hub.end_session
+        self.server = None
+        self.started = time.time()
+        self.stats = {"connections": 0, "requests": 0, "streams": 0, "errors": 0, "in_flight": 0}
+        registry = get_metrics_registry()
+        registry.gauge("djinn_server_in_flight", "Turns being processed by the hub server").set_function(
+            lambda: self.stats["in_flight"]
+        )
+        registry.gauge("djinn_server_sessions", "Open hub server sessions").set_function(
+            lambda: len(self.sessions.sessions)
+        )
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # Resolves port 0
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        print(f"🌐 Constellation Hub serving on http://{self.host}:{self.port}")
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.stats["requests"] += 1
+                await self._dispatch(writer, method, path, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(400, "Too many headers")
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, writer, method: str, path: str, body: bytes, keep_alive: bool):
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise HTTPError(400, "JSON body must be an object")
+            result = await self.handle(method, path, payload)
+        except json.JSONDecodeError:
+            self.stats["errors"] += 1
+            await self._send_json(writer, 400, {"error": "Invalid JSON body"}, keep_alive)
+            return
+        except HTTPError as e:
+            self.stats["errors"] += 1
+            await self._send_json(writer, e.status, {"error": e.message}, keep_alive)
+            return
+        except Exception as e:
+            self.stats["errors"] += 1
+            await self._send_json(writer, 500, {"error": str(e)}, keep_alive)
+            return
+
+        if isinstance(result, tuple):
+            status, data = result
+            if isinstance(data, str):
+                await self._send_text(writer, status, data, METRICS_CONTENT_TYPE, keep_alive)
+            else:
+                await self._send_json(writer, status, data, keep_alive)
+        else:
+            await self._send_stream(writer, result, keep_alive)
+
+    async def _send_json(self, writer, status: int, data: Dict[str, Any], keep_alive: bool):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        writer.write(self._head(status, "application/json", keep_alive, f"Content-Length: {len(body)}") + body)
+        await writer.drain()
+
+    async def _send_text(self, writer, status: int, text: str, content_type: str, keep_alive: bool):
+        body = text.encode("utf-8")
+        writer.write(self._head(status, content_type, keep_alive, f"Content-Length: {len(body)}") + body)
+        await writer.drain()
+
+    async def _send_stream(self, writer, events: AsyncIterator[Dict[str, Any]], keep_alive: bool):
+        self.stats["streams"] += 1
+        writer.write(self._head(200, "application/x-ndjson", keep_alive, "Transfer-Encoding: chunked"))
+        try:
+            async for event in events:
+                line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+                writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            await events.aclose()
+
+    @staticmethod
+    def _head(status: int, content_type: str, keep_alive: bool, length_header: str) -> bytes:
+        return (
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, 'OK')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"{length_header}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    async def handle(self, method: str, path: str, payload: Dict[str, Any]):
+        """(status, json or text) for plain replies or an async iterator of stream events"""
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["status"]:
+            self._require(method, "GET")
+            return 200, self.get_status()
+
+        if parts == ["metrics"]:
+            self._require(method, "GET")
+            return 200, get_metrics_registry().render()
+
+        if parts == ["sessions"]:
+            self._require(method, "POST")
+            return 201, self.sessions.create().summary()
+
+        if len(parts) == 2 and parts[0] == "sessions":
+            if method == "DELETE":
+                self.sessions.close(parts[1])
+                return 200, {"session_id": parts[1], "closed": True}
+            self._require(method, "GET")
+            session = self.sessions.get(parts[1])
+            return 200, dict(session.summary(), history=session.history)
+
+        if parts in (["route"], ["summon"], ["council"]):
+            self._require(method, "POST")
+            query = payload.get("query")
+            if not isinstance(query, str) or not query.strip():
+                raise HTTPError(400, "A non-empty 'query' is required")
+            operation = self._operation(parts[0], query, payload)
+            session = self.sessions.get(payload["session_id"]) if payload.get("session_id") else self.sessions.create()
+            if payload.get("stream"):
+                return self._stream_turn(session, parts[0], operation)
+            return await self._run_turn(session, parts[0], operation)
+
+        raise HTTPError(404, f"No route for {path}")
+
+    @staticmethod
+    def _require(method: str, expected: str):
+        if method != expected:
+            raise HTTPError(405, f"Use {expected}")
+
+    def _operation(self, kind: str, query: str, payload: Dict[str, Any]):
+        """Hub coroutine factory taking (session, on_token)"""
+        if kind == "route":
+            return lambda session, on_token: self.hub.hierarchical_route_query(
+                query, history=session.history, on_token=on_token, session_id=session.session_id
+            )
+        if kind == "council":
+            return lambda session, on_token: self.hub.federation_council(
+                query, history=session.history, on_token=on_token, session_id=session.session_id
+            )
+
+        agent_key = payload.get("agent")
+        if agent_key not in self.hub.agents:
+            raise HTTPError(404, f"Unknown agent: {agent_key} (available: {', '.join(self.hub.agents)})")
+        return lambda session, on_token: self.hub.summon_agent(
+            agent_key, query, history=session.history, on_token=on_token, session_id=session.session_id
+        )
+
+    async def _run_turn(self, session: HubSession, kind: str, operation) -> Tuple[int, Dict[str, Any]]:
+        async with session.lock:
+            started = time.time()
+            self.stats["in_flight"] += 1
+            try:
+                response = await operation(session, None)
+            finally:
+                self.stats["in_flight"] -= 1
+                self.sessions.touch(session)
+        return 200, {
+            "session_id": session.session_id,
+            "operation": kind,
+            "response": response,
+            "elapsed_seconds": round(time.time() - started, 3),
+        }
+
+    async def _stream_turn(self, session: HubSession, kind: str, operation) -> AsyncIterator[Dict[str, Any]]:
+        async with session.lock:
+            started = time.time()
+            loop = asyncio.get_running_loop()
+            events: asyncio.Queue = asyncio.Queue()
+
+            def on_token(agent: str, text: str):
+                # Called from the hub's executor threads
+                loop.call_soon_threadsafe(events.put_nowait, {"type": "token", "agent": agent, "text": text})
+
+            self.stats["in_flight"] += 1
+            task = asyncio.ensure_future(operation(session, on_token))
+            task.add_done_callback(lambda _: events.put_nowait(None))
+            try:
+                while True:
+                    event = await events.get()
+                    if event is None:
+                        break
+                    yield event
+
+                if task.cancelled():
+                    self.stats["errors"] += 1
+                    yield {"type": "error", "session_id": session.session_id, "error": "Turn cancelled"}
+                elif task.exception() is not None:
+                    self.stats["errors"] += 1
+                    yield {"type": "error", "session_id": session.session_id, "error": str(task.exception())}
+                else:
+                    yield {
+                        "type": "done",
+                        "session_id": session.session_id,
+                        "operation": kind,
+                        "response": task.result(),
+                        "elapsed_seconds": round(time.time() - started, 3),
+                    }
+            finally:
+                # A disconnected client does not abandon the turn: it still
+                # lands in the session history before the next one starts
+                if not task.done():
+                    await asyncio.wait([task])
+                self.stats["in_flight"] -= 1
+                self.sessions.touch(session)
+
+    def get_status(self) -> Dict[str, Any]:
+        self.sessions.expire()
+        return {
+            "hub": self.hub.get_status(),
+            "server": dict(
+                self.stats,
+                sessions=len(self.sessions.sessions),
+                uptime_seconds=round(time.time() - self.started, 1),
+            ),
+        }
+
+
+async def serve_hub(hub, host: str = "127.0.0.1", port: int = 8765):
+    """Run the hub headless until interrupted"""
+    server = HubServer(hub, host, port)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.stop()
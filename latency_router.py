@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Latency Router
+Measured, cost-aware tier selection for the Djinn Federation
+
+Keeps completion-time distributions per (model, tier, prompt-length bucket)
+from real executions and predicts the end-to-end time of every routing
+candidate as
+
+    queue wait + cold-start load (if the model is not resident) + service time
+
+then picks the fastest candidate whose quality meets the task's floor.
+Quality is the hub's prior for a model, scaled by its observed success
+rate once there is enough evidence.
+
+Candidates nobody has measured yet fall back to their prior estimate, so
+the router starts out behaving like the static tables and converges on
+measured behaviour as executions are recorded.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Prompt-length buckets (upper bounds in tokens)
+PROMPT_BUCKETS = (64, 256, 1024, 4096)
+
+# Ollama unloads idle models after its keep-alive (10 minutes in the hubs)
+DEFAULT_KEEP_ALIVE_SECONDS = 600
+
+# Evidence needed before measurements override priors
+MIN_SAMPLES = 3
+
+# Service-time quantile used for predictions (slightly pessimistic median)
+PREDICTION_QUANTILE = 0.75
+
+
+def prompt_bucket(prompt_tokens: int) -> str:
+    """Bucket label for a prompt length, e.g. '<256' or '4096+'"""
+    for bound in PROMPT_BUCKETS:
+        if prompt_tokens < bound:
+            return f"<{bound}"
+    return f"{PROMPT_BUCKETS[-1]}+"
+
+
+def quantile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@dataclass
+class RouteCandidate:
+    """One way to serve a query"""
+
+    tier: str  # "local", "pcloud" or "cloud"
+    model: str  # Hub-level model key, e.g. "coding"
+    model_name: str  # Ollama model name
+    quality: float  # Prior quality for this task (0-1)
+    prior_seconds: float  # Service-time guess before measurements exist
+    prior_cold_start_seconds: float = 0.0
+
+
+@dataclass
+class RouteDecision:
+    """Chosen candidate plus the prediction behind it"""
+
+    candidate: RouteCandidate
+    predicted_seconds: float
+    breakdown: Dict[str, float]
+    quality: float
+    meets_floor: bool
+    reasoning: str
+    alternatives: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class LatencyDistribution:
+    """Bounded window of observed completion times"""
+
+    def __init__(self, window: int = 50, samples=None):
+        self.samples: Deque[float] = deque(samples or [], maxlen=window)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": len(self.samples),
+            "p50": round(quantile(self.samples, 0.5), 3),
+            "p75": round(quantile(self.samples, 0.75), 3),
+            "p95": round(quantile(self.samples, 0.95), 3),
+        }
+
+
+class LatencyRouter:
+    """
+    Learns latency per (model, tier, prompt bucket) and routes on predicted
+    completion time subject to a quality floor.
+    """
+
+    def __init__(
+        self,
+        profile_file: Optional[Path] = None,
+        window: int = 50,
+        keep_alive_seconds: float = DEFAULT_KEEP_ALIVE_SECONDS,
+        clock=time.time,
+    ):
+        self.profile_file = Path(profile_file) if profile_file else None
+        self.window = window
+        self.keep_alive_seconds = keep_alive_seconds
+        self.clock = clock
+
+        self.service: Dict[Tuple[str, str, str], LatencyDistribution] = {}
+        self.cold_start: Dict[Tuple[str, str], LatencyDistribution] = {}
+        self.outcomes: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.last_used: Dict[Tuple[str, str], float] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.queue_depth: Dict[str, int] = {}
+        self.unsaved = 0
+        self.save_pending = False  # A background save is scheduled or running
+
+        self.router_lock = threading.Lock()
+        self.save_lock = threading.Lock()  # One profile write at a time
+        self._load_profile()
+        if self.profile_file:
+            atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        model_name: str,
+        tier: str,
+        prompt_tokens: int,
+        seconds: float,
+        success: bool = True,
+        load_seconds: Optional[float] = None,
+    ):
+        """
+        Record one execution. load_seconds is the server-reported model load
+        time when known; otherwise a run after the keep-alive window is
+        treated as a cold start.
+        """
+        key = (model_name, tier)
+        with self.router_lock:
+            now = self.clock()
+            was_warm = key in self.last_used and now - self.last_used[key] < self.keep_alive_seconds
+            self.last_used[key] = now
+
+            outcome = self.outcomes.setdefault(key, {"success": 0, "failure": 0})
+            outcome["success" if success else "failure"] += 1
+            if not success:
+                self._mark_dirty()
+                return
+
+            if load_seconds is None and not was_warm:
+                cold = self.cold_start.setdefault(key, LatencyDistribution(self.window))
+                warm = self._service_estimate(model_name, tier, prompt_bucket(prompt_tokens))
+                if warm is not None:
+                    cold.add(max(0.0, seconds - warm))
+                self._mark_dirty()
+                return  # Cold runs would skew the service-time distribution
+
+            if load_seconds:
+                self.cold_start.setdefault(key, LatencyDistribution(self.window)).add(load_seconds)
+                seconds = max(0.0, seconds - load_seconds)
+
+            bucket_key = (model_name, tier, prompt_bucket(prompt_tokens))
+            self.service.setdefault(bucket_key, LatencyDistribution(self.window)).add(seconds)
+            self._mark_dirty()
+
+    def learn_from_history(self, history: List[Dict[str, Any]]) -> int:
+        """
+        Ingest performance_history entries (model name, tier, response_time,
+        prompt_tokens, success, load_duration_ms). Returns entries learned.
+        """
+        learned = 0
+        for entry in history:
+            model_name = entry.get("model_name") or entry.get("model")
+            if not model_name or "response_time" not in entry or not entry.get("tier"):
+                continue
+            load_ms = entry.get("load_duration_ms")
+            self.record(
+                model_name,
+                entry["tier"],
+                entry.get("prompt_tokens", 0),
+                entry["response_time"],
+                success=entry.get("success", True),
+                load_seconds=load_ms / 1000 if load_ms is not None else None,
+            )
+            learned += 1
+        return learned
+
+    def begin(self, tier: str):
+        """An execution on this tier started (counts toward its queue)"""
+        with self.router_lock:
+            self.in_flight[tier] = self.in_flight.get(tier, 0) + 1
+
+    def end(self, tier: str):
+        with self.router_lock:
+            self.in_flight[tier] = max(0, self.in_flight.get(tier, 0) - 1)
+
+    def set_queue_depth(self, tier: str, depth: int):
+        """External queue length for a tier (e.g. pending PCloud tasks)"""
+        with self.router_lock:
+            self.queue_depth[tier] = max(0, depth)
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+
+    def predict(self, candidate: RouteCandidate, prompt_tokens: int) -> Dict[str, float]:
+        """Predicted seconds broken down into queue, cold start and service"""
+        with self.router_lock:
+            return self._predict(candidate, prompt_tokens)
+
+    def _predict(self, candidate: RouteCandidate, prompt_tokens: int) -> Dict[str, float]:
+        key = (candidate.model_name, candidate.tier)
+        service = self._service_estimate(candidate.model_name, candidate.tier, prompt_bucket(prompt_tokens))
+        if service is None:
+            service = candidate.prior_seconds
+
+        cold_start = 0.0
+        last_used = self.last_used.get(key)
+        if last_used is None or self.clock() - last_used >= self.keep_alive_seconds:
+            cold = self.cold_start.get(key)
+            cold_start = quantile(cold.samples, 0.5) if cold and len(cold) else candidate.prior_cold_start_seconds
+
+        waiting = self.in_flight.get(candidate.tier, 0) + self.queue_depth.get(candidate.tier, 0)
+        queue = waiting * service
+
+        return {
+            "queue": round(queue, 3),
+            "cold_start": round(cold_start, 3),
+            "service": round(service, 3),
+            "total": round(queue + cold_start + service, 3),
+        }
+
+    def _service_estimate(self, model_name: str, tier: str, bucket: str) -> Optional[float]:
+        distribution = self.service.get((model_name, tier, bucket))
+        if distribution and len(distribution) >= MIN_SAMPLES:
+            return quantile(distribution.samples, PREDICTION_QUANTILE)
+
+        # Other buckets of the same model, scaled by prompt size ratio
+        best = None
+        for (other_model, other_tier, other_bucket), other in self.service.items():
+            if other_model != model_name or other_tier != tier or len(other) < MIN_SAMPLES:
+                continue
+            ratio = self._bucket_index(bucket) - self._bucket_index(other_bucket)
+            estimate = quantile(other.samples, PREDICTION_QUANTILE) * (1.5 ** ratio)
+            if best is None or abs(ratio) < best[0]:
+                best = (abs(ratio), estimate)
+        return best[1] if best else None
+
+    @staticmethod
+    def _bucket_index(bucket: str) -> int:
+        labels = [f"<{bound}" for bound in PROMPT_BUCKETS] + [f"{PROMPT_BUCKETS[-1]}+"]
+        return labels.index(bucket) if bucket in labels else 0
+
+    def effective_quality(self, candidate: RouteCandidate) -> float:
+        """Prior quality scaled by observed success rate"""
+        outcome = self.outcomes.get((candidate.model_name, candidate.tier))
+        if not outcome:
+            return candidate.quality
+        total = outcome["success"] + outcome["failure"]
+        if total < MIN_SAMPLES:
+            return candidate.quality
+        return candidate.quality * (outcome["success"] / total)
+
+    def choose(
+        self, candidates: List[RouteCandidate], prompt_tokens: int, quality_floor: float
+    ) -> RouteDecision:
+        """Fastest candidate meeting the quality floor (best quality if none does)"""
+        if not candidates:
+            raise ValueError("No routing candidates")
+
+        with self.router_lock:
+            scored = []
+            for candidate in candidates:
+                prediction = self._predict(candidate, prompt_tokens)
+                quality = self.effective_quality(candidate)
+                scored.append((candidate, prediction, quality))
+
+        eligible = [item for item in scored if item[2] >= quality_floor]
+        if eligible:
+            candidate, prediction, quality = min(eligible, key=lambda item: item[1]["total"])
+            reasoning = (
+                f"Fastest option meeting quality {quality_floor:.2f}: "
+                f"~{prediction['total']:.1f}s predicted"
+            )
+        else:
+            candidate, prediction, quality = max(scored, key=lambda item: (item[2], -item[1]["total"]))
+            reasoning = f"No option meets quality {quality_floor:.2f}; using highest quality ({quality:.2f})"
+
+        if prediction["cold_start"]:
+            reasoning += f" incl. {prediction['cold_start']:.1f}s cold start"
+        if prediction["queue"]:
+            reasoning += f" and {prediction['queue']:.1f}s queueing"
+
+        return RouteDecision(
+            candidate=candidate,
+            predicted_seconds=prediction["total"],
+            breakdown=prediction,
+            quality=round(quality, 3),
+            meets_floor=quality >= quality_floor,
+            reasoning=reasoning,
+            alternatives=[
+                {
+                    "tier": other.tier,
+                    "model": other.model,
+                    "predicted_seconds": other_prediction["total"],
+                    "quality": round(other_quality, 3),
+                }
+                for other, other_prediction, other_quality in scored
+                if other is not candidate
+            ],
+        )
+
+    # ------------------------------------------------------------------
+    # Reporting and persistence
+    # ------------------------------------------------------------------
+
+    def get_profile(self) -> Dict[str, Any]:
+        """Measured distributions per model/tier/bucket"""
+        with self.router_lock:
+            return {
+                "service": {
+                    f"{model}|{tier}|{bucket}": distribution.summary()
+                    for (model, tier, bucket), distribution in self.service.items()
+                },
+                "cold_start": {
+                    f"{model}|{tier}": distribution.summary()
+                    for (model, tier), distribution in self.cold_start.items()
+                },
+                "outcomes": {f"{model}|{tier}": dict(counts) for (model, tier), counts in self.outcomes.items()},
+            }
+
+    def save(self):
+        """Write the profile, replacing the file whole; saves run one at a time"""
+        if not self.profile_file:
+            return
+        with self.save_lock:
+            # Snapshot under save_lock so a later write never carries older data
+            with self.router_lock:
+                data = {
+                    "service": [
+                        [model, tier, bucket, list(distribution.samples)]
+                        for (model, tier, bucket), distribution in self.service.items()
+                    ],
+                    "cold_start": [
+                        [model, tier, list(distribution.samples)]
+                        for (model, tier), distribution in self.cold_start.items()
+                    ],
+                    "outcomes": [[model, tier, dict(counts)] for (model, tier), counts in self.outcomes.items()],
+                }
+                self.unsaved = 0
+            try:
+                self.profile_file.parent.mkdir(parents=True, exist_ok=True)
+                import tempfile
+
+                fd, tmp_path = tempfile.mkstemp(
+                    prefix=f".{self.profile_file.name}.", dir=str(self.profile_file.parent)
+                )
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(data, f, indent=2)
+                    os.replace(tmp_path, self.profile_file)
+                except BaseException:
+                    os.remove(tmp_path)
+                    raise
+            except Exception as e:
+                print(f"⚠️ Error saving latency profile: {e}")
+
+    def flush(self):
+        """Save updates not yet written (runs at interpreter exit)"""
+        with self.router_lock:
+            outstanding = self.unsaved > 0 or self.save_pending
+        if outstanding:
+            self.save()
+
+    def _mark_dirty(self):
+        # Called with router_lock held; a single background saver writes
+        self.unsaved += 1
+        if self.profile_file and self.unsaved >= 10 and not self.save_pending:
+            self.save_pending = True
+            threading.Thread(target=self._background_save, daemon=True).start()
+
+    def _background_save(self):
+        try:
+            self.save()
+        finally:
+            with self.router_lock:
+                self.save_pending = False
+
+    def _load_profile(self):
+        if not self.profile_file or not self.profile_file.exists():
+            return
+        try:
+            with open(self.profile_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for model, tier, bucket, samples in data.get("service", []):
+                self.service[(model, tier, bucket)] = LatencyDistribution(self.window, samples)
+            for model, tier, samples in data.get("cold_start", []):
+                self.cold_start[(model, tier)] = LatencyDistribution(self.window, samples)
+            for model, tier, counts in data.get("outcomes", []):
+                self.outcomes[(model, tier)] = counts
+        except Exception as e:
+            print(f"⚠️ Error loading latency profile: {e}")
+
+
+# Global latency router instance
+latency_router = None
+
+
+def get_latency_router():
+    """Get or create the global latency router (profile kept in memory_bank)"""
+    global latency_router
+    if latency_router is None:
+        latency_router = LatencyRouter(Path("memory_bank") / "latency_profile.json")
+    return latency_router
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Lazy Subsystems
+On-demand construction of the federation subsystems, and a startup report
+
+Each revolutionary subsystem loads its JSON state and starts a background
+thread when constructed, and the pre-warming manager immediately queues a
+model warmup. Built eagerly, they sit between launching a hub and its
+first prompt. SubsystemRegistry builds each one exactly once, on its first
+use, and can also build the ones registered with preload=True on a single
+background thread once startup is done. A turn that arrives before a
+preload has finished waits for that build instead of starting a second
+one. A subsystem whose constructor fails is logged and stays None, the
+same as the legacy mode the hubs already handle.
+
+StartupReport records the phases between process start and the first
+prompt, plus the time each subsystem took to build (in the background or
+on first use), for the hubs' status views.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class StartupReport:
+    """Phase timings from process start to the first prompt"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_after: Optional[float] = None
+        self.report_lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a blocking startup step"""
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - began, "startup", began)
+
+    def record(self, name: str, seconds: float, where: str = "startup", began: Optional[float] = None):
+        """Add a timing; `where` is startup, background or first use"""
+        began = began if began is not None else time.perf_counter() - seconds
+        with self.report_lock:
+            self.phases.append({
+                "name": name,
+                "where": where,
+                "offset_ms": round((began - self.started) * 1000, 1),
+                "duration_ms": round(seconds * 1000, 1),
+            })
+
+    def mark_ready(self) -> float:
+        """Record time-to-first-prompt (once); returns it in seconds"""
+        with self.report_lock:
+            if self.ready_after is None:
+                self.ready_after = time.perf_counter() - self.started
+            return self.ready_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.report_lock:
+            return {
+                "time_to_first_prompt_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+                "phases": list(self.phases),
+            }
+
+    def summary(self) -> str:
+        """One line for the hubs to print when the prompt first appears"""
+        report = self.to_dict()
+        blocking = [phase for phase in report["phases"] if phase["where"] == "startup"]
+        slowest = max(blocking, key=lambda phase: phase["duration_ms"], default=None)
+        line = f"⚡ Ready in {report['time_to_first_prompt_ms'] or 0:.0f}ms"
+        if slowest:
+            line += f" (slowest step: {slowest['name']} {slowest['duration_ms']:.0f}ms)"
+        return line
+
+    def format(self) -> str:
+        """Startup waterfall: blocking steps, then background and first-use builds"""
+        report = self.to_dict()
+        ready = report["time_to_first_prompt_ms"]
+        lines = [f"⚡ STARTUP: first prompt after {ready:.0f}ms" if ready is not None
+                 else "⚡ STARTUP: first prompt not shown yet"]
+        for phase in sorted(report["phases"], key=lambda item: item["offset_ms"]):
+            lines.append(
+                f"  {phase['name']:<28} {phase['where']:<10} +{phase['offset_ms']:>8.0f}ms "
+                f"{phase['duration_ms']:>8.1f}ms"
+            )
+        return "\n".join(lines)
+
+
+class LazySubsystem:
+    """One subsystem, built by its factory exactly once"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], report: Optional[StartupReport] = None,
+                 preload: bool = True):
+        self.name = name
+        self.factory = factory
+        self.report = report
+        self.preload = preload
+        self.instance = None
+        self.built = False
+        self.building = False
+        self.error: Optional[str] = None
+        self.build_lock = threading.Lock()
+
+    def get(self, where: str = "first use") -> Any:
+        """The subsystem, building it (or waiting for a build in progress) if needed"""
+        if self.built:
+            return self.instance
+        with self.build_lock:
+            if not self.built:
+                self._build(where)
+        return self.instance
+
+    def peek(self) -> Any:
+        """The subsystem if already built, without building it"""
+        return self.instance if self.built else None
+
+    def _build(self, where: str):
+        self.building = True
+        began = time.perf_counter()
+        try:
+            self.instance = self.factory()
+        except Exception as e:
+            self.error = str(e)
+            print(f"⚠️ {self.name} unavailable: {e}")
+        finally:
+            self.building = False
+            self.built = True
+            if self.report:
+                self.report.record(self.name, time.perf_counter() - began, where, began)
+
+    @property
+    def state(self) -> str:
+        if self.built:
+            return "failed" if self.error else "ready"
+        return "loading" if self.building else "not started"
+
+
+class SubsystemRegistry:
+    """Named lazy subsystems with an optional background preload"""
+
+    def __init__(self, report: Optional[StartupReport] = None):
+        self.report = report
+        self.subsystems: Dict[str, LazySubsystem] = {}
+        self.preload_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, factory: Callable[[], Any], preload: bool = True) -> LazySubsystem:
+        """Add a subsystem; preload=False leaves it strictly to first use"""
+        subsystem = self.subsystems[name] = LazySubsystem(name, factory, self.report, preload)
+        return subsystem
+
+    def get(self, name: str) -> Any:
+        """The named subsystem (built on first use), or None if not registered"""
+        subsystem = self.subsystems.get(name)
+        return subsystem.get() if subsystem else None
+
+    def peek(self, name: str) -> Any:
+        subsystem = self.subsystems.get(name)
+        return subsystem.peek() if subsystem else None
+
+    def start_preload(self) -> Optional[threading.Thread]:
+        """Build the preloadable subsystems one after another on a daemon thread"""
+        pending = [subsystem for subsystem in self.subsystems.values() if subsystem.preload and not subsystem.built]
+        if not pending or self.preload_thread is not None:
+            return self.preload_thread
+
+        def preload():
+            for subsystem in pending:
+                subsystem.get(where="background")
+
+        self.preload_thread = threading.Thread(target=preload, name="subsystem-preload", daemon=True)
+        self.preload_thread.start()
+        return self.preload_thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the background preload is done (True if it finished)"""
+        if self.preload_thread is None:
+            return True
+        self.preload_thread.join(timeout)
+        return not self.preload_thread.is_alive()
+
+    def status(self) -> Dict[str, str]:
+        return {name: subsystem.state for name, subsystem in self.subsystems.items()}
+
+    def describe(self, name: str) -> str:
+        """Status marker for the hubs' system listings"""
+        return {
+            "ready": "✅ ACTIVE",
+            "loading": "⏳ LOADING",
+            "not started": "💤 ON FIRST USE",
+        }.get(self.subsystems[name].state if name in self.subsystems else "", "❌ OFFLINE")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Lock Profiler
+Wait and hold times for the federation subsystems' shared-state locks
+
+stream_lock, comm_lock, analytics_lock and collab_lock guard process-wide
+state and are also taken by background processors, some of which save
+JSON while holding them. ProfiledLock is a drop-in threading.Lock that
+records, per acquisition, how long the caller waited, how long the lock
+was then held and where it was acquired. Waits and holds are aggregated
+into per-lock histograms (holds also per call site), fed to the metrics
+registry as djinn_lock_wait_seconds / djinn_lock_hold_seconds, and
+periodically written to a JSON report that the Steward's monitor reads to
+flag hot locks.
+
+Profiling is off unless DJINN_LOCK_PROFILE is set ("1" reports to
+logs/lock_profile.json, any other value is taken as the report path).
+Disabled, make_lock() returns a plain threading.Lock, so the subsystems
+pay nothing.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+LOCK_PROFILE_ENV = "DJINN_LOCK_PROFILE"
+# Anchored to the repository so hubs and the steward agree wherever they run from
+DEFAULT_REPORT_FILE = Path(__file__).resolve().parent / "logs" / "lock_profile.json"
+DEFAULT_DUMP_INTERVAL = 10.0
+
+# Histogram bounds in seconds, from uncontended handoffs to saves under a lock
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# A lock is hot when enough acquisitions have been seen and callers either
+# queue behind it often or wait long at the tail
+HOT_MIN_ACQUISITIONS = 20
+HOT_CONTENTION_RATIO = 0.1
+HOT_WAIT_P95_MS = 5.0
+
+# Frames skipped when attributing an acquisition to its caller
+_WRAPPER_FILES = {"lock_profiler.py", "contextlib.py", "metrics_registry.py"}
+
+
+class _Distribution:
+    """Fixed-bucket histogram with count, total and max (seconds)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last slot is overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        index = 0
+        while index < len(BUCKETS) and value > BUCKETS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction (the max past the last bucket)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "p50_ms": round(self.percentile(0.5) * 1000, 3),
+            "p95_ms": round(self.percentile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets_ms": {
+                **{f"{bound * 1000:g}": count for bound, count in zip(BUCKETS, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class LockStats:
+    """Aggregated acquisitions of every lock sharing one name"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.contended = 0
+        self.wait = _Distribution()
+        self.hold = _Distribution()
+        self.sites: Dict[str, Dict[str, Any]] = {}  # call site -> acquisitions, wait and hold
+        self.stats_lock = threading.Lock()
+        self.wait_metric = None
+        self.hold_metric = None
+
+    def record(self, waited: float, held: float, site: str, contended: bool):
+        with self.stats_lock:
+            if contended:
+                self.contended += 1
+            self.wait.observe(waited)
+            self.hold.observe(held)
+            stats = self.sites.get(site)
+            if stats is None:
+                stats = self.sites[site] = {"acquisitions": 0, "wait": 0.0, "hold": _Distribution()}
+            stats["acquisitions"] += 1
+            stats["wait"] += waited
+            stats["hold"].observe(held)
+        self._export(waited, held)
+
+    def _export(self, waited: float, held: float):
+        if self.wait_metric is None:
+            from metrics_registry import get_metrics_registry
+
+            registry = get_metrics_registry()
+            self.wait_metric = registry.histogram(
+                "djinn_lock_wait_seconds", "Time spent waiting to acquire shared-state locks", ["lock"]
+            ).labels(self.name)
+            self.hold_metric = registry.histogram(
+                "djinn_lock_hold_seconds", "Time shared-state locks are held per acquisition", ["lock"]
+            ).labels(self.name)
+        self.wait_metric.observe(waited)
+        self.hold_metric.observe(held)
+
+    def summary(self, top_sites: int = 3) -> Dict[str, Any]:
+        with self.stats_lock:
+            acquisitions = self.wait.count
+            ratio = self.contended / acquisitions if acquisitions else 0.0
+            wait = self.wait.to_dict()
+            sites = sorted(self.sites.items(), key=lambda item: item[1]["hold"].total, reverse=True)
+            return {
+                "name": self.name,
+                "acquisitions": acquisitions,
+                "contended": self.contended,
+                "contention_ratio": round(ratio, 4),
+                "wait": wait,
+                "hold": self.hold.to_dict(),
+                "hot": acquisitions >= HOT_MIN_ACQUISITIONS
+                and (ratio >= HOT_CONTENTION_RATIO or wait["p95_ms"] >= HOT_WAIT_P95_MS),
+                "top_sites": [
+                    {
+                        "site": site,
+                        "acquisitions": stats["acquisitions"],
+                        "wait_total_ms": round(stats["wait"] * 1000, 3),
+                        "hold_total_ms": round(stats["hold"].total * 1000, 3),
+                        "hold_p95_ms": round(stats["hold"].percentile(0.95) * 1000, 3),
+                        "hold_max_ms": round(stats["hold"].max * 1000, 3),
+                    }
+                    for site, stats in sites[:top_sites]
+                ],
+            }
+
+
+def _call_site() -> str:
+    """file:line function of the first frame outside the lock wrappers"""
+    frame = sys._getframe(2)
+    while frame is not None and os.path.basename(frame.f_code.co_filename) in _WRAPPER_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+class ProfiledLock:
+    """threading.Lock that records wait, hold and call site per acquisition"""
+
+    # timed_lock() leaves wait recording to the lock itself
+    records_wait = True
+
+    def __init__(self, stats: LockStats):
+        self.stats = stats
+        self._lock = threading.Lock()
+        # Written only by the current holder
+        self._acquired_at = 0.0
+        self._waited = 0.0
+        self._contended = False
+        self._site = ""
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        started = time.perf_counter()
+        contended = not self._lock.acquire(False)
+        if contended and not (blocking and self._lock.acquire(True, timeout)):
+            return False
+        acquired_at = time.perf_counter()
+        self._acquired_at = acquired_at
+        self._waited = acquired_at - started if contended else 0.0
+        self._contended = contended
+        self._site = _call_site()
+        return True
+
+    def release(self):
+        held = time.perf_counter() - self._acquired_at
+        waited, site, contended = self._waited, self._site, self._contended
+        self._lock.release()
+        self.stats.record(waited, held, site, contended)
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def __repr__(self) -> str:
+        return f"<ProfiledLock {self.stats.name} {'locked' if self.locked() else 'unlocked'}>"
+
+
+class LockProfiler:
+    """Hands out named locks and aggregates their contention"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        report_path: Optional[str] = None,
+        dump_interval: float = DEFAULT_DUMP_INTERVAL,
+    ):
+        self.enabled = enabled
+        self.report_path = Path(report_path) if report_path else None
+        self.dump_interval = dump_interval
+        self.locks: Dict[str, LockStats] = {}
+        self.profiler_lock = threading.Lock()
+        self.dump_thread: Optional[threading.Thread] = None
+
+    def lock(self, name: str):
+        """A lock for `name`: profiled while enabled, a plain threading.Lock otherwise"""
+        if not self.enabled:
+            return threading.Lock()
+        with self.profiler_lock:
+            stats = self.locks.get(name)
+            if stats is None:
+                stats = self.locks[name] = LockStats(name)
+            if self.report_path and self.dump_thread is None:
+                self._start_dump()
+        return ProfiledLock(stats)
+
+    def _start_dump(self):
+        def dump_loop():
+            while True:
+                time.sleep(self.dump_interval)
+                self._write_quietly()
+
+        self.dump_thread = threading.Thread(target=dump_loop, daemon=True)
+        self.dump_thread.start()
+        atexit.register(self._write_quietly)
+
+    def _write_quietly(self):
+        try:
+            self.write_report()
+        except OSError as e:
+            print(f"⚠️ Lock profile write to {self.report_path} failed: {e}")
+
+    def report(self) -> Dict[str, Any]:
+        """Per-lock summaries, highest total wait first"""
+        with self.profiler_lock:
+            stats = list(self.locks.values())
+        locks = sorted((lock.summary() for lock in stats), key=lambda item: item["wait"]["total_ms"], reverse=True)
+        return {
+            "pid": os.getpid(),
+            "updated_at": datetime.now().isoformat(),
+            "thresholds": {
+                "min_acquisitions": HOT_MIN_ACQUISITIONS,
+                "contention_ratio": HOT_CONTENTION_RATIO,
+                "wait_p95_ms": HOT_WAIT_P95_MS,
+            },
+            "locks": locks,
+            "hot_locks": [lock["name"] for lock in locks if lock["hot"]],
+        }
+
+    def write_report(self, path=None) -> Path:
+        """Atomically replace the report file with the current summary"""
+        path = Path(path) if path else self.report_path or DEFAULT_REPORT_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        import tempfile
+
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+
+def format_report(report: Dict[str, Any], top: int = 5) -> str:
+    """Text table of the locks with the most waiting, hot ones marked"""
+    locks = report.get("locks", [])
+    if not locks:
+        return "🔒 LOCK PROFILE: no profiled acquisitions yet"
+    lines = [f"🔒 LOCK PROFILE ({len(report.get('hot_locks', []))} hot of {len(locks)})"]
+    lines.append(f"  {'lock':<28} {'acq':>8} {'cont':>6} {'wait p95':>10} {'wait max':>10} {'hold p95':>10} {'hold max':>10}")
+    for lock in locks[:top]:
+        marker = " 🔥" if lock["hot"] else ""
+        lines.append(
+            f"  {lock['name'][:28]:<28} {lock['acquisitions']:>8} {lock['contention_ratio']:>6.0%} "
+            f"{lock['wait']['p95_ms']:>8.2f}ms {lock['wait']['max_ms']:>8.2f}ms "
+            f"{lock['hold']['p95_ms']:>8.2f}ms {lock['hold']['max_ms']:>8.2f}ms{marker}"
+        )
+        if lock["hot"] and lock["top_sites"]:
+            site = lock["top_sites"][0]
+            lines.append(f"      longest holder: {site['site']} ({site['hold_total_ms']:.1f}ms total, "
+                         f"max {site['hold_max_ms']:.1f}ms)")
+    return "\n".join(lines)
+
+
+def report_path_from_env() -> Optional[Path]:
+    """Report file DJINN_LOCK_PROFILE selects, or None when profiling is off"""
+    setting = os.environ.get(LOCK_PROFILE_ENV, "").strip()
+    if setting.lower() in ("", "0", "false", "no", "off"):
+        return None
+    if setting.lower() in ("1", "true", "yes", "on"):
+        return DEFAULT_REPORT_FILE
+    return Path(setting)
+
+
+def _profiler_from_env() -> LockProfiler:
+    report_path = report_path_from_env()
+    if report_path is None:
+        return LockProfiler()
+    return LockProfiler(enabled=True, report_path=str(report_path))
+
+
+# Global lock profiler instance
+lock_profiler = None
+lock_profiler_lock = threading.Lock()
+
+
+def get_lock_profiler() -> LockProfiler:
+    """Get or create the global lock profiler (configured from DJINN_LOCK_PROFILE)"""
+    global lock_profiler
+    if lock_profiler is None:
+        with lock_profiler_lock:
+            if lock_profiler is None:
+                lock_profiler = _profiler_from_env()
+    return lock_profiler
+
+
+def make_lock(name: str):
+    """Lock for a subsystem's shared state, profiled under `name` when DJINN_LOCK_PROFILE is set"""
+    return get_lock_profiler().lock(name)
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry
+Counters, gauges and latency histograms for the Djinn Federation
+
+The hubs' status views print point-in-time snapshots. The registry keeps
+running totals instead: requests and latencies per tier and model, cold
+starts, warmup durations, cache hits, queue depth, persistence write times
+and lock waits. It renders them in the Prometheus text exposition format,
+so they can be scraped and graphed over time.
+
+Exposure:
+  - hub_server serves GET /metrics next to /status
+  - serve_metrics(port) runs a standalone scrape endpoint for the
+    interactive hubs
+  - write_textfile(path) dumps the same text atomically (for a node
+    exporter textfile collector, or to diff two runs)
+start_exporters_from_env() starts the last two when DJINN_METRICS_PORT or
+DJINN_METRICS_FILE is set.
+
+Metrics are created on first use and looked up by name afterwards, so
+instrumented modules call get_metrics_registry().counter(...) where they
+record rather than declaring everything up front.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+METRICS_PORT_ENV = "DJINN_METRICS_PORT"
+METRICS_FILE_ENV = "DJINN_METRICS_FILE"
+DEFAULT_DUMP_INTERVAL = 15.0
+
+# Seconds; covers lock waits (sub-millisecond) up to large-model generations
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Shared label handling; each label combination is one child series"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.children: Dict[Tuple[str, ...], object] = {}
+        self.metric_lock = threading.Lock()
+
+    def labels(self, *values, **labelled):
+        if labelled:
+            values = tuple(str(labelled[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        with self.metric_lock:
+            child = self.children.get(values)
+            if child is None:
+                child = self.children[values] = self._new_child()
+            return child
+
+    def _default_child(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        with self.metric_lock:
+            children = sorted(self.children.items())
+        for values, child in children:
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.get())}"]
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self.value_lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.value_lock:
+            self.value += amount
+
+    def get(self) -> float:
+        return self.value
+
+
+class _GaugeValue(_Value):
+    def __init__(self):
+        super().__init__()
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        with self.value_lock:
+            self.value = float(value)
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value at scrape time instead of tracking it"""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.value_lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.value_lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self.value_lock:
+            return list(self.counts), self.sum
+
+
+class Counter(_Metric):
+    """Monotonic total"""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default_child().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down"""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeValue()
+
+    def set(self, value: float):
+        self._default_child().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default_child().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default_child().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default_child().set_function(function)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (cumulative buckets, sum and count when rendered)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default_child().observe(value)
+
+    def time(self):
+        return self._default_child().time()
+
+    def _render_child(self, values, child) -> List[str]:
+        counts, total = child.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_label_text(self.labelnames, values, le)} {cumulative}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics; asking for an existing name returns the same metric"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.registry_lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self.registry_lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.kind} with labels {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        with self.registry_lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically replace `path` with the current exposition"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        import tempfile
+
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+@contextmanager
+def timed_lock(lock, name: str) -> Iterator[None]:
+    """Acquire `lock`, recording the wait in djinn_lock_wait_seconds{lock=name}"""
+    if getattr(lock, "records_wait", False):
+        # A profiled lock (lock_profiler) records every acquisition itself
+        with lock:
+            yield
+        return
+    started = time.perf_counter()
+    with lock:
+        get_metrics_registry().histogram(
+            "djinn_lock_wait_seconds", "Time spent waiting to acquire shared-state locks", ["lock"]
+        ).labels(name).observe(time.perf_counter() - started)
+        yield
+
+
+def record_hub_request(hub: str, tier: str, seconds: Optional[float], success: bool = True):
+    """Count a routed turn per hub and tier, and record its latency when known"""
+    registry = get_metrics_registry()
+    registry.counter(
+        "djinn_hub_requests_total", "Turns handled per hub and tier", ["hub", "tier", "outcome"]
+    ).labels(hub, tier, "ok" if success else "error").inc()
+    if seconds is not None:
+        registry.histogram(
+            "djinn_hub_request_seconds", "Turn latency per hub and tier", ["hub", "tier"]
+        ).labels(hub, tier).observe(seconds)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Count one lookup in djinn_cache_lookups_total{cache, result}"""
+    get_metrics_registry().counter(
+        "djinn_cache_lookups_total", "Cache lookups by cache and result", ["cache", "result"]
+    ).labels(cache, "hit" if hit else "miss").inc()
+
+
+def persistence_timer(store: str):
+    """Context manager recording djinn_persistence_write_seconds{store}"""
+    return get_metrics_registry().histogram(
+        "djinn_persistence_write_seconds", "Time spent writing memory stores to disk", ["store"]
+    ).labels(store).time()
+
+
+def serve_metrics(port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None):
+    """Scrape endpoint (GET /metrics) on a daemon thread; returns the ThreadingHTTPServer"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry or get_metrics_registry()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{CONTENT_TYPE}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_textfile_dump(path, interval: float = DEFAULT_DUMP_INTERVAL,
+                        registry: Optional[MetricsRegistry] = None) -> threading.Thread:
+    """Rewrite the dump file every `interval` seconds on a daemon thread"""
+    registry = registry or get_metrics_registry()
+
+    def dump_loop():
+        while True:
+            try:
+                registry.write_textfile(path)
+            except OSError as e:
+                print(f"⚠️ Metrics dump to {path} failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=dump_loop, daemon=True)
+    thread.start()
+    return thread
+
+
+exporters_started = False
+exporters_lock = threading.Lock()
+
+
+def start_exporters_from_env():
+    """Start the scrape endpoint / file dump named by DJINN_METRICS_PORT / DJINN_METRICS_FILE (once)"""
+    global exporters_started
+    with exporters_lock:
+        if exporters_started:
+            return
+        exporters_started = True
+    port = os.environ.get(METRICS_PORT_ENV)
+    path = os.environ.get(METRICS_FILE_ENV)
+    if port:
+        try:
+            serve_metrics(int(port))
+            print(f"📈 Metrics at http://127.0.0.1:{port}/metrics")
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Metrics endpoint unavailable on port {port}: {e}")
+    if path:
+        start_textfile_dump(path)
+        print(f"📈 Metrics dumped to {path}")
+
+
+# Global registry instance
+metrics_registry = None
+metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get or create the global metrics registry"""
+    global metrics_registry
+    if metrics_registry is None:
+        with metrics_registry_lock:
+            if metrics_registry is None:
+                metrics_registry = MetricsRegistry()
+    return metrics_registry
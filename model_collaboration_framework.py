@@ -10,14 +10,21 @@ through synchronized intelligence and unified reasoning.
 import json
 import time
 import asyncio
+import hashlib
+import re
 import threading
+from collections import OrderedDict
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field, replace
 from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 from enum import Enum
 import subprocess
 
+from lock_profiler import make_lock
+from metrics_registry import persistence_timer, record_cache_lookup
+from tracing import traced
+
 class CollaborationMode(Enum):
     SEQUENTIAL = "sequential"  # Models work one after another
     PARALLEL = "parallel"     # Models work simultaneously
@@ -62,6 +69,133 @@ class CollaborationResult:
     reasoning_chain: List[str]
     quality_metrics: Dict[str, float]
     timestamp: str
+    provenance: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class CachedCollaboration:
+    """A synthesized result held in the collaboration cache"""
+    cache_key: str
+    result: CollaborationResult
+    strategy: str
+    participants: List[str]
+    cached_at: float
+    expires_at: float
+    hits: int = 0
+
+class CollaborationResultCache:
+    """
+    Cache of synthesized collaboration results.
+    Keyed by normalized task text, resolved strategy and participant set so
+    repeated or near-duplicate requests skip the full multi-model synthesis.
+    """
+    
+    def __init__(self, ttl_seconds: float = 900, min_confidence: float = 0.6,
+                 max_entries: int = 256, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.min_confidence = min_confidence
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.cache_lock = threading.Lock()
+    
+    @staticmethod
+    def normalize_task(task_description: str) -> str:
+        """Normalize task text so trivially different phrasings share a key"""
+        text = re.sub(r'\s+', ' ', task_description.lower()).strip()
+        return text.strip(' .!?')
+    
+    def make_key(self, task_description: str, strategy: str, participants: List[str]) -> str:
+        """Build the cache key for a task/strategy/participant combination"""
+        fingerprint = '|'.join([
+            self.normalize_task(task_description),
+            strategy,
+            ','.join(sorted(participants))
+        ])
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:24]
+    
+    def get(self, cache_key: str) -> Optional[CollaborationResult]:
+        """Return a copy of the cached result with provenance, or None"""
+        with self.cache_lock:
+            entry = self.entries.get(cache_key)
+            now = self.clock()
+            if entry is None or now >= entry.expires_at or entry.result.confidence_score < self.min_confidence:
+                if entry is not None:
+                    del self.entries[cache_key]
+                self.misses += 1
+                record_cache_lookup("collaboration_results", False)
+                return None
+            
+            entry.hits += 1
+            self.hits += 1
+            self.entries.move_to_end(cache_key)
+            record_cache_lookup("collaboration_results", True)
+            
+            return replace(
+                entry.result,
+                reasoning_chain=list(entry.result.reasoning_chain),
+                provenance={
+                    'source': 'cache',
+                    'cache_key': cache_key,
+                    'original_task_id': entry.result.task_id,
+                    'original_result_id': entry.result.result_id,
+                    'strategy': entry.strategy,
+                    'participants': list(entry.participants),
+                    'cached_at': datetime.fromtimestamp(entry.cached_at).isoformat(),
+                    'age_seconds': round(now - entry.cached_at, 3),
+                    'hits': entry.hits
+                }
+            )
+    
+    def put(self, cache_key: str, result: CollaborationResult, strategy: str, participants: List[str]) -> bool:
+        """Cache a result; low-confidence syntheses are never stored"""
+        with self.cache_lock:
+            if result.confidence_score < self.min_confidence:
+                self.entries.pop(cache_key, None)
+                return False
+            
+            # Confident results stay valid longer than borderline ones
+            now = self.clock()
+            self.entries[cache_key] = CachedCollaboration(
+                cache_key=cache_key,
+                result=result,
+                strategy=strategy,
+                participants=list(participants),
+                cached_at=now,
+                expires_at=now + self.ttl_seconds * min(1.0, result.confidence_score)
+            )
+            self.entries.move_to_end(cache_key)
+            
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            return True
+    
+    def invalidate(self, model_name: str = None, below_confidence: float = None) -> int:
+        """Drop entries involving a model and/or under a confidence floor"""
+        with self.cache_lock:
+            stale_keys = [
+                key for key, entry in self.entries.items()
+                if (model_name is None and below_confidence is None)
+                or (model_name is not None and model_name in entry.participants)
+                or (below_confidence is not None and entry.result.confidence_score < below_confidence)
+            ]
+            for key in stale_keys:
+                del self.entries[key]
+            return len(stale_keys)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        with self.cache_lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'ttl_seconds': self.ttl_seconds,
+                'min_confidence': self.min_confidence
+            }
 
 class ModelCollaborationFramework:
     """
@@ -69,7 +203,8 @@ class ModelCollaborationFramework:
     Enables unified intelligence through synchronized model cooperation
     """
     
-    def __init__(self, memory_dir="memory_bank", cross_model_comm=None, analytics=None):
+    def __init__(self, memory_dir="memory_bank", cross_model_comm=None, analytics=None,
+                 result_cache: CollaborationResultCache = None):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(exist_ok=True)
         
@@ -77,6 +212,9 @@ class ModelCollaborationFramework:
         self.cross_model_comm = cross_model_comm
         self.analytics = analytics
         
+        # Synthesized results reused for repeated tasks
+        self.result_cache = result_cache or CollaborationResultCache()
+        
         # Collaboration management
         self.active_collaborations = {}
         self.collaboration_history = []
@@ -150,7 +288,7 @@ class ModelCollaborationFramework:
         ]
         
         # Thread safety
-        self.collab_lock = threading.Lock()
+        self.collab_lock = make_lock("collaboration")
         
         # Background collaboration processor
         self.processor_active = True
@@ -277,11 +415,17 @@ class ModelCollaborationFramework:
                 contributing_models=list(contributions.keys()),
                 confidence_score=enhanced_synthesis['confidence'],
                 reasoning_chain=enhanced_synthesis['reasoning_chain'],
-                quality_metrics=enhanced_synthesis['quality_metrics'],
-                timestamp=datetime.now().isoformat()
+                quality_metrics=enhanced_synthesis.get('quality_metrics', {}),
+                timestamp=datetime.now().isoformat(),
+                provenance={'source': 'synthesis'}
             )
             
             collaboration['synthesis'] = result
+            
+            cache_key = self.result_cache.make_key(
+                task.task_description, task.expected_outcome, task.participating_models
+            )
+            self.result_cache.put(cache_key, result, task.expected_outcome, task.participating_models)
             collaboration['status'] = 'completed'
             
             # Move to history
@@ -295,6 +439,7 @@ class ModelCollaborationFramework:
             
             return result
     
+    @traced("collaboration.unified_response")
     def get_unified_response(self, user_input: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get unified response using collaborative intelligence"""
         # Determine if collaboration is needed
@@ -319,6 +464,22 @@ class ModelCollaborationFramework:
                 'collaboration_used': False
             }
         
+        # Reuse a recent synthesis of the same task when one is still valid
+        cached_result = self.lookup_cached_result(user_input)
+        if cached_result:
+            print(f"♻️ Reusing cached collaboration from {cached_result.provenance['original_task_id']}")
+            return {
+                'response_type': 'collaborative',
+                'task_id': cached_result.task_id,
+                'response': cached_result.unified_response,
+                'contributing_models': cached_result.contributing_models,
+                'confidence': cached_result.confidence_score,
+                'reasoning_chain': cached_result.reasoning_chain,
+                'collaboration_used': True,
+                'cached': True,
+                'provenance': cached_result.provenance
+            }
+        
         # Initiate collaboration
         task_id = self.initiate_collaboration(user_input, priority=8)
         
@@ -336,7 +497,9 @@ class ModelCollaborationFramework:
                 'contributing_models': result.contributing_models,
                 'confidence': result.confidence_score,
                 'reasoning_chain': result.reasoning_chain,
-                'collaboration_used': True
+                'collaboration_used': True,
+                'cached': False,
+                'provenance': result.provenance
             }
         else:
             return {
@@ -345,6 +508,14 @@ class ModelCollaborationFramework:
                 'collaboration_used': False
             }
     
+    def lookup_cached_result(self, task_description: str, task_type: str = None,
+                             preferred_models: List[str] = None) -> Optional[CollaborationResult]:
+        """Find a cached synthesis for the task as it would be resolved now"""
+        strategy = self._determine_strategy(task_description, task_type)
+        participants = preferred_models or self._select_optimal_models(task_description, strategy)
+        cache_key = self.result_cache.make_key(task_description, strategy['approach'], participants)
+        return self.result_cache.get(cache_key)
+    
     def _determine_strategy(self, task_description: str, task_type: str = None) -> Dict[str, Any]:
         """Determine optimal collaboration strategy"""
         task_lower = task_description.lower()
@@ -747,7 +918,8 @@ class ModelCollaborationFramework:
                 'active_collaborations': len(self.active_collaborations),
                 'completed_collaborations': len(self.collaboration_history),
                 'available_models': list(self.model_capabilities.keys()),
-                'collaboration_strategies': list(self.collaboration_strategies.keys())
+                'collaboration_strategies': list(self.collaboration_strategies.keys()),
+                'result_cache': self.result_cache.get_stats()
             }
     
     def save_collaboration_history(self):
@@ -765,7 +937,7 @@ class ModelCollaborationFramework:
                 }
                 serializable_history.append(serializable_collab)
             
-            with open(history_file, 'w', encoding='utf-8') as f:
+            with persistence_timer("collaboration_history"), open(history_file, 'w', encoding='utf-8') as f:
                 json.dump(serializable_history, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Collaboration history save error: {e}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Model Inventory
+Cached, structured view of the models installed on the local Ollama server
+
+The hubs, the health check and the verify scripts used to shell out to
+`ollama list` (often once per model checked) and substring-match the CLI's
+table. ModelInventory asks the server instead: /api/tags for the installed
+models and /api/ps for the ones loaded in memory, parsed into ModelRecord
+entries and cached for a short TTL, so a capability check or status view
+costs at most one round trip. A failed query is cached too, for a shorter
+time, so an unreachable server is not retried once per model.
+
+Anything that changes the installed set in-process (a model restored from
+PCloud, a pull or create) calls invalidate(); changes made by other
+processes show up once the TTL expires.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from metrics_registry import record_cache_lookup
+from ollama_client import OllamaError, get_ollama_client
+
+DEFAULT_TTL_SECONDS = 30.0
+ERROR_TTL_SECONDS = 5.0
+
+
+def split_model_name(name: str) -> Tuple[str, str]:
+    """("Yufok1/djinn-federation", "council") for "Yufok1/djinn-federation:council"; tag defaults to latest"""
+    repository, _, tag = name.rpartition(":")
+    if not repository or "/" in tag:
+        return name, "latest"
+    return repository, tag
+
+
+def normalize_model_name(name: str) -> str:
+    """Lower-case name with an explicit tag, the form records are keyed by"""
+    repository, tag = split_model_name(name.strip())
+    return f"{repository}:{tag}".lower()
+
+
+def format_size(size: int) -> str:
+    """Size in the units `ollama list` prints (decimal GB/MB)"""
+    if size >= 1000 ** 3:
+        return f"{size / 1000 ** 3:.1f} GB"
+    if size >= 1000 ** 2:
+        return f"{size / 1000 ** 2:.0f} MB"
+    return f"{size / 1000:.0f} KB"
+
+
+@dataclass
+class ModelRecord:
+    """One installed model"""
+
+    name: str
+    repository: str
+    tag: str
+    size: int = 0
+    digest: str = ""
+    modified_at: str = ""
+    parameter_size: str = ""
+    loaded: bool = False
+    size_vram: int = 0
+    expires_at: str = ""
+
+    @property
+    def size_label(self) -> str:
+        return format_size(self.size)
+
+    @classmethod
+    def from_tags_entry(cls, entry: Dict[str, Any]) -> "ModelRecord":
+        name = entry.get("name") or entry.get("model", "")
+        repository, tag = split_model_name(name)
+        return cls(
+            name=name,
+            repository=repository,
+            tag=tag,
+            size=int(entry.get("size") or 0),
+            digest=entry.get("digest", ""),
+            modified_at=entry.get("modified_at", ""),
+            parameter_size=(entry.get("details") or {}).get("parameter_size", ""),
+        )
+
+    def matches(self, wanted: str) -> bool:
+        """Same model, allowing the registry namespace to be left out
+
+        "djinn-federation:council" finds "Yufok1/djinn-federation:council",
+        as the hubs' tier tables expect.
+        """
+        key, wanted = normalize_model_name(self.name), normalize_model_name(wanted)
+        return key == wanted or key.endswith("/" + wanted)
+
+
+class ModelInventory:
+    """Installed and loaded models from the Ollama server, cached for `ttl` seconds"""
+
+    def __init__(self, client=None, ttl: float = DEFAULT_TTL_SECONDS,
+                 error_ttl: float = ERROR_TTL_SECONDS, timeout: float = 10):
+        self.client = client
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.records: List[ModelRecord] = []
+        self.error: Optional[OllamaError] = None
+        self.fetched_at: Optional[float] = None
+        self.inventory_lock = threading.Lock()
+
+    def models(self) -> List[ModelRecord]:
+        """Installed models; raises OllamaError if the server could not be queried"""
+        with self.inventory_lock:
+            fresh = self.fetched_at is not None and (
+                time.monotonic() - self.fetched_at < (self.error_ttl if self.error else self.ttl)
+            )
+            record_cache_lookup("model_inventory", fresh)
+            if not fresh:
+                self._refresh()
+            if self.error:
+                raise self.error.with_traceback(None)
+            return list(self.records)
+
+    def get(self, name: str) -> Optional[ModelRecord]:
+        """Record for `name`, or None if it is not installed"""
+        return next((record for record in self.models() if record.matches(name)), None)
+
+    def is_installed(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def is_loaded(self, name: str) -> bool:
+        record = self.get(name)
+        return bool(record and record.loaded)
+
+    def availability(self, names: Iterable[str]) -> Dict[str, bool]:
+        """Installed state of several models from a single inventory"""
+        records = self.models()
+        return {name: any(record.matches(name) for record in records) for name in names}
+
+    def invalidate(self):
+        """Drop the cache; the next lookup queries the server again"""
+        with self.inventory_lock:
+            self.fetched_at = None
+
+    def _refresh(self):
+        client = self.client or get_ollama_client()
+        try:
+            records = [ModelRecord.from_tags_entry(entry) for entry in client.list_models(self.timeout)]
+        except OllamaError as e:
+            self.records, self.error = [], e
+        else:
+            try:
+                running = {
+                    normalize_model_name(entry.get("name") or entry.get("model", "")): entry
+                    for entry in client.running_models(self.timeout)
+                }
+            except OllamaError:
+                running = {}  # Loaded state is best effort; the installed list is what callers need
+            for record in records:
+                entry = running.get(normalize_model_name(record.name))
+                if entry:
+                    record.loaded = True
+                    record.size_vram = int(entry.get("size_vram") or 0)
+                    record.expires_at = entry.get("expires_at", "")
+            self.records, self.error = records, None
+        self.fetched_at = time.monotonic()
+
+
+# Global inventory instance
+model_inventory = None
+model_inventory_lock = threading.Lock()
+
+
+def get_model_inventory() -> ModelInventory:
+    """Get or create global model inventory"""
+    global model_inventory
+    if model_inventory is None:
+        with model_inventory_lock:
+            if model_inventory is None:
+                model_inventory = ModelInventory()
+    return model_inventory
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Set
 
+from metrics_registry import get_metrics_registry
+
 
 @dataclass
 class ModelState:
@@ -238,6 +240,9 @@ class ModelPrewarmingManager:
 
             warmup_time = time.time() - start_time
             model.warmup_time = warmup_time
+            get_metrics_registry().histogram(
+                "djinn_model_warmup_seconds", "Pre-warming duration per model", ["model", "outcome"]
+            ).labels(model.name, "ok" if result.returncode == 0 else "error").observe(warmup_time)
 
             if result.returncode == 0:
                 model.status = "hot"
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Ollama Client
+Direct HTTP access to the local Ollama server for the Djinn Federation
+
+Talks to the server's /api/generate endpoint instead of shelling out to
+`ollama run`, so hubs can send a stable system prefix separately from the
+volatile part of a prompt (letting the server reuse its prompt KV cache)
+and read the server's timing and token counters for every request.
+"""
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics_registry import get_metrics_registry, record_cache_lookup
+from tracing import SPAN_KIND_CLIENT, get_tracer
+
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+COLD_START_LOAD_MS = 500  # load_duration above this means the model was loaded for the request
+
+
+class OllamaError(Exception):
+    """The Ollama server could not complete a request"""
+
+
+class OllamaTimeoutError(OllamaError):
+    """The Ollama server did not answer in time"""
+
+
+@dataclass
+class GenerationResult:
+    """Response text plus the server's counters (durations in milliseconds)"""
+
+    model: str
+    response: str
+    prompt_eval_count: int = 0
+    prompt_eval_duration_ms: float = 0.0
+    eval_count: int = 0
+    eval_duration_ms: float = 0.0
+    load_duration_ms: float = 0.0
+    total_duration_ms: float = 0.0
+    context: Optional[List[int]] = None
+
+    @property
+    def tokens_per_second(self) -> float:
+        if self.eval_duration_ms <= 0:
+            return 0.0
+        return self.eval_count / (self.eval_duration_ms / 1000)
+
+    @classmethod
+    def from_response(cls, model: str, data: Dict[str, Any]) -> "GenerationResult":
+        ns_to_ms = 1e-6
+        return cls(
+            model=model,
+            response=data.get("response", ""),
+            prompt_eval_count=data.get("prompt_eval_count", 0),
+            prompt_eval_duration_ms=data.get("prompt_eval_duration", 0) * ns_to_ms,
+            eval_count=data.get("eval_count", 0),
+            eval_duration_ms=data.get("eval_duration", 0) * ns_to_ms,
+            load_duration_ms=data.get("load_duration", 0) * ns_to_ms,
+            total_duration_ms=data.get("total_duration", 0) * ns_to_ms,
+            context=data.get("context"),
+        )
+
+
+def resolve_ollama_host(host: Optional[str] = None) -> str:
+    """Normalize OLLAMA_HOST-style values ('127.0.0.1:11434', 'http://host')"""
+    host = host or os.environ.get("OLLAMA_HOST") or DEFAULT_OLLAMA_HOST
+    if "://" not in host:
+        host = f"http://{host}"
+    if host.count(":") == 1:
+        host = f"{host}:11434"
+    return host.rstrip("/")
+
+
+class OllamaClient:
+    """
+    Minimal Ollama HTTP client (standard library only).
+    System prefixes passed to generate() are appended to the model's own
+    Modelfile SYSTEM prompt so federation personas are preserved.
+    """
+
+    def __init__(self, host: Optional[str] = None, keep_alive: str = "10m"):
+        self.host = resolve_ollama_host(host)
+        self.keep_alive = keep_alive
+        self.model_systems: Dict[str, str] = {}
+        self.system_lock = threading.Lock()
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        context: Optional[List[int]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: float = 120,
+        keep_alive: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> GenerationResult:
+        """
+        Run a generation and return text plus counters. With on_token the
+        server streams and each text fragment is passed on as it arrives;
+        timeout then bounds the gap between fragments, not the whole reply.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with get_tracer().span("ollama.generate", SPAN_KIND_CLIENT, model=model, stream=on_token is not None) as span:
+                payload: Dict[str, Any] = {
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": on_token is not None,
+                    "keep_alive": keep_alive or self.keep_alive,
+                }
+                if system:
+                    payload["system"] = self.compose_system(model, system, timeout)
+                if context:
+                    payload["context"] = context
+                if options:
+                    payload["options"] = options
+
+                if on_token is None:
+                    data = self._request("/api/generate", payload, timeout)
+                else:
+                    fragments: List[str] = []
+
+                    def on_chunk(chunk: Dict[str, Any]):
+                        if chunk.get("response"):
+                            if not fragments:
+                                span.add_event("first_token")
+                                get_metrics_registry().histogram(
+                                    "djinn_model_first_token_seconds", "Time to first streamed token per model", ["model"]
+                                ).labels(model).observe(time.perf_counter() - started)
+                            fragments.append(chunk["response"])
+                            on_token(chunk["response"])
+
+                    data = self._request("/api/generate", payload, timeout, on_chunk=on_chunk)
+                    data = dict(data, response="".join(fragments))  # Final chunk carries only counters
+
+                if "error" in data:
+                    raise OllamaError(data["error"])
+                result = GenerationResult.from_response(model, data)
+                span.set_attributes(
+                    prompt_eval_count=result.prompt_eval_count,
+                    eval_count=result.eval_count,
+                    load_duration_ms=result.load_duration_ms,
+                    prompt_eval_duration_ms=result.prompt_eval_duration_ms,
+                    eval_duration_ms=result.eval_duration_ms,
+                )
+            outcome = "ok"
+        except OllamaTimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            self._record_request(model, outcome, time.perf_counter() - started)
+
+        if result.load_duration_ms >= COLD_START_LOAD_MS:
+            registry = get_metrics_registry()
+            registry.counter(
+                "djinn_model_cold_starts_total", "Generations that had to load the model first", ["model"]
+            ).labels(model).inc()
+            registry.histogram(
+                "djinn_model_load_seconds", "Model load time reported by the server on cold starts", ["model"]
+            ).labels(model).observe(result.load_duration_ms / 1000)
+        return result
+
+    @staticmethod
+    def _record_request(model: str, outcome: str, seconds: float):
+        registry = get_metrics_registry()
+        registry.counter(
+            "djinn_model_requests_total", "Generations per model and outcome", ["model", "outcome"]
+        ).labels(model, outcome).inc()
+        registry.histogram(
+            "djinn_model_request_seconds", "Generation wall time per model", ["model"]
+        ).labels(model).observe(seconds)
+
+    def compose_system(self, model: str, system_prefix: str, timeout: float = 10) -> str:
+        """Model's Modelfile SYSTEM prompt followed by a hub's stable prefix"""
+        base_system = self.get_model_system(model, timeout)
+        if base_system:
+            return f"{base_system}\n\n{system_prefix}"
+        return system_prefix
+
+    def get_model_system(self, model: str, timeout: float = 10) -> str:
+        """Modelfile SYSTEM prompt for a model (cached; empty if none)"""
+        with self.system_lock:
+            cached = self.model_systems.get(model)
+        record_cache_lookup("model_system_prompt", cached is not None)
+        if cached is not None:
+            return cached
+
+        try:
+            data = self._request("/api/show", {"model": model, "name": model}, min(timeout, 10))
+        except OllamaError:
+            return ""
+
+        system = data.get("system") or self._parse_modelfile_system(data.get("modelfile", ""))
+        with self.system_lock:
+            self.model_systems[model] = system
+        return system
+
+    def list_models(self, timeout: float = 10) -> List[Dict[str, Any]]:
+        """Installed models as reported by /api/tags"""
+        return self._request("/api/tags", None, timeout).get("models") or []
+
+    def running_models(self, timeout: float = 10) -> List[Dict[str, Any]]:
+        """Models currently loaded in memory, as reported by /api/ps"""
+        return self._request("/api/ps", None, timeout).get("models") or []
+
+    @staticmethod
+    def _parse_modelfile_system(modelfile: str) -> str:
+        match = re.search(r'^SYSTEM\s+"""(.*?)"""', modelfile, re.MULTILINE | re.DOTALL)
+        if not match:
+            match = re.search(r"^SYSTEM\s+(.+)$", modelfile, re.MULTILINE)
+        return match.group(1).strip() if match else ""
+
+    def _request(
+        self,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        timeout: float,
+        on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """POST (or GET without payload) and decode JSON; on_chunk reads NDJSON streams"""
+        # urllib.request pulls in http.client, email and ssl; load them with
+        # the first request rather than whenever a hub imports the client
+        import urllib.error
+        import urllib.request
+
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            f"{self.host}{path}",
+            data=data,
+            headers={"Content-Type": "application/json"},
+            method="POST" if data is not None else "GET",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                if on_chunk is None:
+                    return json.loads(response.read().decode("utf-8"))
+                last_chunk: Dict[str, Any] = {}
+                for line in response:
+                    if line.strip():
+                        last_chunk = json.loads(line.decode("utf-8"))
+                        on_chunk(last_chunk)
+                return last_chunk
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", e.reason)
+            except (ValueError, AttributeError):
+                message = e.reason
+            raise OllamaError(f"Ollama {path} failed ({e.code}): {message}") from e
+        except urllib.error.URLError as e:
+            if isinstance(e.reason, socket.timeout):
+                raise OllamaTimeoutError(f"Ollama {path} timed out after {timeout}s") from e
+            raise OllamaError(f"Ollama server unreachable at {self.host}: {e.reason}") from e
+        except socket.timeout as e:
+            raise OllamaTimeoutError(f"Ollama {path} timed out after {timeout}s") from e
+
+
+# Global client instance
+ollama_client = None
+
+
+def get_ollama_client():
+    """Get or create global Ollama client"""
+    global ollama_client
+    if ollama_client is None:
+        ollama_client = OllamaClient()
+    return ollama_client
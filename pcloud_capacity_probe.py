@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+☁️ PCloud Capacity Probe ☁️
+Background sampling of PCloud mount capacity, throughput and latency
+
+Routing decisions read a cached snapshot and never touch the cloud drive.
+A daemon thread periodically writes and reads back a multi-megabyte
+incompressible payload (small files mostly measure request latency on a
+network mount), times a metadata round trip separately, and keeps an EWMA
+plus recent-sample percentiles for each metric.
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional
+
+DEFAULT_PAYLOAD_BYTES = 4 * 1024 * 1024
+DEFAULT_PROBE_INTERVAL = 300  # Seconds between samples
+MB = 1024 * 1024
+
+# Write throughput (MB/s) thresholds for the performance rating
+GOOD_WRITE_MBPS = 10.0
+MODERATE_WRITE_MBPS = 2.0
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a sequence (0.0 when empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class MetricWindow:
+    """EWMA plus a bounded window of raw samples for one metric"""
+
+    def __init__(self, alpha: float, window: int):
+        self.alpha = alpha
+        self.ewma: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.ewma = value if self.ewma is None else self.alpha * value + (1 - self.alpha) * self.ewma
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "ewma": round(self.ewma or 0.0, 3),
+            "p50": round(percentile(self.samples, 0.5), 3),
+            "p95": round(percentile(self.samples, 0.95), 3),
+            "last": round(self.samples[-1], 3) if self.samples else 0.0,
+        }
+
+
+class PCloudCapacityProbe:
+    """
+    Samples a mount in the background; snapshot() is served from memory.
+    """
+
+    def __init__(
+        self,
+        mount_path: str,
+        probe_dir: Optional[str] = None,
+        payload_bytes: int = DEFAULT_PAYLOAD_BYTES,
+        interval: float = DEFAULT_PROBE_INTERVAL,
+        alpha: float = 0.3,
+        window: int = 50,
+        timer: Callable[[], float] = time.perf_counter,
+    ):
+        self.mount_path = mount_path
+        self.probe_dir = probe_dir or mount_path
+        self.payload_bytes = payload_bytes
+        self.interval = interval
+        self.timer = timer
+
+        self.metrics = {
+            "write_mbps": MetricWindow(alpha, window),
+            "read_mbps": MetricWindow(alpha, window),
+            "latency_ms": MetricWindow(alpha, window),
+        }
+        self.capacity: Dict[str, float] = {}
+        self.available = True  # Mount was detected; the first sample confirms it
+        self.last_error: Optional[str] = None
+        self.last_sampled_at: Optional[float] = None
+        self.sample_count = 0
+
+        self.probe_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.probe_thread = None
+
+    def start(self):
+        """Sample now and then every interval, in a daemon thread"""
+        if self.probe_thread and self.probe_thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+        self.probe_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.probe_thread:
+            self.probe_thread.join()
+
+    def _probe_loop(self):
+        while not self.stop_event.is_set():
+            self.sample()
+            self.stop_event.wait(self.interval)
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one measurement (blocking I/O on the mount) and return the new snapshot"""
+        try:
+            usage = shutil.disk_usage(self.mount_path)
+            latency_ms = self._measure_latency()
+            write_mbps, read_mbps = self._measure_throughput()
+        except Exception as e:
+            with self.probe_lock:
+                self.available = False
+                self.last_error = str(e)
+                self.last_sampled_at = time.time()
+            return self.snapshot()
+
+        with self.probe_lock:
+            total_gb = usage.total / (1024**3)
+            free_gb = usage.free / (1024**3)
+            self.capacity = {
+                "total_gb": round(total_gb, 1),
+                "free_gb": round(free_gb, 1),
+                "used_gb": round(total_gb - free_gb, 1),
+                "usage_percent": round(((total_gb - free_gb) / total_gb) * 100, 1) if total_gb else 0.0,
+            }
+            self.metrics["latency_ms"].add(latency_ms)
+            self.metrics["write_mbps"].add(write_mbps)
+            self.metrics["read_mbps"].add(read_mbps)
+            self.available = True
+            self.last_error = None
+            self.last_sampled_at = time.time()
+            self.sample_count += 1
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest capacity and performance figures (never touches the mount)"""
+        with self.probe_lock:
+            if not self.available:
+                return {"available": False, "error": self.last_error}
+
+            status: Dict[str, Any] = {"available": True, **self.capacity}
+            if not self.sample_count:
+                status.update({
+                    "write_speed_estimate": "Unknown",
+                    "read_speed_estimate": "Unknown",
+                    "performance_rating": "Probing",
+                })
+                return status
+
+            summaries = {name: metric.summary() for name, metric in self.metrics.items()}
+            write_mbps = summaries["write_mbps"]["ewma"]
+            status.update({
+                "write_speed_estimate": f"{write_mbps:.1f} MB/s",
+                "read_speed_estimate": f"{summaries['read_mbps']['ewma']:.1f} MB/s",
+                "performance_rating": (
+                    "Good" if write_mbps >= GOOD_WRITE_MBPS
+                    else "Moderate" if write_mbps >= MODERATE_WRITE_MBPS
+                    else "Slow"
+                ),
+                "metrics": summaries,
+                "samples": self.sample_count,
+                "sampled_at": datetime.fromtimestamp(self.last_sampled_at).isoformat(),
+                "sample_age_seconds": round(time.time() - self.last_sampled_at, 1),
+            })
+            return status
+
+    def _probe_path(self, suffix: str) -> str:
+        return os.path.join(self.probe_dir, f".djinn_probe_{uuid.uuid4().hex[:8]}{suffix}")
+
+    def _measure_latency(self) -> float:
+        """Create, stat and delete an empty file: one metadata round trip each"""
+        path = self._probe_path(".latency")
+        start = self.timer()
+        with open(path, "wb"):
+            pass
+        os.stat(path)
+        os.remove(path)
+        return (self.timer() - start) * 1000 / 3
+
+    def _measure_throughput(self):
+        payload = os.urandom(self.payload_bytes)  # Incompressible, defeats transfer compression
+        path = self._probe_path(".tmp")
+        try:
+            start = self.timer()
+            with open(path, "wb") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            write_seconds = self.timer() - start
+
+            start = self.timer()
+            with open(path, "rb") as f:
+                while f.read(MB):
+                    pass
+            read_seconds = self.timer() - start
+        finally:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        size_mb = self.payload_bytes / MB
+        return size_mb / max(write_seconds, 1e-6), size_mb / max(read_seconds, 1e-6)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+☁️ PCloud Completion Watcher ☁️
+Event-driven completion notifications for PCloud tasks
+
+Lets the hub's event loop `await watcher.wait_for(task_id)` instead of
+polling check_pcloud_task_status on a timer. One watcher serves every
+waiting task in a completed_tasks directory:
+
+- Linux: inotify (via ctypes, no extra dependencies) reports completion
+  files as workers rename them into place. A slow backstop poll still runs,
+  because FUSE/network mounts do not always deliver events for writes made
+  by other devices.
+- Elsewhere: polling with adaptive backoff. Checks start fast and slow down
+  geometrically while nothing completes, so a long-running task costs a
+  handful of stat calls on the cloud mount rather than a steady stream.
+
+Filesystem access runs in the default executor so a slow mount never
+blocks the event loop.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# inotify constants (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000  # O_NONBLOCK on Linux; os.O_NONBLOCK does not exist on Windows
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify requires Linux")
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    _libc = None
+    INOTIFY_AVAILABLE = False
+
+
+def parse_inotify_names(data: bytes) -> List[str]:
+    """File names from a buffer of inotify_event records"""
+    names = []
+    offset = 0
+    while offset + INOTIFY_EVENT_HEADER.size <= len(data):
+        _, _, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+        offset += INOTIFY_EVENT_HEADER.size
+        name = data[offset:offset + name_length].rstrip(b"\0")
+        offset += name_length
+        if name:
+            names.append(os.fsdecode(name))
+    return names
+
+
+class CompletionWatcher:
+    """
+    Awaitable completion files for a completed_tasks directory.
+    Bound to the event loop that first calls wait_for().
+    """
+
+    def __init__(
+        self,
+        completed_dir,
+        use_inotify: Optional[bool] = None,
+        min_interval: float = 0.05,
+        max_interval: float = 2.0,
+        backoff: float = 2.0,
+        backstop_interval: float = 5.0,
+    ):
+        self.completed_dir = Path(completed_dir)
+        self.use_inotify = INOTIFY_AVAILABLE if use_inotify is None else (use_inotify and INOTIFY_AVAILABLE)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.backstop_interval = backstop_interval
+
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.loop = None
+        self.inotify_fd = None
+        self.poll_task = None
+        self.wakeup = None
+        self.stats = {"polls": 0, "stat_calls": 0, "events": 0, "completions": 0}
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self.inotify_fd is not None else "polling"
+
+    async def wait_for(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Completion record for a task, or None if it does not finish within timeout"""
+        self._ensure_started()
+        future = self.loop.create_future()
+        self.waiters.setdefault(task_id, []).append(future)
+
+        # Registered first, so a file landing during this check is not missed
+        await self._check(task_id)
+        if not future.done():
+            self.wakeup.set()
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            remaining = [f for f in self.waiters.get(task_id, []) if f is not future]
+            if remaining:
+                self.waiters[task_id] = remaining
+            else:
+                self.waiters.pop(task_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "backend": self.backend, "waiting_tasks": len(self.waiters)}
+
+    def close(self):
+        """Stop watching (pending waiters are cancelled)"""
+        loop_open = self.loop is not None and not self.loop.is_closed()
+        if self.inotify_fd is not None:
+            if loop_open:
+                self.loop.remove_reader(self.inotify_fd)
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+        if self.poll_task and loop_open:
+            self.poll_task.cancel()
+        self.poll_task = None
+        if loop_open:
+            for futures in self.waiters.values():
+                for future in futures:
+                    future.cancel()
+        self.waiters.clear()
+        self.loop = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is loop:
+            return
+        if self.loop is not None:
+            self.close()
+
+        self.loop = loop
+        self.wakeup = asyncio.Event()
+        if self.use_inotify:
+            self._start_inotify()
+        self.poll_task = loop.create_task(self._poll_loop())
+
+    def _start_inotify(self):
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        watch = _libc.inotify_add_watch(fd, os.fsencode(str(self.completed_dir)), IN_MOVED_TO | IN_CLOSE_WRITE)
+        if watch < 0:
+            os.close(fd)
+            return
+        self.inotify_fd = fd
+        self.loop.add_reader(fd, self._on_inotify_readable)
+
+    def _on_inotify_readable(self):
+        try:
+            data = os.read(self.inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        for name in parse_inotify_names(data):
+            self.stats["events"] += 1
+            if name.startswith(".") or not name.endswith(".json"):
+                continue  # Temporary files from atomic writes
+            task_id = name[:-len(".json")]
+            if task_id in self.waiters:
+                self.loop.create_task(self._check(task_id))
+
+    async def _poll_loop(self):
+        # With inotify the poll is only a backstop for mounts that miss events
+        floor = self.backstop_interval if self.inotify_fd is not None else self.min_interval
+        ceiling = self.backstop_interval if self.inotify_fd is not None else self.max_interval
+        interval = floor
+
+        while True:
+            timeout = interval if self.waiters else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+                self.wakeup.clear()
+                interval = floor  # New waiter: check soon
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            self.stats["polls"] += 1
+            found = False
+            for task_id in list(self.waiters):
+                found = await self._check(task_id) or found
+            interval = floor if found else min(interval * self.backoff, ceiling)
+
+    async def _check(self, task_id: str) -> bool:
+        self.stats["stat_calls"] += 1
+        result = await self.loop.run_in_executor(None, self._read_result, task_id)
+        if result is None:
+            return False
+        self._resolve(task_id, result)
+        return True
+
+    def _read_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.completed_dir / f"{task_id}.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _resolve(self, task_id: str, result: Dict[str, Any]):
+        for future in self.waiters.get(task_id, []):
+            if not future.done():
+                future.set_result(result)
+                self.stats["completions"] += 1
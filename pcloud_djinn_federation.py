@@ -11,17 +11,21 @@ ARCHITECTURE:
 """
 
 import asyncio
-import json
 import os
-import subprocess
 import sys
-import time
-import psutil
-import shutil
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from federated_memory_log import FederatedMemoryLog
+from latency_router import RouteCandidate, get_latency_router
+from pcloud_capacity_probe import PCloudCapacityProbe
+from pcloud_completion_watcher import CompletionWatcher
+from pcloud_model_sync import ModelSyncError, PCloudModelSync
+from pcloud_task_queue import PCloudTaskQueue
+from prompt_context_builder import estimate_tokens
+from resource_sampler import get_resource_sampler
+
 class PCloudDjinnFederation:
     """
     ☁️ PCloud-Powered Djinn Federation ☁️
@@ -37,12 +41,24 @@ class PCloudDjinnFederation:
     def __init__(self):
         self.pcloud_drive = self.detect_pcloud_mount()
         self.local_models_dir = "djinn_models_local"
+        self.task_queue = None
+        self.completion_watcher = None
+        self.memory_log = None
+        self.capacity_probe = None
+        self.latency_router = get_latency_router()
+        self.pcloud_task_timeout = 600  # Seconds to wait for a remote worker
         
         if self.pcloud_drive:
             self.pcloud_models_dir = f"{self.pcloud_drive}/djinn_models"
             self.pcloud_memory_dir = f"{self.pcloud_drive}/djinn_memory"
             self.pcloud_operations_dir = f"{self.pcloud_drive}/djinn_operations"
             self.setup_pcloud_structure()
+            self.task_queue = PCloudTaskQueue(self.pcloud_operations_dir)
+            self.completion_watcher = CompletionWatcher(self.task_queue.completed_dir)
+            self.memory_log = FederatedMemoryLog(f"{self.pcloud_memory_dir}/conversations")
+            self.memory_log.import_legacy(f"{self.pcloud_memory_dir}/conversations/federated_memory.json")
+            self.capacity_probe = PCloudCapacityProbe(self.pcloud_drive, probe_dir=self.pcloud_operations_dir)
+            self.capacity_probe.start()
         else:
             print("⚠️  PCloud not detected. Operating in local-only mode.")
             
@@ -118,6 +134,8 @@ class PCloudDjinnFederation:
             self.pcloud_operations_dir,
             f"{self.pcloud_operations_dir}/pending_tasks",
             f"{self.pcloud_operations_dir}/completed_tasks",
+            f"{self.pcloud_operations_dir}/claimed",
+            f"{self.pcloud_operations_dir}/leases",
             f"{self.pcloud_operations_dir}/federated_sessions",
             f"{self.pcloud_memory_dir}/conversations",
             f"{self.pcloud_memory_dir}/user_preferences", 
@@ -133,62 +151,18 @@ class PCloudDjinnFederation:
             except Exception as e:
                 print(f"⚠️  Could not create {directory}: {e}")
                 
-    def check_pcloud_capacity(self) -> Dict:
-        """Check PCloud storage capacity and performance"""
-        if not self.pcloud_drive:
+    def check_pcloud_capacity(self, refresh: bool = False) -> Dict:
+        """PCloud storage capacity and performance from the background probe"""
+        if not self.capacity_probe:
             return {"available": False}
             
-        try:
-            statvfs = shutil.disk_usage(self.pcloud_drive)
-            total_gb = statvfs.total / (1024**3)
-            free_gb = statvfs.free / (1024**3)
-            used_gb = total_gb - free_gb
-            
-            # Test write/read speed (rough estimate)
-            test_file = f"{self.pcloud_drive}/djinn_speed_test.tmp"
-            start_time = time.time()
-            
-            try:
-                with open(test_file, 'w') as f:
-                    f.write("PCloud speed test" * 1000)  # ~17KB
-                write_time = time.time() - start_time
-                
-                start_time = time.time()
-                with open(test_file, 'r') as f:
-                    content = f.read()
-                read_time = time.time() - start_time
-                
-                os.remove(test_file)
-                
-                return {
-                    "available": True,
-                    "total_gb": round(total_gb, 1),
-                    "free_gb": round(free_gb, 1),
-                    "used_gb": round(used_gb, 1),
-                    "usage_percent": round((used_gb / total_gb) * 100, 1),
-                    "write_speed_estimate": f"{17/write_time:.1f} KB/s" if write_time > 0 else "Unknown",
-                    "read_speed_estimate": f"{17/read_time:.1f} KB/s" if read_time > 0 else "Unknown",
-                    "performance_rating": "Good" if (write_time + read_time) < 2 else "Moderate" if (write_time + read_time) < 5 else "Slow"
-                }
-                
-            except Exception as e:
-                return {
-                    "available": True,
-                    "total_gb": round(total_gb, 1), 
-                    "free_gb": round(free_gb, 1),
-                    "used_gb": round(used_gb, 1),
-                    "usage_percent": round((used_gb / total_gb) * 100, 1),
-                    "write_speed_estimate": "Unknown",
-                    "read_speed_estimate": "Unknown", 
-                    "performance_rating": "Unknown",
-                    "error": str(e)
-                }
-                
-        except Exception as e:
-            return {"available": False, "error": str(e)}
+        # Cached figures by default: routing never waits on the cloud drive
+        if refresh:
+            return self.capacity_probe.sample()
+        return self.capacity_probe.snapshot()
             
-    def sync_models_to_pcloud(self) -> bool:
-        """Sync revolutionary models to PCloud for cloud operations"""
+    def sync_models_to_pcloud(self, models_to_sync: Optional[List[str]] = None) -> bool:
+        """Sync model blobs to PCloud (content-addressed; unchanged models are skipped)"""
         if not self.pcloud_drive:
             print("❌ PCloud not available for model sync")
             return False
@@ -196,35 +170,26 @@ class PCloudDjinnFederation:
         print("🔄 Syncing revolutionary models to PCloud...")
         
         # Models to sync (the large revolutionary ones)
-        models_to_sync = [
+        models_to_sync = models_to_sync or [
             "djinn-cosmic-coder:latest",
             "djinn-deep-thinker:latest", 
             "djinn-logic-master:latest",
             "djinn-enterprise-architect:latest"
         ]
         
+        model_sync = PCloudModelSync(self.pcloud_models_dir)
         for model in models_to_sync:
             try:
                 print(f"📤 Syncing {model} to PCloud...")
-                
-                # Export model to PCloud
-                model_name = model.replace(":", "_")
-                pcloud_model_path = f"{self.pcloud_models_dir}/revolutionary/{model_name}.Modelfile"
-                
-                # Export modelfile
-                result = subprocess.run(
-                    ['ollama', 'show', model, '--modelfile'],
-                    capture_output=True,
-                    text=True
-                )
-                
-                if result.returncode == 0:
-                    with open(pcloud_model_path, 'w', encoding='utf-8') as f:
-                        f.write(result.stdout)
-                    print(f"✅ {model} synced to PCloud")
+                report = model_sync.push(model)
+                if report.status == "unchanged":
+                    print(f"✅ {model} already up to date on PCloud")
                 else:
-                    print(f"⚠️  Could not export {model}: {result.stderr}")
-                    
+                    print(f"✅ {model} synced: {report.blobs_transferred}/{report.blobs_total} blobs, "
+                          f"{report.chunks_uploaded} chunks uploaded, {report.chunks_skipped} reused "
+                          f"({report.bytes_transferred / (1024**3):.2f}GB in {report.seconds:.0f}s)")
+            except ModelSyncError as e:
+                print(f"⚠️  Could not sync {model}: {e}")
             except Exception as e:
                 print(f"❌ Error syncing {model}: {e}")
                 
@@ -232,27 +197,12 @@ class PCloudDjinnFederation:
         return True
         
     def create_pcloud_task(self, task_type: str, query: str, model: str) -> str:
-        """Create a task file for PCloud-based execution"""
-        if not self.pcloud_drive:
+        """Queue a task for execution by a PCloud worker"""
+        if not self.task_queue:
             return None
             
-        task_id = f"djinn_task_{int(time.time())}"
-        task_file = f"{self.pcloud_operations_dir}/pending_tasks/{task_id}.json"
-        
-        task_data = {
-            "task_id": task_id,
-            "type": task_type,
-            "query": query,
-            "model": model,
-            "created_at": datetime.now().isoformat(),
-            "status": "pending",
-            "requester": "local_djinn_federation",
-            "priority": "normal"
-        }
-        
         try:
-            with open(task_file, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, indent=2, ensure_ascii=False)
+            task_id = self.task_queue.enqueue(task_type, query, model)
             print(f"📝 Created PCloud task: {task_id}")
             return task_id
         except Exception as e:
@@ -260,58 +210,23 @@ class PCloudDjinnFederation:
             return None
             
     def check_pcloud_task_status(self, task_id: str) -> Dict:
-        """Check status of a PCloud task"""
-        if not self.pcloud_drive:
+        """Check status of a PCloud task (pending, running, completed or failed)"""
+        if not self.task_queue:
             return {"status": "error", "message": "PCloud not available"}
             
-        # Check pending tasks
-        pending_file = f"{self.pcloud_operations_dir}/pending_tasks/{task_id}.json"
-        completed_file = f"{self.pcloud_operations_dir}/completed_tasks/{task_id}.json"
-        
-        if os.path.exists(completed_file):
-            try:
-                with open(completed_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                return {"status": "error", "message": f"Error reading completed task: {e}"}
-                
-        elif os.path.exists(pending_file):
-            return {"status": "pending", "message": "Task is still being processed"}
-            
-        else:
-            return {"status": "not_found", "message": "Task not found"}
+        try:
+            return self.task_queue.status(task_id)
+        except Exception as e:
+            return {"status": "error", "message": f"Error reading task status: {e}"}
             
     def federate_memory_to_pcloud(self, conversation_data: Dict):
-        """Sync conversation memory to PCloud for federation across devices"""
-        if not self.pcloud_drive:
+        """Append conversation memory to this device's PCloud segment"""
+        if not self.memory_log:
             return
             
         try:
-            memory_file = f"{self.pcloud_memory_dir}/conversations/federated_memory.json"
-            
-            # Load existing federated memory
-            federated_memory = []
-            if os.path.exists(memory_file):
-                with open(memory_file, 'r', encoding='utf-8') as f:
-                    federated_memory = json.load(f)
-                    
-            # Add new conversation data
-            federated_memory.append({
-                **conversation_data,
-                "federated_at": datetime.now().isoformat(),
-                "source_device": "main_pc"
-            })
-            
-            # Keep only last 1000 conversations
-            if len(federated_memory) > 1000:
-                federated_memory = federated_memory[-1000:]
-                
-            # Save updated memory
-            with open(memory_file, 'w', encoding='utf-8') as f:
-                json.dump(federated_memory, f, indent=2, ensure_ascii=False)
-                
-            print("🧠 Memory federated to PCloud")
-            
+            if self.memory_log.append(conversation_data):
+                print("🧠 Memory federated to PCloud")
         except Exception as e:
             print(f"⚠️  Error federating memory: {e}")
             
@@ -357,7 +272,7 @@ class PCloudDjinnFederation:
         print(banner)
         
     async def intelligent_routing(self, query: str) -> Tuple[str, str, str]:
-        """Intelligently route between local and PCloud execution"""
+        """Route to whichever tier is predicted to finish first at the required quality"""
         
         # Analyze query complexity and requirements
         query_lower = query.lower()
@@ -369,23 +284,32 @@ class PCloudDjinnFederation:
         pcloud_score = sum(1 for kw in pcloud_keywords if kw in query_lower)
         
         # System capabilities
-        local_memory = psutil.virtual_memory()
+        local_ram_percent = get_resource_sampler().snapshot()["ram_percent"]
         pcloud_status = self.check_pcloud_capacity()
         
         # Decision logic
         if not pcloud_status.get("available"):
             return "local", "Use best available local model", "PCloud not available"
             
-        if pcloud_score >= 2 or word_count >= 30:
-            return "pcloud", "Complex task requiring cloud power", f"PCloud indicators: {pcloud_score}"
+        candidates = [RouteCandidate(
+            "pcloud", "cosmic_coding", self.federation_tiers["pcloud"]["models"]["cosmic_coding"],
+            quality=0.95, prior_seconds=60, prior_cold_start_seconds=30
+        )]
+        if local_ram_percent <= 85:
+            candidates.append(RouteCandidate(
+                "local", "capable", self.federation_tiers["local"]["models"]["capable"],
+                quality=0.75, prior_seconds=8, prior_cold_start_seconds=2
+            ))
             
-        if local_memory.percent > 85:
-            return "pcloud", "Local system under memory pressure", f"Local RAM: {local_memory.percent}%"
-            
-        return "local", "Suitable for local execution", "Efficient local processing"
+        quality_floor = min(0.9, 0.6 + 0.15 * pcloud_score + word_count / 200)
+        decision = self.latency_router.choose(candidates, estimate_tokens(query), quality_floor)
+        details = f"PCloud indicators: {pcloud_score} | Local RAM: {local_ram_percent}% | " + ", ".join(
+            f"{alt['tier']} ~{alt['predicted_seconds']:.0f}s" for alt in decision.alternatives
+        )
+        return decision.candidate.tier, decision.reasoning, details
         
     async def execute_pcloud_operation(self, model: str, query: str) -> str:
-        """Execute operation via PCloud infrastructure"""
+        """Execute operation via a PCloud worker and wait for its result"""
         
         # Create task for PCloud execution
         task_id = self.create_pcloud_task("query_execution", query, model)
@@ -395,30 +319,29 @@ class PCloudDjinnFederation:
         print(f"☁️ PCloud task created: {task_id}")
         print("⏳ Waiting for PCloud execution...")
         
-        # In a real implementation, this would:
-        # 1. Wait for another device to pick up the task
-        # 2. Execute the model on that device
-        # 3. Return the results via PCloud
-        
-        # For now, simulate the operation
-        await asyncio.sleep(2)  # Simulate processing time
-        
-        return f"""✨ PCloud Execution Simulation:
+        started = asyncio.get_event_loop().time()
+        self.latency_router.begin("pcloud")
+        try:
+            result = await self.completion_watcher.wait_for(task_id, timeout=self.pcloud_task_timeout)
+        finally:
+            self.latency_router.end("pcloud")
+        self.latency_router.record(
+            model, "pcloud", estimate_tokens(query), asyncio.get_event_loop().time() - started,
+            success=bool(result) and result.get("status") == "completed"
+        )
         
-Task ID: {task_id}
-Model: {model}
-Query: {query[:100]}...
-
-🌟 This would be executed on a PCloud-connected device with the revolutionary model installed.
-The result would be federated back through PCloud and displayed here.
-
-To implement full PCloud operations:
-1. Install Djinn Federation on multiple devices
-2. Mount PCloud on all devices
-3. Run PCloud monitoring service
-4. Enable distributed task execution
-
-🜂 The mystical federation awaits full PCloud integration!"""
+        if result is None:
+            status = self.check_pcloud_task_status(task_id)
+            return f"""⏳ PCloud task {task_id} is still {status.get('status', 'pending')} after {self.pcloud_task_timeout}s.
+The result will appear in {self.pcloud_operations_dir}/completed_tasks when a worker finishes it.
+Start a worker on a device with {model} installed:
+  python pcloud_task_queue.py worker --operations-dir {self.pcloud_operations_dir}"""
+            
+        if result.get("status") == "failed":
+            return f"❌ PCloud task {task_id} failed on {result.get('worker_id')}: {result.get('error')}"
+            
+        print(f"✨ PCloud task completed by {result.get('worker_id')}")
+        return result.get("response") or ""
         
     async def interactive_mode(self):
         """Run PCloud Djinn Federation interactive mode"""
@@ -444,12 +367,16 @@ To implement full PCloud operations:
                     print("☁️ PCloud Djinn Federation signing off! May the cloud wisdom guide you!")
                     break
                 elif user_input.lower() == "/pcloud":
-                    status = self.check_pcloud_capacity()
+                    status = self.check_pcloud_capacity(refresh=True)
                     if status.get("available"):
                         print(f"\n☁️ PCloud Status: CONNECTED ({self.pcloud_drive})")
                         print(f"  Storage: {status['free_gb']:.1f}GB free of {status['total_gb']:.1f}GB")
-                        print(f"  Performance: {status['performance_rating']}")
-                        print(f"  Models: {len(os.listdir(f'{self.pcloud_models_dir}/revolutionary') if os.path.exists(f'{self.pcloud_models_dir}/revolutionary') else [])} synced")
+                        print(f"  Performance: {status['performance_rating']} (write {status['write_speed_estimate']}, read {status['read_speed_estimate']})")
+                        if status.get("metrics"):
+                            latency = status["metrics"]["latency_ms"]
+                            print(f"  Latency: p50 {latency['p50']:.0f}ms | p95 {latency['p95']:.0f}ms over {status['samples']} samples")
+                        synced_dir = f"{self.pcloud_models_dir}/store/models"
+                        print(f"  Models: {len(os.listdir(synced_dir)) if os.path.exists(synced_dir) else 0} synced")
                     else:
                         print("\n❌ PCloud not connected")
                     print()
@@ -458,11 +385,10 @@ To implement full PCloud operations:
                     self.sync_models_to_pcloud()
                     continue
                 elif user_input.lower() == "/federate":
-                    memory_file = f"{self.pcloud_memory_dir}/conversations/federated_memory.json"
-                    if os.path.exists(memory_file):
-                        with open(memory_file, 'r') as f:
-                            memory = json.load(f)
-                        print(f"\n🧠 Federated Memory: {len(memory)} conversations across devices")
+                    if self.memory_log:
+                        memory = self.memory_log.read()
+                        stats = self.memory_log.get_stats()
+                        print(f"\n🧠 Federated Memory: {len(memory)} conversations across {stats['devices']} devices")
                     else:
                         print("\n🧠 No federated memory found")
                     print()
@@ -474,10 +400,11 @@ To implement full PCloud operations:
                     print()
                     continue
                 elif user_input.lower() == "/status":
-                    caps = psutil.virtual_memory()
+                    caps = get_resource_sampler().snapshot()
                     pcloud = self.check_pcloud_capacity()
                     print(f"\n📊 System Status:")
-                    print(f"  Local RAM: {caps.available/(1024**3):.1f}GB / {caps.total/(1024**3):.1f}GB")
+                    print(f"  Local RAM: {caps['ram_available_gb']:.1f}GB / {caps['ram_total_gb']:.1f}GB")
+                    print(f"  CPU: {caps['cpu_avg_percent']:.0f}% (avg) | Swap: {caps['swap_percent']:.0f}%")
                     print(f"  PCloud: {'✅ Connected' if pcloud.get('available') else '❌ Disconnected'}")
                     print()
                     continue
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+☁️ PCloud Model Sync ☁️
+Chunked, content-addressed sync of the local Ollama model store to PCloud
+
+Remote layout (under djinn_models/):
+
+    store/chunks/<aa>/<sha256>        64 MiB chunks, stored once
+    store/blobs/<blob-digest>.json    chunk list of one Ollama blob
+    store/models/<model>.json         the model's Ollama manifest
+
+Ollama manifests already name every layer by its sha256 digest, so an
+unchanged model re-syncs with a manifest compare and no blob reads. New
+blobs are split into chunks; chunks already present remotely are skipped
+and the rest upload in parallel with bounded concurrency. Chunks land
+under their final name only once complete and a blob manifest is written
+only after all of its chunks, so an interrupted sync resumes where it
+stopped. Chunk hashes are cached locally by blob digest, so resuming does
+not re-hash.
+
+    python pcloud_model_sync.py push djinn-federation:idhhc --remote Z:/djinn_models
+    python pcloud_model_sync.py pull djinn-federation:idhhc --remote Z:/djinn_models
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_REGISTRY = "registry.ollama.ai"
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_UPLOAD_WORKERS = 4
+READ_BUFFER = 4 * 1024 * 1024
+
+
+class ModelSyncError(Exception):
+    """A model could not be synced or restored"""
+
+
+def default_models_dir() -> Path:
+    """Local Ollama model store (OLLAMA_MODELS or ~/.ollama/models)"""
+    return Path(os.environ.get("OLLAMA_MODELS") or Path.home() / ".ollama" / "models")
+
+
+def parse_model_name(model: str) -> Tuple[str, str, str, str]:
+    """'Yufok1/djinn-federation:idhhc' -> (registry, namespace, repository, tag)"""
+    name, tag = model, "latest"
+    if ":" in model.rsplit("/", 1)[-1]:
+        name, tag = model.rsplit(":", 1)
+
+    parts = name.split("/")
+    if len(parts) == 1:
+        return DEFAULT_REGISTRY, "library", parts[0], tag
+    if len(parts) == 2:
+        return DEFAULT_REGISTRY, parts[0], parts[1], tag
+    return parts[0], parts[1], "/".join(parts[2:]), tag
+
+
+def safe_model_name(model: str) -> str:
+    return model.replace("/", "__").replace(":", "_")
+
+
+@dataclass
+class SyncReport:
+    """What one push or pull did"""
+
+    model: str
+    status: str  # "unchanged", "synced" or "restored"
+    blobs_total: int = 0
+    blobs_transferred: int = 0
+    chunks_uploaded: int = 0
+    chunks_skipped: int = 0
+    bytes_transferred: int = 0
+    seconds: float = 0.0
+
+
+class PCloudModelSync:
+    """Content-addressed push/pull between an Ollama store and a PCloud directory"""
+
+    def __init__(
+        self,
+        remote_dir,
+        models_dir=None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = DEFAULT_UPLOAD_WORKERS,
+        state_dir=None,
+    ):
+        self.models_dir = Path(models_dir) if models_dir else default_models_dir()
+        self.store_dir = Path(remote_dir) / "store"
+        self.chunks_dir = self.store_dir / "chunks"
+        self.blobs_dir = self.store_dir / "blobs"
+        self.manifests_dir = self.store_dir / "models"
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+        self.state_dir = Path(state_dir) if state_dir else Path("memory_bank") / "model_sync"
+        self.chunk_index_file = self.state_dir / "chunk_index.json"
+        self.chunk_index: Dict[str, Dict[str, Any]] = self._load_chunk_index()
+        self.index_lock = threading.Lock()
+
+        for directory in (self.chunks_dir, self.blobs_dir, self.manifests_dir, self.state_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Push
+    # ------------------------------------------------------------------
+
+    def push(self, model: str) -> SyncReport:
+        """Upload a local model; unchanged models cost a manifest compare"""
+        started = time.time()
+        manifest = self.read_local_manifest(model)
+        report = SyncReport(model=model, status="unchanged")
+        digests = self._layer_digests(manifest)
+        report.blobs_total = len(digests)
+
+        remote = self._read_json(self.manifests_dir / f"{safe_model_name(model)}.json")
+        if remote and remote.get("manifest") == manifest and all(self._remote_blob_exists(d) for d in digests):
+            report.seconds = round(time.time() - started, 3)
+            return report
+
+        for digest in digests:
+            if self._remote_blob_exists(digest):
+                continue
+            self._push_blob(digest, report)
+            report.blobs_transferred += 1
+
+        self._write_json(self.manifests_dir / f"{safe_model_name(model)}.json", {
+            "model": model,
+            "manifest": manifest,
+            "synced_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        report.status = "synced"
+        report.seconds = round(time.time() - started, 3)
+        return report
+
+    def _push_blob(self, digest: str, report: SyncReport):
+        blob_path = self._local_blob_path(digest)
+        size = blob_path.stat().st_size
+        chunks = self._chunk_hashes(digest, blob_path, size)
+
+        missing = [(index, chunk) for index, chunk in enumerate(chunks) if not self._chunk_path(chunk).exists()]
+        report.chunks_skipped += len(chunks) - len(missing)
+
+        def upload(item):
+            index, chunk = item
+            offset = index * self.chunk_size
+            length = min(self.chunk_size, size - offset)
+            with open(blob_path, "rb") as f:
+                f.seek(offset)
+                self._write_atomic(self._chunk_path(chunk), f.read(length))
+            return length
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for length in pool.map(upload, missing):
+                report.chunks_uploaded += 1
+                report.bytes_transferred += length
+
+        self._write_json(self.blobs_dir / f"{self._digest_name(digest)}.json", {
+            "digest": digest,
+            "size": size,
+            "chunk_size": self.chunk_size,
+            "chunks": chunks,
+        })
+
+    def _chunk_hashes(self, digest: str, blob_path: Path, size: int) -> List[str]:
+        """Chunk sha256s for a blob, verifying the blob digest (cached by digest)"""
+        with self.index_lock:
+            cached = self.chunk_index.get(digest)
+        if cached and cached.get("chunk_size") == self.chunk_size and cached.get("size") == size:
+            return cached["chunks"]
+
+        blob_hash = hashlib.sha256()
+        chunks = []
+        with open(blob_path, "rb") as f:
+            while True:
+                chunk_hash = hashlib.sha256()
+                remaining = self.chunk_size
+                while remaining:
+                    data = f.read(min(READ_BUFFER, remaining))
+                    if not data:
+                        break
+                    chunk_hash.update(data)
+                    blob_hash.update(data)
+                    remaining -= len(data)
+                if remaining == self.chunk_size:
+                    break
+                chunks.append(chunk_hash.hexdigest())
+
+        if f"sha256:{blob_hash.hexdigest()}" != self._normalize_digest(digest):
+            raise ModelSyncError(f"Local blob {digest} is corrupt (content hash mismatch)")
+
+        with self.index_lock:
+            self.chunk_index[digest] = {"size": size, "chunk_size": self.chunk_size, "chunks": chunks}
+            self._write_json(self.chunk_index_file, self.chunk_index)
+        return chunks
+
+    # ------------------------------------------------------------------
+    # Pull
+    # ------------------------------------------------------------------
+
+    def pull(self, model: str) -> SyncReport:
+        """Restore a synced model into the local Ollama store"""
+        started = time.time()
+        remote = self._read_json(self.manifests_dir / f"{safe_model_name(model)}.json")
+        if not remote:
+            raise ModelSyncError(f"{model} has not been synced to PCloud")
+
+        manifest = remote["manifest"]
+        digests = self._layer_digests(manifest)
+        report = SyncReport(model=model, status="restored", blobs_total=len(digests))
+
+        for digest in digests:
+            target = self.models_dir / "blobs" / self._digest_name(digest)
+            if self._find_local_blob(digest):
+                continue
+            blob = self._read_json(self.blobs_dir / f"{self._digest_name(digest)}.json")
+            if not blob:
+                raise ModelSyncError(f"Blob {digest} of {model} is missing from PCloud")
+            report.bytes_transferred += self._assemble_blob(blob, target)
+            report.blobs_transferred += 1
+
+        registry, namespace, repository, tag = parse_model_name(model)
+        manifest_path = self.models_dir / "manifests" / registry / namespace / repository / tag
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+
+        # The restored model is installed now; don't answer from a stale inventory
+        from model_inventory import get_model_inventory
+
+        get_model_inventory().invalidate()
+
+        report.seconds = round(time.time() - started, 3)
+        return report
+
+    def _assemble_blob(self, blob: Dict[str, Any], target: Path) -> int:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.partial")
+        blob_hash = hashlib.sha256()
+        try:
+            with open(tmp_path, "wb") as out:
+                for chunk in blob["chunks"]:
+                    with open(self._chunk_path(chunk), "rb") as f:
+                        while True:
+                            data = f.read(READ_BUFFER)
+                            if not data:
+                                break
+                            blob_hash.update(data)
+                            out.write(data)
+            if f"sha256:{blob_hash.hexdigest()}" != self._normalize_digest(blob["digest"]):
+                raise ModelSyncError(f"Blob {blob['digest']} failed verification after download")
+            os.replace(tmp_path, target)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return blob["size"]
+
+    # ------------------------------------------------------------------
+    # Local store helpers
+    # ------------------------------------------------------------------
+
+    def read_local_manifest(self, model: str) -> Dict[str, Any]:
+        registry, namespace, repository, tag = parse_model_name(model)
+        path = self.models_dir / "manifests" / registry / namespace / repository / tag
+        manifest = self._read_json(path)
+        if manifest is None:
+            raise ModelSyncError(f"{model} is not installed locally ({path} not found)")
+        return manifest
+
+    @staticmethod
+    def _layer_digests(manifest: Dict[str, Any]) -> List[str]:
+        digests = [layer["digest"] for layer in manifest.get("layers", [])]
+        if manifest.get("config", {}).get("digest"):
+            digests.append(manifest["config"]["digest"])
+        return list(dict.fromkeys(digests))
+
+    @staticmethod
+    def _normalize_digest(digest: str) -> str:
+        return digest.replace("sha256-", "sha256:", 1)
+
+    def _digest_name(self, digest: str) -> str:
+        return self._normalize_digest(digest).replace(":", "-")
+
+    def _find_local_blob(self, digest: str) -> Optional[Path]:
+        blobs = self.models_dir / "blobs"
+        for name in (self._digest_name(digest), self._normalize_digest(digest)):
+            if (blobs / name).exists():
+                return blobs / name
+        return None
+
+    def _local_blob_path(self, digest: str) -> Path:
+        path = self._find_local_blob(digest)
+        if path is None:
+            raise ModelSyncError(f"Blob {digest} is missing from the local Ollama store")
+        return path
+
+    def _remote_blob_exists(self, digest: str) -> bool:
+        return (self.blobs_dir / f"{self._digest_name(digest)}.json").exists()
+
+    def _chunk_path(self, chunk: str) -> Path:
+        return self.chunks_dir / chunk[:2] / chunk
+
+    def _load_chunk_index(self) -> Dict[str, Dict[str, Any]]:
+        return self._read_json(self.chunk_index_file) or {}
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        self._write_atomic(path, json.dumps(data, indent=2).encode("utf-8"))
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Sync Ollama models through PCloud")
+    parser.add_argument("action", choices=["push", "pull"])
+    parser.add_argument("models", nargs="+", help="Model names, e.g. djinn-federation:idhhc")
+    parser.add_argument("--remote", required=True, help="PCloud djinn_models directory")
+    parser.add_argument("--models-dir", help="Local Ollama model store (default: OLLAMA_MODELS or ~/.ollama/models)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_UPLOAD_WORKERS)
+    args = parser.parse_args(argv)
+
+    sync = PCloudModelSync(args.remote, models_dir=args.models_dir, max_workers=args.workers)
+    failures = 0
+    for model in args.models:
+        try:
+            report = sync.push(model) if args.action == "push" else sync.pull(model)
+            print(json.dumps(asdict(report)))
+        except ModelSyncError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            failures += 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
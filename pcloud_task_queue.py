@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+☁️ PCloud Task Queue ☁️
+Shared-directory work queue for the PCloud Djinn Federation
+
+Any device with the PCloud drive mounted can enqueue tasks or run a worker:
+
+    djinn_operations/
+      pending_tasks/<task_id>.json          waiting for a worker
+      claimed/<worker_id>/<task_id>.json    owned by one worker
+      leases/<task_id>.json                 worker heartbeat (expires_at)
+      completed_tasks/<task_id>.json        result, watched by the requester
+
+Claiming is a single rename from pending_tasks into the worker's own
+directory, so exactly one worker wins each task. Every file is written to a
+temporary name and renamed into place, so readers never see partial JSON.
+Workers renew their lease while the model runs; a task whose lease expires
+(crashed worker, unmounted drive) is moved back to pending_tasks by the next
+queue user that runs recover_expired().
+
+Leases compare timestamps written by different devices, so lease_seconds
+should be much larger than the clock skew between them.
+
+Run a worker on the machine that hosts the heavy models:
+
+    python pcloud_task_queue.py worker --operations-dir Z:/djinn_operations
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+TASK_DIRECTORIES = ("pending_tasks", "claimed", "leases", "completed_tasks")
+
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def default_worker_id() -> str:
+    """Worker identity: host plus process, unique across federation devices"""
+    return f"{socket.gethostname()}_{os.getpid()}"
+
+
+class PCloudTaskQueue:
+    """
+    Work queue over a shared directory (PCloud mount or any shared path).
+    Safe for concurrent use by several processes and devices.
+    """
+
+    def __init__(
+        self,
+        operations_dir,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.operations_dir = Path(operations_dir)
+        self.pending_dir = self.operations_dir / "pending_tasks"
+        self.claimed_dir = self.operations_dir / "claimed"
+        self.leases_dir = self.operations_dir / "leases"
+        self.completed_dir = self.operations_dir / "completed_tasks"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+
+        for name in TASK_DIRECTORIES:
+            (self.operations_dir / name).mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Requester side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        task_type: str,
+        query: str,
+        model: str,
+        requester: str = "local_djinn_federation",
+        priority: str = "normal",
+        system: Optional[str] = None,
+    ) -> str:
+        """Publish a task to pending_tasks and return its ID"""
+        task_id = f"djinn_task_{int(self.clock() * 1000)}_{uuid.uuid4().hex[:8]}"
+        task = {
+            "task_id": task_id,
+            "type": task_type,
+            "query": query,
+            "model": model,
+            "system": system,
+            "created_at": datetime.now().isoformat(),
+            "status": "pending",
+            "requester": requester,
+            "priority": priority,
+            "attempts": 0,
+        }
+        self._write_json(self.pending_dir / f"{task_id}.json", task)
+        return task_id
+
+    def status(self, task_id: str) -> Dict[str, Any]:
+        """Current state of a task: completed/failed record, running, pending or not_found"""
+        completed = self._read_json(self.completed_dir / f"{task_id}.json")
+        if completed is not None:
+            return completed
+
+        if (self.pending_dir / f"{task_id}.json").exists():
+            return {"task_id": task_id, "status": "pending", "message": "Task is waiting for a worker"}
+
+        for worker_dir in self._worker_dirs():
+            if (worker_dir / f"{task_id}.json").exists():
+                lease = self._read_json(self.leases_dir / f"{task_id}.json") or {}
+                return {
+                    "task_id": task_id,
+                    "status": "running",
+                    "worker_id": worker_dir.name,
+                    "lease_expires_at": lease.get("expires_at"),
+                    "message": f"Task is running on {worker_dir.name}",
+                }
+
+        return {"task_id": task_id, "status": "not_found", "message": "Task not found"}
+
+    def get_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Completion record for a task, or None while it is unfinished"""
+        return self._read_json(self.completed_dir / f"{task_id}.json")
+
+    def wait_for_completion(
+        self, task_id: str, timeout: float = 300, poll_interval: float = 0.5
+    ) -> Optional[Dict[str, Any]]:
+        """Block until the completion file appears (None on timeout)"""
+        deadline = time.time() + timeout
+        while True:
+            result = self.get_result(task_id)
+            if result is not None:
+                return result
+            if time.time() >= deadline:
+                return None
+            self.recover_expired()
+            time.sleep(poll_interval)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest pending task (None if the queue is empty)"""
+        worker_dir = self.claimed_dir / worker_id
+        worker_dir.mkdir(parents=True, exist_ok=True)
+
+        for name in self._pending_names():
+            claimed_file = worker_dir / name
+            try:
+                os.rename(self.pending_dir / name, claimed_file)
+            except (FileNotFoundError, FileExistsError, PermissionError):
+                continue  # Another worker won this task
+            # The rename keeps the mtime from pending_tasks, which recover_expired
+            # falls back to until the first lease is written
+            now = self.clock()
+            try:
+                os.utime(claimed_file, (now, now))
+            except FileNotFoundError:
+                continue
+
+            task = self._read_json(claimed_file)
+            if task is None:
+                claimed_file.unlink()
+                continue
+
+            task["status"] = "claimed"
+            task["worker_id"] = worker_id
+            task["claimed_at"] = datetime.now().isoformat()
+            task["attempts"] = task.get("attempts", 0) + 1
+            self._write_json(claimed_file, task)
+            self.heartbeat(task["task_id"], worker_id)
+            return task
+
+        return None
+
+    def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        """Renew a worker's lease; False once the task was taken away from it"""
+        if not (self.claimed_dir / worker_id / f"{task_id}.json").exists():
+            return False
+
+        now = self.clock()
+        self._write_json(
+            self.leases_dir / f"{task_id}.json",
+            {
+                "task_id": task_id,
+                "worker_id": worker_id,
+                "heartbeat_at": now,
+                "expires_at": now + self.lease_seconds,
+            },
+        )
+        return True
+
+    def complete(
+        self,
+        task_id: str,
+        worker_id: str,
+        response: Optional[str] = None,
+        error: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Publish the completion file and release the claim"""
+        claimed_file = self.claimed_dir / worker_id / f"{task_id}.json"
+        record = self._read_json(claimed_file) or {"task_id": task_id}
+        record.update({
+            "status": "failed" if error else "completed",
+            "worker_id": worker_id,
+            "response": response,
+            "error": error,
+            "metrics": metrics or {},
+            "completed_at": datetime.now().isoformat(),
+        })
+
+        self._write_json(self.completed_dir / f"{task_id}.json", record)
+        self._remove(claimed_file)
+        self._remove(self.leases_dir / f"{task_id}.json")
+        return record
+
+    def recover_expired(self) -> List[str]:
+        """Return tasks with expired leases to pending_tasks (or fail them after max_attempts)"""
+        now = self.clock()
+        recovered = []
+
+        for worker_dir in self._worker_dirs():
+            for claimed_file in worker_dir.glob("*.json"):
+                task_id = claimed_file.stem
+                lease = self._read_json(self.leases_dir / f"{task_id}.json")
+                if lease and lease.get("worker_id") == worker_dir.name:
+                    expires_at = lease.get("expires_at", 0)
+                else:
+                    # Crashed between claiming and writing the first lease
+                    try:
+                        expires_at = claimed_file.stat().st_mtime + self.lease_seconds
+                    except FileNotFoundError:
+                        continue
+                if expires_at > now:
+                    continue
+
+                if self._requeue(claimed_file, worker_dir.name):
+                    recovered.append(task_id)
+
+        return recovered
+
+    def _requeue(self, claimed_file: Path, worker_id: str) -> bool:
+        task_id = claimed_file.stem
+        # Take the claim away first: the rename fails if the worker completed
+        # the task (or another queue user recovered it) in the meantime
+        recovering = claimed_file.parent / f".{claimed_file.name}.recovering-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(claimed_file, recovering)
+        except (FileNotFoundError, FileExistsError, PermissionError):
+            return False
+        task = self._read_json(recovering) or {"task_id": task_id}
+        self._remove(self.leases_dir / f"{task_id}.json")
+
+        if task.get("attempts", 0) >= self.max_attempts:
+            if not (self.completed_dir / f"{task_id}.json").exists():
+                task.update({
+                    "status": "failed",
+                    "worker_id": worker_id,
+                    "response": None,
+                    "error": f"Lease expired after {task.get('attempts')} attempts",
+                    "metrics": {},
+                    "completed_at": datetime.now().isoformat(),
+                })
+                self._write_json(self.completed_dir / f"{task_id}.json", task)
+            self._remove(recovering)
+            return True
+
+        task["status"] = "pending"
+        task["recovered_from"] = worker_id
+        self._write_json(recovering, task)
+        os.replace(recovering, self.pending_dir / claimed_file.name)
+        return True
+
+    # ------------------------------------------------------------------
+    # File helpers
+    # ------------------------------------------------------------------
+
+    def _pending_names(self) -> List[str]:
+        # Task IDs start with a millisecond timestamp, so name order is FIFO
+        return sorted(
+            name for name in os.listdir(self.pending_dir)
+            if name.endswith(".json") and not name.startswith(".")
+        )
+
+    def _worker_dirs(self) -> List[Path]:
+        return [path for path in self.claimed_dir.iterdir() if path.is_dir()]
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]):
+        tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _installed_size_gb(model: str) -> Optional[float]:
+    """Size of `model` on this worker's Ollama server, so admission picks its memory class"""
+    from model_inventory import get_model_inventory
+    from ollama_client import OllamaError
+
+    try:
+        record = get_model_inventory().get(model)
+    except OllamaError:
+        return None
+    return record.size / 1024 ** 3 if record else None
+
+
+def run_with_ollama(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Default worker executor: run the task's model on this device's Ollama server"""
+    from admission_control import get_admission_controller
+    from ollama_client import get_ollama_client
+
+    # Federation work yields to interactive sessions on the worker's machine
+    size_gb = _installed_size_gb(task["model"])
+    with get_admission_controller().admit(task["model"], size_gb=size_gb, priority="djinn") as admission:
+        result = get_ollama_client().generate(
+            task["model"], task["query"], system=task.get("system"), timeout=task.get("timeout", 600)
+        )
+    return {
+        "response": result.response,
+        "metrics": {
+            "prompt_eval_count": result.prompt_eval_count,
+            "eval_count": result.eval_count,
+            "load_duration_ms": result.load_duration_ms,
+            "total_duration_ms": result.total_duration_ms,
+            "tokens_per_second": round(result.tokens_per_second, 2),
+            "admission_wait_seconds": admission.wait_seconds,
+        },
+    }
+
+
+class PCloudTaskWorker:
+    """
+    Worker daemon: claims tasks, runs them and publishes completion files.
+    A heartbeat thread renews the lease while the executor runs.
+    """
+
+    def __init__(
+        self,
+        queue: PCloudTaskQueue,
+        worker_id: Optional[str] = None,
+        executor: Callable[[Dict[str, Any]], Dict[str, Any]] = run_with_ollama,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.executor = executor
+        self.poll_interval = poll_interval
+        self.tasks_completed = 0
+        self.stop_event = threading.Event()
+        self.worker_thread = None
+
+    def run_once(self) -> bool:
+        """Process one task; False when the queue was empty"""
+        self.queue.recover_expired()
+        task = self.queue.claim(self.worker_id)
+        if task is None:
+            return False
+
+        task_id = task["task_id"]
+        print(f"☁️ [{self.worker_id}] Running {task_id} on {task['model']}")
+
+        lease_lost = threading.Event()
+        finished = threading.Event()
+
+        def renew_lease():
+            while not finished.wait(self.queue.lease_seconds / 3):
+                if not self.queue.heartbeat(task_id, self.worker_id):
+                    lease_lost.set()
+                    return
+
+        heartbeat_thread = threading.Thread(target=renew_lease, daemon=True)
+        heartbeat_thread.start()
+        try:
+            outcome = self.executor(task)
+            error = None
+        except Exception as e:
+            outcome = {}
+            error = str(e)
+        finally:
+            finished.set()
+            heartbeat_thread.join()
+
+        if lease_lost.is_set():
+            print(f"⚠️  [{self.worker_id}] Lease on {task_id} expired; result discarded")
+            return True
+
+        self.queue.complete(
+            task_id, self.worker_id,
+            response=outcome.get("response"), error=error, metrics=outcome.get("metrics"),
+        )
+        self.tasks_completed += 1
+        print(f"✅ [{self.worker_id}] Completed {task_id}" + (f" with error: {error}" if error else ""))
+        return True
+
+    def run_forever(self, max_tasks: Optional[int] = None):
+        """Poll the queue until stopped (or until max_tasks are done)"""
+        while not self.stop_event.is_set():
+            if max_tasks is not None and self.tasks_completed >= max_tasks:
+                break
+            if not self.run_once():
+                self.stop_event.wait(self.poll_interval)
+
+    def start(self):
+        """Run the worker in a background daemon thread"""
+        self.stop_event.clear()
+        self.worker_thread = threading.Thread(target=self.run_forever, daemon=True)
+        self.worker_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.worker_thread:
+            self.worker_thread.join()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="PCloud Djinn Federation task queue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Run tasks from a shared operations directory")
+    worker_parser.add_argument("--operations-dir", required=True, help="Shared djinn_operations directory")
+    worker_parser.add_argument("--worker-id", help="Worker name (default: host_pid)")
+    worker_parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS)
+    worker_parser.add_argument("--poll-interval", type=float, default=1.0)
+    worker_parser.add_argument("--max-tasks", type=int, help="Exit after completing this many tasks")
+
+    args = parser.parse_args(argv)
+
+    queue = PCloudTaskQueue(args.operations_dir, lease_seconds=args.lease_seconds)
+    worker = PCloudTaskWorker(queue, worker_id=args.worker_id, poll_interval=args.poll_interval)
+    print(f"☁️ PCloud worker {worker.worker_id} watching {queue.operations_dir}")
+    try:
+        worker.run_forever(max_tasks=args.max_tasks)
+    except KeyboardInterrupt:
+        print("\n☁️ PCloud worker signing off!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Prompt Context Builder
+Token-budgeted prompt assembly for the Djinn Federation
+
+Assembles system preamble, memories, insights and the user query under a
+per-model token budget, so oversized context never silently slows prompt
+evaluation on the large models.
+
+Sections marked stable form a per-model system prefix that is identical on
+every turn; everything volatile (scores, memories, the query) goes in the
+suffix. Sending the prefix through the server's system field lets it reuse
+the prompt KV cache across repeated turns to the same model.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from tracing import get_tracer
+
+# Prompt token budgets per federation model (matched by substring, longest first)
+MODEL_TOKEN_BUDGETS = {
+    "constellation-lite": 1024,
+    "constellation-core": 2048,
+    "constellation-max": 3072,
+    "companion": 2048,
+    "council": 3072,
+    "idhhc": 4096,
+    "steward": 2048,
+    "djinn-cosmic-coder": 4096,
+    "djinn-deep-thinker": 4096,
+    "djinn-logic-master": 4096,
+}
+DEFAULT_TOKEN_BUDGET = 2048
+
+# Optional sections with less room than this are dropped rather than truncated
+MIN_SECTION_TOKENS = 16
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local token estimate - no tokenizer required.
+    BPE vocabularies average roughly 4 characters per token on English text,
+    while short-word and symbol-heavy text runs closer to 1.3 tokens per word.
+    """
+    if not text:
+        return 0
+    return max(len(text) // 4, int(len(text.split()) * 1.3))
+
+
+def get_token_budget(model_name: Optional[str]) -> int:
+    """Prompt token budget for a model name such as 'Yufok1/djinn-federation:council'"""
+    if model_name:
+        for key in sorted(MODEL_TOKEN_BUDGETS, key=len, reverse=True):
+            if key in model_name:
+                return MODEL_TOKEN_BUDGETS[key]
+    return DEFAULT_TOKEN_BUDGET
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to fit a token budget, preferring whole lines"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        line_tokens = estimate_tokens(line) + 1
+        if used + line_tokens > max_tokens:
+            break
+        kept.append(line)
+        used += line_tokens
+
+    if kept:
+        return "\n".join(kept)
+    return text[: max_tokens * 4]
+
+
+def keep_recent_lines(text: str, max_tokens: int) -> str:
+    """
+    Summarization hook for chronological blocks (memories, insights):
+    keep the header line and as many of the newest entries as fit.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return ""
+
+    header, entries = lines[0], lines[1:]
+    used = estimate_tokens(header) + 1
+    recent = []
+    for line in reversed(entries):
+        line_tokens = estimate_tokens(line) + 1
+        if used + line_tokens > max_tokens:
+            break
+        recent.append(line)
+        used += line_tokens
+
+    if not recent:
+        return ""
+    omitted = len(entries) - len(recent)
+    if omitted:
+        header = f"{header} ({omitted} older entries omitted)"
+    return "\n".join([header] + recent[::-1])
+
+
+@dataclass
+class ContextSection:
+    """One block of a prompt"""
+
+    name: str
+    text: str
+    priority: int = 50  # Lower values are kept first
+    required: bool = False
+    summarize: Optional[Callable[[str, int], str]] = None
+    stable: bool = False  # Part of the cacheable system prefix
+
+
+@dataclass
+class BuiltPrompt:
+    """Assembled prompt plus what the budget did to it"""
+
+    text: str
+    token_count: int
+    budget: int
+    model_name: Optional[str] = None
+    system: str = ""  # Stable prefix, for the server's system field
+    prompt: str = ""  # Volatile suffix
+    included: List[str] = field(default_factory=list)
+    summarized: List[str] = field(default_factory=list)
+    truncated: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.token_count > self.budget
+
+
+class PromptContextBuilder:
+    """
+    Assembles prompt sections under a token budget.
+    Required and stable sections are always kept; optional sections are
+    admitted by priority, summarized or truncated when they don't fit, and
+    dropped last. Output preserves the order sections were added in.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        budget_tokens: Optional[int] = None,
+        estimator: Callable[[str], int] = estimate_tokens,
+    ):
+        self.model_name = model_name
+        self.budget_tokens = budget_tokens or get_token_budget(model_name)
+        self.estimator = estimator
+        self.sections: List[ContextSection] = []
+
+    def add_section(
+        self,
+        name: str,
+        text: str,
+        priority: int = 50,
+        required: bool = False,
+        summarize: Optional[Callable[[str, int], str]] = None,
+        stable: bool = False,
+    ) -> "PromptContextBuilder":
+        """Add a prompt block; empty blocks are ignored"""
+        if text:
+            self.sections.append(ContextSection(name, text, priority, required or stable, summarize, stable))
+        return self
+
+    def add_system(self, name: str, text: str) -> "PromptContextBuilder":
+        """Add a block of the stable per-model prefix (never trimmed)"""
+        return self.add_section(name, text, stable=True)
+
+    def build(self) -> BuiltPrompt:
+        """Fit sections to the budget and join them into the final prompt"""
+        with get_tracer().span("prompt.build", model=self.model_name) as span:
+            result = self._fit_sections()
+            span.set_attributes(
+                tokens=result.token_count,
+                budget=result.budget,
+                trimmed=len(result.truncated) + len(result.summarized) + len(result.dropped),
+            )
+        get_prompt_metrics().record(result)
+        return result
+
+    def _fit_sections(self) -> BuiltPrompt:
+        result = BuiltPrompt(text="", token_count=0, budget=self.budget_tokens, model_name=self.model_name)
+        fitted: Dict[int, str] = {}
+
+        remaining = self.budget_tokens
+        for index, section in enumerate(self.sections):
+            if section.required:
+                fitted[index] = section.text
+                remaining -= self.estimator(section.text)
+
+        optional = sorted(
+            (index for index, section in enumerate(self.sections) if not section.required),
+            key=lambda index: self.sections[index].priority,
+        )
+        for index in optional:
+            section = self.sections[index]
+            tokens = self.estimator(section.text)
+            if tokens <= remaining:
+                fitted[index] = section.text
+                remaining -= tokens
+                continue
+
+            if remaining < MIN_SECTION_TOKENS:
+                result.dropped.append(section.name)
+                continue
+
+            if section.summarize:
+                summary = section.summarize(section.text, remaining)
+                if summary and self.estimator(summary) <= remaining:
+                    fitted[index] = summary
+                    remaining -= self.estimator(summary)
+                    result.summarized.append(section.name)
+                    continue
+
+            fitted[index] = truncate_to_tokens(section.text, remaining)
+            remaining -= self.estimator(fitted[index])
+            result.truncated.append(section.name)
+
+        ordered = [index for index in range(len(self.sections)) if index in fitted]
+        result.included = [self.sections[index].name for index in ordered]
+        result.text = "\n".join(fitted[index] for index in ordered)
+        result.system = "\n".join(fitted[index] for index in ordered if self.sections[index].stable)
+        result.prompt = "\n".join(fitted[index] for index in ordered if not self.sections[index].stable)
+        result.token_count = self.estimator(result.text)
+        return result
+
+
+class PromptTokenMetrics:
+    """Running prompt token statistics per model"""
+
+    def __init__(self):
+        self.by_model: Dict[str, Dict[str, Any]] = {}
+        self.metrics_lock = threading.Lock()
+
+    def record(self, prompt: BuiltPrompt):
+        model = prompt.model_name or "unknown"
+        with self.metrics_lock:
+            stats = self.by_model.setdefault(
+                model,
+                {"prompts": 0, "total_tokens": 0, "max_tokens": 0, "last_tokens": 0, "trimmed_prompts": 0},
+            )
+            stats["prompts"] += 1
+            stats["total_tokens"] += prompt.token_count
+            stats["max_tokens"] = max(stats["max_tokens"], prompt.token_count)
+            stats["last_tokens"] = prompt.token_count
+            if prompt.summarized or prompt.truncated or prompt.dropped:
+                stats["trimmed_prompts"] += 1
+
+    def get_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model prompt counts, average/max token sizes and trim counts"""
+        with self.metrics_lock:
+            summary = {}
+            for model, stats in self.by_model.items():
+                summary[model] = dict(stats)
+                summary[model]["avg_tokens"] = round(stats["total_tokens"] / stats["prompts"], 1)
+            return summary
+
+
+# Global prompt metrics instance
+prompt_metrics = None
+
+
+def get_prompt_metrics():
+    """Get or create global prompt token metrics"""
+    global prompt_metrics
+    if prompt_metrics is None:
+        prompt_metrics = PromptTokenMetrics()
+    return prompt_metrics
@@ -9,56 +9,41 @@ import sys
 import time
 from pathlib import Path
 
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError
+
 
 def test_ollama_connection():
     """Test basic Ollama connectivity"""
     print("🔗 Testing Ollama connection...")
     try:
-        result = subprocess.run(
-            ["ollama", "list"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            print("✅ Ollama connection successful")
-            return True
-        else:
-            print("❌ Ollama connection failed")
-            return False
-    except Exception as e:
-        print(f"❌ Ollama test error: {e}")
+        get_model_inventory().models()
+        print("✅ Ollama connection successful")
+        return True
+    except OllamaError as e:
+        print(f"❌ Ollama connection failed: {e}")
         return False
 
 
 def test_model_availability():
     """Test if core models are available"""
     print("🧠 Testing model availability...")
+    core_models = ["Yufok1/djinn-federation:companion", "tinydolphin:latest"]
     try:
-        result = subprocess.run(
-            ["ollama", "list"], capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            models = result.stdout
-            core_models = ["Yufok1/djinn-federation:companion", "tinydolphin:latest"]
-
-            available = []
-            missing = []
-            for model in core_models:
-                if model in models:
-                    available.append(model)
-                else:
-                    missing.append(model)
-
-            print(f"✅ Available: {len(available)}/{len(core_models)} core models")
-            if missing:
-                print(f"⚠️ Missing: {', '.join(missing)}")
-
-            return len(available) > 0
-        else:
-            print("❌ Could not check models")
-            return False
-    except Exception as e:
-        print(f"❌ Model test error: {e}")
+        installed = get_model_inventory().availability(core_models)
+    except OllamaError as e:
+        print(f"❌ Could not check models: {e}")
         return False
 
+    available = [model for model in core_models if installed[model]]
+    missing = [model for model in core_models if not installed[model]]
+
+    print(f"✅ Available: {len(available)}/{len(core_models)} core models")
+    if missing:
+        print(f"⚠️ Missing: {', '.join(missing)}")
+
+    return len(available) > 0
+
 
 def test_simple_query():
     """Test a simple query with tinydolphin"""
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Request Accounting
+Per-request CPU, memory and token attribution for model executions
+
+System-wide RAM percent before and after a call mostly measures other
+processes. The accountant measures the Ollama server processes themselves
+(CPU seconds consumed, resident memory and its growth) around each
+request, adds this process's own CPU time, and takes prompt/eval token
+counts and durations from the server's response metadata.
+
+When several requests overlap, server CPU is shared between them; each
+usage record carries the number of concurrent requests so consumers can
+discount it.
+"""
+
+import importlib.util
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+# Located here, imported by the first tracked request
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+psutil = None
+
+
+def _psutil():
+    global psutil
+    if psutil is None:
+        import psutil as module
+        psutil = module
+    return psutil
+
+MB = 1024 * 1024
+SERVER_PROCESS_NAMES = ("ollama", "ollama_llama_server", "llama-server")
+
+
+@dataclass
+class RequestUsage:
+    """Resources attributed to one model request"""
+
+    wall_seconds: float = 0.0
+    client_cpu_seconds: float = 0.0
+    server_cpu_seconds: Optional[float] = None
+    server_rss_mb: Optional[float] = None
+    server_rss_delta_mb: Optional[float] = None
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    prompt_eval_duration_ms: float = 0.0
+    eval_duration_ms: float = 0.0
+    load_duration_ms: Optional[float] = None  # None when the server did not report it
+    tokens_per_second: float = 0.0
+    concurrent_requests: int = 1
+
+    def attach_generation(self, result):
+        """Copy token counts and durations from an ollama_client GenerationResult"""
+        self.prompt_eval_count = result.prompt_eval_count
+        self.eval_count = result.eval_count
+        self.prompt_eval_duration_ms = result.prompt_eval_duration_ms
+        self.eval_duration_ms = result.eval_duration_ms
+        self.load_duration_ms = result.load_duration_ms
+        self.tokens_per_second = round(result.tokens_per_second, 2)
+
+    def attach_metrics(self, metrics: Dict[str, Any]):
+        """Copy counters reported by a remote worker (PCloud completion metrics)"""
+        for name in ("prompt_eval_count", "eval_count", "load_duration_ms", "tokens_per_second"):
+            if metrics.get(name) is not None:
+                setattr(self, name, metrics[name])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _is_server_process(name: str, cmdline: List[str]) -> bool:
+    name = name.lower()
+    if any(name.startswith(server) for server in SERVER_PROCESS_NAMES):
+        return True
+    return bool(cmdline) and os.path.basename(cmdline[0]).lower().startswith("ollama")
+
+
+class RequestAccountant:
+    """Measures the model-server processes around each request"""
+
+    def __init__(self, server_pids: Optional[List[int]] = None):
+        self.fixed_pids = server_pids
+        self.active_usages: List[RequestUsage] = []
+        self.accounting_lock = threading.Lock()
+        try:
+            self.clock_ticks = os.sysconf("SC_CLK_TCK")
+            self.page_size = os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            self.clock_ticks, self.page_size = 100, 4096
+
+    @contextmanager
+    def track(self) -> Iterator[RequestUsage]:
+        """Attribute server CPU/RSS and client CPU to the enclosed request"""
+        usage = RequestUsage()
+        with self.accounting_lock:
+            self.active_usages.append(usage)
+            # Peak overlap: every request in flight now shares the server with this one
+            for active in self.active_usages:
+                active.concurrent_requests = max(active.concurrent_requests, len(self.active_usages))
+
+        before = self.server_snapshot()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield usage
+        finally:
+            usage.wall_seconds = round(time.perf_counter() - wall_start, 3)
+            usage.client_cpu_seconds = round(time.process_time() - cpu_start, 3)
+            after = self.server_snapshot()
+            if before and after:
+                usage.server_cpu_seconds = round(max(0.0, after["cpu_seconds"] - before["cpu_seconds"]), 3)
+                usage.server_rss_mb = round(after["rss_bytes"] / MB, 1)
+                usage.server_rss_delta_mb = round((after["rss_bytes"] - before["rss_bytes"]) / MB, 1)
+            with self.accounting_lock:
+                self.active_usages = [active for active in self.active_usages if active is not usage]
+
+    def server_snapshot(self) -> Optional[Dict[str, float]]:
+        """Total CPU seconds and RSS of the model-server processes (None if not found)"""
+        readings = [self._read_process(pid) for pid in self.server_pids()]
+        readings = [reading for reading in readings if reading]
+        if not readings:
+            return None
+        return {
+            "cpu_seconds": sum(reading["cpu_seconds"] for reading in readings),
+            "rss_bytes": sum(reading["rss_bytes"] for reading in readings),
+        }
+
+    def server_pids(self) -> List[int]:
+        """Ollama server and model runner processes (runners come and go with models)"""
+        if self.fixed_pids is not None:
+            return self.fixed_pids
+
+        if PSUTIL_AVAILABLE:
+            psutil = _psutil()
+            pids = []
+            for process in psutil.process_iter(["name", "cmdline"]):
+                try:
+                    if _is_server_process(process.info["name"] or "", process.info["cmdline"] or []):
+                        pids.append(process.pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return pids
+
+        pids = []
+        try:
+            entries = os.listdir("/proc")
+        except OSError:
+            return pids
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/comm", "r") as f:
+                    name = f.read().strip()
+                with open(f"/proc/{entry}/cmdline", "rb") as f:
+                    cmdline = [part.decode(errors="replace") for part in f.read().split(b"\0") if part]
+            except OSError:
+                continue
+            if _is_server_process(name, cmdline):
+                pids.append(int(entry))
+        return pids
+
+    def _read_process(self, pid: int) -> Optional[Dict[str, float]]:
+        if PSUTIL_AVAILABLE:
+            psutil = _psutil()
+            try:
+                process = psutil.Process(pid)
+                times = process.cpu_times()
+                return {"cpu_seconds": times.user + times.system, "rss_bytes": process.memory_info().rss}
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                return None
+
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                # Fields after the parenthesised command name; utime/stime are 14/15
+                fields = f.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{pid}/statm", "r") as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return None
+        return {
+            "cpu_seconds": (int(fields[11]) + int(fields[12])) / self.clock_ticks,
+            "rss_bytes": resident_pages * self.page_size,
+        }
+
+
+# Global accountant instance
+request_accountant = None
+
+
+def get_request_accountant():
+    """Get or create the global request accountant"""
+    global request_accountant
+    if request_accountant is None:
+        request_accountant = RequestAccountant()
+    return request_accountant
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Resource Sampler
+Background CPU/RAM/swap/load sampling for routing and monitoring
+
+psutil.cpu_percent(interval=1) blocks its caller for a full second. The
+sampler measures CPU as the delta between consecutive background samples
+instead, so routing and monitoring read the latest snapshot without
+waiting. Uses psutil when installed and /proc on Linux otherwise.
+"""
+
+import importlib.util
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# psutil is found now but imported with the first measurement, so that
+# importing this module (and every hub that does) stays cheap
+PSUTIL_AVAILABLE = importlib.util.find_spec("psutil") is not None
+psutil = None
+
+
+def _psutil():
+    """The psutil module, imported on first use"""
+    global psutil
+    if psutil is None:
+        import psutil as module
+        psutil = module
+    return psutil
+
+DEFAULT_SAMPLE_INTERVAL = float(os.environ.get("DJINN_RESOURCE_SAMPLE_INTERVAL", "1.0"))
+GB = 1024 ** 3
+
+
+def read_proc_cpu_times() -> Optional[Dict[str, int]]:
+    """Aggregate busy/total jiffies from /proc/stat (None where unavailable)"""
+    try:
+        with open("/proc/stat", "r") as f:
+            fields = [int(value) for value in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)  # idle + iowait
+    total = sum(fields[:8])  # Exclude guest time, already counted in user
+    return {"busy": total - idle, "total": total}
+
+
+def read_proc_meminfo() -> Optional[Dict[str, int]]:
+    """Memory and swap figures in bytes from /proc/meminfo"""
+    try:
+        values = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                values[name] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    available = values.get("MemAvailable", values.get("MemFree", 0))
+    return {
+        "total": values.get("MemTotal", 0),
+        "available": available,
+        "swap_total": values.get("SwapTotal", 0),
+        "swap_free": values.get("SwapFree", 0),
+    }
+
+
+class ResourceSampler:
+    """
+    Samples system load in a daemon thread; snapshot() never blocks on
+    measurement.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL, window: int = 30):
+        self.interval = interval
+        self.window = window
+        self.latest: Dict[str, Any] = {}
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self.last_cpu_times = None
+        self.sample_count = 0
+
+        self.sampler_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.sampler_thread = None
+
+    def start(self):
+        if self.sampler_thread and self.sampler_thread.is_alive():
+            return
+        self.sample()  # Prime CPU counters so the first snapshot is populated
+        self.stop_event.clear()
+        self.sampler_thread = threading.Thread(target=self._sampler_loop, daemon=True)
+        self.sampler_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.sampler_thread:
+            self.sampler_thread.join()
+
+    def _sampler_loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ Resource sampling error: {e}")
+
+    def sample(self) -> Dict[str, Any]:
+        """Take one sample now (cheap; CPU is the delta since the previous sample)"""
+        with self.sampler_lock:
+            reading = {"timestamp": time.time(), "cpu_percent": self._cpu_percent()}
+            reading.update(self._memory())
+            try:
+                reading["load_1m"] = os.getloadavg()[0]
+            except (AttributeError, OSError):
+                reading["load_1m"] = None
+            reading["cpu_count"] = os.cpu_count() or 1
+
+            self.history.append(reading)
+            self.latest = reading
+            self.sample_count += 1
+        return dict(reading)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest sample plus rolling averages over the window"""
+        if not self.sample_count:
+            self.sample()
+        with self.sampler_lock:
+            latest = dict(self.latest)
+            history = list(self.history)
+
+        latest["cpu_avg_percent"] = round(sum(h["cpu_percent"] for h in history) / len(history), 1)
+        latest["ram_avg_percent"] = round(sum(h["ram_percent"] for h in history) / len(history), 1)
+        latest["sample_age_seconds"] = round(time.time() - latest["timestamp"], 2)
+        return latest
+
+    def _cpu_percent(self) -> float:
+        if PSUTIL_AVAILABLE:
+            return _psutil().cpu_percent(interval=None)  # Since the previous call
+
+        times = read_proc_cpu_times()
+        if times is None:
+            return 0.0
+        previous, self.last_cpu_times = self.last_cpu_times, times
+        if previous is None or times["total"] <= previous["total"]:
+            return 0.0
+        busy = times["busy"] - previous["busy"]
+        return round(100.0 * busy / (times["total"] - previous["total"]), 1)
+
+    @staticmethod
+    def _memory() -> Dict[str, Any]:
+        if PSUTIL_AVAILABLE:
+            memory = _psutil().virtual_memory()
+            swap = _psutil().swap_memory()
+            total, available = memory.total, memory.available
+            swap_percent = swap.percent
+        else:
+            info = read_proc_meminfo()
+            if info is None:
+                return {"ram_total_gb": 0.0, "ram_available_gb": 0.0, "ram_percent": 0.0, "swap_percent": 0.0}
+            total, available = info["total"], info["available"]
+            swap_used = info["swap_total"] - info["swap_free"]
+            swap_percent = round(100.0 * swap_used / info["swap_total"], 1) if info["swap_total"] else 0.0
+
+        return {
+            "ram_total_gb": round(total / GB, 2),
+            "ram_available_gb": round(available / GB, 2),
+            "ram_percent": round(100.0 * (total - available) / total, 1) if total else 0.0,
+            "swap_percent": swap_percent,
+        }
+
+
+# Global sampler instance
+resource_sampler = None
+
+
+def get_resource_sampler():
+    """Get or create the global resource sampler (started on first use)"""
+    global resource_sampler
+    if resource_sampler is None:
+        resource_sampler = ResourceSampler()
+        resource_sampler.start()
+    return resource_sampler
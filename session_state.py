@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Session State
+Session-scoped state partitions for the federation's shared subsystems
+
+Consciousness, cross-model communication and analytics are process-wide
+singletons. When the hub is served to many sessions at once, putting
+every user's turns into one stream makes all sessions contend on a single
+lock and mixes their patterns. SessionPartitions gives each session its
+own state object and its own lock. The subsystem keeps a shared,
+read-mostly global layer next to it. Partitions idle past a timeout, or
+beyond a session cap, are evicted (least recently used first), and
+subsystems build them from bounded containers so that per-session memory
+stays flat.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from metrics_registry import get_metrics_registry, timed_lock
+
+DEFAULT_IDLE_TIMEOUT = 1800.0
+DEFAULT_MAX_SESSIONS = 1000
+
+
+@dataclass
+class SessionPartition:
+    """One session's private state and the lock guarding it"""
+
+    session_id: str
+    state: Any
+    created: float
+    last_active: float
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class SessionPartitions:
+    """
+    Lazily created per-session state. The registry lock is only held to
+    find, create or evict a partition; work on a session's state happens
+    under that session's own lock.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        clock: Callable[[], float] = time.time,
+        name: str = "sessions",
+    ):
+        self.factory = factory
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self.clock = clock
+
+        self.partitions: "OrderedDict[str, SessionPartition]" = OrderedDict()  # LRU order
+        self.registry_lock = threading.Lock()
+        self.last_sweep = clock()
+        self.evictions = 0
+        get_metrics_registry().gauge(
+            "djinn_sessions", "Live session partitions per subsystem", ["subsystem"]
+        ).labels(name).set_function(self.__len__)
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[Any]:
+        """Exclusive access to a session's state (created on first use)"""
+        while True:
+            partition = self._partition(session_id)
+            with timed_lock(partition.lock, f"{self.name}.session"):
+                # Eviction skips locked partitions, so one still registered
+                # now stays registered until we release it
+                with self.registry_lock:
+                    registered = self.partitions.get(session_id) is partition
+                if registered:
+                    yield partition.state
+                    return
+            # Evicted or dropped while we waited for its lock; look it up again
+
+    def peek(self, session_id: str) -> Optional[Any]:
+        """A session's state if it exists, without creating or touching it"""
+        with self.registry_lock:
+            partition = self.partitions.get(session_id)
+        return partition.state if partition else None
+
+    def drop(self, session_id: str) -> bool:
+        """End a session now (e.g. when its client disconnects)"""
+        with self.registry_lock:
+            partition = self.partitions.pop(session_id, None)
+        if partition is None:
+            return False
+        self._evicted([partition])
+        return True
+
+    def evict_idle(self) -> int:
+        """Evict sessions idle longer than idle_timeout; returns how many"""
+        with self.registry_lock:
+            evicted = self._collect_idle()
+        self._evicted(evicted)
+        return len(evicted)
+
+    def session_ids(self) -> List[str]:
+        with self.registry_lock:
+            return list(self.partitions)
+
+    def __len__(self) -> int:
+        return len(self.partitions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.registry_lock:
+            active = sum(1 for partition in self.partitions.values() if partition.lock.locked())
+            return {
+                "sessions": len(self.partitions),
+                "active_sessions": active,
+                "evictions": self.evictions,
+                "idle_timeout": self.idle_timeout,
+                "max_sessions": self.max_sessions,
+            }
+
+    def _partition(self, session_id: str) -> SessionPartition:
+        evicted = []
+        with self.registry_lock:
+            now = self.clock()
+            partition = self.partitions.get(session_id)
+            if partition is None:
+                # Sweep on session creation, not on every access
+                if now - self.last_sweep >= self.idle_timeout / 10:
+                    evicted = self._collect_idle()
+                evicted.extend(self._collect_over_capacity())
+                partition = SessionPartition(session_id, self.factory(session_id), now, now)
+                self.partitions[session_id] = partition
+            else:
+                self.partitions.move_to_end(session_id)
+            partition.last_active = now
+        self._evicted(evicted)
+        return partition
+
+    def _collect_idle(self) -> List[SessionPartition]:
+        now = self.clock()
+        self.last_sweep = now
+        cutoff = now - self.idle_timeout
+        idle = [
+            partition for partition in self.partitions.values()
+            if partition.last_active < cutoff and not partition.lock.locked()
+        ]
+        for partition in idle:
+            del self.partitions[partition.session_id]
+        return idle
+
+    def _collect_over_capacity(self) -> List[SessionPartition]:
+        """Least recently used idle partitions beyond max_sessions (before one is added)"""
+        evicted = []
+        for partition in list(self.partitions.values()):
+            if len(self.partitions) < self.max_sessions:
+                break
+            if not partition.lock.locked():
+                del self.partitions[partition.session_id]
+                evicted.append(partition)
+        return evicted
+
+    def _evicted(self, partitions: List[SessionPartition]):
+        """Count evictions and run the hook outside the registry lock"""
+        if not partitions:
+            return
+        with self.registry_lock:
+            self.evictions += len(partitions)
+        if self.on_evict:
+            for partition in partitions:
+                try:
+                    self.on_evict(partition.session_id, partition.state)
+                except Exception as e:
+                    print(f"⚠️ Session eviction hook failed for {partition.session_id}: {e}")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler
+Per-module import cost and import-time side effects of the entry points
+
+`python <entry point> --profile-startup` re-imports the entry point in a
+fresh interpreter under `-X importtime` and reports what its import
+costs: the total, the most expensive modules (cumulative and self time,
+nested the way they were imported), heavy optional modules that were
+pulled in, and side effects. A clean import creates no files in the
+working directory and leaves the root logger unconfigured. The child runs
+in a scratch directory, so profiling never writes into the caller's tree.
+
+benchmarks/import_time_benchmark.py runs the same profile for every entry
+point and fails when an import regresses past its recorded budget.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROFILE_STARTUP_FLAG = "--profile-startup"
+START_MARKER = "djinn-startup-profile:start"
+RESULT_MARKER = "djinn-startup-profile:result"
+
+# Optional or expensive modules an entry point should load only when a
+# feature needs them
+HEAVY_MODULES = ("numpy", "psutil", "asyncio", "urllib.request", "http.server", "ssl", "argparse")
+
+_PROBE = """
+import sys, time
+sys.path.insert(0, {directory!r})
+sys.stderr.write({start!r} + "\\n")
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+logging = sys.modules.get("logging")
+handlers = len(logging.getLogger().handlers) if logging else 0
+sys.stderr.write("{result} %r %d\\n" % (elapsed, handlers))
+"""
+
+
+@dataclass
+class ImportRecord:
+    """One line of -X importtime output"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Import records printed after the probe's start marker, in import order"""
+    records = []
+    started = START_MARKER not in output
+    for line in output.splitlines():
+        if line.startswith(START_MARKER):
+            started = True
+            continue
+        if not started or not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The column header
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2  # " " then two spaces per level
+        records.append(ImportRecord(name.strip(), int(fields[0]) / 1000, int(fields[1]) / 1000, depth))
+    return records
+
+
+def _top_level_depth(records: List[ImportRecord]) -> int:
+    return min((record.depth for record in records), default=0)
+
+
+def _run_probe(script: Path, python: str, timeout: float) -> Dict[str, Any]:
+    probe = _PROBE.format(
+        directory=str(script.parent), module=script.stem, start=START_MARKER, result=RESULT_MARKER
+    )
+    with tempfile.TemporaryDirectory(prefix="djinn-startup-") as scratch:
+        result = subprocess.run(
+            [python, "-X", "importtime", "-c", probe],
+            cwd=scratch, capture_output=True, text=True, encoding="utf-8", errors="replace",
+            timeout=timeout, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        created = sorted(
+            str(path.relative_to(scratch)) for path in Path(scratch).rglob("*") if path.is_file()
+        )
+
+    summary = [line for line in result.stderr.splitlines() if line.startswith(RESULT_MARKER)]
+    if result.returncode != 0 or not summary:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}"
+        raise RuntimeError(f"Importing {script.name} failed: {error}")
+    _, elapsed, handlers = summary[-1].split()
+    return {
+        "import_ms": float(elapsed) * 1000,
+        "records": parse_importtime(result.stderr),
+        "created_files": created,
+        "root_log_handlers": int(handlers),
+    }
+
+
+def profile_startup(script, runs: int = 3, python: str = sys.executable, timeout: float = 120.0) -> Dict[str, Any]:
+    """Import `script` `runs` times in fresh interpreters; report the median run"""
+    script = Path(script).resolve()
+    probes = [_run_probe(script, python, timeout) for _ in range(max(1, runs))]
+    median_ms = statistics.median(probe["import_ms"] for probe in probes)
+    probe = min(probes, key=lambda item: abs(item["import_ms"] - median_ms))
+
+    records = probe["records"]
+    loaded = {record.module: record.cumulative_ms for record in records}
+    top_depth = _top_level_depth(records)
+    return {
+        "entry": script.name,
+        "runs": len(probes),
+        "import_ms": round(median_ms, 1),
+        "import_ms_all": [round(item["import_ms"], 1) for item in probes],
+        "modules_loaded": len(records),
+        "top_level": [
+            {"module": record.module, "cumulative_ms": round(record.cumulative_ms, 2)}
+            for record in records if record.depth == top_depth
+        ],
+        "records": records,
+        "heavy_modules": {name: round(loaded[name], 2) for name in HEAVY_MODULES if name in loaded},
+        "created_files": probe["created_files"],
+        "root_log_handlers": probe["root_log_handlers"],
+    }
+
+
+def format_startup_profile(profile: Dict[str, Any], top: int = 15) -> str:
+    """Text report: slowest modules, heavy modules and side effects"""
+    lines = [
+        f"⏱️ STARTUP PROFILE: {profile['entry']} — import {profile['import_ms']:.1f}ms "
+        f"(median of {profile['runs']}, {profile['modules_loaded']} modules)"
+    ]
+    records: List[ImportRecord] = profile["records"]
+    top_depth = _top_level_depth(records)
+    slowest = sorted(records, key=lambda record: record.cumulative_ms, reverse=True)[:top]
+    lines.append(f"  {'cumulative':>10} {'self':>8}  module")
+    for record in sorted(slowest, key=records.index):
+        indent = "  " * (record.depth - top_depth)
+        lines.append(f"  {record.cumulative_ms:>8.1f}ms {record.self_ms:>6.1f}ms  {indent}{record.module}")
+
+    heavy = profile["heavy_modules"]
+    if heavy:
+        lines.append("🐢 Heavy modules loaded at import: "
+                     + ", ".join(f"{name} ({ms:.1f}ms)" for name, ms in heavy.items()))
+    else:
+        lines.append("🐇 No heavy modules loaded at import")
+
+    effects = []
+    if profile["created_files"]:
+        effects.append("created " + ", ".join(profile["created_files"]))
+    if profile["root_log_handlers"]:
+        effects.append(f"configured root logging ({profile['root_log_handlers']} handlers)")
+    lines.append("🧹 Import side effects: " + ("; ".join(effects) if effects else "none"))
+    return "\n".join(lines)
+
+
+def print_startup_profile(script, runs: int = 3, top: int = 15) -> int:
+    """Entry points' --profile-startup handler; returns the process exit code"""
+    try:
+        profile = profile_startup(script, runs)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+        print(f"❌ Startup profile failed: {e}")
+        return 1
+    print(format_startup_profile(profile, top))
+    return 0
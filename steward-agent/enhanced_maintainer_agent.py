@@ -20,6 +20,10 @@ from typing import Dict, List, Optional, Tuple
 
 import psutil
 
+# Lock profile settings shared with the hubs, from the repository root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from lock_profiler import DEFAULT_REPORT_FILE, report_path_from_env
+
 
 class EnhancedMaintainerAgent:
     """Enhanced Steward with advanced maintenance capabilities"""
@@ -717,11 +721,16 @@ jobs:
             # Monitor federation health
             federation_health = self._monitor_federation_health()
 
+            # Hot shared-state locks from the hubs' lock profile
+            lock_contention = self._monitor_lock_contention()
+            alerts.extend(self._lock_contention_alerts(lock_contention))
+
             report = {
                 "timestamp": datetime.now().isoformat(),
                 "snapshot": snapshot,
                 "alerts": alerts,
                 "federation_health": federation_health,
+                "lock_contention": lock_contention,
                 "recommendations": self._generate_monitoring_recommendations(
                     alerts, federation_health
                 ),
@@ -816,6 +825,77 @@ jobs:
             self.logger.error(f"Federation health monitoring failed: {e}")
             return {"error": str(e)}
 
+    def _monitor_lock_contention(self) -> Dict:
+        """Read the lock profile the hubs write when DJINN_LOCK_PROFILE is set"""
+        # A hub may have profiled without the steward's environment saying so
+        profile_path = report_path_from_env() or DEFAULT_REPORT_FILE
+
+        if not profile_path.exists():
+            return {
+                "available": False,
+                "message": "No lock profile (run a hub with DJINN_LOCK_PROFILE=1)",
+            }
+
+        try:
+            with open(profile_path, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error(f"Lock profile read failed: {e}")
+            return {"available": False, "error": str(e)}
+
+        age = time.time() - profile_path.stat().st_mtime
+        hot_locks = [lock for lock in profile.get("locks", []) if lock.get("hot")]
+        for lock in hot_locks:
+            site = lock["top_sites"][0]["site"] if lock.get("top_sites") else "unknown"
+            print(
+                f"[Enhanced Steward] Hot lock {lock['name']}: "
+                f"{lock['contention_ratio']:.0%} contended, "
+                f"p95 wait {lock['wait']['p95_ms']:.2f}ms, longest holder {site}"
+            )
+
+        return {
+            "available": True,
+            "path": str(profile_path),
+            "pid": profile.get("pid"),
+            "updated_at": profile.get("updated_at"),
+            "stale": age > 3600,
+            "hot_locks": hot_locks,
+            "locks": [
+                {
+                    "name": lock["name"],
+                    "acquisitions": lock["acquisitions"],
+                    "contention_ratio": lock["contention_ratio"],
+                    "wait_p95_ms": lock["wait"]["p95_ms"],
+                    "hold_p95_ms": lock["hold"]["p95_ms"],
+                    "hold_max_ms": lock["hold"]["max_ms"],
+                }
+                for lock in profile.get("locks", [])
+            ],
+        }
+
+    def _lock_contention_alerts(self, lock_contention: Dict) -> List[Dict]:
+        """Turn hot locks from a current lock profile into alerts"""
+        if not lock_contention.get("available") or lock_contention.get("stale"):
+            return []
+
+        alerts = []
+        for lock in lock_contention.get("hot_locks", []):
+            site = lock["top_sites"][0]["site"] if lock.get("top_sites") else "unknown"
+            alerts.append(
+                {
+                    "type": "lock_contention",
+                    "severity": "warning",
+                    "message": (
+                        f"Lock {lock['name']} is hot: {lock['contention_ratio']:.0%} of "
+                        f"{lock['acquisitions']} acquisitions waited, p95 wait "
+                        f"{lock['wait']['p95_ms']:.2f}ms, longest holder {site}"
+                    ),
+                    "lock": lock["name"],
+                    "site": site,
+                }
+            )
+        return alerts
+
     def _generate_monitoring_recommendations(
         self, alerts: List, federation_health: Dict
     ) -> List[str]:
@@ -831,6 +911,11 @@ jobs:
                 )
             elif alert["type"] == "low_disk":
                 recommendations.append("Clean up disk space or expand storage")
+            elif alert["type"] == "lock_contention":
+                recommendations.append(
+                    f"Shorten the critical section at {alert['site']} "
+                    f"(move saves and model calls outside {alert['lock']})"
+                )
 
         if not federation_health.get("constellation_hub_running", False):
             recommendations.append("Restart constellation hub if needed")
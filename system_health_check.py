@@ -11,8 +11,6 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-import psutil
-
 
 class DjinnSystemHealthCheck:
     def __init__(self):
@@ -95,36 +93,33 @@ class DjinnSystemHealthCheck:
         """Check if Ollama service is running"""
         print("🔄 Checking Ollama service...")
 
-        try:
-            result = subprocess.run(
-                ["ollama", "list"], capture_output=True, text=True, timeout=15
-            )
+        from model_inventory import get_model_inventory
+        from ollama_client import OllamaError, OllamaTimeoutError
 
-            if result.returncode == 0:
-                models = result.stdout.strip().split("\n")
-                model_count = len([m for m in models if m.strip()])
+        try:
+            model_count = len(get_model_inventory().models())
 
-                self.health_report["components"]["ollama_service"] = {
-                    "status": "✅ RUNNING",
-                    "models_installed": model_count,
-                    "score": 100,
-                }
-            else:
-                self.health_report["components"]["ollama_service"] = {
-                    "status": "❌ NOT RUNNING",
-                    "error": "Ollama service not responding",
-                    "score": 0,
-                }
-                self.health_report["issues"].append(
-                    "Start Ollama service: ollama serve"
-                )
+            self.health_report["components"]["ollama_service"] = {
+                "status": "✅ RUNNING",
+                "models_installed": model_count,
+                "score": 100,
+            }
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             self.health_report["components"]["ollama_service"] = {
                 "status": "⚠️ TIMEOUT",
                 "error": "Ollama service timeout",
                 "score": 50,
             }
+        except OllamaError:
+            self.health_report["components"]["ollama_service"] = {
+                "status": "❌ NOT RUNNING",
+                "error": "Ollama service not responding",
+                "score": 0,
+            }
+            self.health_report["issues"].append(
+                "Start Ollama service: ollama serve"
+            )
 
     def check_required_models(self):
         """Check if required Djinn Federation models are installed"""
@@ -144,59 +139,52 @@ class DjinnSystemHealthCheck:
             "Yufok1/djinn-federation:lite",
         ]
 
+        from model_inventory import get_model_inventory
+        from ollama_client import OllamaError, OllamaTimeoutError
+
         try:
-            result = subprocess.run(
-                ["ollama", "list"], capture_output=True, text=True, timeout=15
-            )
+            installed = get_model_inventory().availability(required_models)
+            found_models = [model for model in required_models if installed[model]]
+            missing_models = [model for model in required_models if not installed[model]]
 
-            if result.returncode == 0:
-                available_models = result.stdout
-                missing_models = []
-                found_models = []
-
-                for model in required_models:
-                    if model in available_models:
-                        found_models.append(model)
-                    else:
-                        missing_models.append(model)
-
-                score = int((len(found_models) / len(required_models)) * 100)
-
-                self.health_report["components"]["required_models"] = {
-                    "status": "✅ OK" if score == 100 else "⚠️ PARTIAL",
-                    "found": len(found_models),
-                    "missing": len(missing_models),
-                    "missing_list": missing_models,
-                    "score": score,
-                }
+            score = int((len(found_models) / len(required_models)) * 100)
 
-                if missing_models:
-                    self.health_report["issues"].append(
-                        f"Missing models: {', '.join(missing_models)}"
-                    )
-                    self.health_report["recommendations"].append(
-                        "Run: ./setup_djinn_federation.bat"
-                    )
+            self.health_report["components"]["required_models"] = {
+                "status": "✅ OK" if score == 100 else "⚠️ PARTIAL",
+                "found": len(found_models),
+                "missing": len(missing_models),
+                "missing_list": missing_models,
+                "score": score,
+            }
 
-            else:
-                self.health_report["components"]["required_models"] = {
-                    "status": "❌ ERROR",
-                    "error": "Could not check models",
-                    "score": 0,
-                }
+            if missing_models:
+                self.health_report["issues"].append(
+                    f"Missing models: {', '.join(missing_models)}"
+                )
+                self.health_report["recommendations"].append(
+                    "Run: ./setup_djinn_federation.bat"
+                )
 
-        except subprocess.TimeoutExpired:
+        except OllamaTimeoutError:
             self.health_report["components"]["required_models"] = {
                 "status": "⚠️ TIMEOUT",
                 "error": "Model check timeout",
                 "score": 50,
             }
+        except OllamaError:
+            self.health_report["components"]["required_models"] = {
+                "status": "❌ ERROR",
+                "error": "Could not check models",
+                "score": 0,
+            }
 
     def check_system_resources(self):
         """Check system resources (RAM, CPU, storage)"""
         print("💻 Checking system resources...")
 
         try:
+            import psutil
+
             memory = psutil.virtual_memory()
             cpu_percent = psutil.cpu_percent(interval=1)
             disk = psutil.disk_usage("/")
@@ -414,4 +402,8 @@ def main():
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        from startup_profiler import print_startup_profile
+
+        sys.exit(print_startup_profile(__file__))
     main()
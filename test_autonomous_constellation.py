@@ -5,10 +5,12 @@ Tests the constellation-to-IDHHC execution workflow
 """
 
 import json
-import subprocess
 import time
 from pathlib import Path
 
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError
+
 
 def test_constellation_models():
     """Test if constellation models are available"""
@@ -25,20 +27,16 @@ def test_constellation_models():
     available_models = []
 
     try:
-        result = subprocess.run(["ollama", "list"], capture_output=True, text=True)
-        if result.returncode == 0:
-            for model in models:
-                if model in result.stdout:
-                    print(f"✅ {model} - Available")
-                    available_models.append(model)
-                else:
-                    print(f"❌ {model} - Not found")
-        else:
-            print("❌ Cannot access Ollama")
-            return False
-    except Exception as e:
-        print(f"❌ Error checking models: {e}")
+        installed = get_model_inventory().availability(models)
+    except OllamaError as e:
+        print(f"❌ Cannot access Ollama: {e}")
         return False
+    for model in models:
+        if installed[model]:
+            print(f"✅ {model} - Available")
+            available_models.append(model)
+        else:
+            print(f"❌ {model} - Not found")
 
     print(f"\n📊 Available models: {len(available_models)}/{len(models)}")
     return len(available_models) >= 3  # Need at least constellation + IDHHC
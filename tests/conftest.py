@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def hub_workdir(tmp_path, monkeypatch):
+    """Run in tmp_path with a fresh consciousness singleton, so hubs write nothing into the repo"""
+    import federation_consciousness
+
+    monkeypatch.chdir(tmp_path)
+    consciousness = federation_consciousness.FederationConsciousness(memory_dir=tmp_path / "memory_bank")
+    monkeypatch.setattr(federation_consciousness, "federation_consciousness", consciousness)
+    yield tmp_path
+    consciousness.shutdown()
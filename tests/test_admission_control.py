@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from admission_control import (
+    AdmissionController,
+    AdmissionTimeoutError,
+    memory_class,
+    parse_size_gb,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _controller(tmp_path, **kwargs):
+    return AdmissionController(tmp_path / "admission", poll_interval=0.02, **kwargs)
+
+
+def test_sizes_map_to_memory_classes():
+    assert parse_size_gb("636 MB") == pytest.approx(0.62, abs=0.01)
+    assert parse_size_gb("7.3GB") == 7.3
+    assert parse_size_gb(24) == 24.0
+    assert parse_size_gb("unknown") is None
+    assert [memory_class(size) for size in (0.6, 19, 65, None)] == ["small", "medium", "large", "large"]
+
+
+def test_model_slot_is_exclusive_until_released(tmp_path):
+    controller = _controller(tmp_path)
+    with controller.admit("djinn-federation:idhhc", size_gb=19) as admission:
+        assert admission.wait_seconds < 1
+        controller._try_lock = None  # Status views must not probe slots by locking them
+        assert controller.status()["classes"]["medium"]["in_use"] == 1
+        assert controller.queue_depth() == 0
+        del controller._try_lock
+        with pytest.raises(AdmissionTimeoutError):
+            with controller.admit("djinn-federation:idhhc", size_gb=19, timeout=0.1):
+                pass
+
+    # The timed-out waiter left no ticket behind and the slot is free again
+    assert controller.status()["waiting"] == []
+    with controller.admit("djinn-federation:idhhc", size_gb=19, timeout=0.1):
+        pass
+
+
+def test_waiters_are_admitted_by_priority_and_told_their_position(tmp_path):
+    controller = _controller(tmp_path)
+    order, positions = [], {}
+
+    def waiter(priority):
+        def report(position, waited):
+            positions.setdefault(priority, []).append(position)
+        with controller.admit("djinn-cosmic-coder:latest", size_gb=65, priority=priority,
+                              timeout=10, on_queued=report):
+            order.append(priority)
+
+    with controller.admit("djinn-deep-thinker:latest", size_gb=32):
+        threads = []
+        for priority in ("djinn", "command", "dialogue"):
+            thread = threading.Thread(target=waiter, args=(priority,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.1)
+        assert len(controller.status()["waiting"]) == 3
+
+    for thread in threads:
+        thread.join()
+    assert order == ["dialogue", "command", "djinn"]
+    # Overtaken twice while queued; it may move up again before admission
+    assert positions["djinn"][:3] == [1, 2, 3]
+    assert positions["dialogue"] == [1]
+
+
+def test_slot_held_by_crashed_process_is_released(tmp_path):
+    script = (
+        "import sys, time\n"
+        "from admission_control import AdmissionController\n"
+        f"controller = AdmissionController({str(tmp_path / 'admission')!r})\n"
+        "with controller.admit('djinn-cosmic-coder:latest', size_gb=65):\n"
+        "    print('held', flush=True)\n"
+        "    time.sleep(60)\n"
+    )
+    holder = subprocess.Popen([sys.executable, "-c", script], cwd=REPO_ROOT,
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "held"
+        controller = _controller(tmp_path)
+        assert controller.status()["classes"]["large"]["in_use"] == 1
+        with pytest.raises(AdmissionTimeoutError):
+            with controller.admit("djinn-deep-thinker:latest", size_gb=32, timeout=0.1):
+                pass
+    finally:
+        holder.kill()
+        holder.wait()
+
+    assert controller.status()["classes"]["large"]["in_use"] == 0  # Recorded holder is gone
+    with controller.admit("djinn-deep-thinker:latest", size_gb=32, timeout=1):
+        pass
+
+
+def test_stale_tickets_do_not_block_the_queue(tmp_path):
+    controller = _controller(tmp_path, stale_seconds=1)
+    stale = controller.queue_dir / "0-00000000000000000001-1-deadbeef.json"
+    stale.write_text('{"model": "phi3:latest", "memory_class": "small", "priority": "dialogue"}')
+    os.utime(stale, (time.time() - 60, time.time() - 60))
+
+    with controller.admit("phi3:latest", size_gb=2.2, timeout=1) as admission:
+        assert admission.queue_position == 1
+    assert not stale.exists()
@@ -0,0 +1,71 @@
+from model_collaboration_framework import (
+    CollaborationResult,
+    CollaborationResultCache,
+    ModelCollaborationFramework,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_repeated_task_served_from_cache(tmp_path):
+    framework = ModelCollaborationFramework(memory_dir=tmp_path)
+    try:
+        query = "Build a comprehensive strategy plan for the federation"
+        first = framework.get_unified_response(query)
+        assert first['collaboration_used']
+        assert first['cached'] is False
+
+        # Whitespace and case differences normalize to the same key
+        second = framework.get_unified_response("  build a COMPREHENSIVE strategy plan for the federation. ")
+        assert second['cached'] is True
+        assert second['response'] == first['response']
+        assert second['provenance']['original_task_id'] == first['task_id']
+        assert framework.get_collaboration_status()['result_cache']['hits'] == 1
+    finally:
+        framework.shutdown()
+
+
+def test_cache_expires_and_skips_low_confidence():
+    clock = FakeClock()
+    cache = CollaborationResultCache(ttl_seconds=100, min_confidence=0.6, clock=clock)
+    framework_result = _make_result(confidence=0.5)
+    key = cache.make_key("task", "approach", ["council", "idhhc"])
+
+    assert cache.put(key, framework_result, "approach", ["council", "idhhc"]) is False
+    assert cache.get(key) is None
+
+    cache.put(key, _make_result(confidence=0.8), "approach", ["idhhc", "council"])
+    assert cache.get(cache.make_key("task", "approach", ["idhhc", "council"])) is not None
+
+    # Effective TTL scales with confidence (0.8 * 100s)
+    clock.now += 81
+    assert cache.get(key) is None
+
+
+def test_invalidate_by_model():
+    cache = CollaborationResultCache()
+    key = cache.make_key("task", "approach", ["council"])
+    cache.put(key, _make_result(confidence=0.9), "approach", ["council"])
+    assert cache.invalidate(model_name="idhhc") == 0
+    assert cache.invalidate(model_name="council") == 1
+    assert cache.get(key) is None
+
+
+def _make_result(confidence):
+    return CollaborationResult(
+        result_id="result_collab_1",
+        task_id="collab_1",
+        synthesis_approach="consensus",
+        unified_response="response",
+        contributing_models=["council"],
+        confidence_score=confidence,
+        reasoning_chain=["reason"],
+        quality_metrics={},
+        timestamp="2025-01-01T00:00:00",
+    )
@@ -4,7 +4,7 @@ def test_constellation_hub_import():
     import constellation_hub
     assert hasattr(constellation_hub, 'ConstellationHub')
 
-def test_menu_display_runs():
+def test_menu_display_runs(hub_workdir):
     from constellation_hub import ConstellationHub
     hub = ConstellationHub()
     # Should not error
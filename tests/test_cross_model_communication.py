@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import tracing
+from cross_model_communication import CrossModelCommunication, ModelInteraction
+
+
+def _interaction(source='council', text='How should we plan this?'):
+    return ModelInteraction(
+        model_source=source,
+        interaction_type='guidance',
+        user_input=text,
+        model_response='Consider the long-term implications.',
+        context_data={},
+        emotional_tone='calm',
+        technical_complexity=5,
+        timestamp=datetime.now().isoformat(),
+        insights=['plan ahead'],
+    )
+
+
+def test_insight_storage_stays_bounded(tmp_path):
+    comm = CrossModelCommunication(memory_dir=tmp_path)
+    try:
+        for i in range(500):
+            comm.register_interaction(_interaction(text=f"question {i}"))
+            comm.share_insight('companion', 'user_preference', {'n': i}, ['idhhc'])
+
+        assert len(comm.shared_context['conversation_threads']) == comm.CONVERSATION_THREAD_CAPACITY
+        assert len(comm.insight_queue['idhhc']) == comm.INSIGHT_INBOX_CAPACITY
+        assert len(comm.insight_index['idhhc']['strategic_guidance']) == comm.INSIGHT_TYPE_CAPACITY
+
+        # IDs generated within the same second never collide
+        ids = [insight.insight_id for insight in comm.insight_queue['idhhc']]
+        assert len(ids) == len(set(ids))
+
+        preferences = comm.get_insights_by_type('idhhc', 'user_preference', count=3)
+        assert [p['content']['n'] for p in preferences] == [497, 498, 499]
+    finally:
+        comm.shutdown()
+
+
+def test_shared_context_round_trip(tmp_path):
+    comm = CrossModelCommunication(memory_dir=tmp_path)
+    comm.register_interaction(_interaction())
+    comm.shutdown()
+    assert not comm.processor_thread.is_alive()  # Woken, not left sleeping
+    last_sequence = comm.insight_sequence
+
+    reloaded = CrossModelCommunication(memory_dir=tmp_path)
+    try:
+        # Loaded before the new processor's first save could overwrite it
+        assert len(reloaded.shared_context['conversation_threads']) == 1
+        assert [path.name for path in tmp_path.iterdir()] == ["cross_model_context.json"]
+        assert reloaded.insight_sequence == last_sequence
+        assert reloaded._next_insight_id('strategic') == f"strategic_{last_sequence + 1}"
+    finally:
+        reloaded.shutdown()
+
+
+def test_context_sections_are_lazy_and_memoized(tmp_path, monkeypatch):
+    tracer = tracing.Tracer(enabled=True)
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    comm = CrossModelCommunication(memory_dir=tmp_path)
+    try:
+        comm.register_interaction(_interaction())
+        with tracer.span("prompt.build"):
+            context = comm.get_context_for_model('council', 'guidance')
+            assert context.computed_sections() == []
+
+            assert len(context.get('recent_interactions', [])[-3:]) == 1
+            assert context.computed_sections() == ['recent_interactions']
+        # Only the section that was actually assembled is traced
+        loads = [span for span in tracer.last_trace() if span.name == "cross_model.context"]
+        assert [span.attributes for span in loads] == [{"section": "recent_interactions"}]
+        assert 'wisdom_requests' in context
+        assert context['wisdom_requests'] == ['How should we plan this?']
+
+        # Same version reuses the memoized context; a new interaction invalidates it
+        assert comm.get_context_for_model('council', 'guidance') is context
+        comm.register_interaction(_interaction(text='And after that?'))
+        refreshed = comm.get_context_for_model('council', 'guidance')
+        assert refreshed is not context
+        assert len(refreshed['recent_interactions']) == 2
+    finally:
+        comm.shutdown()
+
+
+def test_sessions_keep_separate_profiles_over_shared_insights(tmp_path):
+    comm = CrossModelCommunication(memory_dir=tmp_path)
+    try:
+        comm.register_interaction(_interaction(text='Plan for alice'), session_id='alice')
+        comm.register_interaction(_interaction(source='companion', text='Hi from bob'), session_id='bob')
+
+        alice = comm.get_context_for_model('council', 'guidance', session_id='alice')
+        bob = comm.get_context_for_model('council', 'guidance', session_id='bob')
+        assert [t['user_input'] for t in alice['recent_interactions']] == ['Plan for alice']
+        assert alice['wisdom_requests'] == ['Plan for alice']
+        assert bob['wisdom_requests'] == []
+
+        # Session turns stay out of the global thread, but their insights are shared (alice's council
+        # turn and bob's companion turn both reach idhhc)
+        assert len(comm.shared_context['conversation_threads']) == 0
+        bob_idhhc = comm.get_context_for_model('idhhc', 'command', session_id='bob')
+        assert [i['insight_type'] for i in bob_idhhc['relevant_insights']] == ['strategic_guidance', 'emotional_context']
+
+        # Cached until either layer moves
+        assert comm.get_context_for_model('council', 'guidance', session_id='alice') is alice
+
+        assert comm.end_session('alice') is True
+        fresh = comm.get_context_for_model('council', 'guidance', session_id='alice')
+        assert fresh['recent_interactions'] == []
+    finally:
+        comm.shutdown()
@@ -0,0 +1,91 @@
+import json
+import threading
+
+from federated_memory_log import FederatedMemoryLog
+
+
+def _turn(i, device="laptop"):
+    return {"query": f"question {i}", "tier": "local", "response": f"answer {i}", "timestamp": f"{device}-{i}"}
+
+
+def test_devices_write_concurrently_and_merge_in_order(tmp_path):
+    laptop = FederatedMemoryLog(tmp_path, device_id="laptop")
+    desktop = FederatedMemoryLog(tmp_path, device_id="desktop")
+
+    def write(log, device):
+        for i in range(50):
+            log.append(_turn(i, device))
+
+    threads = [threading.Thread(target=write, args=(laptop, "laptop")),
+               threading.Thread(target=write, args=(desktop, "desktop"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = FederatedMemoryLog(tmp_path, device_id="reader").read()
+    assert len(records) == 100
+    assert {r["source_device"] for r in records} == {"laptop", "desktop"}
+    assert [r["federated_at"] for r in records] == sorted(r["federated_at"] for r in records)
+
+
+def test_duplicates_are_skipped(tmp_path):
+    laptop = FederatedMemoryLog(tmp_path, device_id="laptop")
+    desktop = FederatedMemoryLog(tmp_path, device_id="desktop")
+
+    assert laptop.append(_turn(1)) is not None
+    assert laptop.append(_turn(1)) is None
+    # The same conversation federated from another device is dropped on read
+    desktop.append(_turn(1))
+    assert len(laptop.read()) == 1
+
+
+def test_compaction_keeps_newest_records(tmp_path):
+    log = FederatedMemoryLog(tmp_path, device_id="laptop", max_segment_bytes=600, compact_threshold=4, max_records=20)
+    for i in range(60):
+        log.append(_turn(i))
+
+    assert log.stats["compactions"] >= 1
+    segments = sorted((tmp_path / "segments" / "laptop").glob("*.jsonl"))
+    assert len(segments) < 4
+    assert len(segments[0].read_text(encoding="utf-8").splitlines()) <= 20
+
+    records = log.read()
+    assert records[-1]["query"] == "question 59"
+    assert len(records) < 60
+    assert [r["query"] for r in records] == sorted((r["query"] for r in records), key=lambda q: int(q.split()[1]))
+
+
+def test_torn_line_is_ignored_and_not_appended_to(tmp_path):
+    log = FederatedMemoryLog(tmp_path, device_id="laptop")
+    log.append(_turn(1))
+    with open(log.active_segment, "a", encoding="utf-8") as f:
+        f.write('{"id": "partial", "ts": 1')
+
+    reopened = FederatedMemoryLog(tmp_path, device_id="laptop")
+    reopened.append(_turn(2))
+    assert [r["query"] for r in reopened.read()] == ["question 1", "question 2"]
+
+
+def test_legacy_file_is_migrated_once(tmp_path):
+    legacy = tmp_path / "federated_memory.json"
+    legacy.write_text(json.dumps([_turn(1), _turn(2)]), encoding="utf-8")
+
+    log = FederatedMemoryLog(tmp_path, device_id="laptop")
+    assert log.import_legacy(legacy) == 2
+    assert FederatedMemoryLog(tmp_path, device_id="desktop").import_legacy(legacy) == 0
+    assert not legacy.exists()
+    assert len(log.read()) == 2
+
+
+def test_interrupted_legacy_migration_is_resumed(tmp_path):
+    legacy = tmp_path / "federated_memory.json"
+    claimed = tmp_path / "federated_memory.json.migrating-laptop"
+    claimed.write_text(json.dumps([_turn(1), _turn(2)]), encoding="utf-8")  # Crashed after the rename
+    FederatedMemoryLog(tmp_path, device_id="laptop").append(_turn(1))  # ...and the first record
+
+    log = FederatedMemoryLog(tmp_path, device_id="laptop")
+    assert FederatedMemoryLog(tmp_path, device_id="desktop").import_legacy(legacy) == 0
+    assert log.import_legacy(legacy) == 1
+    assert not claimed.exists()
+    assert [r["query"] for r in log.read()] == ["question 1", "question 2"]
@@ -0,0 +1,16 @@
+from federation_consciousness import FederationConsciousness
+
+
+def test_consciousness_is_saved_only_once_it_changes(tmp_path):
+    memory_dir = tmp_path / "memory_bank"
+    idle = FederationConsciousness(memory_dir=memory_dir)
+    idle.shutdown()
+    assert not memory_dir.exists()
+
+    consciousness = FederationConsciousness(memory_dir=memory_dir)
+    consciousness.add_to_stream("dialogue_interaction", {"user_input": "hello", "intent": "dialogue"}, "companion")
+    consciousness.add_to_stream("dialogue_interaction", {"user_input": "hi"}, "companion", session_id="s1")
+    consciousness.shutdown()
+    assert (memory_dir / "federation_consciousness.json").exists()
+    assert [event["data"]["user_input"] for event in consciousness.memory_stream["conversation_flow"]] == ["hello"]
+    assert len(consciousness.get_contextual_memory(session_id="s1")) == 1
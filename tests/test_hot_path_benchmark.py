@@ -0,0 +1,34 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from hot_path_benchmark import HotPathCase, run_benchmark, synthetic_history, synthetic_stream  # noqa: E402
+
+
+def test_runner_reports_time_allocations_and_growth():
+    def build_list(size):
+        return lambda: [str(i) for i in range(size)]
+
+    report = run_benchmark([HotPathCase("build_list", "items", build_list)], [10, 1000], repeats=2, min_time=0.001)
+    small, large = report["cases"]["build_list"]["results"]
+
+    assert (small["size"], large["size"]) == (10, 1000)
+    assert "growth" not in small and large["growth"] > 1
+    assert large["peak_kib"] > small["peak_kib"] > 0
+    assert large["retained_kib"] == 0  # The result is released after the call
+    assert large["best_ms"] <= large["median_ms"]
+
+
+def test_synthetic_inputs_scale_and_fall_in_the_lookback_window():
+    history = synthetic_history(50)
+    assert len(history) == 50
+    assert sum(entry["was_override"] for entry in history) == 10
+    assert {"timestamp", "user_input", "suggested_agent", "final_agent", "query_type"} <= set(history[0])
+
+    stream = synthetic_stream(100)
+    oldest = datetime.fromisoformat(stream[0]["timestamp"])
+    assert len(stream) == 100
+    assert datetime.now() - oldest < timedelta(minutes=31)
+    assert stream == sorted(stream, key=lambda event: event["timestamp"])
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hub_server import HubServer, SessionStore
+
+
+class _EchoHub:
+    """Stands in for ConstellationHub: slow generations, streamed word by word"""
+
+    agents = {"companion": {"name": "Djinn Companion"}, "council": {"name": "Djinn Council"}}
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.routed_sessions = []
+        self.summoned_sessions = []
+        self.ended_sessions = []
+
+    def _generate(self, agent_key, query, on_token):
+        time.sleep(self.delay)
+        words = [f"{agent_key}:", *query.split()]
+        for word in words:
+            if on_token:
+                on_token(agent_key, word + " ")
+        return " ".join(words)
+
+    async def summon_agent(self, agent_key, query, priority="dialogue", history=None, on_token=None,
+                           session_id=None):
+        self.summoned_sessions.append(session_id)
+        response = await asyncio.get_event_loop().run_in_executor(
+            None, self._generate, agent_key, query, on_token
+        )
+        history.append({"agent": agent_key, "user_input": query, "response": response})
+        return response
+
+    async def federation_council(self, query, history=None, on_token=None, session_id=None):
+        responses = await asyncio.gather(*(
+            self.summon_agent(key, query, history=history, on_token=on_token, session_id=session_id)
+            for key in self.agents
+        ))
+        return "\n".join(responses)
+
+    async def hierarchical_route_query(self, query, history=None, on_token=None, session_id=None):
+        self.routed_sessions.append(session_id)
+        return await self.summon_agent("companion", query, history=history, on_token=on_token,
+                                       session_id=session_id)
+
+    def end_session(self, session_id):
+        self.ended_sessions.append(session_id)
+
+    def get_status(self):
+        return {"agents": list(self.agents)}
+
+
+@pytest.fixture
+def served_hub():
+    loop = asyncio.new_event_loop()
+    hub = _EchoHub()
+    server = HubServer(hub, port=0, sessions=SessionStore(max_history=3))
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.port}", hub
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+def _call(url, payload=None, method=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status, json.loads(response.read())
+
+
+def test_concurrent_sessions_keep_separate_histories(served_hub):
+    hub_url, _ = served_hub
+    sessions = [_call(f"{hub_url}/sessions", {})[1]["session_id"] for _ in range(4)]
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        replies = list(pool.map(
+            lambda index: _call(f"{hub_url}/summon", {
+                "session_id": sessions[index % 4], "agent": "companion", "query": f"question {index}"
+            })[1],
+            range(8),
+        ))
+    # Eight 0.3s generations overlap instead of running back to back
+    assert time.time() - started < 8 * 0.3
+    assert replies[5]["response"] == "companion: question 5"
+
+    history = _call(f"{hub_url}/sessions/{sessions[1]}")[1]["history"]
+    assert [entry["user_input"] for entry in history] == ["question 1", "question 5"]
+
+    status = _call(f"{hub_url}/status")[1]
+    assert status["server"]["sessions"] == 4
+    assert status["hub"]["agents"] == ["companion", "council"]
+
+
+def test_council_streams_tokens_then_done(served_hub):
+    hub_url, hub = served_hub
+    request = urllib.request.Request(
+        f"{hub_url}/council", data=json.dumps({"query": "hello there", "stream": True}).encode()
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response if line.strip()]
+
+    tokens = [event for event in events if event["type"] == "token"]
+    assert {event["agent"] for event in tokens} == {"companion", "council"}
+    assert events[-1]["type"] == "done"
+    assert "council: hello there" in events[-1]["response"]
+
+    # The session was created on demand and holds both council turns
+    session = _call(f"{hub_url}/sessions/{events[-1]['session_id']}")[1]
+    assert session["history_length"] == 2
+    assert hub.summoned_sessions[-2:] == [events[-1]["session_id"]] * 2
+
+
+def test_errors_and_history_bound(served_hub):
+    hub_url, hub = served_hub
+    with pytest.raises(urllib.error.HTTPError) as unknown_agent:
+        _call(f"{hub_url}/summon", {"agent": "nobody", "query": "hi"})
+    assert unknown_agent.value.code == 404
+
+    with pytest.raises(urllib.error.HTTPError) as empty_query:
+        _call(f"{hub_url}/route", {"query": "  "})
+    assert empty_query.value.code == 400
+
+    session_id = _call(f"{hub_url}/sessions", {})[1]["session_id"]
+    for index in range(5):
+        _call(f"{hub_url}/route", {"session_id": session_id, "query": f"q{index}"})
+    assert _call(f"{hub_url}/sessions/{session_id}")[1]["history_length"] == 3
+    # Routing is scoped to the session so the hub can partition its state
+    assert hub.routed_sessions == [session_id] * 5
+
+    assert _call(f"{hub_url}/sessions/{session_id}", method="DELETE")[1]["closed"] is True
+    assert hub.ended_sessions == [session_id]
+    with pytest.raises(urllib.error.HTTPError) as closed:
+        _call(f"{hub_url}/sessions/{session_id}")
+    assert closed.value.code == 404
+
+    host, port = hub_url.rsplit("/", 1)[1].split(":")
+    for length in ("abc", "-5"):
+        with socket.create_connection((host, int(port)), timeout=5) as conn:
+            conn.sendall(f"POST /route HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            assert conn.recv(1024).startswith(b"HTTP/1.1 400")
+
+
+def test_metrics_endpoint_serves_prometheus_text(served_hub):
+    hub_url, _ = served_hub
+    _call(f"{hub_url}/route", {"query": "hello"})
+
+    with urllib.request.urlopen(f"{hub_url}/metrics", timeout=10) as response:
+        content_type = response.headers["Content-Type"]
+        text = response.read().decode("utf-8")
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE djinn_server_in_flight gauge" in text
+    assert "djinn_server_sessions 1" in text
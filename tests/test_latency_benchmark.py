@@ -0,0 +1,78 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from fake_ollama_server import FakeOllamaServer, ModelProfile  # noqa: E402
+from latency_benchmark import compare_to_baseline, gated_percentiles, percentile  # noqa: E402
+from ollama_client import OllamaClient  # noqa: E402
+
+
+@pytest.fixture
+def fake_server():
+    profiles = {
+        "slow-loader:latest": ModelProfile(load_seconds=0.3, ttft_seconds=0.1, tokens_per_second=50, response_tokens=6),
+        "tiny-*": ModelProfile(load_seconds=0.0, ttft_seconds=0.0, tokens_per_second=1000, response_tokens=3),
+    }
+    with FakeOllamaServer(profiles) as server:
+        yield server
+
+
+def test_fake_server_simulates_load_ttft_and_rate(fake_server):
+    client = OllamaClient(host=fake_server.host)
+    arrivals = []
+
+    started = time.perf_counter()
+    cold = client.generate("slow-loader:latest", "hello", on_token=lambda text: arrivals.append(time.perf_counter()))
+    first_token = arrivals[0] - started
+    assert 0.4 <= first_token < 1.0  # load + time to first token
+    assert cold.eval_count == 6 and len(arrivals) == 6
+    assert cold.load_duration_ms == pytest.approx(300)
+    assert cold.eval_duration_ms == pytest.approx(100)  # five more tokens at 50/s
+
+    started = time.perf_counter()
+    warm = client.generate("slow-loader:latest", "hello")
+    assert time.perf_counter() - started < 0.4
+    assert warm.load_duration_ms == 0
+    assert warm.response == cold.response.strip()  # Deterministic per model and prompt
+    assert (cold.prompt_eval_count, warm.prompt_eval_count) == (1, 0)  # Prompt KV cache reused
+    assert fake_server.prompt_cache_stats()["slow-loader:latest"]["hit_rate"] == 0.5
+
+    assert client.generate("tiny-model", "hello").eval_count == 3  # Pattern match
+    fake_server.unload()
+    assert client.generate("slow-loader:latest", "hello").load_duration_ms == pytest.approx(300)
+    assert [entry["model"] for entry in fake_server.generate_requests_since(0)][:2] == [
+        "slow-loader:latest", "slow-loader:latest"
+    ]
+
+
+def test_percentiles_and_baseline_comparison():
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == pytest.approx(50.5)
+    assert percentile(samples, 99) == pytest.approx(99.01)
+    assert percentile([], 95) is None
+
+    baseline = {"scenarios": {
+        "root.route": {"errors": 0, "full": {"samples": 80, "p50": 100.0, "p95": 200.0, "p99": 210.0},
+                       "routing": {"samples": 80, "p50": 2.0, "p95": 3.0, "p99": 3.5}},
+        "launcher.council": {"errors": 0, "full": {"samples": 20, "p50": 300.0, "p95": 400.0, "p99": 400.0}},
+        "served.summon": {"errors": 0, "routing": {"samples": 40, "p50": 2.0, "p95": 3.0, "p99": 3.0}},
+    }}
+    report = {"scenarios": {
+        # p99 of 80 samples is one or two runs: not gated
+        "root.route": {"errors": 0, "full": {"samples": 80, "p50": 120.0, "p95": 300.0, "p99": 900.0},
+                       "routing": {"samples": 80, "p50": 2.5, "p95": 4.0, "p99": 18.0}},
+        # Only p50 has enough samples to gate
+        "launcher.council": {"errors": 0, "full": {"samples": 20, "p50": 320.0, "p95": 900.0, "p99": 900.0}},
+    }}
+    regressions = compare_to_baseline(report, baseline, tolerance=0.25, slack_ms=5)
+    assert regressions == [
+        "root.route.full.p95: 300.0ms vs baseline 200.0ms",
+        "served.summon: missing from this run",
+    ]
+    # Scenarios left out with --scenario are not compared
+    assert compare_to_baseline(report, baseline, scenarios=["launcher.council"]) == []
+    assert gated_percentiles(20) == [50] and gated_percentiles(300) == [50, 95, 99]
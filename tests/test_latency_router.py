@@ -0,0 +1,110 @@
+import threading
+
+from latency_router import LatencyRouter, RouteCandidate, prompt_bucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _candidates():
+    return [
+        RouteCandidate("local", "coding", "djinn-federation:idhhc", quality=0.85, prior_seconds=15),
+        RouteCandidate("local", "ultra_fast", "tinydolphin:latest", quality=0.55, prior_seconds=4),
+        RouteCandidate("pcloud", "deep_thinking", "djinn-deep-thinker:latest", quality=0.92, prior_seconds=30),
+    ]
+
+
+def test_prompt_buckets():
+    assert prompt_bucket(10) == "<64"
+    assert prompt_bucket(300) == "<1024"
+    assert prompt_bucket(9000) == "4096+"
+
+
+def test_fastest_candidate_meeting_quality_floor():
+    router = LatencyRouter(clock=FakeClock())
+    assert router.choose(_candidates(), 20, quality_floor=0.5).candidate.model == "ultra_fast"
+    assert router.choose(_candidates(), 20, quality_floor=0.8).candidate.model == "coding"
+
+    decision = router.choose(_candidates(), 20, quality_floor=0.99)
+    assert decision.candidate.model == "deep_thinking" and not decision.meets_floor
+
+
+def test_measurements_override_priors():
+    clock = FakeClock()
+    router = LatencyRouter(clock=clock)
+    # The PCloud worker turns out much faster than the local coder
+    for seconds in (40, 3, 3, 3):
+        router.record("djinn-deep-thinker:latest", "pcloud", 20, seconds)
+        clock.now += 5
+    for seconds in (20, 12, 12, 12):
+        router.record("djinn-federation:idhhc", "local", 20, seconds)
+        clock.now += 5
+
+    decision = router.choose(_candidates(), 20, quality_floor=0.8)
+    assert decision.candidate.tier == "pcloud"
+    assert decision.breakdown["service"] == 3
+    assert decision.breakdown["cold_start"] == 0  # Used recently, still resident
+
+
+def test_cold_start_and_queueing_are_predicted():
+    clock = FakeClock()
+    router = LatencyRouter(clock=clock, keep_alive_seconds=600)
+    coder = _candidates()[0]
+    for seconds in (5, 5, 5, 5):
+        router.record(coder.model_name, "local", 20, seconds, load_seconds=2)
+
+    clock.now += 1000  # Model unloaded since
+    prediction = router.predict(coder, 20)
+    assert prediction["cold_start"] == 2 and prediction["service"] == 3
+
+    router.begin("local")
+    assert router.predict(coder, 20)["queue"] == 3
+    router.end("local")
+
+
+def test_learns_from_performance_history_and_persists(tmp_path):
+    profile = tmp_path / "latency_profile.json"
+    router = LatencyRouter(profile, clock=FakeClock())
+    history = [
+        {"model": "phi3:latest", "tier": "local", "response_time": 2.0, "prompt_tokens": 30, "success": True,
+         "load_duration_ms": 0}
+        for _ in range(3)
+    ] + [{"model": "phi3:latest", "tier": "local", "query": "no timing"}]
+    assert router.learn_from_history(history) == 3
+    router.save()
+
+    reloaded = LatencyRouter(profile)
+    assert reloaded.get_profile()["service"]["phi3:latest|local|<64"]["p50"] == 2.0
+
+    # Failures lower effective quality
+    for _ in range(3):
+        reloaded.record("phi3:latest", "local", 30, 1.0, success=False)
+    candidate = RouteCandidate("local", "capable", "phi3:latest", quality=0.8, prior_seconds=5)
+    assert reloaded.effective_quality(candidate) == 0.4
+
+
+def test_concurrent_updates_are_saved_whole_and_flushed(tmp_path):
+    profile = tmp_path / "latency_profile.json"
+    router = LatencyRouter(profile)
+
+    def record_many(model):
+        for _ in range(200):
+            router.record(model, "local", 30, 1.0, load_seconds=0)
+
+    threads = [threading.Thread(target=record_many, args=(f"model-{index}",)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    router.flush()
+
+    reloaded = LatencyRouter(profile)
+    assert {key: counts["success"] for key, counts in reloaded.outcomes.items()} == {
+        (f"model-{index}", "local"): 200 for index in range(4)
+    }
+    assert [path.name for path in tmp_path.iterdir()] == ["latency_profile.json"]
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from lazy_subsystems import StartupReport, SubsystemRegistry
+
+
+def test_subsystems_build_once_on_first_use_or_in_background():
+    report = StartupReport()
+    registry = SubsystemRegistry(report)
+    builds = []
+    release = threading.Event()
+
+    def slow_consciousness():
+        builds.append("consciousness")
+        release.wait(5)
+        return "consciousness"
+
+    registry.register("consciousness", slow_consciousness)
+    registry.register("prewarming", lambda: builds.append("prewarming") or "prewarming", preload=False)
+    registry.register("pcloud", lambda: 1 / 0)
+    assert registry.status() == {"consciousness": "not started", "prewarming": "not started", "pcloud": "not started"}
+
+    registry.start_preload()
+    while registry.status()["consciousness"] != "loading":
+        time.sleep(0.001)
+    assert registry.peek("consciousness") is None
+
+    # A turn arriving mid-preload waits for that build rather than starting another
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(registry.get("consciousness")))
+    waiter.start()
+    time.sleep(0.02)
+    assert results == []
+    release.set()
+    waiter.join(5)
+    assert registry.wait(5)
+
+    assert results == ["consciousness"]
+    assert builds == ["consciousness"]
+    assert registry.status() == {"consciousness": "ready", "prewarming": "not started", "pcloud": "failed"}
+    assert registry.get("pcloud") is None
+    assert registry.describe("prewarming") == "💤 ON FIRST USE"
+    assert registry.describe("missing") == "❌ OFFLINE"
+
+    assert registry.get("prewarming") == "prewarming"
+    assert registry.get("missing") is None
+    where = {phase["name"]: phase["where"] for phase in report.to_dict()["phases"]}
+    assert where == {"consciousness": "background", "pcloud": "background", "prewarming": "first use"}
+
+
+def test_startup_report_times_blocking_phases_to_the_first_prompt():
+    report = StartupReport()
+    with report.phase("conversation_history"):
+        time.sleep(0.01)
+    report.record("analytics", 0.5, "background")
+    assert report.to_dict()["time_to_first_prompt_ms"] is None
+
+    ready = report.mark_ready()
+    assert ready >= 0.01
+    assert report.mark_ready() == ready  # Only the first prompt counts
+
+    assert report.summary().startswith(f"⚡ Ready in {ready * 1000:.0f}ms (slowest step: conversation_history")
+    lines = report.format().splitlines()
+    assert lines[0] == f"⚡ STARTUP: first prompt after {ready * 1000:.0f}ms"
+    assert [line.split()[0] for line in lines[1:]] == ["analytics", "conversation_history"]
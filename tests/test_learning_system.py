@@ -1,6 +1,6 @@
 from constellation_hub import ConstellationHub
 
-def test_preference_learning():
+def test_preference_learning(hub_workdir):
     hub = ConstellationHub()
     hub.user_preferences['coding'] = 'idhhc'
     hub.save_user_preferences()
@@ -0,0 +1,70 @@
+import json
+import threading
+import time
+
+import lock_profiler
+import metrics_registry
+from lock_profiler import LockProfiler, ProfiledLock, format_report
+from metrics_registry import MetricsRegistry, timed_lock
+
+
+def test_profiled_lock_records_contention_hold_and_call_site(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_registry, "metrics_registry", registry)
+    monkeypatch.setattr(lock_profiler, "HOT_CONTENTION_RATIO", 0.03)  # 1 in 27 waited
+    profiler = LockProfiler(enabled=True)
+    lock = profiler.lock("consciousness.stream")
+    assert isinstance(lock, ProfiledLock)
+
+    def hold_and_save():
+        with lock:
+            time.sleep(0.05)
+
+    holder = threading.Thread(target=hold_and_save)
+    holder.start()
+    while not lock.locked():
+        time.sleep(0.001)
+    with timed_lock(lock, "consciousness.stream"):
+        pass
+    holder.join()
+    for _ in range(25):
+        with lock:
+            pass
+
+    report = profiler.report()
+    stream = report["locks"][0]
+    assert stream["name"] == "consciousness.stream"
+    assert stream["acquisitions"] == 27
+    assert stream["contended"] == 1
+    assert stream["wait"]["max_ms"] >= 20
+    assert stream["hold"]["max_ms"] >= 45
+    assert stream["hot"] and report["hot_locks"] == ["consciousness.stream"]
+    assert stream["top_sites"][0]["site"].startswith("test_lock_profiler.py:")
+    assert stream["top_sites"][0]["site"].endswith("hold_and_save")
+
+    # The profiled lock records the wait once; timed_lock does not add its own
+    rendered = registry.render()
+    assert 'djinn_lock_wait_seconds_count{lock="consciousness.stream"} 27' in rendered
+    assert 'djinn_lock_hold_seconds_count{lock="consciousness.stream"} 27' in rendered
+
+    path = profiler.write_report(tmp_path / "lock_profile.json")
+    assert json.loads(path.read_text())["hot_locks"] == ["consciousness.stream"]
+    assert "🔥" in format_report(report)
+    assert "longest holder: test_lock_profiler.py:" in format_report(report)
+
+
+def test_disabled_profiler_hands_out_plain_locks(monkeypatch):
+    monkeypatch.delenv(lock_profiler.LOCK_PROFILE_ENV, raising=False)
+    monkeypatch.setattr(lock_profiler, "lock_profiler", None)
+
+    lock = lock_profiler.make_lock("analytics")
+    assert type(lock) is type(threading.Lock())
+    assert lock_profiler.get_lock_profiler().report()["locks"] == []
+    assert format_report(lock_profiler.get_lock_profiler().report()).endswith("no profiled acquisitions yet")
+
+    assert lock_profiler.report_path_from_env() is None
+    monkeypatch.setenv(lock_profiler.LOCK_PROFILE_ENV, "1")
+    assert lock_profiler.report_path_from_env() == lock_profiler.DEFAULT_REPORT_FILE
+    assert lock_profiler.DEFAULT_REPORT_FILE.is_absolute()
+    monkeypatch.setenv(lock_profiler.LOCK_PROFILE_ENV, "/tmp/profile.json")
+    assert lock_profiler._profiler_from_env().report_path.name == "profile.json"
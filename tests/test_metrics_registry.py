@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+import metrics_registry
+from metrics_registry import MetricsRegistry, timed_lock
+
+
+def test_render_counters_gauges_and_histograms():
+    registry = MetricsRegistry()
+    requests = registry.counter("djinn_requests_total", "Requests", ["tier", "model"])
+    requests.labels(tier="fast", model="tiny").inc()
+    requests.labels("fast", "tiny").inc(2)
+    registry.gauge("djinn_queue_depth", "Queued").set(4)
+    registry.gauge("djinn_live", "Live").set_function(lambda: 7)
+    latency = registry.histogram("djinn_latency_seconds", "Latency", ["tier"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.labels("fast").observe(value)
+
+    assert registry.counter("djinn_requests_total", "Requests", ["tier", "model"]) is requests
+    with pytest.raises(ValueError):
+        registry.gauge("djinn_requests_total", "Requests")
+    with pytest.raises(ValueError):
+        requests.inc()  # Labelled metrics need .labels()
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == [
+        "# HELP djinn_latency_seconds Latency",
+        "# TYPE djinn_latency_seconds histogram",
+        'djinn_latency_seconds_bucket{tier="fast",le="0.1"} 2',
+    ]
+    assert 'djinn_latency_seconds_bucket{tier="fast",le="1"} 3' in lines
+    assert 'djinn_latency_seconds_bucket{tier="fast",le="+Inf"} 4' in lines
+    assert 'djinn_latency_seconds_sum{tier="fast"} 3.65' in lines
+    assert 'djinn_latency_seconds_count{tier="fast"} 4' in lines
+    assert "djinn_live 7" in lines
+    assert "djinn_queue_depth 4" in lines
+    assert 'djinn_requests_total{tier="fast",model="tiny"} 3' in lines
+
+
+def test_textfile_dump_and_lock_waits(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_registry, "metrics_registry", registry)
+
+    lock = threading.Lock()
+    with timed_lock(lock, "memory.stream"):
+        assert lock.locked()
+    assert not lock.locked()
+
+    path = tmp_path / "textfile" / "djinn.prom"
+    registry.write_textfile(path)
+    text = path.read_text()
+    assert 'djinn_lock_wait_seconds_count{lock="memory.stream"} 1' in text
+    assert [item.name for item in path.parent.iterdir()] == ["djinn.prom"]  # No temp files left
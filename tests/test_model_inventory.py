@@ -0,0 +1,73 @@
+import pytest
+
+from model_inventory import ModelInventory, normalize_model_name
+from ollama_client import OllamaError, OllamaTimeoutError
+
+
+class _Client:
+    def __init__(self):
+        self.calls = []
+        self.tags = [
+            {"name": "Yufok1/djinn-federation:council", "size": 7_365_960_935, "digest": "sha256:aa",
+             "details": {"parameter_size": "13B"}},
+            {"name": "tinydolphin:latest", "size": 636_000_000, "digest": "sha256:bb"},
+        ]
+        self.running = [{"name": "tinydolphin:latest", "size_vram": 640_000_000, "expires_at": "soon"}]
+        self.fail = None
+
+    def list_models(self, timeout):
+        self.calls.append("/api/tags")
+        if self.fail:
+            raise self.fail
+        return self.tags
+
+    def running_models(self, timeout):
+        self.calls.append("/api/ps")
+        return self.running
+
+
+def test_inventory_parses_records_and_queries_once_per_ttl():
+    client = _Client()
+    inventory = ModelInventory(client, ttl=60)
+
+    council = inventory.get("Yufok1/djinn-federation:council")
+    assert (council.repository, council.tag, council.digest) == ("Yufok1/djinn-federation", "council", "sha256:aa")
+    assert council.size_label == "7.4 GB"
+    assert council.parameter_size == "13B"
+    assert not council.loaded
+    assert inventory.is_loaded("tinydolphin")  # Untagged means :latest
+    assert inventory.get("TinyDolphin:latest").size_vram == 640_000_000
+
+    # Namespace may be omitted; other tags and prefixes of names do not match
+    assert inventory.availability(["djinn-federation:council", "djinn-federation:idhhc", "dolphin"]) == {
+        "djinn-federation:council": True,
+        "djinn-federation:idhhc": False,
+        "dolphin": False,
+    }
+    assert client.calls == ["/api/tags", "/api/ps"]
+
+    client.tags.append({"name": "djinn-federation:idhhc", "size": 1})
+    assert not inventory.is_installed("djinn-federation:idhhc")
+    inventory.invalidate()
+    assert inventory.is_installed("djinn-federation:idhhc")
+    assert client.calls == ["/api/tags", "/api/ps"] * 2
+    assert normalize_model_name(" Yufok1/Djinn-Federation ") == "yufok1/djinn-federation:latest"
+
+
+def test_unreachable_server_is_cached_briefly_then_retried():
+    client = _Client()
+    client.fail = OllamaTimeoutError("Ollama /api/tags timed out after 10s")
+    inventory = ModelInventory(client, ttl=60, error_ttl=0)
+
+    with pytest.raises(OllamaTimeoutError):
+        inventory.models()
+    client.fail = None
+    assert len(inventory.models()) == 2
+
+    client.fail = OllamaError("Ollama server unreachable")
+    inventory.invalidate()
+    inventory.error_ttl = 60
+    for _ in range(3):
+        with pytest.raises(OllamaError):
+            inventory.is_installed("tinydolphin")
+    assert client.calls.count("/api/tags") == 3
@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from ollama_client import OllamaClient, OllamaError, resolve_ollama_host
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _Handler.requests.append((self.path, body))
+        if self.path == "/api/show":
+            payload = {"modelfile": 'FROM llama3\nSYSTEM """You are the Djinn Companion."""\n'}
+        elif body["model"] == "missing":
+            self.send_response(404)
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": "model not found"}).encode())
+            return
+        elif body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for chunk in ({"response": "hel"}, {"response": "lo"},
+                          {"response": "", "done": True, "eval_count": 2, "eval_duration": 1_000_000}):
+                self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            return
+        else:
+            payload = {
+                "response": "hello",
+                "prompt_eval_count": 12,
+                "prompt_eval_duration": 3_000_000,
+                "eval_count": 4,
+                "eval_duration": 2_000_000,
+            }
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.requests = []
+    yield f"127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_resolve_host():
+    assert resolve_ollama_host("127.0.0.1:11434") == "http://127.0.0.1:11434"
+    assert resolve_ollama_host("http://gpu-box") == "http://gpu-box:11434"
+
+
+def test_generate_keeps_model_system_prompt(server):
+    client = OllamaClient(host=server)
+    result = client.generate("companion", "Hi there", system="STABLE PREFIX")
+
+    assert result.response == "hello"
+    assert result.prompt_eval_count == 12
+    assert result.prompt_eval_duration_ms == pytest.approx(3.0)
+    assert result.tokens_per_second == pytest.approx(2000.0)
+
+    generate_body = [body for path, body in _Handler.requests if path == "/api/generate"][0]
+    assert generate_body["system"] == "You are the Djinn Companion.\n\nSTABLE PREFIX"
+    assert generate_body["prompt"] == "Hi there"
+
+    # The Modelfile system prompt is looked up once per model
+    client.generate("companion", "Again", system="STABLE PREFIX")
+    assert sum(1 for path, _ in _Handler.requests if path == "/api/show") == 1
+
+
+def test_server_errors_raise(server):
+    with pytest.raises(OllamaError, match="model not found"):
+        OllamaClient(host=server).generate("missing", "Hi")
+
+
+def test_generate_streams_fragments(server):
+    fragments = []
+    result = OllamaClient(host=server).generate("companion", "Hi", on_token=fragments.append)
+
+    assert fragments == ["hel", "lo"]
+    assert result.response == "hello"
+    assert result.eval_count == 2
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from pcloud_capacity_probe import MetricWindow, PCloudCapacityProbe, percentile
+
+
+def test_metric_window_ewma_and_percentiles():
+    window = MetricWindow(alpha=0.5, window=3)
+    for value in (10, 20, 30, 40):
+        window.add(value)
+
+    assert window.ewma == pytest.approx(31.25)
+    assert list(window.samples) == [20, 30, 40]
+    assert window.summary()["p50"] == 30
+    assert percentile([], 0.95) == 0.0
+
+
+def test_snapshot_is_cached_until_sampled(tmp_path):
+    probe = PCloudCapacityProbe(str(tmp_path), payload_bytes=256 * 1024)
+    assert probe.snapshot()["performance_rating"] == "Probing"
+
+    probe.sample()
+    probe.sample()
+    status = probe.snapshot()
+
+    assert status["available"] and status["samples"] == 2
+    assert status["total_gb"] > 0
+    assert status["metrics"]["write_mbps"]["ewma"] > 0
+    assert status["metrics"]["latency_ms"]["p95"] >= status["metrics"]["latency_ms"]["p50"]
+    assert status["performance_rating"] in ("Good", "Moderate", "Slow")
+    # Probe files are cleaned up
+    assert os.listdir(tmp_path) == []
+
+
+def test_background_thread_and_unavailable_mount(tmp_path):
+    probe = PCloudCapacityProbe(str(tmp_path), payload_bytes=64 * 1024, interval=60)
+    probe.start()
+    probe.stop()
+    assert probe.sample_count == 1
+
+    missing = PCloudCapacityProbe(str(tmp_path / "unmounted"))
+    status = missing.sample()
+    assert status["available"] is False and status["error"]
@@ -0,0 +1,93 @@
+import asyncio
+import importlib
+import os
+import struct
+import sys
+
+import pytest
+
+from pcloud_completion_watcher import INOTIFY_AVAILABLE, CompletionWatcher, parse_inotify_names
+from pcloud_task_queue import PCloudTaskQueue
+
+
+async def _complete_later(queue, task_id, delay):
+    await asyncio.sleep(delay)
+    queue.claim("worker")
+    queue.complete(task_id, "worker", response="done")
+
+
+def _run(queue, watcher, task_id, complete_after, timeout=5):
+    async def scenario():
+        finisher = asyncio.ensure_future(_complete_later(queue, task_id, complete_after))
+        result = await watcher.wait_for(task_id, timeout=timeout)
+        await finisher
+        watcher.close()
+        return result
+
+    return asyncio.run(scenario())
+
+
+def test_polling_backend_backs_off(tmp_path):
+    queue = PCloudTaskQueue(tmp_path)
+    task_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+    watcher = CompletionWatcher(queue.completed_dir, use_inotify=False, min_interval=0.01, max_interval=0.4)
+
+    result = _run(queue, watcher, task_id, complete_after=1.0)
+
+    assert result["response"] == "done"
+    assert watcher.backend == "polling"
+    # Fixed 10ms polling would take ~100 checks; backoff keeps it to a handful
+    assert watcher.stats["polls"] <= 10
+    assert watcher.stats["completions"] == 1
+
+
+@pytest.mark.skipif(not INOTIFY_AVAILABLE, reason="inotify requires Linux")
+def test_inotify_backend_wakes_on_completion(tmp_path):
+    queue = PCloudTaskQueue(tmp_path)
+    task_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+    watcher = CompletionWatcher(queue.completed_dir, backstop_interval=30)
+
+    result = _run(queue, watcher, task_id, complete_after=0.2)
+
+    assert result["status"] == "completed"
+    assert watcher.stats["events"] >= 1
+    assert watcher.stats["polls"] == 0
+
+
+def test_already_completed_and_timeout(tmp_path):
+    queue = PCloudTaskQueue(tmp_path)
+    done_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+    queue.claim("worker")
+    queue.complete(done_id, "worker", response="early")
+    waiting_id = queue.enqueue("query_execution", "again", "djinn-deep-thinker:latest")
+    watcher = CompletionWatcher(queue.completed_dir, use_inotify=False, min_interval=0.01)
+
+    async def scenario():
+        early = await watcher.wait_for(done_id, timeout=1)
+        missing = await watcher.wait_for(waiting_id, timeout=0.2)
+        stats = watcher.get_stats()
+        watcher.close()
+        return early, missing, stats
+
+    early, missing, stats = asyncio.run(scenario())
+    assert early["response"] == "early"
+    assert missing is None
+    assert stats["waiting_tasks"] == 0
+
+
+def test_parse_inotify_names():
+    name = b"djinn_task_1.json\0\0\0"
+    data = struct.pack("iIII", 1, 0x80, 0, len(name)) + name + struct.pack("iIII", 1, 0x8, 0, 0)
+    assert parse_inotify_names(data) == ["djinn_task_1.json"]
+
+
+def test_pcloud_federation_imports_without_o_nonblock(monkeypatch):
+    # Windows (PCloud's drive-letter platform) has no os.O_NONBLOCK
+    monkeypatch.delattr(os, "O_NONBLOCK")
+    monkeypatch.setattr(sys, "platform", "win32")
+    for name in ("pcloud_completion_watcher", "pcloud_djinn_federation"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    watcher_module = importlib.import_module("pcloud_completion_watcher")
+    importlib.import_module("pcloud_djinn_federation")
+    assert not watcher_module.INOTIFY_AVAILABLE
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from pcloud_model_sync import ModelSyncError, PCloudModelSync, parse_model_name
+
+
+def _install_model(models_dir, model, blobs):
+    """Write blobs and an Ollama-style manifest into a fake local store"""
+    layers = []
+    for content in blobs:
+        digest = f"sha256:{hashlib.sha256(content).hexdigest()}"
+        (models_dir / "blobs").mkdir(parents=True, exist_ok=True)
+        (models_dir / "blobs" / digest.replace(":", "-")).write_bytes(content)
+        layers.append({"mediaType": "application/vnd.ollama.image.model", "digest": digest, "size": len(content)})
+
+    registry, namespace, repository, tag = parse_model_name(model)
+    manifest_path = models_dir / "manifests" / registry / namespace / repository / tag
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps({"schemaVersion": 2, "layers": layers}), encoding="utf-8")
+
+
+def _sync(tmp_path, models_dir, **kwargs):
+    return PCloudModelSync(tmp_path / "pcloud", models_dir=models_dir, chunk_size=1024,
+                           state_dir=tmp_path / "state", **kwargs)
+
+
+def test_parse_model_name():
+    assert parse_model_name("djinn-cosmic-coder") == ("registry.ollama.ai", "library", "djinn-cosmic-coder", "latest")
+    assert parse_model_name("Yufok1/djinn-federation:idhhc") == ("registry.ollama.ai", "Yufok1", "djinn-federation", "idhhc")
+
+
+def test_push_dedups_and_unchanged_resync_is_free(tmp_path):
+    local = tmp_path / "local"
+    weights = os.urandom(5000)
+    _install_model(local, "djinn-federation:idhhc", [weights, b"TEMPLATE {{ .Prompt }}"])
+    # A second model sharing the weights blob
+    _install_model(local, "djinn-federation:council", [weights, b"SYSTEM council"])
+
+    sync = _sync(tmp_path, local)
+    first = sync.push("djinn-federation:idhhc")
+    assert first.status == "synced"
+    assert first.blobs_transferred == 2
+    assert first.chunks_uploaded == 6  # 5 weight chunks + 1 template chunk
+
+    shared = sync.push("djinn-federation:council")
+    assert shared.blobs_transferred == 1 and shared.chunks_uploaded == 1
+
+    again = sync.push("djinn-federation:idhhc")
+    assert again.status == "unchanged"
+    assert again.chunks_uploaded == again.bytes_transferred == 0
+
+
+def test_interrupted_push_resumes(tmp_path):
+    local = tmp_path / "local"
+    _install_model(local, "djinn-cosmic-coder:latest", [os.urandom(4096)])
+    sync = _sync(tmp_path, local)
+    sync.push("djinn-cosmic-coder:latest")
+
+    # Simulate a crash: lose half the chunks and the blob manifest
+    chunks = sorted((tmp_path / "pcloud" / "store" / "chunks").rglob("*"))
+    chunk_files = [path for path in chunks if path.is_file()]
+    for path in chunk_files[:2]:
+        path.unlink()
+    for path in (tmp_path / "pcloud" / "store" / "blobs").iterdir():
+        path.unlink()
+
+    resumed = _sync(tmp_path, local).push("djinn-cosmic-coder:latest")
+    assert resumed.chunks_uploaded == 2
+    assert resumed.chunks_skipped == 2
+
+
+def test_pull_restores_on_another_device(tmp_path):
+    source = tmp_path / "source"
+    weights = os.urandom(3000)
+    _install_model(source, "djinn-deep-thinker:latest", [weights])
+    _sync(tmp_path, source).push("djinn-deep-thinker:latest")
+
+    target = tmp_path / "target"
+    report = _sync(tmp_path, target).pull("djinn-deep-thinker:latest")
+    assert report.status == "restored" and report.blobs_transferred == 1
+
+    digest = hashlib.sha256(weights).hexdigest()
+    assert (target / "blobs" / f"sha256-{digest}").read_bytes() == weights
+    assert (target / "manifests" / "registry.ollama.ai" / "library" / "djinn-deep-thinker" / "latest").exists()
+
+    with pytest.raises(ModelSyncError):
+        _sync(tmp_path, target).pull("djinn-logic-master:latest")
@@ -0,0 +1,128 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+from pcloud_task_queue import PCloudTaskQueue
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _EchoOllama(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = {"response": f"{body['model']} says: {body['prompt']}", "eval_count": 3}
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama_host():
+    httpd = HTTPServer(("127.0.0.1", 0), _EchoOllama)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_worker_process_completes_tasks(tmp_path, ollama_host):
+    queue = PCloudTaskQueue(tmp_path)
+    first = queue.enqueue("query_execution", "design the vault", "djinn-cosmic-coder:latest")
+    second = queue.enqueue("query_execution", "review the vault", "djinn-logic-master:latest")
+
+    worker = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "pcloud_task_queue.py"), "worker",
+         "--operations-dir", str(tmp_path), "--worker-id", "gpu-box",
+         "--poll-interval", "0.1", "--max-tasks", "2"],
+        env={**os.environ, "OLLAMA_HOST": ollama_host},
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        result = queue.wait_for_completion(first, timeout=30, poll_interval=0.1)
+        assert result["status"] == "completed"
+        assert result["worker_id"] == "gpu-box"
+        assert result["response"] == "djinn-cosmic-coder:latest says: design the vault"
+
+        result = queue.wait_for_completion(second, timeout=30, poll_interval=0.1)
+        assert result["response"] == "djinn-logic-master:latest says: review the vault"
+        assert worker.wait(timeout=30) == 0
+    finally:
+        worker.kill()
+
+    assert not list((tmp_path / "claimed" / "gpu-box").iterdir())
+    assert not list((tmp_path / "leases").iterdir())
+
+
+def test_claim_is_exclusive(tmp_path):
+    queue = PCloudTaskQueue(tmp_path)
+    task_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+
+    task = queue.claim("worker-a")
+    assert task["task_id"] == task_id and task["attempts"] == 1
+    assert queue.claim("worker-b") is None
+    assert queue.status(task_id)["status"] == "running"
+
+
+def test_expired_lease_returns_task_to_pending(tmp_path):
+    clock = FakeClock()
+    queue = PCloudTaskQueue(tmp_path, lease_seconds=30, max_attempts=2, clock=clock)
+    task_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+    queue.claim("crashed-worker")
+
+    clock.now += 10
+    assert queue.recover_expired() == []
+
+    clock.now += 30
+    assert queue.recover_expired() == [task_id]
+    assert queue.status(task_id)["status"] == "pending"
+
+    retried = queue.claim("healthy-worker")
+    assert retried["attempts"] == 2 and retried["recovered_from"] == "crashed-worker"
+
+    # The crashed worker has lost its claim and cannot renew it
+    assert not queue.heartbeat(task_id, "crashed-worker")
+
+    clock.now += 60
+    assert queue.recover_expired() == [task_id]
+    assert queue.status(task_id)["status"] == "failed"
+
+
+def test_fresh_claim_without_lease_is_not_recovered(tmp_path, monkeypatch):
+    queue = PCloudTaskQueue(tmp_path, lease_seconds=30)
+    task_id = queue.enqueue("query_execution", "hello", "djinn-deep-thinker:latest")
+    pending_file = queue.pending_dir / f"{task_id}.json"
+    os.utime(pending_file, (pending_file.stat().st_mtime - 3600,) * 2)  # Queued for an hour
+
+    def unmounted(path, data):
+        raise OSError("drive unmounted")
+
+    # The worker dies right after winning the rename, before any lease is written
+    monkeypatch.setattr(queue, "_write_json", unmounted)
+    with pytest.raises(OSError):
+        queue.claim("worker-a")
+    monkeypatch.undo()
+    assert queue.recover_expired() == []
+
+    # A claim completed while recovery was deciding is not requeued or failed
+    claimed_file = queue.claimed_dir / "worker-a" / f"{task_id}.json"
+    queue.complete(task_id, "worker-a", response="done")
+    assert not queue._requeue(claimed_file, "worker-a")
+    assert queue.status(task_id)["status"] == "completed"
+    assert queue._pending_names() == []
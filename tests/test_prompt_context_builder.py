@@ -0,0 +1,59 @@
+from prompt_context_builder import (
+    PromptContextBuilder,
+    estimate_tokens,
+    get_prompt_metrics,
+    get_token_budget,
+    keep_recent_lines,
+)
+
+
+def test_token_budget_lookup():
+    assert get_token_budget("Yufok1/djinn-federation:constellation-lite") == 1024
+    assert get_token_budget("djinn-cosmic-coder:latest") == 4096
+    assert get_token_budget("unknown-model") == 2048
+
+
+def test_small_prompt_is_kept_in_order():
+    builder = PromptContextBuilder("Yufok1/djinn-federation:council")
+    builder.add_section("preamble", "You are the Council.", required=True)
+    builder.add_section("memories", "RECENT MEMORIES:\n- one", priority=20)
+    builder.add_section("query", "USER QUERY: hello", required=True)
+    prompt = builder.build()
+
+    assert prompt.included == ["preamble", "memories", "query"]
+    assert prompt.text.index("Council") < prompt.text.index("one") < prompt.text.index("hello")
+    assert not prompt.over_budget
+
+
+def test_low_priority_sections_give_way_under_budget():
+    memories = "RECENT MEMORIES:\n" + "\n".join(f"- memory {i} " + "x" * 200 for i in range(40))
+    builder = PromptContextBuilder("test-model", budget_tokens=400)
+    builder.add_section("preamble", "You are a helpful djinn.", required=True)
+    builder.add_section("memories", memories, priority=20, summarize=keep_recent_lines)
+    builder.add_section("flourish", "*cosmic energies swirl* " * 50, priority=90)
+    builder.add_section("query", "USER QUERY: summarize", required=True)
+    prompt = builder.build()
+
+    assert prompt.summarized == ["memories"]
+    assert prompt.dropped == ["flourish"]
+    assert "memory 39" in prompt.text and "memory 0 " not in prompt.text
+    assert "older entries omitted" in prompt.text
+    assert prompt.token_count <= 400
+    assert estimate_tokens(prompt.text) == prompt.token_count
+
+    stats = get_prompt_metrics().get_summary()["test-model"]
+    assert stats["trimmed_prompts"] >= 1
+
+
+def test_stable_sections_form_system_prefix():
+    def build(score, query):
+        builder = PromptContextBuilder("Yufok1/djinn-federation:constellation-core")
+        builder.add_system("instructions", "CONSTELLATION HUB COMMAND PROCESSING")
+        builder.add_section("command", f"Complexity Score: {score}/100\nUSER COMMAND: {query}", required=True)
+        return builder.build()
+
+    first, second = build(30, "list files"), build(85, "deploy the federation")
+    assert first.system == second.system == "CONSTELLATION HUB COMMAND PROCESSING"
+    assert "Complexity Score" not in first.system
+    assert first.prompt.startswith("Complexity Score: 30/100")
+    assert first.text == f"{first.system}\n{first.prompt}"
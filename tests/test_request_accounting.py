@@ -0,0 +1,45 @@
+import os
+import time
+
+from ollama_client import GenerationResult
+from request_accounting import RequestAccountant
+
+
+def test_tracks_server_process_and_tokens():
+    # Treat this test process as the "model server" so its CPU is attributed
+    accountant = RequestAccountant(server_pids=[os.getpid()])
+    with accountant.track() as usage:
+        deadline = time.process_time() + 0.05
+        while time.process_time() < deadline:
+            pass
+        usage.attach_generation(GenerationResult.from_response("phi3:latest", {
+            "response": "ok",
+            "prompt_eval_count": 42,
+            "eval_count": 10,
+            "eval_duration": 500_000_000,
+            "load_duration": 1_500_000_000,
+        }))
+
+    assert usage.server_cpu_seconds >= 0.04
+    assert usage.client_cpu_seconds >= 0.04
+    assert usage.server_rss_mb > 0
+    assert usage.prompt_eval_count == 42 and usage.eval_count == 10
+    assert usage.tokens_per_second == 20.0
+    assert usage.load_duration_ms == 1500.0
+    assert usage.concurrent_requests == 1
+
+
+def test_missing_server_and_overlapping_requests():
+    accountant = RequestAccountant(server_pids=[])
+    with accountant.track() as first:
+        with accountant.track() as second:
+            pass
+
+    assert first.server_cpu_seconds is None and first.server_rss_mb is None
+    assert first.concurrent_requests == 2 and second.concurrent_requests == 2
+    assert accountant.active_usages == []
+
+    remote = accountant.track()
+    with remote as usage:
+        usage.attach_metrics({"eval_count": 7, "tokens_per_second": 3.5})
+    assert usage.to_dict()["eval_count"] == 7
@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+import resource_sampler
+from resource_sampler import ResourceSampler, read_proc_cpu_times
+
+
+def test_snapshot_does_not_block():
+    sampler = ResourceSampler(interval=0.05, window=5)
+    sampler.start()
+    try:
+        time.sleep(0.2)
+        started = time.perf_counter()
+        snapshot = sampler.snapshot()
+        assert time.perf_counter() - started < 0.05
+
+        assert snapshot["ram_total_gb"] > 0
+        assert 0 <= snapshot["ram_percent"] <= 100
+        assert 0 <= snapshot["cpu_avg_percent"] <= 100
+        assert snapshot["sample_age_seconds"] < 1
+        assert len(sampler.history) <= 5
+    finally:
+        sampler.stop()
+
+
+def test_proc_fallback_without_psutil(monkeypatch):
+    if read_proc_cpu_times() is None:
+        pytest.skip("/proc is not available")
+    monkeypatch.setattr(resource_sampler, "PSUTIL_AVAILABLE", False)
+    sampler = ResourceSampler()
+    sampler.sample()
+    sum(i * i for i in range(200000))  # Burn a little CPU between samples
+    reading = sampler.sample()
+
+    assert 0 <= reading["cpu_percent"] <= 100
+    assert reading["ram_available_gb"] <= reading["ram_total_gb"]
+    assert sampler.snapshot()["cpu_avg_percent"] >= 0
@@ -0,0 +1,114 @@
+import threading
+
+from session_state import SessionPartitions
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sessions_get_private_state():
+    partitions = SessionPartitions(lambda session_id: {"owner": session_id, "turns": []})
+
+    with partitions.session("a") as state:
+        state["turns"].append("hello")
+    with partitions.session("b") as state:
+        assert state == {"owner": "b", "turns": []}
+    with partitions.session("a") as state:
+        assert state["turns"] == ["hello"]
+
+    assert partitions.peek("c") is None
+    assert sorted(partitions.session_ids()) == ["a", "b"]
+
+
+def test_busy_session_does_not_block_others():
+    partitions = SessionPartitions(lambda session_id: [])
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with partitions.session("slow"):
+            inside.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    inside.wait(5)
+
+    other_done = threading.Event()
+    worker = threading.Thread(target=lambda: (partitions.session("fast").__enter__(), other_done.set()))
+    worker.start()
+    assert other_done.wait(1)
+    assert partitions.get_stats()["active_sessions"] >= 1
+
+    release.set()
+    holder.join()
+    worker.join()
+
+
+def test_idle_sessions_are_evicted_with_hook():
+    clock = _Clock()
+    evicted = []
+    partitions = SessionPartitions(
+        lambda session_id: {"id": session_id}, idle_timeout=60, clock=clock,
+        on_evict=lambda session_id, state: evicted.append(state["id"]),
+    )
+    with partitions.session("old"):
+        pass
+    clock.now += 30
+    with partitions.session("recent"):
+        pass
+    clock.now += 45
+
+    assert partitions.evict_idle() == 1
+    assert evicted == ["old"]
+    assert partitions.session_ids() == ["recent"]
+
+    # Creating a session later sweeps idle ones too
+    clock.now += 120
+    with partitions.session("new"):
+        pass
+    assert partitions.session_ids() == ["new"]
+    assert partitions.get_stats()["evictions"] == 2
+
+
+def test_capacity_evicts_least_recent_unlocked_session():
+    partitions = SessionPartitions(lambda session_id: session_id, max_sessions=2)
+    busy = partitions._partition("busy")
+    busy.lock.acquire()
+    try:
+        with partitions.session("idle"):
+            pass
+        with partitions.session("newest"):
+            pass
+        assert sorted(partitions.session_ids()) == ["busy", "newest"]
+    finally:
+        busy.lock.release()
+
+    assert partitions.drop("busy") is True
+    assert partitions.drop("busy") is False
+
+
+def test_session_dropped_while_waiting_is_not_handed_out():
+    partitions = SessionPartitions(lambda session_id: {"turns": []})
+    stale = partitions._partition("a")
+    stale.lock.acquire()
+    seen = []
+
+    def wait_for_session():
+        with partitions.session("a") as state:
+            seen.append(state)
+
+    waiter = threading.Thread(target=wait_for_session)
+    waiter.start()
+    waiter.join(0.1)
+    assert partitions.drop("a") is True
+    stale.lock.release()
+    waiter.join(5)
+
+    assert len(seen) == 1 and seen[0] is not stale.state
+    assert partitions.peek("a") is seen[0]
@@ -1,6 +1,6 @@
 from constellation_hub import ConstellationHub
 
-def test_smart_routing_basic():
+def test_smart_routing_basic(hub_workdir):
     hub = ConstellationHub()
     best_agent, confidence, scores = hub.analyze_query_intent('Write python code to reverse a string')
     assert best_agent in ['council', 'idhhc', 'companion']
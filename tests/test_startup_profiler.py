@@ -0,0 +1,40 @@
+from startup_profiler import START_MARKER, format_startup_profile, parse_importtime, profile_startup
+
+IMPORTTIME_OUTPUT = f"""import time: self [us] | cumulative | imported package
+import time:       120 |        120 | encodings
+{START_MARKER}
+import time: self [us] | cumulative | imported package
+import time:       400 |        400 |     _json
+import time:      1000 |       1400 |   json
+import time:       500 |       2000 | hub
+"""
+
+
+def test_parse_importtime_keeps_records_after_the_marker():
+    records = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(record.module, record.depth) for record in records] == [("_json", 2), ("json", 1), ("hub", 0)]
+    assert records[-1].self_ms == 0.5
+    assert records[-1].cumulative_ms == 2.0
+
+
+def test_profile_reports_import_side_effects(tmp_path):
+    noisy = tmp_path / "noisy_entry.py"
+    noisy.write_text(
+        "import logging\n"
+        "logging.basicConfig(filename='noisy.log')\n"
+        "import argparse\n"
+    )
+    profile = profile_startup(noisy, runs=1)
+    assert profile["entry"] == "noisy_entry.py"
+    assert profile["created_files"] == ["noisy.log"]
+    assert profile["root_log_handlers"] == 1
+    assert "argparse" in profile["heavy_modules"]
+    assert not (tmp_path / "noisy.log").exists()  # Written in the probe's scratch directory
+
+    report = format_startup_profile(profile)
+    assert "🐢 Heavy modules loaded at import: argparse" in report
+    assert "created noisy.log; configured root logging (1 handlers)" in report
+
+    quiet = tmp_path / "quiet_entry.py"
+    quiet.write_text("VALUE = 1\n")
+    assert format_startup_profile(profile_startup(quiet, runs=1)).endswith("🧹 Import side effects: none")
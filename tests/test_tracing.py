@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+
+import tracing
+from tracing import NOOP_SPAN, STATUS_ERROR, Tracer, bind, format_waterfall, traced
+
+
+@pytest.fixture
+def tracer(tmp_path, monkeypatch):
+    tracer = Tracer(enabled=True, export_path=str(tmp_path / "traces.otlp.jsonl"))
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    return tracer
+
+
+def test_spans_nest_across_coroutines_and_executor_calls(tracer):
+    @traced("model.call")
+    def call_model():
+        tracer.current_span().add_event("first_token")
+        return "reply"
+
+    @traced("hub.route")
+    async def route():
+        with tracer.span("analytics", intent="command"):
+            await asyncio.sleep(0)
+        return await asyncio.get_event_loop().run_in_executor(None, bind(call_model))
+
+    assert asyncio.run(route()) == "reply"
+
+    spans = {span.name: span for span in tracer.last_trace()}
+    root = spans["hub.route"]
+    assert root.parent_id is None
+    assert spans["analytics"].parent_id == root.span_id
+    assert spans["model.call"].parent_id == root.span_id
+    assert {span.trace_id for span in spans.values()} == {root.trace_id}
+    assert spans["analytics"].attributes == {"intent": "command"}
+
+    lines = tracer.export_path.read_text().splitlines()
+    assert len(lines) == 1
+    request = json.loads(lines[0])
+    otlp_spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in otlp_spans] == ["hub.route", "analytics", "model.call"]
+    assert otlp_spans[1]["parentSpanId"] == root.span_id
+    assert otlp_spans[1]["attributes"] == [{"key": "intent", "value": {"stringValue": "command"}}]
+    assert otlp_spans[2]["events"][0]["name"] == "first_token"
+    assert int(otlp_spans[0]["endTimeUnixNano"]) >= int(otlp_spans[0]["startTimeUnixNano"])
+
+
+def test_errors_mark_the_span_and_waterfall_shows_nesting(tracer):
+    with pytest.raises(ValueError):
+        with tracer.span("turn"):
+            with tracer.span("history.save"):
+                raise ValueError("disk full")
+
+    spans = tracer.last_trace()
+    assert all(span.status == STATUS_ERROR for span in spans)
+    assert spans[1].events[0]["attributes"]["exception.message"] == "disk full"
+
+    waterfall = format_waterfall(spans).splitlines()
+    assert waterfall[0].startswith(f"🧵 Trace {spans[0].trace_id[:8]} — turn")
+    assert waterfall[1].lstrip().startswith("turn ")
+    assert waterfall[2].lstrip().startswith("history.save") and "  history.save" in waterfall[2]
+    assert waterfall[2].endswith("❌")
+
+
+def test_disabled_tracer_records_nothing(monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(tracing, "tracer", tracer)
+
+    @traced()
+    def work():
+        return tracer.current_span()
+
+    assert tracer.span("anything") is NOOP_SPAN
+    assert work() is NOOP_SPAN
+    assert bind(work) is work
+    assert tracer.last_trace() is None
+    assert tracer.get_stats()["recent_traces"] == 0
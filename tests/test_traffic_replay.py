@@ -0,0 +1,75 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from traffic_replay import collect_traffic, distribution, replay_offsets, replay_target  # noqa: E402
+
+
+@pytest.fixture
+def recorded_traffic(tmp_path):
+    conversation = tmp_path / "conversation_history.json"
+    conversation.write_text(json.dumps([
+        {"agent": "Djinn Companion", "user_input": "hello there", "timestamp": "2025-01-01 10:00:00", "session_id": "s1"},
+        {"agent": "Phi3 Constellation (Coordinator)", "user_input": "hello there", "timestamp": "2025-01-01 10:00:01"},
+        {"agent": "Djinn Council", "user_input": "what is wise?", "timestamp": "2025-01-01 10:00:20"},
+    ]))
+
+    directives = tmp_path / "coder_directives.jsonl"
+    directive = {"original_prompt": "deploy the build", "task": "Execute", "completed_at": "2025-01-01T10:00:10"}
+    # Written once on completion and again by the status update
+    directives.write_text(json.dumps(directive) + "\n" + json.dumps(directive) + "\n")
+
+    memory_dir = tmp_path / "memory_bank"
+    memory_dir.mkdir()
+    (memory_dir / "archive_20250101_10.json").write_text(
+        json.dumps({"timestamp": "2025-01-01T10:00:05", "type": "dialogue_interaction",
+                    "data": {"user_input": "from the archive"}, "model_source": "companion"}) + "\n"
+        + json.dumps({"timestamp": "2025-01-01T10:00:06", "type": "dialogue_response",
+                      "data": {"response": "not a prompt"}}) + "\n"
+        + '{"torn'
+    )
+    return conversation, directives, memory_dir
+
+
+def test_collects_prompts_from_every_source_in_time_order(recorded_traffic):
+    records = collect_traffic(*recorded_traffic)
+
+    assert [record.prompt for record in records] == [
+        "hello there", "from the archive", "deploy the build", "what is wise?"
+    ]
+    assert [record.source for record in records] == ["conversation", "consciousness", "directives", "conversation"]
+    assert records[0].session_id == "s1"
+
+    # Gaps of 5s, 5s and 10s at 10x speed, the last one capped at 0.75s
+    assert replay_offsets(records, speedup=10, max_gap=0.75) == pytest.approx([0.0, 0.5, 1.0, 1.75])
+    assert replay_offsets(records, speedup=0, max_gap=0.75) == [0.0] * 4
+
+    assert distribution(["a", "b", "a", "a"]) == {"a": {"count": 3, "share": 0.75}, "b": {"count": 1, "share": 0.25}}
+
+
+def test_replay_paces_and_bounds_concurrency(recorded_traffic):
+    records = collect_traffic(*recorded_traffic)
+    in_flight, peak = [0], [0]
+
+    async def call(record):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        if record.prompt == "what is wise?":
+            raise RuntimeError("model unavailable")
+
+    started = time.perf_counter()
+    result = asyncio.run(replay_target(call, records, [0.0, 0.0, 0.0, 0.2], concurrency=2))
+
+    assert time.perf_counter() - started >= 0.25
+    assert peak[0] == 2
+    assert result["requests"] == 4 and result["errors"] == 1
+    assert "model unavailable" in result["sample_errors"][0]
+    assert result["latency_ms"]["p50"] >= 50
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Tracing
+Nested timing spans across the hubs and the federation subsystems
+
+A turn through a hub touches analytics, cross-model context assembly,
+pre-warming, admission, the model call and persistence. Spans record how
+long each took and where it sits in the turn: the current span travels in
+a context variable, so spans opened inside it (including in coroutines
+and in executor calls wrapped with bind()) become its children. When a
+turn's root span ends the whole trace is kept for the status waterfall
+and, if an export file is set, appended to it as one OTLP/JSON
+ExportTraceServiceRequest per line (the OpenTelemetry collector's file
+format).
+
+Tracing is off unless DJINN_TRACE is set ("1" exports to
+logs/traces.otlp.jsonl, any other value is taken as the export path).
+Disabled, span() returns a shared no-op span and traced() adds one flag
+check per call.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+TRACE_ENV = "DJINN_TRACE"
+DEFAULT_TRACE_FILE = Path("logs") / "traces.otlp.jsonl"
+SERVICE_NAME = "djinn-federation"
+RECENT_TRACES = 20
+MAX_OPEN_TRACES = 1000
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("djinn_current_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace"""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    status: int = STATUS_OK
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes):
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = [
+                {
+                    "name": event["name"],
+                    "timeUnixNano": str(event["time_ns"]),
+                    "attributes": _otlp_attributes(event["attributes"]),
+                }
+                for event in self.events
+            ]
+        return span
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled; accepts and drops everything"""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def add_event(self, name: str, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # OTLP/JSON encodes int64 as a string
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Tracer:
+    """Collects spans into traces; exports each trace when its root span ends"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        export_path: Optional[str] = None,
+        service_name: str = SERVICE_NAME,
+        keep_traces: int = RECENT_TRACES,
+    ):
+        self.enabled = enabled
+        self.export_path = Path(export_path) if export_path else None
+        self.service_name = service_name
+        self.open_traces: Dict[str, List[Span]] = {}
+        self.recent: Deque[List[Span]] = deque(maxlen=keep_traces)
+        self.trace_lock = threading.Lock()
+        self.export_lock = threading.Lock()  # Serializes file writes without holding up span bookkeeping
+        self.exported_traces = 0
+        self.export_errors = 0
+
+    def enable(self, export_path: Optional[str] = None):
+        if export_path:
+            self.export_path = Path(export_path)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+        """Context manager for a child of the current span (or a new trace's root)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return self._span(name, kind, attributes)
+
+    @contextmanager
+    def _span(self, name: str, kind: int, attributes: Dict[str, Any]) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            kind=kind,
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.status_message = f"{type(e).__name__}: {e}"
+            span.add_event("exception", **{"exception.type": type(e).__name__, "exception.message": str(e)})
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span)
+
+    def current_span(self):
+        """The active span, or the no-op span outside a trace"""
+        return _current_span.get() or NOOP_SPAN
+
+    def _finish(self, span: Span):
+        with self.trace_lock:
+            spans = self.open_traces.setdefault(span.trace_id, [])
+            spans.append(span)
+            if span.parent_id is not None:
+                # A child outliving its root (a background thread) starts an
+                # entry that never closes; keep those bounded
+                if len(self.open_traces) > MAX_OPEN_TRACES:
+                    del self.open_traces[next(iter(self.open_traces))]
+                return
+            del self.open_traces[span.trace_id]
+            spans.sort(key=lambda item: item.start_ns)
+            self.recent.append(spans)
+        self._export(spans)
+
+    def _export(self, spans: List[Span]):
+        if not self.export_path:
+            return
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({
+                    "service.name": self.service_name,
+                    "process.pid": os.getpid(),
+                })},
+                "scopeSpans": [{
+                    "scope": {"name": "djinn.tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }
+        try:
+            with self.export_lock:
+                self.export_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(request, ensure_ascii=False) + "\n")
+                self.exported_traces += 1
+        except OSError as e:
+            self.export_errors += 1
+            print(f"⚠️ Trace export failed: {e}")
+
+    def last_trace(self) -> Optional[List[Span]]:
+        with self.trace_lock:
+            return list(self.recent[-1]) if self.recent else None
+
+    def recent_traces(self) -> List[List[Span]]:
+        with self.trace_lock:
+            return [list(spans) for spans in self.recent]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.trace_lock:
+            return {
+                "enabled": self.enabled,
+                "export_path": str(self.export_path) if self.export_path else None,
+                "recent_traces": len(self.recent),
+                "open_traces": len(self.open_traces),
+                "exported_traces": self.exported_traces,
+                "export_errors": self.export_errors,
+            }
+
+
+def format_waterfall(spans: List[Span], width: int = 32) -> str:
+    """Text waterfall of one trace: nesting, offset and duration of every span"""
+    if not spans:
+        return ""
+    children: Dict[Optional[str], List[Span]] = {}
+    span_ids = {span.span_id for span in spans}
+    for span in sorted(spans, key=lambda item: item.start_ns):
+        parent = span.parent_id if span.parent_id in span_ids else None
+        children.setdefault(parent, []).append(span)
+
+    start = min(span.start_ns for span in spans)
+    end = max(span.end_ns or span.start_ns for span in spans)
+    total = max(end - start, 1)
+    roots = children.get(None, [])
+    lines = [f"🧵 Trace {spans[0].trace_id[:8]} — {roots[0].name if roots else spans[0].name} "
+             f"{(end - start) / 1e6:.1f}ms"]
+
+    def walk(span: Span, depth: int):
+        offset = int((span.start_ns - start) / total * width)
+        length = max(1, int(((span.end_ns or end) - span.start_ns) / total * width))
+        bar = " " * offset + "█" * min(length, width - offset)
+        label = ("  " * depth + span.name)[:34]
+        marker = " ❌" if span.status == STATUS_ERROR else ""
+        lines.append(f"  {label:<34} |{bar:<{width}}| {span.duration_ms:>8.1f}ms{marker}")
+        for child in children.get(span.span_id, []):
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def describe_last_trace(tracer: Optional[Tracer] = None) -> str:
+    """Waterfall of the most recent turn, for the hubs' status commands"""
+    tracer = tracer or get_tracer()
+    if not tracer.enabled:
+        return f"🧵 TRACING: off (set {TRACE_ENV}=1 to record per-turn waterfalls)"
+    spans = tracer.last_trace()
+    if not spans:
+        return "🧵 TRACING: on, no completed turns yet"
+    return "🧵 LAST TURN:\n" + format_waterfall(spans)
+
+
+def print_last_trace(tracer: Optional[Tracer] = None):
+    print("\n" + describe_last_trace(tracer))
+
+
+def traced(name: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL):
+    """Decorator: run the function (sync or async) inside a span"""
+
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tracer = get_tracer()
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name, kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def bind(func: Callable) -> Callable:
+    """Carry the current span into a call made on another thread (run_in_executor)"""
+    if not get_tracer().enabled:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def _tracer_from_env() -> Tracer:
+    setting = os.environ.get(TRACE_ENV, "").strip()
+    if setting.lower() in ("", "0", "false", "no", "off"):
+        return Tracer()
+    if setting.lower() in ("1", "true", "yes", "on"):
+        return Tracer(enabled=True, export_path=str(DEFAULT_TRACE_FILE))
+    return Tracer(enabled=True, export_path=setting)
+
+
+# Global tracer instance
+tracer = None
+tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get or create the global tracer (configured from DJINN_TRACE)"""
+    global tracer
+    if tracer is None:
+        with tracer_lock:
+            if tracer is None:
+                tracer = _tracer_from_env()
+    return tracer
@@ -34,19 +34,27 @@ class PayloadValidationError(ValidationError):
     pass
 
 # === Logging Setup ===
+# Importing the validators must not touch the filesystem or the root logger:
+# the validation log and its directory are created with the first record,
+# and console output is left to whichever entry point configures logging.
 VALIDATION_LOG_DIR = Path("logs")
-VALIDATION_LOG_DIR.mkdir(exist_ok=True)
 VALIDATION_LOG_FILE = VALIDATION_LOG_DIR / "input_validation.log"
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(VALIDATION_LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+class DeferredFileHandler(logging.FileHandler):
+    """FileHandler that creates its directory and file on the first record"""
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
 validation_logger = logging.getLogger('InputValidator')
+validation_logger.setLevel(logging.INFO)
+if not validation_logger.handlers:  # Once, even if the module is loaded under two names
+    _validation_log_handler = DeferredFileHandler(VALIDATION_LOG_FILE)
+    _validation_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    validation_logger.addHandler(_validation_log_handler)
 
 # === Schema Definitions ===
 FEDERATION_CONFIG_SCHEMA = {
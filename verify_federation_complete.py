@@ -10,17 +10,15 @@ import sys
 import time
 from pathlib import Path
 
+from model_inventory import get_model_inventory
+from ollama_client import OllamaError
+
 
 def check_model_exists(model_name):
     """Check if a model exists in Ollama"""
     try:
-        result = subprocess.run(
-            ["ollama", "list"], capture_output=True, text=True, timeout=30
-        )
-        if result.returncode == 0:
-            return model_name in result.stdout
-        return False
-    except Exception:
+        return get_model_inventory().is_installed(model_name)
+    except OllamaError:
         return False
 
 